@@ -0,0 +1,262 @@
+"""
+Adaptive (AIMD) concurrency for Edge TTS
+
+A static 30-slot pool under-uses Edge TTS at night and gets throttled at
+peak. AdaptiveConcurrencyController replaces EDGE_TTS_SEMAPHORE with a gate
+whose limit follows what the service tolerates:
+
+- Additive increase: every EDGE_TTS_AIMD_WINDOW seconds, if the window had
+  enough samples, p95 chunk latency stayed under EDGE_TTS_P95_TARGET, the
+  error rate stayed under EDGE_TTS_MAX_ERROR_RATE and the pool was actually
+  saturated, the limit grows by one slot
+- Multiplicative decrease: a 429 / throttle response or a timeout cuts the
+  limit by EDGE_TTS_AIMD_BETA immediately (at most once per cooldown, so one
+  burst of failures from in-flight requests counts once); an unhealthy window
+  does the same
+- Every change is pushed to listeners; the TTS service feeds it into
+  GLOBAL_USER_LIMITER.update_max_slots() and re-runs the per-user split, so
+  UserJobManager fairness is preserved at any ceiling
+
+get_stats() exposes the current limit, a cumulative latency histogram, recent
+p50/p95 and the last throttle events.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+EDGE_TTS_INITIAL_SLOTS = int(os.getenv('EDGE_TTS_INITIAL_SLOTS', '30'))
+EDGE_TTS_MIN_SLOTS = int(os.getenv('EDGE_TTS_MIN_SLOTS', '4'))
+EDGE_TTS_MAX_SLOTS = int(os.getenv('EDGE_TTS_MAX_SLOTS', '64'))
+EDGE_TTS_P95_TARGET = float(os.getenv('EDGE_TTS_P95_TARGET', '25'))  # seconds per chunk
+EDGE_TTS_MAX_ERROR_RATE = float(os.getenv('EDGE_TTS_MAX_ERROR_RATE', '0.05'))
+EDGE_TTS_AIMD_WINDOW = float(os.getenv('EDGE_TTS_AIMD_WINDOW', '15'))
+EDGE_TTS_AIMD_BETA = float(os.getenv('EDGE_TTS_AIMD_BETA', '0.7'))
+EDGE_TTS_DECREASE_COOLDOWN = 10.0
+EDGE_TTS_WINDOW_MIN_SAMPLES = 8
+
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120)  # seconds; plus +Inf
+THROTTLE_MARKERS = ("429", "too many requests", "rate limit", "throttl", "quota")
+TIMEOUT_MARKERS = ("timeout", "timed out")
+
+
+def classify_failure(exc: BaseException) -> str:
+    """'throttle', 'timeout' or 'error' for an exception raised by an Edge TTS request"""
+    if getattr(exc, "status", None) == 429:
+        return "throttle"
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return "timeout"
+    msg = str(exc).lower()
+    if any(marker in msg for marker in THROTTLE_MARKERS):
+        return "throttle"
+    if any(marker in msg for marker in TIMEOUT_MARKERS):
+        return "timeout"
+    return "error"
+
+
+class AdaptiveConcurrencyController:
+    """Resizable concurrency gate with AIMD control of its limit"""
+
+    def __init__(
+        self,
+        name: str,
+        initial: int = EDGE_TTS_INITIAL_SLOTS,
+        minimum: int = EDGE_TTS_MIN_SLOTS,
+        maximum: int = EDGE_TTS_MAX_SLOTS,
+        p95_target: float = EDGE_TTS_P95_TARGET,
+        max_error_rate: float = EDGE_TTS_MAX_ERROR_RATE,
+        window: float = EDGE_TTS_AIMD_WINDOW,
+        beta: float = EDGE_TTS_AIMD_BETA,
+    ):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError(f"Invalid AIMD bounds: min={minimum} initial={initial} max={maximum}")
+        self.name = name
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.p95_target = p95_target
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.beta = beta
+
+        self.inflight = 0
+        self._condition = asyncio.Condition()
+        self._listeners: List[Callable[[int], Awaitable[None]]] = []
+        self._apply_tasks = set()
+
+        # Current control window
+        self._window_started = time.monotonic()
+        self._window_latencies: List[float] = []
+        self._window_failures = 0
+        self._window_peak_inflight = 0
+        self._last_decrease = 0.0
+
+        # Observability
+        self._recent: Deque[float] = deque(maxlen=500)
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.successes = 0
+        self.errors = 0
+        self.throttles = 0
+        self.timeouts = 0
+        self.increases = 0
+        self.decreases = 0
+        self.throttle_events: Deque[Dict] = deque(maxlen=50)
+
+    def add_listener(self, callback: Callable[[int], Awaitable[None]]):
+        """callback(new_limit) is awaited (as a task) after every limit change"""
+        self._listeners.append(callback)
+
+    # ------------------------------------------------------------------ gate
+
+    @asynccontextmanager
+    async def request(self):
+        """Hold one permit for the duration of an Edge TTS request and record its outcome"""
+        async with self._condition:
+            while self.inflight >= self.limit:
+                await self._condition.wait()
+            self.inflight += 1
+            self._window_peak_inflight = max(self._window_peak_inflight, self.inflight)
+
+        started = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._record_failure(classify_failure(e), e)
+            raise
+        else:
+            self._record_success(time.monotonic() - started)
+        finally:
+            async with self._condition:
+                self.inflight -= 1
+                self._condition.notify_all()
+
+    # --------------------------------------------------------------- control
+
+    def _record_success(self, latency: float):
+        self.successes += 1
+        self.histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self._recent.append(latency)
+        self._window_latencies.append(latency)
+        self._maybe_evaluate_window()
+
+    def _record_failure(self, kind: str, exc: BaseException):
+        self._window_failures += 1
+        if kind == "error":
+            self.errors += 1
+            self._maybe_evaluate_window()
+            return
+
+        if kind == "throttle":
+            self.throttles += 1
+        else:
+            self.timeouts += 1
+        before = self.limit
+        decreased = self._decrease()
+        self.throttle_events.append({
+            "at": time.time(),
+            "kind": kind,
+            "limit_before": before,
+            "limit_after": self.limit,
+            "decreased": decreased,
+            "error": str(exc)[:200],
+        })
+
+    def _maybe_evaluate_window(self):
+        now = time.monotonic()
+        samples = len(self._window_latencies) + self._window_failures
+        if now - self._window_started < self.window or samples < EDGE_TTS_WINDOW_MIN_SAMPLES:
+            return
+
+        p95 = self._percentile(self._window_latencies, 0.95)
+        error_rate = self._window_failures / samples
+        saturated = self._window_peak_inflight >= self.limit - 1
+
+        if error_rate > self.max_error_rate or (p95 is not None and p95 > self.p95_target):
+            self._decrease()
+        elif saturated and self.limit < self.maximum:
+            self._set_limit(self.limit + 1)
+            self.increases += 1
+
+        self._window_started = now
+        self._window_latencies = []
+        self._window_failures = 0
+        self._window_peak_inflight = self.inflight
+
+    def _decrease(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_decrease < EDGE_TTS_DECREASE_COOLDOWN:
+            return False
+        self._last_decrease = now
+        new_limit = max(self.minimum, int(self.limit * self.beta))
+        if new_limit == self.limit:
+            return False
+        self._set_limit(new_limit)
+        self.decreases += 1
+        return True
+
+    def _set_limit(self, new_limit: int):
+        old_limit, self.limit = self.limit, new_limit
+        logger.info(f"[{self.name}] AIMD limit {old_limit} -> {new_limit} (inflight={self.inflight})")
+        self._schedule(self._apply(new_limit))
+
+    def _schedule(self, coro):
+        task = asyncio.create_task(coro)
+        self._apply_tasks.add(task)
+        task.add_done_callback(self._apply_tasks.discard)
+
+    async def _apply(self, new_limit: int):
+        async with self._condition:
+            self._condition.notify_all()  # growth admits waiters right away
+        for callback in self._listeners:
+            try:
+                await callback(new_limit)
+            except Exception as e:
+                logger.error(f"[{self.name}] limit listener failed: {e}")
+
+    # ---------------------------------------------------------- observability
+
+    @staticmethod
+    def _percentile(values, q: float) -> Optional[float]:
+        if not values:
+            return None
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def get_stats(self) -> Dict:
+        recent = list(self._recent)
+        buckets = {f"le_{b}": 0 for b in LATENCY_BUCKETS}
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.histogram):
+            cumulative += count
+            buckets[f"le_{bound}"] = cumulative
+        buckets["le_inf"] = cumulative + self.histogram[-1]
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "min_limit": self.minimum,
+            "max_limit": self.maximum,
+            "inflight": self.inflight,
+            "p95_target_seconds": self.p95_target,
+            "recent_p50_seconds": self._percentile(recent, 0.5),
+            "recent_p95_seconds": self._percentile(recent, 0.95),
+            "latency_histogram": buckets,
+            "successes": self.successes,
+            "errors": self.errors,
+            "throttles": self.throttles,
+            "timeouts": self.timeouts,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "throttle_events": list(self.throttle_events),
+        }
+
+
+edge_tts_concurrency = AdaptiveConcurrencyController("EDGE_TTS")
@@ -449,13 +449,9 @@ class AlbumService:
                             from enhanced_tts_voice_service import enhanced_voice_tts_service
                             
                             # Find and cancel any active jobs for this track
-                            for user_id, limiter in enhanced_voice_tts_service.user_job_manager._user_limiters.items():
-                                async with limiter._condition:
-                                    for job_id in list(limiter.desired.keys()):
-                                        job_info = enhanced_voice_tts_service.user_job_manager._user_jobs.get(user_id, {}).get(job_id)
-                                        if job_info and job_info.get('track_id') == tts_track.id:
-                                            logger.info(f"Cancelling TTS for track {tts_track.id} during album deletion")
-                                            await enhanced_voice_tts_service.cancel_job(job_id, tts_track.id)
+                            for _, job_id in await enhanced_voice_tts_service.user_job_manager.find_jobs_for_track(tts_track.id):
+                                logger.info(f"Cancelling TTS for track {tts_track.id} during album deletion")
+                                await enhanced_voice_tts_service.cancel_job(job_id, tts_track.id)
                         except Exception as cancel_error:
                             logger.warning(f"Could not cancel TTS job for track {tts_track.id}: {cancel_error}")
                     
@@ -742,6 +738,7 @@ class AlbumService:
             ).all()
 
             updated_albums = []
+            revoked_track_ids = []
             for album in albums:
                 if minimum_tier and tier:
                     album.tier_restrictions = {
@@ -773,9 +770,15 @@ class AlbumService:
                 for track in tracks:
                     old_version = track.content_version or 0
                     track.content_version = old_version + 1
+                    revoked_track_ids.append(str(track.id))
 
             self.db.commit()
 
+            # Token-only segment requests never see content_version, so mark grants stale
+            from authorization_service import AuthorizationService
+            for revoked_track_id in revoked_track_ids:
+                AuthorizationService.mark_track_revoked(revoked_track_id)
+
             # Get creator name for notification
             creator_obj = self.db.query(User).filter(User.id == creator_id).first()
             creator_name = creator_obj.username if creator_obj else None
@@ -1,7 +1,7 @@
 from redis_state.config import redis_client, REDIS_HOST, REDIS_PORT, REDIS_PASSWORD
 
 
-from authorization_service import AuthorizationService
+from authorization_service import AuthorizationService, get_user_tier_amount
 from sync.sync_service import PatreonSyncService
 from sync.sync_worker import PatreonSyncWorker
 from models import Campaign  # Import Campaign model
@@ -57,6 +57,7 @@ from read_along_cache import start_cache_cleanup_task
 from activity_logs_router import router as activity_logs_router
 from user_preferences import router as user_preferences_router
 from scheduled_visibility_routes import router as scheduled_visibility_router
+from worker_monitoring import monitor_router
 from progress import router as progress_router, get_in_progress_tracks as get_in_progress_tracks_from_router
 
 from credit_reservation import CreditReservationService
@@ -71,6 +72,7 @@ from enhanced_app_routes_voice import (
     serve_hls_master, 
     serve_variant_playlist, 
     serve_segment,
+    serve_segment_fast,
     player,
     get_segment_progress,
     get_track_metadata,
@@ -455,11 +457,12 @@ async def _cleanup_download_managers(download_manager, track_download_manager):
     await track_download_manager.stop()
 
 async def _cleanup_temp_directories(temp_dirs):
-    """Remove temporary directories."""
+    """Remove temporary directories (TTS sessions that can be resumed are kept)."""
+    from tts_job_manifest import rmtree_preserving_sessions
     logger.info("Cleaning up temporary directories...")
     for dir_path in temp_dirs:
         if Path(dir_path).exists():
-            shutil.rmtree(dir_path)
+            rmtree_preserving_sessions(Path(dir_path))
             logger.info(f"Cleaned up directory: {dir_path}")
 
 async def cleanup_stale_voice_generations():
@@ -523,6 +526,8 @@ async def lifespan(app: FastAPI):
     orphan_cleanup_task = None
     voice_cleanup_task = None
     voice_status_validator_task = None
+    hot_segment_prewarm_task = None
+    progress_flush_task = None
 
     try:
         # ============================================================
@@ -544,8 +549,12 @@ async def lifespan(app: FastAPI):
         # Cleanup orphaned track locks
         logger.info("🔧 Cleaning up orphaned track locks...")
         from status_lock import status_lock
+        from tts_job_manifest import find_interrupted_jobs
+        interrupted_tts_jobs = await find_interrupted_jobs()
         with SessionLocal() as startup_db:
-            cleared_count = await status_lock.clear_all_on_startup(startup_db)
+            cleared_count = await status_lock.clear_all_on_startup(
+                startup_db, resumable_jobs=interrupted_tts_jobs
+            )
         if cleared_count > 0:
             logger.warning(f"⚠️ Cleared {cleared_count} orphaned track locks from previous session")
 
@@ -632,11 +641,29 @@ async def lifespan(app: FastAPI):
         
         # Initialize stream manager
         await stream_manager.initialize()
+
+        # Keep the opening segments of popular tracks in memory
+        logger.info("🔥 Starting hot segment pre-warm task...")
+        from hot_segment_cache import hot_segment_prewarm_loop
+        hot_segment_prewarm_task = asyncio.create_task(hot_segment_prewarm_loop())
+        app.state.background_tasks.append(hot_segment_prewarm_task)
+
+        # Flush write-behind playback progress to Postgres
+        logger.info("💾 Starting playback progress flush task...")
+        from playback_progress_buffer import playback_progress_flush_loop
+        progress_flush_task = asyncio.create_task(playback_progress_flush_loop())
+        app.state.background_tasks.append(progress_flush_task)
         
         # Initialize track-centric text storage
         logger.info("Initializing track-centric text storage service with 15GB TTL cache...")
         from text_storage_service import initialize_text_storage
         await initialize_text_storage()
+
+        # Continue TTS jobs a restart interrupted, from their chunk manifests
+        if interrupted_tts_jobs:
+            from enhanced_tts_api_voice import resume_interrupted_tts_jobs
+            resumed_count = await resume_interrupted_tts_jobs(interrupted_tts_jobs)
+            logger.info(f"🔁 Resumed {resumed_count}/{len(interrupted_tts_jobs)} interrupted TTS jobs")
         
         # Initialize document extraction service
         logger.info("Initializing document extraction service...")
@@ -722,6 +749,10 @@ async def lifespan(app: FastAPI):
 
         yield
 
+        # From here on a cancelled TTS job is an interruption, kept for resume
+        from enhanced_tts_voice_service import enhanced_voice_tts_service
+        enhanced_voice_tts_service.begin_shutdown()
+
         logger.info("🔧 Stopping periodic lock cleanup...")
         await status_lock.stop_periodic_cleanup()
         
@@ -754,6 +785,29 @@ async def lifespan(app: FastAPI):
         if orphan_cleanup_task:
             orphan_cleanup_task.cancel()
             await orphan_cleanup_task
+
+        # Stop hot segment pre-warm task
+        if hot_segment_prewarm_task:
+            hot_segment_prewarm_task.cancel()
+            await hot_segment_prewarm_task
+
+        # Stop progress flusher and drain what is still buffered
+        if progress_flush_task:
+            progress_flush_task.cancel()
+            await progress_flush_task
+        try:
+            from playback_progress_buffer import playback_progress_buffer
+            flushed = await playback_progress_buffer.flush_all()
+            logger.info(f"Flushed {flushed} buffered playback progress rows")
+        except Exception as e:
+            logger.error(f"Error flushing playback progress: {e}")
+
+        # Flush buffered voice access counters
+        try:
+            from voice_cache_manager import voice_access_tracker
+            await voice_access_tracker.flush()
+        except Exception as e:
+            logger.error(f"Error flushing voice access tracker: {e}")
         
         # Clean up document extraction
         await _cleanup_document_extraction()
@@ -2099,6 +2153,7 @@ app.include_router(document_router)
 app.include_router(activity_logs_router)
 app.include_router(user_preferences_router)
 app.include_router(scheduled_visibility_router)
+app.include_router(monitor_router)
 
 
 
@@ -3559,7 +3614,8 @@ async def check_track_access(
                     track_id=track_id,
                     voice_id=None,  # Will be specified per-voice for TTS tracks
                     content_version=track.content_version or 1,
-                    user_id=current_user.id
+                    user_id=current_user.id,
+                    tier_amount=get_user_tier_amount(current_user)
                 )
 
             return JSONResponse({
@@ -3583,7 +3639,8 @@ async def check_track_access(
                     track_id=track_id,
                     voice_id=None,
                     content_version=track.content_version or 1,
-                    user_id=current_user.id
+                    user_id=current_user.id,
+                    tier_amount=get_user_tier_amount(current_user)
                 )
 
             return JSONResponse({
@@ -3620,7 +3677,8 @@ async def check_track_access(
                         track_id=track_id,
                         voice_id=None,
                         content_version=track.content_version or 1,
-                        user_id=current_user.id
+                        user_id=current_user.id,
+                        tier_amount=get_user_tier_amount(current_user)
                     )
 
                 return JSONResponse({
@@ -3646,7 +3704,8 @@ async def check_track_access(
                             track_id=track_id,
                             voice_id=None,
                             content_version=track.content_version or 1,
-                            user_id=current_user.id
+                            user_id=current_user.id,
+                            tier_amount=get_user_tier_amount(current_user)
                         )
 
                     return JSONResponse({
@@ -3721,12 +3780,10 @@ async def serve_segment_route(
     track_id: str,
     quality: str,
     segment_id: str,
-    request: Request,
-    db: Session = Depends(get_db),
-    current_user = Depends(login_required)
+    request: Request
 ):
-    """Regular audio tracks - segments"""
-    return await serve_segment(track_id, quality, segment_id, request, db, current_user)
+    """Regular audio tracks - segments (grant token fast path, session fallback)"""
+    return await serve_segment_fast(track_id, quality, segment_id, request)
 
 @app.get("/hls/{track_id}/voice/{voice_id}/{quality}/segment_{segment_id}.ts")
 async def serve_segment_voice_route(
@@ -3734,12 +3791,38 @@ async def serve_segment_voice_route(
     voice_id: str,
     quality: str,
     segment_id: str,
-    request: Request,
-    db: Session = Depends(get_db),
-    current_user = Depends(login_required)
+    request: Request
 ):
-    """TTS tracks with specific voice - segments"""
-    return await serve_segment(track_id, quality, segment_id, request, db, current_user, voice_id=voice_id)
+    """TTS tracks with specific voice - segments (grant token fast path, session fallback)"""
+    return await serve_segment_fast(track_id, quality, segment_id, request, voice_id=voice_id)
+
+
+@app.get("/api/admin/track-metadata-cache/stats")
+async def get_track_metadata_cache_stats(current_user: User = Depends(login_required)):
+    """Hit/miss counters for the per-worker track metadata cache"""
+    if not current_user.is_creator:
+        raise HTTPException(status_code=403, detail="Admin only")
+
+    from track_metadata_cache import track_metadata_cache
+    return track_metadata_cache.get_stats()
+
+@app.get("/api/admin/tts-chunk-cache/stats")
+async def get_tts_chunk_cache_stats(current_user: User = Depends(login_required)):
+    """Hit/miss counters and disk usage of the content-addressed TTS chunk cache"""
+    if not current_user.is_creator:
+        raise HTTPException(status_code=403, detail="Admin only")
+
+    from tts_chunk_cache import tts_chunk_cache
+    return tts_chunk_cache.get_stats()
+
+@app.get("/api/admin/edge-tts/concurrency")
+async def get_edge_tts_concurrency_stats(current_user: User = Depends(login_required)):
+    """Adaptive Edge TTS slot limit, latency histogram and recent throttle events"""
+    if not current_user.is_creator:
+        raise HTTPException(status_code=403, detail="Admin only")
+
+    from adaptive_concurrency import edge_tts_concurrency
+    return edge_tts_concurrency.get_stats()
 
 async def update_session_activity(request: Request, db: Session):
     """Non-blocking session activity update"""
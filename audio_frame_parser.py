@@ -0,0 +1,347 @@
+"""
+In-process MP3 / ADTS-AAC duration from frame headers
+
+Every Edge TTS chunk used to be measured with an ffprobe subprocess, and
+uploads were probed the same way; a long book spawned thousands of them.
+MP3 and ADTS streams carry the sample count in every frame header, so the
+exact duration is just a frame walk:
+
+- AudioFrameCounter.feed() accepts bytes as they arrive (e.g. straight from
+  communicate.stream()), so a chunk's duration is known the moment its last
+  byte is written
+- probe_audio_file() walks a file on disk and returns the same metadata dict
+  shape as the ffprobe extractors
+- The counter also records where the audio payload starts and ends, so
+  mp3_concat can splice files without their tags
+
+Leading/embedded ID3v2 tags are skipped, a Xing/Info/VBRI header frame is not
+counted as audio, and trailing junk (ID3v1 etc.) is ignored. Anything that
+does not start with a valid frame is reported as unrecognized so callers can
+fall back to ffprobe.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PROBE_READ_SIZE = 1024 * 1024
+MAX_JUNK_RATIO = 0.05  # more unparseable bytes than this -> not confident, use ffprobe
+
+# MPEG audio version bits -> name; 1 is reserved
+_MPEG_VERSIONS = {0: "2.5", 2: "2", 3: "1"}
+# layer bits -> layer number; 0 is reserved (and is ADTS's layer field)
+_MPEG_LAYERS = {1: 3, 2: 2, 3: 1}
+
+_MPEG_SAMPLE_RATES = {
+    "1": (44100, 48000, 32000),
+    "2": (22050, 24000, 16000),
+    "2.5": (11025, 12000, 8000),
+}
+
+# kbit/s, index 0 = free format (unsupported), 15 = invalid
+_MPEG_BITRATES = {
+    ("1", 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    ("1", 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    ("1", 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    ("2", 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    ("2", 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    ("2", 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+_ADTS_SAMPLE_RATES = (
+    96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050, 16000, 12000, 11025, 8000, 7350
+)
+
+_MAX_HEADER_PEEK = 48  # enough for any MP3 side info + Xing/VBRI tag
+
+
+def _parse_mpeg_header(b: bytes, i: int) -> Optional[tuple]:
+    """(frame_length, samples, sample_rate, channels, version, layer) or None"""
+    b1, b2, b3 = b[i + 1], b[i + 2], b[i + 3]
+    version = _MPEG_VERSIONS.get((b1 >> 3) & 3)
+    layer = _MPEG_LAYERS.get((b1 >> 1) & 3)
+    if version is None or layer is None:
+        return None
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 3
+    if bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    table_version = "1" if version == "1" else "2"
+    bitrate = _MPEG_BITRATES[(table_version, layer)][bitrate_index] * 1000
+    sample_rate = _MPEG_SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 1
+    channels = 1 if (b3 >> 6) == 3 else 2
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2:
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+    elif version == "1":
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 576
+        length = 72 * bitrate // sample_rate + padding
+
+    return length, samples, sample_rate, channels, version, layer
+
+
+def _parse_adts_header(b: bytes, i: int) -> Optional[tuple]:
+    """(frame_length, samples, sample_rate, channels) or None"""
+    b2, b3, b4, b5, b6 = b[i + 2], b[i + 3], b[i + 4], b[i + 5], b[i + 6]
+    rate_index = (b2 >> 2) & 0xF
+    if rate_index >= len(_ADTS_SAMPLE_RATES):
+        return None
+    length = ((b3 & 3) << 11) | (b4 << 3) | (b5 >> 5)
+    header_len = 7 if b[i + 1] & 1 else 9
+    if length <= header_len:
+        return None
+    channels = ((b2 & 1) << 2) | (b3 >> 6)
+    samples = 1024 * ((b6 & 3) + 1)
+    return length, samples, _ADTS_SAMPLE_RATES[rate_index], channels
+
+
+def _has_vbr_tag(frame: bytes, version: str, channels: int) -> bool:
+    side_info = (32 if channels == 2 else 17) if version == "1" else (17 if channels == 2 else 9)
+    tag = frame[4 + side_info:8 + side_info]
+    return tag in (b"Xing", b"Info") or frame[36:40] == b"VBRI"
+
+
+class AudioFrameCounter:
+    """Incremental MP3 / ADTS frame walker; feed() bytes, read .duration"""
+
+    def __init__(self):
+        self.codec: Optional[str] = None
+        self.sample_rate = 0
+        self.channels = 0
+        self.frames = 0
+        self.samples = 0
+        self.audio_bytes = 0
+        self.junk_bytes = 0
+        self.total_bytes = 0
+        self.unrecognized = False
+        self._buf = bytearray()
+        self._skip = 0
+        self._lock = None  # (version, layer, sample_rate) of the first frame
+        self._known_headers: Dict[bytes, tuple] = {}  # MP3 header bytes -> (length, samples)
+
+        # Payload layout, as stream offsets
+        self.audio_start: Optional[int] = None  # first counted frame (after ID3v2 / Xing)
+        self.audio_end = 0  # just past the last counted frame (before ID3v1 / trailing junk)
+        self.interior_junk = 0  # junk or tags between counted frames
+        self.first_header: Optional[bytes] = None
+        self._base = 0  # stream offset of _buf[0]
+        self._pending_junk = 0
+
+    @property
+    def duration(self) -> float:
+        return self.samples / self.sample_rate if self.sample_rate else 0.0
+
+    @property
+    def is_valid(self) -> bool:
+        """True when the stream parsed cleanly enough to trust duration over ffprobe"""
+        return (
+            not self.unrecognized
+            and self.frames > 0
+            and self.junk_bytes <= self.total_bytes * MAX_JUNK_RATIO
+        )
+
+    @property
+    def bit_rate(self) -> int:
+        return int(self.audio_bytes * 8 / self.duration) if self.duration else 0
+
+    @property
+    def signature(self) -> Optional[tuple]:
+        """Codec, MPEG version/layer, sample rate and channels; equal signatures splice cleanly"""
+        if self._lock is None:
+            return None
+        return (self.codec, self._lock, self.channels)
+
+    @property
+    def is_cbr(self) -> bool:
+        return self.codec == "mp3" and len({header[2] >> 4 for header in self._known_headers}) == 1
+
+    def feed(self, data: bytes):
+        self.total_bytes += len(data)
+        if self.unrecognized:
+            return
+        if self._skip:
+            if self._skip >= len(data):
+                self._skip -= len(data)
+                self._base += len(data)
+                return
+            data = data[self._skip:]
+            self._base += self._skip
+            self._skip = 0
+        self._buf += data
+        self._walk(final=False)
+
+    def finish(self) -> "AudioFrameCounter":
+        """Account for a trailing partial buffer (junk or a truncated last frame)"""
+        self._walk(final=True)
+        self.junk_bytes += len(self._buf)
+        self._buf.clear()
+        return self
+
+    def _walk(self, final: bool):
+        buf = self._buf
+        end = len(buf)
+        i = 0
+        last_end = None
+        pending = self._pending_junk
+
+        known = self._known_headers
+        while i < end:
+            remaining = end - i
+
+            # Fast path: an MP3 header already seen fully determines the frame
+            cached = known.get(bytes(buf[i:i + 4])) if remaining >= 4 else None
+            if cached is not None:
+                length, samples = cached
+                if length > remaining:
+                    break
+                self.frames += 1
+                self.samples += samples
+                self.audio_bytes += length
+                i += length
+                last_end = i
+                if pending:
+                    self.interior_junk += pending
+                    pending = 0
+                continue
+
+            if buf[i] == 0x49 and buf[i + 1:i + 3] == b"D3":  # "ID3"
+                if remaining < 10:
+                    break
+                size = (buf[i + 6] << 21) | (buf[i + 7] << 14) | (buf[i + 8] << 7) | buf[i + 9]
+                tag_len = 10 + size + (10 if buf[i + 5] & 0x10 else 0)
+                if self.frames:
+                    pending += tag_len
+                if tag_len > remaining:
+                    self._skip = tag_len - remaining
+                    i = end
+                    break
+                i += tag_len
+                continue
+
+            if remaining < 7 and not final:
+                break
+            if remaining < 4:
+                break
+
+            header = None
+            if buf[i] == 0xFF and (buf[i + 1] & 0xE0) == 0xE0:
+                if (buf[i + 1] & 0xF6) == 0xF0 and remaining >= 7:
+                    parsed = _parse_adts_header(buf, i)
+                    if parsed and self._accept(("adts", None, parsed[2])):
+                        header = ("aac",) + parsed
+                elif (buf[i + 1] & 0x06) != 0:
+                    parsed = _parse_mpeg_header(buf, i)
+                    if parsed and self._accept((parsed[4], parsed[5], parsed[2])):
+                        header = ("mp3",) + parsed
+
+            if header is None:
+                if self.codec is None:
+                    # Stream does not open with a frame (WAV, FLAC, MP4, ...): leave it to ffprobe
+                    self.unrecognized = True
+                    buf.clear()
+                    return
+                next_sync = buf.find(b"\xff", i + 1)
+                skipped = (next_sync if next_sync != -1 else end) - i
+                self.junk_bytes += skipped
+                if self.frames:
+                    pending += skipped
+                i += skipped
+                continue
+
+            codec, length, samples, sample_rate, channels = header[:5]
+            if length > remaining:
+                # Frames are at most a few KiB; wait for the rest (a truncated last frame is junk)
+                break
+
+            if self.codec is None and codec == "mp3" and _has_vbr_tag(
+                bytes(buf[i:i + min(length, _MAX_HEADER_PEEK)]), header[5], channels
+            ):
+                self.codec = codec
+                self.sample_rate = sample_rate
+                self.channels = channels
+                i += length
+                continue
+
+            if self.audio_start is None:
+                self.audio_start = self._base + i
+                self.first_header = bytes(buf[i:i + 4])
+            self._count(codec, length, samples, sample_rate, channels)
+            if codec == "mp3":
+                known[bytes(buf[i:i + 4])] = (length, samples)
+            i += length
+            last_end = i
+            if pending:
+                self.interior_junk += pending
+                pending = 0
+
+        if last_end is not None:
+            self.audio_end = self._base + last_end
+        self._pending_junk = pending
+        del buf[:i]
+        self._base += i
+
+    def _accept(self, signature: tuple) -> bool:
+        if self._lock is None:
+            self._lock = signature
+            return True
+        return signature == self._lock
+
+    def _count(self, codec: str, length: int, samples: int, sample_rate: int, channels: int):
+        if self.codec is None or self.frames == 0:
+            self.codec = codec
+            self.sample_rate = sample_rate
+            self.channels = channels
+        self.frames += 1
+        self.samples += samples
+        self.audio_bytes += length
+
+    def metadata(self) -> Optional[Dict]:
+        """ffprobe-extractor shaped dict (without size/extracted_at), or None if not trustworthy"""
+        if not self.is_valid:
+            return None
+        return {
+            'duration': self.duration,
+            'format': 'mp3' if self.codec == 'mp3' else 'aac',
+            'codec': self.codec,
+            'sample_rate': self.sample_rate,
+            'channels': self.channels,
+            'bit_rate': self.bit_rate,
+        }
+
+
+def probe_audio_file(file_path: Union[str, Path]) -> Optional[Dict]:
+    """
+    Frame-walk an MP3/ADTS file (blocking; run in a thread from async code).
+    Returns metadata with 'duration', 'size', 'format', 'codec', 'sample_rate',
+    'channels', 'bit_rate', or None for anything else.
+    """
+    path = Path(file_path)
+    counter = AudioFrameCounter()
+    try:
+        with path.open('rb') as f:
+            while True:
+                data = f.read(PROBE_READ_SIZE)
+                if not data:
+                    break
+                counter.feed(data)
+                if counter.unrecognized:
+                    return None
+    except OSError as e:
+        logger.debug(f"Frame probe failed for {path}: {e}")
+        return None
+
+    metadata = counter.finish().metadata()
+    if metadata is not None:
+        metadata['size'] = counter.total_bytes
+    return metadata
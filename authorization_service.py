@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 
 from models import User, Track, Album, CampaignTier
 from redis_config import redis_client
+from track_metadata_cache import track_metadata_cache
 
 # Secret for signing tokens (in production, use env variable)
 import os
@@ -21,6 +22,17 @@ TOKEN_SECRET = os.getenv('GRANT_TOKEN_SECRET', 'your-secret-key-change-in-produc
 # Token TTL in seconds (10 minutes)
 TOKEN_TTL = 600
 
+# How long a per-worker copy of a track's revocation marker is trusted (seconds)
+REVOCATION_CACHE_TTL = 5.0
+
+# Grant 'amt' claim of creators and team, who pass every tier restriction
+UNRESTRICTED_TIER_AMOUNT = 2 ** 31 - 1
+# Grant 'amt' claim of users check_tier_access never admits to restricted albums
+NO_TIER_AMOUNT = -1
+
+# {track_id: (revoked_at, checked_at)}
+_revocation_cache = {}
+
 class AuthorizationService:
     """Unified authorization service with token caching"""
 
@@ -86,7 +98,8 @@ class AuthorizationService:
         voice_id: Optional[str],
         content_version: int,
         user_id: int,
-        ttl: int = TOKEN_TTL
+        ttl: int = TOKEN_TTL,
+        tier_amount: Optional[int] = None
     ) -> str:
         """
         Create a signed grant token valid for TTL seconds.
@@ -95,11 +108,13 @@ class AuthorizationService:
         old tokens become invalid automatically.
 
         Format: {payload}.{signature}
-        Payload: base64({session_id, track_id, voice_id, content_version, user_id, exp})
+        Payload: base64({session_id, track_id, voice_id, content_version, user_id,
+                         tier_amount, iat, exp})
         """
         import base64
 
-        expiry = int(time.time()) + ttl
+        issued_at = int(time.time())
+        expiry = issued_at + ttl
 
         payload = {
             'sid': session_id,
@@ -107,6 +122,8 @@ class AuthorizationService:
             'vid': voice_id,
             'cv': content_version,  # Content version for cache invalidation
             'uid': user_id,
+            'amt': tier_amount,  # Tier amount (cents) the grant was issued against
+            'iat': issued_at,
             'exp': expiry
         }
 
@@ -183,6 +200,116 @@ class AuthorizationService:
         except Exception as e:
             return False, f"Token validation error: {str(e)}"
 
+    @staticmethod
+    def decode_grant_token(
+        token: str,
+        track_id: str,
+        voice_id: Optional[str]
+    ) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        Verify a grant token without knowing the current content_version.
+
+        Used by the segment fast path, which must not touch the database.
+        Instead of comparing content_version, the token's issue time is
+        checked against the track's revocation marker, which is written by
+        invalidate_track_grants() whenever content or tier rules change.
+
+        Returns:
+            (payload: Optional[dict], reason: Optional[str])
+        """
+        import base64
+
+        if not token:
+            return None, "No token provided"
+
+        try:
+            parts = token.split('.')
+            if len(parts) != 2:
+                return None, "Invalid token format"
+
+            payload_str, signature = parts
+
+            expected_sig = hmac.new(
+                TOKEN_SECRET.encode(),
+                payload_str.encode(),
+                hashlib.sha256
+            ).hexdigest()
+
+            if not hmac.compare_digest(signature, expected_sig):
+                return None, "Invalid signature"
+
+            payload = json.loads(base64.b64decode(payload_str))
+
+            if time.time() > payload['exp']:
+                return None, "Token expired"
+
+            if payload['tid'] != track_id:
+                return None, "Track ID mismatch"
+
+            if payload['vid'] != voice_id:
+                return None, "Voice ID mismatch"
+
+            # Tokens minted before the per-track fields existed can't be
+            # checked against revocation markers - send them down the full path
+            issued_at = payload.get('iat')
+            if issued_at is None or payload.get('uid') is None:
+                return None, "Legacy token"
+
+            revoked_at = AuthorizationService.get_track_revocation(track_id)
+            if revoked_at is not None and issued_at <= revoked_at:
+                return None, "Token revoked"
+
+            return payload, None
+
+        except Exception as e:
+            return None, f"Token validation error: {str(e)}"
+
+    @staticmethod
+    def get_track_revocation(track_id: str) -> Optional[int]:
+        """
+        Return the timestamp of the last grant revocation for a track.
+
+        The marker lives in Redis so it is shared by every worker; each worker
+        keeps its own copy for REVOCATION_CACHE_TTL seconds so hot segment
+        traffic costs at most one Redis GET per track every few seconds.
+        """
+        now = time.monotonic()
+        cached = _revocation_cache.get(track_id)
+        if cached and now - cached[1] < REVOCATION_CACHE_TTL:
+            return cached[0]
+
+        revoked_at = None
+        try:
+            if redis_client:
+                value = redis_client.get(f"grant_revoked:{track_id}")
+                if value:
+                    revoked_at = int(float(value))
+        except Exception:
+            # Redis failure is not fatal - the content_version check on the
+            # full path still protects changed content
+            revoked_at = cached[0] if cached else None
+
+        _revocation_cache[track_id] = (revoked_at, now)
+        return revoked_at
+
+    @staticmethod
+    def mark_track_revoked(track_id: str):
+        """Record that every grant issued for a track up to now is stale."""
+        revoked_at = int(time.time())
+        _revocation_cache[track_id] = (revoked_at, time.monotonic())
+
+        # Cached content_version / tier facts are stale too - drop them on every replica
+        track_metadata_cache.invalidate_track(track_id)
+
+        from hot_segment_cache import hot_segment_cache
+        hot_segment_cache.invalidate_track(track_id)
+        try:
+            if redis_client:
+                # Tokens outlive the marker by at most TOKEN_TTL
+                redis_client.set(f"grant_revoked:{track_id}", str(revoked_at), ex=TOKEN_TTL)
+        except Exception:
+            pass
+
     @staticmethod
     async def cache_grant_in_redis(
         session_id: str,
@@ -221,7 +348,7 @@ class AuthorizationService:
             (is_valid: bool, reason: Optional[str])
         """
         try:
-            redis = get_redis_client()
+            redis = redis_client
             if not redis:
                 return False, "Redis unavailable"
 
@@ -247,8 +374,10 @@ class AuthorizationService:
         Invalidate all grants for a track.
         Called when track content changes.
         """
+        AuthorizationService.mark_track_revoked(track_id)
+
         try:
-            redis = get_redis_client()
+            redis = redis_client
             if not redis:
                 return
 
@@ -267,13 +396,17 @@ class AuthorizationService:
         Called when album tier restrictions change.
         """
         try:
-            redis = get_redis_client()
-            if not redis:
-                return
-
             # Get all track IDs in album
             tracks = db.query(Track).filter(Track.album_id == album_id).all()
 
+            for track in tracks:
+                AuthorizationService.mark_track_revoked(str(track.id))
+            track_metadata_cache.invalidate_album(str(album_id))
+
+            redis = redis_client
+            if not redis:
+                return
+
             for track in tracks:
                 pattern = f"grant:*:{track.id}:*"
                 keys = redis.keys(pattern)
@@ -285,17 +418,52 @@ class AuthorizationService:
 
 # Helper functions for easy integration
 
+def get_user_tier_amount(user: User) -> int:
+    """
+    Effective tier amount in cents (Ko-fi donations included) for grant tokens,
+    on the same terms as permissions.check_tier_access
+    """
+    if user and (user.is_creator or user.is_team):
+        return UNRESTRICTED_TIER_AMOUNT
+    tier_data = user.patreon_tier_data if user and user.patreon_tier_data else {}
+    if not tier_data or not (user.is_patreon or user.is_kofi or user.is_guest_trial):
+        return NO_TIER_AMOUNT
+    amount = tier_data.get("amount_cents", 0) or 0
+    if user and user.is_kofi and tier_data.get('has_donations', False):
+        amount += tier_data.get('donation_amount_cents', 0) or 0
+    return amount
+
+
+def required_tier_amount(track) -> Optional[int]:
+    """Minimum tier amount (cents) the track's album demands, None if it is not restricted"""
+    album = getattr(track, 'album', None)
+    restrictions = album.tier_restrictions if album else None
+    if not restrictions or restrictions.get("is_restricted") is not True:
+        return None
+    return restrictions.get("minimum_tier_amount", 0) or 0
+
+
+def grant_covers_tier(payload: dict, track) -> bool:
+    """Whether a decoded grant was issued for a tier high enough for track (tokens without 'amt' are not)"""
+    required = required_tier_amount(track)
+    if required is None:
+        return True
+    amount = payload.get('amt')
+    return amount is not None and amount >= required
+
+
 def issue_grant_token(
     session_id: str,
     track_id: str,
     voice_id: Optional[str],
     content_version: int,
     user_id: int,
-    ttl: int = TOKEN_TTL
+    ttl: int = TOKEN_TTL,
+    tier_amount: Optional[int] = None
 ) -> str:
     """Create and cache a grant token"""
     token = AuthorizationService.create_grant_token(
-        session_id, track_id, voice_id, content_version, user_id, ttl
+        session_id, track_id, voice_id, content_version, user_id, ttl, tier_amount
     )
 
     # Also cache in Redis for faster validation
@@ -0,0 +1,197 @@
+"""
+Bounded in-process caches
+
+Several services cached per track/voice results in plain dicts that only
+ever grew: WordTimingOptimizer.segment_cache, SmartVoiceSegmentService's
+seeking behavior per voice and its shared generation results, and
+PopularTracksService.cache. Expiry was a timestamp checked on read, so an
+entry nobody read again stayed for the life of the worker. With thousands
+of TTS tracks in the catalog that is where worker RSS went.
+
+BoundedCache is the one primitive they share (ReadAlongService's LRUs too):
+
+- max_entries and/or max_bytes budgets; sizeof(value) prices an entry
+  (default: len() of str/bytes, a flat per-entry estimate otherwise)
+- optional ttl per cache or per set(); expired entries are dropped on read
+  and swept from the cold end of the LRU on every write
+- least recently used entries are evicted first
+- hits, misses, evictions and expirations per cache; every cache registers
+  itself so all_stats() reports a worker's caches in one place
+"""
+
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+DEFAULT_ENTRY_BYTES = 256  # rough price of a small dict/tuple value when no sizeof is given
+
+_registry: "weakref.WeakValueDictionary[str, BoundedCache]" = weakref.WeakValueDictionary()
+
+
+def default_sizeof(value: Any) -> int:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value)
+    return DEFAULT_ENTRY_BYTES
+
+
+class BoundedCache:
+    """LRU mapping with entry/byte budgets, optional TTL and hit/miss counters"""
+
+    def __init__(self, name: str, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None, sizeof: Callable[[Any], int] = default_sizeof,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.clock = clock
+        # key -> (value, size, expires_at or None)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        _registry[name] = self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._live(key) is not None
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self._entries))
+
+    def keys(self):
+        return list(self._entries)
+
+    # ------------------------------------------------------------- lookups
+
+    def _live(self, key: Hashable) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] is not None and entry[2] <= self.clock():
+            self._drop(key)
+            self.expirations += 1
+            return None
+        return entry
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._live(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Value without counting a lookup or refreshing its LRU position"""
+        entry = self._live(key)
+        return default if entry is None else entry[0]
+
+    # -------------------------------------------------------------- writes
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        size = self.sizeof(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.pop(key)
+            return
+        if key in self._entries:
+            self._drop(key)
+        ttl = self.ttl if ttl is None else ttl
+        now = self.clock()
+        self._entries[key] = (value, size, now + ttl if ttl is not None else None)
+        self.current_bytes += size
+        self._sweep(now)
+        while self._over_budget():
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def __setitem__(self, key: Hashable, value: Any):
+        self.set(key, value)
+
+    def resize(self, key: Hashable):
+        """Re-price an entry whose value was mutated in place"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        size = self.sizeof(entry[0])
+        self.current_bytes += size - entry[1]
+        self._entries[key] = (entry[0], size, entry[2])
+        while self._over_budget() and len(self._entries) > 1:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value (default if missing or expired)"""
+        entry = self._live(key)
+        if entry is None:
+            return default
+        self._drop(key)
+        return entry[0]
+
+    def pop_prefix(self, prefix: str) -> int:
+        stale = [key for key in self._entries if isinstance(key, str) and key.startswith(prefix)]
+        for key in stale:
+            self._drop(key)
+        return len(stale)
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def expire(self) -> int:
+        """Drop every expired entry (not only the cold end); returns how many"""
+        now = self.clock()
+        stale = [key for key, entry in self._entries.items() if entry[2] is not None and entry[2] <= now]
+        for key in stale:
+            self._drop(key)
+        self.expirations += len(stale)
+        return len(stale)
+
+    def _sweep(self, now: float):
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry[2] is None or entry[2] > now:
+                return
+            self._drop(key)
+            self.expirations += 1
+
+    def _over_budget(self) -> bool:
+        return bool(self._entries) and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.current_bytes > self.max_bytes)
+        )
+
+    def _drop(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'bytes_cached': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+def all_stats() -> Dict[str, Dict[str, Any]]:
+    """get_stats() of every live BoundedCache in this worker, by name"""
+    return {name: cache.get_stats() for name, cache in list(_registry.items())}
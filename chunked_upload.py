@@ -26,7 +26,7 @@ logger = logging.getLogger(__name__)
 
 # Import Redis upload state manager V2 (using generic RedisStateManager)
 # OLD: from redis_state.state.upload_legacy import get_redis_upload_state
-from redis_state.state.upload import get_redis_upload_state
+from redis_state.state.upload import get_redis_upload_state, async_upload_state
 
 # Get Redis state manager (will be initialized on first use)
 # Now uses generic RedisStateManager("upload") for consistency
@@ -220,7 +220,7 @@ async def cleanup_cancelled_uploads():
             to_remove = []
 
             # Get all active uploads from Redis
-            all_uploads = redis_upload_state.get_all_active_uploads()
+            all_uploads = await async_upload_state.get_all_active_uploads()
 
             for session in all_uploads:
                 upload_id = session.get("upload_id")
@@ -234,7 +234,7 @@ async def cleanup_cancelled_uploads():
 
             # Remove the identified uploads
             for upload_id in to_remove:
-                session = redis_upload_state.get_session(upload_id)
+                session = await async_upload_state.get_session(upload_id)
                 if not session:
                     continue
 
@@ -249,7 +249,7 @@ async def cleanup_cancelled_uploads():
                         logger.error(f"Error removing chunks directory: {e}")
 
                 # Remove from Redis
-                redis_upload_state.delete_session(upload_id)
+                await async_upload_state.delete_session(upload_id)
 
             if to_remove:
                 logger.info(f"Cleaned up {len(to_remove)} stale uploads")
@@ -344,7 +344,7 @@ async def init_chunked_upload(
         }
 
         # Create session in Redis
-        success = redis_upload_state.create_session(upload_data)
+        success = await async_upload_state.create_session(upload_data)
         if not success:
             logger.error(f"Failed to create Redis session for upload {upload_id}")
             raise HTTPException(status_code=500, detail="Failed to initialize upload session")
@@ -387,7 +387,7 @@ async def upload_chunk(
             raise HTTPException(status_code=400, detail="Missing required fields")
 
         # Validate the upload exists in Redis
-        upload_info = redis_upload_state.get_session(uploadId)
+        upload_info = await async_upload_state.get_session(uploadId)
         if not upload_info:
             logger.error(f"Upload not found in Redis: {uploadId}")
             raise HTTPException(status_code=404, detail="Upload not found")
@@ -405,7 +405,7 @@ async def upload_chunk(
 
         # Update total chunks if necessary
         if upload_info["total_chunks"] == 0:
-            redis_upload_state.update_session(uploadId, {"total_chunks": totalChunks})
+            await async_upload_state.update_session(uploadId, {"total_chunks": totalChunks})
 
         # Save chunk to temporary location
         chunks_dir_str = upload_info["chunks_dir"]
@@ -416,7 +416,7 @@ async def upload_chunk(
             chunks_dir_str = f"/tmp/media_storage/chunks/{upload_id_from_path}"
             logger.info(f"Migrated old chunk path to shared storage: {chunks_dir_str}")
             # Update Redis with new path
-            redis_upload_state.update_session(uploadId, {"chunks_dir": chunks_dir_str})
+            await async_upload_state.update_session(uploadId, {"chunks_dir": chunks_dir_str})
 
         chunks_dir = Path(chunks_dir_str)
 
@@ -434,11 +434,8 @@ async def upload_chunk(
             raise HTTPException(status_code=500, detail=f"Error saving chunk: {str(chunk_error)}")
 
         # Update tracking in Redis
-        # Register this chunk as received
-        redis_upload_state.register_chunk(uploadId, chunkIndex)
-
-        # Get updated session info
-        upload_info = redis_upload_state.get_session(uploadId)
+        # Register this chunk and read back session + received count in one round trip
+        upload_info, received_chunks = await async_upload_state.register_chunk_and_get_session(uploadId, chunkIndex)
         if not upload_info:
             raise HTTPException(status_code=404, detail="Upload not found")
 
@@ -446,9 +443,6 @@ async def upload_chunk(
             logger.info(f"Upload {uploadId} was cancelled after chunk {chunkIndex} was saved")
             return {"message": "Upload cancelled by user", "cancelled": True}
 
-        # Get received chunk count from Redis
-        received_chunks = redis_upload_state.get_received_chunks_count(uploadId)
-
         logger.info(f"Received chunk {chunkIndex+1}/{totalChunks} for upload {uploadId} (total received: {received_chunks})")
 
         # If all chunks received and no Track yet, create Track + LOCK IT immediately
@@ -456,7 +450,7 @@ async def upload_chunk(
             logger.info(f"All chunks received for upload {uploadId}, creating track in database")
 
             # Update status to chunks_complete in Redis
-            redis_upload_state.update_session(uploadId, {
+            await async_upload_state.update_session(uploadId, {
                 "status": "chunks_complete",
                 "received_chunks": received_chunks
             })
@@ -492,7 +486,7 @@ async def upload_chunk(
             db.commit()
 
             # Update Redis to mark track as created
-            redis_upload_state.update_session(uploadId, {"track_created": True})
+            await async_upload_state.update_session(uploadId, {"track_created": True})
             logger.info(f"Created track in database: {track_id}")
 
             # 🔒 Acquire lock IMMEDIATELY so user cannot trigger regeneration after row exists
@@ -578,12 +572,12 @@ async def finalize_upload(
             raise HTTPException(status_code=400, detail="Missing uploadId or trackId")
 
         # Get upload info from Redis
-        upload_info = redis_upload_state.get_session(upload_id)
+        upload_info = await async_upload_state.get_session(upload_id)
         if not upload_info:
             raise HTTPException(status_code=404, detail="Upload not found")
 
         if upload_info["status"] != "chunks_complete":
-            received = redis_upload_state.get_received_chunks_count(upload_id)
+            received = await async_upload_state.get_received_chunks_count(upload_id)
             raise HTTPException(
                 status_code=400,
                 detail=f"Upload not ready for finalization ({received}/{upload_info['total_chunks']} chunks)"
@@ -742,7 +736,7 @@ async def finalize_upload(
             db.refresh(track)
 
             # Clean Redis upload session entry
-            redis_upload_state.delete_session(upload_id)
+            await async_upload_state.delete_session(upload_id)
 
             return {
                 "id": track_id,
@@ -822,7 +816,7 @@ async def cancel_upload(
             raise HTTPException(status_code=404, detail="Album not found")
 
         # Get upload info from Redis
-        upload_info = redis_upload_state.get_session(upload_id)
+        upload_info = await async_upload_state.get_session(upload_id)
         if not upload_info:
             logger.info(f"Upload not found for cancellation: {upload_id}")
             return {"message": "Upload not found"}
@@ -832,7 +826,7 @@ async def cancel_upload(
             raise HTTPException(status_code=403, detail="Upload does not belong to this album")
 
         # Update status to cancelled in Redis
-        redis_upload_state.update_session(upload_id, {"status": "cancelled"})
+        await async_upload_state.update_session(upload_id, {"status": "cancelled"})
 
         # If a track was created, delete it from the database
         if upload_info.get("track_created", False) and "track_id" in upload_info:
@@ -18,6 +18,7 @@ from database import get_db, SessionLocal
 from auth import login_required
 from redis_state.config import redis_client
 from websocket_manager import WebSocketManager
+from track_metadata_cache import track_metadata_cache
 
 # Create a router for comment-related endpoints
 comment_router = APIRouter(prefix="/api")
@@ -764,7 +765,7 @@ async def get_track_comments(
 ):
     """Get all comments for a track, including replies"""
     # Verify track exists and user has access
-    track = db.query(Track).filter(Track.id == track_id).first()
+    track = await track_metadata_cache.get(track_id, db)
     if not track:
         raise HTTPException(status_code=404, detail="Track not found")
     
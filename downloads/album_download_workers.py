@@ -915,8 +915,9 @@ class DownloadManager:
         self.status_queue = asyncio.Queue()
 
         # MIGRATED TO REDIS: Use RedisDownloadState for cross-container state
-        from redis_state.state.download import get_album_download_state
+        from redis_state.state.download import get_album_download_state, async_album_download_state
         self._download_state = get_album_download_state()
+        self._async_state = async_album_download_state
 
         # Expose Redis-backed state as properties for backward compatibility
         self.active_downloads = self._download_state.active_downloads
@@ -1188,7 +1189,7 @@ class DownloadManager:
 
     async def get_download_status(self, download_id: str) -> Optional[Dict]:
         async with self._lock:
-            st = self.active_downloads.get(download_id)
+            st = await self._async_state.get(download_id)
             if not st:
                 return None
             if st.get("stage") == DownloadStage.QUEUED.value:
@@ -1246,10 +1247,10 @@ class DownloadManager:
                 download_id = update["download_id"]
 
                 async with self._lock:
-                    if download_id not in self.active_downloads:
+                    current = await self._async_state.get(download_id)
+                    if not current:
                         continue
 
-                    current = self.active_downloads[download_id]
                     cur_stage = current.get("stage")
                     new_stage = update["stage"]
 
@@ -1269,12 +1270,11 @@ class DownloadManager:
 
                     if new_stage in (DownloadStage.COMPLETED.value, DownloadStage.ERROR.value):
                         current["completed_at"] = datetime.now(timezone.utc)
-                        self.completed_downloads[download_id] = current
-                        self.active_downloads.pop(download_id, None)
+                        await self._async_state.complete(download_id, current)
 
                         # ===== RELEASE DISTRIBUTED LOCK =====
                         # Download finished (success or failure), release Redis lock
-                        lock_released = self._download_state._manager.release_lock(download_id)
+                        lock_released = await self._async_state._manager.release_lock(download_id)
                         if lock_released:
                             logger.info(f"Released Redis lock for download: {download_id}")
                         else:
@@ -1284,6 +1284,8 @@ class DownloadManager:
                             logger.info(f"Album complete: {download_id}")
                         else:
                             logger.error(f"Album failed: {download_id}")
+                    else:
+                        await self._async_state.update(download_id, current)
 
                     if cur_stage != new_stage:
                         logger.info(f"Album {download_id}: {cur_stage} -> {new_stage}")
@@ -164,6 +164,11 @@ class TrackDownloadWorker:
                 await mega_s4_client.start()
 
             logger.info(f"Starting S4 download: {object_key} -> {file_path}")
+
+            object_size = await asyncio.wait_for(mega_s4_client.get_object_size(object_key), timeout=60.0)
+            if object_size and object_size >= mega_s4_client.ranged_download_threshold:
+                return await self._download_ranged_with_progress(object_key, file_path, object_size, download_id)
+
             response = await asyncio.wait_for(mega_s4_client.download_file_stream(object_key), timeout=60.0)
             if not response:
                 raise Exception(f"Failed to start S4 download for {object_key}")
@@ -197,17 +202,15 @@ class TrackDownloadWorker:
                             speed = (downloaded - last_size) / (1024 * 1024 * dt)  # MB/s
                             pct = (downloaded / expected_size * 100) if expected_size else 0.0
 
-                            async with track_download_manager._lock:
-                                track_download_manager.active_downloads[download_id] = {
-                                    "status": "processing",
-                                    "progress": pct,
-                                    "message": "Downloading from S4",
-                                    "downloaded": downloaded,
-                                    "total_size": expected_size,
-                                    "speed": f"{speed:.2f} MB/s",
-                                    "voice": track_download_manager.active_downloads.get(download_id, {}).get("voice"),
-                                    "track_type": track_download_manager.active_downloads.get(download_id, {}).get("track_type", "audio"),
-                                }
+                            # Merge keeps voice/track_type from the active entry
+                            await track_download_manager._async_state.update(download_id, {
+                                "status": "processing",
+                                "progress": pct,
+                                "message": "Downloading from S4",
+                                "downloaded": downloaded,
+                                "total_size": expected_size,
+                                "speed": f"{speed:.2f} MB/s",
+                            })
 
                             last_size = downloaded
                             last_update_t = now
@@ -247,6 +250,43 @@ class TrackDownloadWorker:
                 except Exception as ce:
                     logger.error(f"Response close error: {ce}")
 
+    async def _download_ranged_with_progress(
+        self, object_key: str, file_path: Path, object_size: int, download_id: str
+    ) -> int:
+        """Large objects: concurrent Range GETs, progress merged into the download state"""
+        from mega_s4_client import mega_s4_client
+
+        start = time.time()
+        last = {"t": start, "size": 0}
+
+        async def _on_progress(downloaded: int, total: int):
+            now = time.time()
+            if downloaded > last["size"]:
+                self.last_progress_time = now
+            dt = max(now - last["t"], 1e-3)
+            speed = (downloaded - last["size"]) / (1024 * 1024 * dt)  # MB/s
+            last.update(t=now, size=downloaded)
+
+            # Merge keeps voice/track_type from the active entry
+            await track_download_manager._async_state.update(download_id, {
+                "status": "processing",
+                "progress": downloaded / total * 100 if total else 0.0,
+                "message": "Downloading from S4",
+                "downloaded": downloaded,
+                "total_size": total,
+                "speed": f"{speed:.2f} MB/s",
+            })
+
+        final_size = await mega_s4_client.download_file_ranged(
+            object_key, file_path, size=object_size, progress_callback=_on_progress
+        )
+        elapsed = time.time() - start
+        logger.info(
+            f"S4 ranged download OK: file={object_key}, size={final_size:,} bytes, "
+            f"time={elapsed:.1f}s, avg={final_size / (1024 * 1024 * max(elapsed, 1e-3)):.2f} MB/s"
+        )
+        return final_size
+
     # Timeouts / stuck ---------------------------------------------------------
     async def _handle_timeout_error(self, task: Dict):
         try:
@@ -284,7 +324,7 @@ class TrackDownloadWorker:
 
             # clear active
             async with track_download_manager._lock:
-                track_download_manager.active_downloads.pop(download_id, None)
+                await track_download_manager._async_state.pop(download_id)
 
         except Exception as e:
             logger.error(f"Timeout handler error for {task.get('download_id')}: {e}")
@@ -315,13 +355,13 @@ class TrackDownloadWorker:
         try:
             # mark active
             async with track_download_manager._lock:
-                track_download_manager.active_downloads[download_id] = {
+                await track_download_manager._async_state.set(download_id, {
                     "status": "processing",
                     "progress": 0,
                     "message": "Starting S4 download",
                     "voice": voice,
                     "track_type": track_info.get("track_type", "audio"),
-                }
+                })
 
             # resolve object key
             mega_path = track_info["mega_path"]
@@ -341,7 +381,7 @@ class TrackDownloadWorker:
 
             # init progress
             async with track_download_manager._lock:
-                track_download_manager.active_downloads[download_id].update({
+                await track_download_manager._async_state.update(download_id, {
                     "message": "Downloading from S4",
                     "downloaded": 0,
                     "total_size": total_size,
@@ -353,7 +393,7 @@ class TrackDownloadWorker:
 
             # final progress
             async with track_download_manager._lock:
-                track_download_manager.active_downloads[download_id].update({
+                await track_download_manager._async_state.update(download_id, {
                     "progress": 100,
                     "message": "Download complete",
                     "downloaded": final_size,
@@ -435,7 +475,7 @@ class TrackDownloadWorker:
 
         finally:
             async with track_download_manager._lock:
-                track_download_manager.active_downloads.pop(download_id, None)
+                await track_download_manager._async_state.pop(download_id)
 
     # File cleanup / status ----------------------------------------------------
     async def _cleanup_file(self, file_path: Path, delay: int = 10):
@@ -451,33 +491,33 @@ class TrackDownloadWorker:
         voice = None
         track_type = "audio"
         async with track_download_manager._lock:
-            active = track_download_manager.active_downloads.get(download_id, {})
+            active = await track_download_manager._async_state.get(download_id, {})
             voice = active.get("voice")
             track_type = active.get("track_type", "audio")
 
-        track_download_manager.completed_downloads[download_id] = {
+        await track_download_manager._async_state.set_completed(download_id, {
             "status": "completed",
             "file_path": file_path,
             "completed_at": datetime.now(timezone.utc),
             "voice": voice,
             "track_type": track_type,
-        }
+        })
 
     async def _set_download_error(self, download_id: str, error: str):
         voice = None
         track_type = "audio"
         async with track_download_manager._lock:
-            active = track_download_manager.active_downloads.get(download_id, {})
+            active = await track_download_manager._async_state.get(download_id, {})
             voice = active.get("voice")
             track_type = active.get("track_type", "audio")
 
-        track_download_manager.completed_downloads[download_id] = {
+        await track_download_manager._async_state.set_completed(download_id, {
             "status": "error",
             "error": error,
             "completed_at": datetime.now(timezone.utc),
             "voice": voice,
             "track_type": track_type,
-        }
+        })
 
     # Inventory + success history (code-level trigger) -------------------------
     async def add_to_my_downloads(
@@ -645,8 +685,9 @@ class TrackDownloadManager:
         self.download_queue = asyncio.Queue()
 
         # MIGRATED TO REDIS: Use RedisDownloadState for cross-container state
-        from redis_state.state.download import get_track_download_state
+        from redis_state.state.download import get_track_download_state, async_track_download_state
         self._download_state = get_track_download_state()
+        self._async_state = async_track_download_state
 
         # Expose Redis-backed state as properties for backward compatibility
         self.active_downloads = self._download_state.active_downloads
@@ -838,8 +879,8 @@ class TrackDownloadManager:
         return download_id
 
     async def get_download_status(self, download_id: str) -> Dict:
-        if download_id in self.completed_downloads:
-            st = self.completed_downloads[download_id]
+        st = await self._async_state.get_completed(download_id)
+        if st:
             if st["status"] == "completed":
                 return {
                     "status": "completed",
@@ -858,8 +899,8 @@ class TrackDownloadManager:
                 }
 
         async with self._lock:
-            if download_id in self.active_downloads:
-                s = self.active_downloads[download_id]
+            s = await self._async_state.get(download_id)
+            if s:
                 return {
                     "status": "processing" if s.get("status") != "queued" else "queued",
                     "progress": s.get("progress", 0),
@@ -9,6 +9,7 @@ from sqlalchemy import update, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from models import Track
+from audio_frame_parser import probe_audio_file
 
 logger = logging.getLogger(__name__)
 
@@ -389,6 +390,13 @@ class DurationManager:
                 self.extraction_locks[file_key] = asyncio.Lock()
 
             async with self.extraction_locks[file_key]:
+                # MP3/ADTS: exact duration from frame headers, no subprocess
+                probed = await asyncio.to_thread(probe_audio_file, file_path)
+                if probed:
+                    metadata = {**probed, 'size': file_size, 'extracted_at': datetime.utcnow().isoformat()}
+                    logger.info(f"Extracted metadata from frame headers: {json.dumps(metadata, indent=2)}")
+                    return metadata
+
                 cmd = [
                     'ffprobe',
                     '-v', 'error',
@@ -7,12 +7,13 @@ import asyncio
 import logging
 import math
 import re
-from datetime import datetime, timezone
 
 from database import get_db
 from models import Track, Album, User
 from auth import login_required
 from hls_streaming import stream_manager
+from text_storage_service import text_storage_service
+from bounded_cache import BoundedCache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -21,6 +22,10 @@ router = APIRouter()
 DEFAULT_PAGE_SIZE = 200
 SEGMENT_DURATION = 30
 WORD_CACHE_TTL = 300
+SEGMENT_CACHE_MAX_ENTRIES = 2000
+SEGMENT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+INDEX_CACHE_MAX_ENTRIES = 10000
+WORD_DICT_BYTES = 400  # one cached word dict (with global_index/segment_index added)
 
 # In-memory cache
 word_segment_cache = {}
@@ -29,13 +34,31 @@ class WordTimingOptimizer:
     """Optimized word timing with proper text structure preservation"""
     
     def __init__(self):
-        self.segment_cache = {}
-        self.index_cache = {}
-        self.text_structure_cache = {}  # Cache for text structure
+        self.segment_cache = BoundedCache(
+            "word_timing.segments", max_entries=SEGMENT_CACHE_MAX_ENTRIES, max_bytes=SEGMENT_CACHE_MAX_BYTES,
+            ttl=WORD_CACHE_TTL, sizeof=lambda words: len(words) * WORD_DICT_BYTES,
+        )
+        self.index_cache = BoundedCache("word_timing.counts", max_entries=INDEX_CACHE_MAX_ENTRIES, ttl=WORD_CACHE_TTL)
+        self.text_structure_cache = BoundedCache("word_timing.text_structure", max_entries=INDEX_CACHE_MAX_ENTRIES, ttl=WORD_CACHE_TTL)
     
     async def get_word_index_at_time(self, track_id: str, voice_id: str, time: float, db: Session) -> Dict:
         """Get word index at specific time for player sync"""
         try:
+            # Bisect the mapped columnar timings when the voice has them
+            word = await text_storage_service.get_word_at_time(track_id, voice_id, time)
+            if word is not None:
+                return {
+                    "track_id": track_id,
+                    "voice_id": voice_id,
+                    "time": time,
+                    "word_index": word['word_index'],
+                    "segment_index": word['segment_index'],
+                    "word": word['word'],
+                    "start_time": word['start_time'],
+                    "end_time": word['end_time'],
+                    "status": "found"
+                }
+
             segment_index = int(time // SEGMENT_DURATION)
             cache_key = f"{track_id}:{voice_id}:seg_{segment_index}"
             
@@ -47,13 +70,7 @@ class WordTimingOptimizer:
                 )
                 
                 if segment_words:
-                    self.segment_cache[cache_key] = {
-                        'words': segment_words,
-                        'cached_at': datetime.now(),
-                        'segment_index': segment_index
-                    }
-            else:
-                segment_words = segment_words['words']
+                    self.segment_cache.set(cache_key, segment_words)
             
             if not segment_words:
                 return {
@@ -359,21 +376,19 @@ class WordTimingOptimizer:
         """Get total word count (cached)"""
         cache_key = f"{track_id}:{voice_id}:count"
         
-        if cache_key in self.index_cache:
-            cached = self.index_cache[cache_key]
-            if (datetime.now() - cached['cached_at']).seconds < WORD_CACHE_TTL:
-                return cached['count']
+        cached = self.index_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
-            all_words = await stream_manager.get_words_for_segment_precise(
-                track_id, voice_id, None, db
-            )
-            count = len(all_words) if all_words else 0
+            count = await text_storage_service.get_word_count(track_id, voice_id)
+            if not count:
+                all_words = await stream_manager.get_words_for_segment_precise(
+                    track_id, voice_id, None, db
+                )
+                count = len(all_words) if all_words else 0
             
-            self.index_cache[cache_key] = {
-                'count': count,
-                'cached_at': datetime.now()
-            }
+            self.index_cache.set(cache_key, count)
             
             return count
             
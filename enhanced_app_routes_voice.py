@@ -5,15 +5,17 @@ from fastapi.responses import StreamingResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, and_, select
+from sqlalchemy import func, and_, select, case
 from pathlib import Path
 import asyncio
 import aiofiles
 import logging
+import os
 import time
 import numpy as np
 from typing import Optional, List, Dict
 from datetime import datetime, timezone
+import hashlib
 import json
 
 # Import everything - FIXED: Removed TrackLike, TrackShare (don't exist in models)
@@ -23,12 +25,17 @@ from models import (
     AvailableVoice, TTSWordTiming, TTSTextSegment
 )
 from auth import login_required
-from authorization_service import AuthorizationService
+from authorization_service import AuthorizationService, get_user_tier_amount, grant_covers_tier
+from track_metadata_cache import track_metadata_cache
 from storage import storage
 from hls_streaming import stream_manager
 from duration_manager import duration_manager
 from status_lock import status_lock
 from cache_busting import cache_busted_url_for
+from segment_delivery import build_segment_response
+from hot_segment_cache import hot_segment_cache
+from playback_progress_buffer import playback_progress_buffer
+from bounded_cache import BoundedCache
 
 # Constants
 MEDIA_URL = "/media"
@@ -61,14 +68,12 @@ async def async_read_file(path: Path, encoding: str = 'utf-8') -> str:
     async with aiofiles.open(path, 'r', encoding=encoding) as f:
         return await f.read()
 
-async def _file_iter(path: Path, chunk_size: int = 64 * 1024):
-    """Non-blocking file streaming"""
-    async with aiofiles.open(path, "rb") as f:
-        while True:
-            chunk = await f.read(chunk_size)
-            if not chunk:
-                break
-            yield chunk
+async def async_stat_or_none(path: Path):
+    """Single non-blocking stat; None if the path doesn't exist"""
+    try:
+        return await asyncio.to_thread(os.stat, path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
 
 # ========================================
 # HELPER FUNCTIONS
@@ -102,36 +107,133 @@ def append_token_to_playlist(playlist_content: str, token: str, is_master: bool
     return '\n'.join(modified_lines)
 
 
+# ========================================
+# VARIANT PLAYLIST TEMPLATES
+# ========================================
+
+# Parsed variant playlists keyed by path, validated by (mtime_ns, size).
+# A template is the playlist split at every token insertion point, so adding a
+# grant token is a single str.join instead of a split/rewrite of every line.
+# A 10-hour book's playlist is thousands of pieces, so the budget is in bytes.
+_PLAYLIST_TEMPLATE_MAX = 2000
+_PLAYLIST_TEMPLATE_MAX_BYTES = int(os.getenv("PLAYLIST_TEMPLATE_CACHE_MB", "64")) * 1024 * 1024
+_PLAYLIST_PIECE_BYTES = 64  # str object overhead of one piece
+
+def _playlist_template_size(entry: tuple) -> int:
+    # plain and the pieces hold the same characters once each
+    return 2 * len(entry[3]) + _PLAYLIST_PIECE_BYTES * len(entry[2])
+
+_playlist_templates = BoundedCache(  # path -> (mtime_ns, size, pieces, plain)
+    "playlist_templates", max_entries=_PLAYLIST_TEMPLATE_MAX,
+    max_bytes=_PLAYLIST_TEMPLATE_MAX_BYTES, sizeof=_playlist_template_size,
+)
+
+def _build_playlist_template(playlist_content: str, is_master: bool = False) -> List[str]:
+    """Split a playlist into pieces so token.join(pieces) == append_token_to_playlist(...)"""
+    suffix = '.m3u8' if is_master else '.ts'
+    pieces = []
+    pending = []
+    for line in playlist_content.split('\n'):
+        if line.endswith(suffix):
+            separator = '?' if '?' not in line else '&'
+            pending.append(f"{line}{separator}token=")
+            pieces.append('\n'.join(pending))
+            pending = ['']
+        else:
+            pending.append(line)
+    pieces.append('\n'.join(pending))
+    return pieces
+
+async def get_tokenized_playlist(playlist_path: Path, token: Optional[str]) -> Optional[tuple]:
+    """
+    Return (content, etag) for a variant playlist with the token applied,
+    or None if the playlist doesn't exist. Disk is read only when the file's
+    mtime/size changed since the template was built.
+    """
+    try:
+        st = await async_stat(playlist_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    key = str(playlist_path)
+    cached = _playlist_templates.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        pieces, plain = cached[2], cached[3]
+    else:
+        plain = await async_read_file(playlist_path)
+        pieces = _build_playlist_template(plain)
+        _playlist_templates.set(key, (st.st_mtime_ns, st.st_size, pieces, plain))
+
+    content = token.join(pieces) if token else plain
+    token_tag = hashlib.blake2b(token.encode(), digest_size=6).hexdigest() if token else '0'
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}-{token_tag}"'
+    return content, etag
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f"W/{etag}" in candidates
+
 # Permission functions now imported from centralized permissions.py
 from permissions import get_simple_user_permissions as get_user_permissions, check_tier_access
 
-def _update_session_sync(session_id: str):
+# Session activity is coalesced: segment requests only mark the session as seen and
+# a single UPDATE flushes all touched sessions every SESSION_ACTIVITY_FLUSH_INTERVAL seconds
+SESSION_ACTIVITY_FLUSH_INTERVAL = 30.0
+
+_pending_session_activity: Dict[str, datetime] = {}
+_session_activity_task: Optional[asyncio.Task] = None
+
+def _update_sessions_sync(activity: Dict[str, datetime]):
     """Pure sync function - runs in thread pool"""
     from database import SessionLocal
     db = SessionLocal()
     try:
-        user_session = db.query(UserSession).filter(
-            UserSession.session_id == session_id
-        ).first()
-        if user_session:
-            user_session.last_active = datetime.now(timezone.utc)
-            db.commit()
+        # One statement, each session set to its own last activity
+        db.query(UserSession).filter(
+            UserSession.session_id.in_(list(activity.keys()))
+        ).update(
+            {UserSession.last_active: case(activity, value=UserSession.session_id)},
+            synchronize_session=False
+        )
+        db.commit()
     except Exception as e:
         logger.error(f"Failed to update session activity: {e}")
         db.rollback()
     finally:
         db.close()
 
+async def flush_session_activity():
+    """Write all pending session activity bumps in one statement"""
+    if not _pending_session_activity:
+        return
+    activity = dict(_pending_session_activity)
+    _pending_session_activity.clear()
+    await asyncio.to_thread(_update_sessions_sync, activity)
+
+async def _session_activity_flusher():
+    while True:
+        await asyncio.sleep(SESSION_ACTIVITY_FLUSH_INTERVAL)
+        try:
+            await flush_session_activity()
+        except Exception as e:
+            logger.error(f"Session activity flush error: {e}")
+
+def touch_session(session_id: Optional[str]):
+    """Mark a session as active; persisted by the next coalesced flush"""
+    global _session_activity_task
+    if not session_id:
+        return
+    _pending_session_activity[session_id] = datetime.now(timezone.utc)
+    if _session_activity_task is None or _session_activity_task.done():
+        _session_activity_task = asyncio.create_task(_session_activity_flusher())
+
 async def update_session_activity(request: Request):
-    """Non-blocking session activity update using thread pool"""
+    """Non-blocking session activity update (coalesced, no DB hit per request)"""
     try:
-        session_id = request.cookies.get("session_id")
-        if not session_id:
-            return
-        
-        # Run sync DB operation in thread pool - truly non-blocking
-        await asyncio.to_thread(_update_session_sync, session_id)
-        
+        touch_session(request.cookies.get("session_id"))
     except Exception as e:
         logger.error(f"Session activity error: {e}")
 
@@ -282,7 +384,8 @@ async def serve_hls_master(
                 track_id=track_id,
                 voice_id=voice_id,  # Will be None for regular audio
                 content_version=track.content_version or 1,
-                user_id=current_user.id
+                user_id=current_user.id,
+                tier_amount=get_user_tier_amount(current_user)
             )
 
         # Play recording
@@ -610,8 +713,8 @@ async def serve_variant_playlist(
                 }
             )
 
-        # Get track
-        track = db.query(Track).filter(Track.id == track_id).first()
+        # Get track (cached metadata, invalidated on content/tier change)
+        track = await track_metadata_cache.get(track_id, db)
         if not track:
             logger.error(f"Track {track_id} not found")
             raise HTTPException(status_code=404, detail="Track not found")
@@ -634,7 +737,8 @@ async def serve_variant_playlist(
                     track_id=track_id,
                     voice_id=voice_id,
                     content_version=track.content_version or 1,
-                    user_id=current_user.id
+                    user_id=current_user.id,
+                    tier_amount=get_user_tier_amount(current_user)
                 )
 
         # Handle track type
@@ -663,19 +767,24 @@ async def serve_variant_playlist(
         # Check lock (with voice context if TTS)
         is_locked, lock_type = await status_lock.is_voice_locked(track_id, voice_id if track_type == 'tts' else None, db)
         
-        # Serve if exists
-        if await async_exists(playlist_path):
+        # Serve if exists (template cached by path+mtime, token added with one join)
+        try:
+            tokenized = await get_tokenized_playlist(playlist_path, token)
+        except Exception as e:
+            logger.error(f"Error reading variant playlist {playlist_path}: {str(e)}")
+            raise HTTPException(status_code=500, detail="Error reading playlist")
+
+        if tokenized:
             try:
-                content = await async_read_file(playlist_path)
-                # Add token to segment URLs
-                if token:
-                    content = append_token_to_playlist(content, token, is_master=False)
+                content, etag = tokenized
 
                 headers = {
                     'Access-Control-Allow-Origin': '*',
                     'Access-Control-Allow-Methods': 'GET, OPTIONS',
-                    'Access-Control-Allow-Headers': 'Origin, Content-Type, Accept, Range',
+                    'Access-Control-Allow-Headers': 'Origin, Content-Type, Accept, Range, If-None-Match',
+                    'Access-Control-Expose-Headers': 'ETag',
                     'Cache-Control': 'no-cache',
+                    'ETag': etag,
                     'X-Track-ID': track_id,
                     'X-Quality': quality,
                     'X-Track-Type': track_type
@@ -695,6 +804,11 @@ async def serve_variant_playlist(
                         'X-Processing': lock_type,
                         'X-Track-Locked': 'true'
                     })
+
+                # Client re-polling an unchanged playlist
+                if _etag_matches(request, etag):
+                    log_playlist_event("not-modified")
+                    return Response(status_code=304, headers=headers)
                 
                 log_playlist_event("served-cache")
                 return Response(
@@ -740,8 +854,15 @@ async def serve_variant_playlist(
             )
         log_playlist_event("regeneration-request")
         
+        # Serve newly created
+        try:
+            tokenized = await get_tokenized_playlist(playlist_path, token)
+        except Exception as e:
+            logger.error(f"Error reading variant playlist {playlist_path}: {str(e)}")
+            raise HTTPException(status_code=500, detail="Error reading playlist")
+
         # Check again
-        if not await async_exists(playlist_path):
+        if not tokenized:
             headers = {"Retry-After": "10", "X-Track-Type": track_type}
             if track_type == 'tts':
                 headers["X-Voice-ID"] = voice_id
@@ -753,21 +874,15 @@ async def serve_variant_playlist(
                 headers=headers
             )
 
-        # Serve newly created
-        try:
-            content = await async_read_file(playlist_path)
-            # Add token to segment URLs
-            if token:
-                content = append_token_to_playlist(content, token, is_master=False)
-        except Exception as e:
-            logger.error(f"Error reading variant playlist {playlist_path}: {str(e)}")
-            raise HTTPException(status_code=500, detail="Error reading playlist")
+        content, etag = tokenized
         
         headers = {
             'Access-Control-Allow-Origin': '*',
             'Access-Control-Allow-Methods': 'GET, OPTIONS',
-            'Access-Control-Allow-Headers': 'Origin, Content-Type, Accept, Range',
+            'Access-Control-Allow-Headers': 'Origin, Content-Type, Accept, Range, If-None-Match',
+            'Access-Control-Expose-Headers': 'ETag',
             'Cache-Control': 'no-cache',
+            'ETag': etag,
             'X-Track-ID': track_id,
             'X-Quality': quality,
             'X-Track-Type': track_type,
@@ -794,6 +909,117 @@ async def serve_variant_playlist(
         logger.error(f"Variant playlist error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+SEGMENT_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, OPTIONS',
+    'Access-Control-Allow-Headers': 'Origin, Content-Type, Accept, Range, If-None-Match, If-Range, X-HLS-Keep-Alive, X-No-Activity-Update',
+}
+
+async def serve_segment_token_only(
+    track_id: str,
+    quality: str,
+    segment_id: str,
+    request: Request,
+    voice_id: Optional[str] = None
+) -> Optional[Response]:
+    """
+    Segment fast path - authorizes from the grant token alone (no DB access).
+
+    Returns None whenever the request can't be served this way (missing, stale or
+    revoked token, or a segment that isn't on disk yet) so the caller can fall
+    back to the full session + tier check in serve_segment().
+    """
+    token = request.query_params.get('token') or request.headers.get('X-Grant-Token')
+    if not token:
+        return None
+
+    try:
+        seg_num = int(segment_id)
+    except ValueError:
+        return None
+    if seg_num < 0:
+        return None
+
+    payload, reason = AuthorizationService.decode_grant_token(token, track_id, voice_id)
+    if not payload:
+        logger.debug(f"Segment fast path unavailable for track {track_id}: {reason}")
+        return None
+
+    # A token issued for a lower tier than the album now requires goes through
+    # check_tier_access; so does a track whose metadata isn't cached yet
+    track_meta = track_metadata_cache.get_cached(track_id)
+    if track_meta is None or not grant_covers_tier(payload, track_meta):
+        return None
+
+    # The token was issued for this exact voice (or None for regular audio),
+    # so the path can be resolved without looking up track_type
+    if voice_id:
+        segment_path = stream_manager.segment_dir / track_id / f"voice-{voice_id}" / quality / f"segment_{segment_id}.ts"
+    else:
+        segment_path = stream_manager.segment_dir / track_id / quality / f"segment_{segment_id}.ts"
+
+    segment_stat = await async_stat_or_none(segment_path)
+    if segment_stat is None or segment_stat.st_size <= 0:
+        return None
+
+    if request.headers.get('X-HLS-Keep-Alive') == 'true':
+        return Response(status_code=200)
+
+    if voice_id:
+        from voice_cache_manager import voice_access_tracker
+        voice_access_tracker.record_segment_access(track_id, voice_id, segment_id)
+
+    if request.headers.get('X-No-Activity-Update') != 'true':
+        touch_session(payload.get('sid') or request.cookies.get("session_id"))
+
+    headers = {
+        **SEGMENT_CORS_HEADERS,
+        'Cache-Control': 'public, max-age=604800, immutable',
+        'X-Track-ID': track_id,
+        'X-Quality': quality,
+        'X-Segment-Number': segment_id,
+        'X-Served-From': 'existing',
+        'X-Auth-Mode': 'token'
+    }
+
+    if voice_id:
+        headers.update({
+            'X-Track-Type': 'tts',
+            'X-Voice-ID': voice_id,
+            'X-Voice-Specific': 'true',
+            'X-User-Specific': 'true',
+            'X-Supports-Word-Timing': 'true',
+            'X-Word-Timing-Endpoint': f'/api/tracks/{track_id}/word-timings/{voice_id}'
+        })
+
+    body = await hot_segment_cache.get_or_load(segment_path, segment_stat, seg_num, track_id, payload.get('cv'))
+    if body is not None:
+        headers['X-Served-From'] = 'memory'
+    return build_segment_response(request, segment_path, segment_stat, headers, body=body)
+
+async def serve_segment_fast(
+    track_id: str,
+    quality: str,
+    segment_id: str,
+    request: Request,
+    voice_id: Optional[str] = None
+):
+    """
+    Segment route mode: token-only fast path first, full check_tier_access path
+    (session lookup + Track query) only when the token is missing or stale.
+    """
+    response = await serve_segment_token_only(track_id, quality, segment_id, request, voice_id=voice_id)
+    if response is not None:
+        return response
+
+    db_gen = get_db()
+    db = next(db_gen)
+    try:
+        current_user = await login_required(request, db)
+        return await serve_segment(track_id, quality, segment_id, request, db, current_user, voice_id=voice_id)
+    finally:
+        db_gen.close()
+
 async def serve_segment(
     track_id: str,
     quality: str,
@@ -825,9 +1051,9 @@ async def serve_segment(
         is_keep_alive = request.headers.get('X-HLS-Keep-Alive') == 'true'
         skip_activity = request.headers.get('X-No-Activity-Update') == 'true'
 
-        # Get track
+        # Get track (cached metadata, invalidated on content/tier change)
         perf_db_start = time.perf_counter()
-        track = db.query(Track).filter(Track.id == track_id).first()
+        track = await track_metadata_cache.get(track_id, db)
         perf_db = (time.perf_counter() - perf_db_start) * 1000
         if not track:
             raise HTTPException(status_code=404, detail="Track not found")
@@ -895,14 +1121,9 @@ async def serve_segment(
             stream_dir = stream_manager.segment_dir / track_id
             segment_path = stream_dir / quality / f"segment_{segment_id}.ts"
 
-        # FAST PATH: Serve if exists
-        perf_exists_start = time.perf_counter()
-        if await async_exists(segment_path):
-            perf_exists = (time.perf_counter() - perf_exists_start) * 1000
-            perf_stat_start = time.perf_counter()
-            segment_stat = await async_stat(segment_path)
-            perf_stat = (time.perf_counter() - perf_stat_start) * 1000
-
+        # FAST PATH: Serve if exists (one stat covers existence and size)
+        segment_stat = await async_stat_or_none(segment_path)
+        if segment_stat is not None:
             if segment_stat.st_size > 0:
                 if is_keep_alive:
                     log_segment_event("keep-alive-hit")
@@ -910,17 +1131,11 @@ async def serve_segment(
 
                 # Update session activity
                 if not skip_activity:
-                    asyncio.create_task(update_session_activity(request))
+                    touch_session(request.cookies.get("session_id"))
 
                 # Serve segment
-                segment_size = segment_stat.st_size
-                # Removed verbose performance logging
                 headers = {
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Methods': 'GET, OPTIONS',
-                    'Access-Control-Allow-Headers': 'Origin, Content-Type, Accept, Range, X-HLS-Keep-Alive, X-No-Activity-Update',
-                    'Content-Type': 'video/mp2t',
-                    'Content-Length': str(segment_size),
+                    **SEGMENT_CORS_HEADERS,
                     'Cache-Control': 'public, max-age=604800, immutable',
                     'X-Track-ID': track_id,
                     'X-Quality': quality,
@@ -938,12 +1153,14 @@ async def serve_segment(
                         'X-Word-Timing-Endpoint': f'/api/tracks/{track_id}/word-timings/{voice_id}'
                     })
 
-                log_segment_event("served-cache")
-                return StreamingResponse(
-                    _file_iter(segment_path),
-                    media_type='video/mp2t',
-                    headers=headers
+                body = await hot_segment_cache.get_or_load(
+                    segment_path, segment_stat, seg_num, track_id, track.content_version
                 )
+                if body is not None:
+                    headers['X-Served-From'] = 'memory'
+
+                log_segment_event("served-cache")
+                return build_segment_response(request, segment_path, segment_stat, headers, body=body)
 
         log_segment_event("cache-miss")
 
@@ -1011,21 +1228,15 @@ async def serve_segment(
 
             # Check if segment exists
             for _ in range(5):
-                if await async_exists(segment_path):
-                    segment_stat = await async_stat(segment_path)
-                    if segment_stat.st_size > 0:
-                        break
+                segment_stat = await async_stat_or_none(segment_path)
+                if segment_stat is not None and segment_stat.st_size > 0:
+                    break
                 await asyncio.sleep(0.05)
             else:
                 raise HTTPException(status_code=500, detail="Segment missing after regeneration")
             
-            segment_size = segment_stat.st_size
             headers = {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, OPTIONS',
-                'Access-Control-Allow-Headers': 'Origin, Content-Type, Accept, Range, X-HLS-Keep-Alive, X-No-Activity-Update',
-                'Content-Type': 'video/mp2t',
-                'Content-Length': str(segment_size),
+                **SEGMENT_CORS_HEADERS,
                 'Cache-Control': 'public, max-age=604800, immutable',
                 'X-Track-ID': track_id,
                 'X-Quality': quality,
@@ -1042,11 +1253,7 @@ async def serve_segment(
                 })
             
             log_segment_event("served-regenerated")
-            return StreamingResponse(
-                _file_iter(segment_path),
-                media_type='video/mp2t',
-                headers=headers
-            )
+            return build_segment_response(request, segment_path, segment_stat, headers)
 
         except Exception as regen_error:
             await status_lock.unlock_voice(track_id, voice_id if track_type == 'tts' else None, success=False, db=db)
@@ -1179,8 +1386,8 @@ async def get_tts_generation_progress(track_id: str, voice_id: str):
         lock_key = f"{track_id}:{voice_id}"
         
         # Check if TTS generation in progress
-        if lock_key in enhanced_voice_tts_service.voice_switch_progress:
-            progress_data = enhanced_voice_tts_service.voice_switch_progress[lock_key]
+        progress_data = await enhanced_voice_tts_service.get_voice_switch_progress(lock_key)
+        if progress_data is not None:
             
             status = progress_data.get('status', 'processing')
             progress = progress_data.get('progress', 0)
@@ -1508,12 +1715,7 @@ async def player(
                 return await duration_manager.get_duration(track_id, db)
 
         async def get_progress_async():
-            return db.query(PlaybackProgress).filter(
-                and_(
-                    PlaybackProgress.user_id == current_user.id,
-                    PlaybackProgress.track_id == track_id
-                )
-            ).first()
+            return await playback_progress_buffer.get_state(current_user.id, track_id, db)
 
         duration, progress = await asyncio.gather(
             get_duration_async(),
@@ -1574,11 +1776,11 @@ async def player(
             },
             "supports_voice_durations": track_type == 'tts' and bool(all_voice_durations),
             "progress": {
-                "position": float(progress.position) if progress else 0,
+                "position": float(progress['position']) if progress else 0,
                 "duration": duration,
-                "completion_rate": progress.completion_rate if progress else 0,
-                "completed": progress.completed if progress else False,
-                "last_played": progress.last_played.isoformat() if progress and progress.last_played else None
+                "completion_rate": progress['completion_rate'] if progress else 0,
+                "completed": progress['completed'] if progress else False,
+                "last_played": progress['last_played'].isoformat() if progress and progress['last_played'] else None
             }
         }
 
@@ -1813,6 +2015,8 @@ __all__ = [
     'serve_hls_master',
     'serve_variant_playlist',
     'serve_segment',
+    'serve_segment_token_only',
+    'serve_segment_fast',
     'get_segment_progress',
     'get_track_metadata',
     'serve_media',
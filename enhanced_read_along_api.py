@@ -1,6 +1,6 @@
 # enhanced_read_along_api.py
 
-from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
 from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict, Any, Tuple
@@ -8,12 +8,19 @@ from bisect import bisect_right
 from pydantic import BaseModel
 from collections import OrderedDict
 from read_along_cache import get_cache_stats
+from bounded_cache import BoundedCache
 import asyncio
+import fcntl
 import time
 import logging
+from pathlib import Path
 from database import get_db
 from models import Track, Album, User, CampaignTier
 from auth import login_required
+from track_metadata_cache import track_metadata_cache
+from read_along_artifact import READ_ALONG_PAGE_SIZES, ReadAlongArtifact, ReadAlongArtifactError, ReadAlongArtifactWriter
+from read_along_search_index import ReadAlongSearchIndex, SearchIndexError, SearchIndexWriter, normalize_term
+from segment_word_timings import SegmentTimingsError, SegmentWordTimings
 from read_along_cache import (
     DEFAULT_PAGE_SIZE,
     MAX_PAGE_SIZE,
@@ -37,6 +44,13 @@ TIMINGS_CACHE_MAX = 256
 TEXT_CACHE_MAX = 128
 PAGE_PLAN_CACHE_MAX = 256
 SPAN_CACHE_MAX = 256
+TIMINGS_CACHE_MAX_BYTES = 512 * 1024 * 1024
+TEXT_CACHE_MAX_BYTES = 128 * 1024 * 1024
+SPAN_CACHE_MAX_BYTES = 256 * 1024 * 1024
+WORD_DICT_BYTES = 360  # one word timing dict with its keys' values
+WORD_SPAN_BYTES = 120  # one (start, end) tuple
+ARTIFACT_OPEN_MAX = 256
+ARTIFACT_RETRY_SECONDS = 600
 
 SENTENCE_SEARCH_FWD = 50
 SENTENCE_SEARCH_BACK = 50
@@ -69,6 +83,19 @@ def check_read_along_access(user: User, creator_id: int, db: Session) -> bool:
 async def check_read_along_access_async(user: User, creator_id: int, db: Session) -> bool:
     return await run_in_threadpool(check_read_along_access, user, creator_id, db)
 
+def _lock_exclusive(lock_path: Path):
+    """Blocking; an exclusive flock held until the returned file is closed, None if the voice dir is gone"""
+    try:
+        f = open(lock_path, "a+b")
+    except FileNotFoundError:
+        return None
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX)
+    except BaseException:
+        f.close()
+        raise
+    return f
+
 def resolve_word_index_for_time(words: List[Dict[str, Any]], t: float, tolerance: float = 0.25) -> Tuple[int, str]:
     """Map playback time to stable word index"""
     if not words:
@@ -92,61 +119,265 @@ def resolve_word_index_for_time(words: List[Dict[str, Any]], t: float, tolerance
         return i, "between_prev_close"
     return min(i + 1, len(words) - 1), "between_next"
 
-class _LRU:
-    """Tiny LRU using OrderedDict"""
-    def __init__(self, cap: int):
-        self.cap = cap
-        self._d: "OrderedDict[str, Any]" = OrderedDict()
-
-    def get(self, k: str):
-        v = self._d.get(k)
-        if v is None:
-            return None
-        self._d.move_to_end(k)
-        return v
-
-    def set(self, k: str, v: Any):
-        self._d[k] = v
-        self._d.move_to_end(k)
-        if len(self._d) > self.cap:
-            self._d.popitem(last=False)
-
 class ReadAlongService:
     """Read-along service with file-storage integration (paged-only, sentence-safe)"""
 
     def __init__(self):
-        self.page_cache = _LRU(PAGE_CACHE_MAX_ENTRIES)
-        self.timings_cache = _LRU(TIMINGS_CACHE_MAX)
-        self.text_cache = _LRU(TEXT_CACHE_MAX)
-        self.plan_cache = _LRU(PAGE_PLAN_CACHE_MAX)
-        self.spans_cache = _LRU(SPAN_CACHE_MAX)
+        self.page_cache = BoundedCache("read_along.pages", max_entries=PAGE_CACHE_MAX_ENTRIES)
+        self.timings_cache = BoundedCache(
+            "read_along.timings", max_entries=TIMINGS_CACHE_MAX, max_bytes=TIMINGS_CACHE_MAX_BYTES,
+            sizeof=lambda words: len(words) * WORD_DICT_BYTES,
+        )
+        self.text_cache = BoundedCache("read_along.texts", max_entries=TEXT_CACHE_MAX, max_bytes=TEXT_CACHE_MAX_BYTES)
+        self.plan_cache = BoundedCache("read_along.page_plans", max_entries=PAGE_PLAN_CACHE_MAX)
+        self.spans_cache = BoundedCache(
+            "read_along.spans", max_entries=SPAN_CACHE_MAX, max_bytes=SPAN_CACHE_MAX_BYTES,
+            sizeof=lambda spans: len(spans) * WORD_SPAN_BYTES,
+        )
         self._cpu_sem = asyncio.Semaphore(TOKENIZATION_CONCURRENCY)
+        self._artifacts: "OrderedDict[Tuple[str, str, str], Tuple[int, Any]]" = OrderedDict()
+        self._compiling: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._compile_failed: Dict[Tuple[str, str], float] = {}
 
         from text_storage_service import text_storage_service
         self.text_service = text_storage_service
 
-    def clear_all_caches(self):
-        """Clear all caches to force recalculation"""
-        self.page_cache = _LRU(PAGE_CACHE_MAX_ENTRIES)
-        self.timings_cache = _LRU(TIMINGS_CACHE_MAX)
-        self.text_cache = _LRU(TEXT_CACHE_MAX)
-        self.plan_cache = _LRU(PAGE_PLAN_CACHE_MAX)
-        self.spans_cache = _LRU(SPAN_CACHE_MAX)
+    def forget(self, track_id: str, voice_id: str):
+        """Drop this process's lazily built state for one voice (its artifact changed)"""
+        key = f"{track_id}:{voice_id}"
+        self.timings_cache.pop(key)
+        self.spans_cache.pop(key)
+        self.plan_cache.pop_prefix(f"{key}:")
+        self.text_cache.pop(f"{track_id}")
+
+    # ------------------------------------------------------------------
+    # Precompiled artifact (readalong.bin)
+    # ------------------------------------------------------------------
+
+    async def open_artifact(self, track_id: str, voice_id: str) -> Optional[ReadAlongArtifact]:
+        """Mapped readalong.bin of a voice, or None if it is missing or older than its timings or text"""
+        return await self._open_compiled("pages", track_id, voice_id)
+
+    async def open_search_index(self, track_id: str, voice_id: str) -> Optional[ReadAlongSearchIndex]:
+        """Mapped search.idx of a voice, or None if it is missing or older than its timings or text"""
+        return await self._open_compiled("search", track_id, voice_id)
+
+    async def open_segment_timings(self, track_id: str, voice_id: str) -> Optional[SegmentWordTimings]:
+        """Mapped segment_timings.bin of a voice (written by HLS word mapping), or None if it is missing"""
+        return await self._open_compiled("segments", track_id, voice_id)
+
+    async def _open_compiled(self, kind: str, track_id: str, voice_id: str):
+        try:
+            if kind == "pages":
+                path = self.text_service._get_read_along_artifact_path(track_id, voice_id)
+                opener, errors = ReadAlongArtifact.open, (OSError, ReadAlongArtifactError)
+            elif kind == "search":
+                path = self.text_service._get_search_index_path(track_id, voice_id)
+                opener, errors = ReadAlongSearchIndex.open, (OSError, SearchIndexError)
+            else:
+                path = self.text_service._get_segment_timing_path(track_id, voice_id)
+                opener, errors = SegmentWordTimings.open, (OSError, SegmentTimingsError)
+            # The sidecar is written with the segment mapping, not compiled from timings.cols
+            sources = () if kind == "segments" else (
+                self.text_service._get_columnar_timing_path(track_id, voice_id),
+                self.text_service._get_text_file_path(track_id),
+            )
+        except Exception:
+            return None
+
+        def _mtime() -> Optional[int]:
+            try:
+                mtime = path.stat().st_mtime_ns
+            except OSError:
+                return None
+            for source in sources:
+                try:
+                    if source.stat().st_mtime_ns > mtime:
+                        return None
+                except OSError:
+                    pass
+            return mtime
+
+        key = (kind, track_id, voice_id)
+        mtime = await run_in_threadpool(_mtime)
+        opened = self._artifacts.get(key)
+        if opened and opened[0] == mtime:
+            self._artifacts.move_to_end(key)
+            return opened[1]
+        if opened:
+            # Dropped, not closed: in-flight requests may still hold the old map
+            del self._artifacts[key]
+            if sources:
+                # Recompiled (here or by another worker): lazily built pages are stale too
+                self.forget(track_id, voice_id)
+        if mtime is None:
+            return None
+
+        try:
+            artifact = await run_in_threadpool(opener, path)
+        except errors as e:
+            logger.warning(f"Cannot map read-along {kind} artifact {track_id}:{voice_id}: {e}")
+            return None
+
+        self._artifacts[key] = (mtime, artifact)
+        while len(self._artifacts) > ARTIFACT_OPEN_MAX:
+            self._artifacts.popitem(last=False)
+        return artifact
+
+    async def compile_artifact(self, track_id: str, voice_id: str) -> Optional[Path]:
+        """
+        Build readalong.bin and search.idx from the voice's stored timings and the
+        track's source text. Workers serialize on a flock next to the artifact; one
+        that waited returns the artifact another worker just compiled.
+        """
+        path = self.text_service._get_read_along_artifact_path(track_id, voice_id)
+        lock_file = await run_in_threadpool(_lock_exclusive, path.with_name(f".{path.name}.lock"))
+        if lock_file is None:
+            return None
+        try:
+            if (await self._open_compiled("pages", track_id, voice_id) is not None
+                    and await self._open_compiled("search", track_id, voice_id) is not None):
+                self._compile_failed.pop((track_id, voice_id), None)
+                return path
+            return await self._compile_artifact_locked(track_id, voice_id, path)
+        finally:
+            lock_file.close()
+
+    async def _compile_artifact_locked(self, track_id: str, voice_id: str, path: Path) -> Optional[Path]:
+        columns = await self.text_service.open_columnar_timings(track_id, voice_id)
+        if columns is not None:
+            word_timings = await run_in_threadpool(columns.words)
+        else:
+            word_timings = await self.text_service.get_word_timings(track_id, voice_id)
+        if not word_timings:
+            return None
+
+        original_text = await self.text_service.get_source_text(track_id)
+        if not original_text:
+            original_text = " ".join([w.get("word", "") for w in word_timings])
+
+        started = time.time()
+        async with self._cpu_sem:
+            writer, search_writer = await run_in_threadpool(self._compile_artifact_sync, word_timings, original_text)
+            await run_in_threadpool(search_writer.write, self.text_service._get_search_index_path(track_id, voice_id))
+            await run_in_threadpool(writer.write, path)
+        self.forget(track_id, voice_id)
+        self._compile_failed.pop((track_id, voice_id), None)
+        logger.info(
+            f"Compiled read-along artifact {track_id}:{voice_id}: {len(word_timings)} words, "
+            f"page sizes {list(READ_ALONG_PAGE_SIZES)}, {(time.time() - started) * 1000:.0f}ms"
+        )
+        return path
+
+    def _compile_artifact_sync(self, word_timings: List[Dict[str, Any]], full_text: str) -> Tuple[ReadAlongArtifactWriter, SearchIndexWriter]:
+        """Spans, page plans and every page's text and tokens, exactly as the lazy path builds them, and the search index"""
+        spans = self._build_word_char_spans_robust(word_timings, full_text)
+        writer = ReadAlongArtifactWriter(len(word_timings), len(full_text))
+        writer.set_spans(spans)
+        search_writer = SearchIndexWriter([w.get("word", "") for w in word_timings])
+        for page_size in READ_ALONG_PAGE_SIZES:
+            page_plan = self._build_sentence_page_plan(word_timings, full_text, page_size)
+            search_writer.add_page_plan(page_size, page_plan)
+            for start_idx, end_idx_ex in page_plan:
+                segment, seg_start_char, seg_end_char = self._extract_text_segment_precise(full_text, spans, start_idx, end_idx_ex)
+                tokens = self._tokens_from_spans(
+                    full_text, spans, word_timings[start_idx:end_idx_ex], start_idx, seg_start_char, seg_end_char
+                )
+                writer.add_page(page_size, start_idx, end_idx_ex, segment, self._pack_tokens(tokens))
+        return writer, search_writer
+
+    def schedule_compile(self, track_id: str, voice_id: str):
+        """Compile in the background (voices stored before artifacts existed); at most one task per voice"""
+        key = (track_id, voice_id)
+        if key in self._compiling or time.time() - self._compile_failed.get(key, 0.0) < ARTIFACT_RETRY_SECONDS:
+            return
+
+        async def _run():
+            try:
+                if await self.compile_artifact(track_id, voice_id) is None:
+                    self._compile_failed[key] = time.time()
+            except Exception as e:
+                self._compile_failed[key] = time.time()
+                logger.warning(f"Read-along artifact compile failed for {track_id}:{voice_id}: {e}")
+            finally:
+                self._compiling.pop(key, None)
+
+        self._compiling[key] = asyncio.create_task(_run())
+
+    async def get_page_plan(self, track_id: str, voice_id: str, page_size: int, word_timings: List[Dict[str, Any]], db: Session) -> List[Tuple[int, int]]:
+        """Sentence-safe page plan, from the artifact when it has this page size"""
+        artifact = await self.open_artifact(track_id, voice_id)
+        if artifact is not None and artifact.has_page_size(page_size) and artifact.word_count == len(word_timings):
+            return artifact.page_plan(page_size)
+
+        plan_key = f"{track_id}:{voice_id}:{page_size}"
+        page_plan = self.plan_cache.get(plan_key)
+        if page_plan is None:
+            original_text = await self._get_original_text(track_id, word_timings, db)
+            async with self._cpu_sem:
+                page_plan = await run_in_threadpool(self._build_sentence_page_plan, word_timings, original_text, page_size)
+            self.plan_cache.set(plan_key, page_plan)
+        return page_plan
+
+    async def _get_original_text(self, track_id: str, word_timings: List[Dict[str, Any]], db: Session) -> str:
+        text_key = f"{track_id}"
+        original_text = self.text_cache.get(text_key)
+        if original_text is None:
+            try:
+                original_text = await self.text_service.get_source_text(track_id, db)
+            except Exception as e:
+                logger.error(f"Failed to load text for {track_id}: {e}")
+                original_text = ""
+            if not original_text:
+                original_text = " ".join([w.get("word", "") for w in word_timings])
+            self.text_cache.set(text_key, original_text)
+        return original_text
+
+    async def _page_from_artifact(self, artifact: ReadAlongArtifact, track_id: str, voice_id: str, page: int, page_size: int) -> Optional[Dict[str, Any]]:
+        """Serve a page by slicing the mapped artifact; None if the timings no longer match it"""
+        columns = await self.text_service.open_columnar_timings(track_id, voice_id)
+        if columns is None or len(columns) != artifact.word_count:
+            return None
+
+        total_words = artifact.word_count
+        total_pages = artifact.page_count(page_size)
+        if total_pages == 0:
+            return self._empty_payload(track_id, voice_id, page, page_size, total_words, 0, "no_timings")
+        if page < 0 or page >= total_pages:
+            return self._empty_payload(track_id, voice_id, page, page_size, total_words, total_pages, "page_out_of_range")
+
+        start_idx, end_idx_ex = artifact.page_bounds(page_size, page)
+        page_words = columns.words(start_idx, end_idx_ex)
+        page_text_segment, packed_tokens = artifact.page(page_size, page)
+        payload = self._build_page_payload(
+            track_id, voice_id, page, page_size, total_words, total_pages, page_words,
+            page_text_segment, self._unpack_tokens(packed_tokens, page_words, start_idx), start_idx, end_idx_ex
+        )
+        payload["data_source"] = "read_along_artifact"
+        return payload
+
+    def _empty_payload(self, track_id: str, voice_id: str, page: int, page_size: int, total_words: int, total_pages: int, status: str) -> Dict[str, Any]:
+        return {
+            "track_id": track_id,
+            "voice_id": voice_id,
+            "page": page,
+            "page_size": page_size,
+            "total_words": total_words,
+            "total_pages": total_pages,
+            "sourceText": "",
+            "mappedTokens": [],
+            "wordTimings": [],
+            "status": status,
+            "data_source": "file_storage_enhanced",
+        }
 
     async def get_read_along_data(self, track_id: str, voice_id: str, page: Optional[int], page_size: Optional[int], db: Session) -> Dict[str, Any]:
         """Always paginated. If page is None, default to page 0"""
         page = 0 if page is None else int(page)
         page_size = min(max(int(page_size or DEFAULT_PAGE_SIZE), 10), MAX_PAGE_SIZE)
-        
-        if page == 0:
-            self.clear_all_caches()
 
-        def _fetch_track_album():
-            track = db.query(Track).filter(Track.id == track_id).first()
-            album = db.query(Album).filter(Album.id == track.album_id).first() if track else None
-            return track, album
-
-        track, album = await run_in_threadpool(_fetch_track_album)
+        track = await track_metadata_cache.get(track_id, db)
+        album = track.album if track else None
         if not track:
             raise HTTPException(status_code=404, detail="Track not found")
         if not album:
@@ -154,6 +385,15 @@ class ReadAlongService:
         if getattr(track, "track_type", "audio") != "tts":
             raise HTTPException(status_code=400, detail="Track is not a TTS track")
 
+        artifact = await self.open_artifact(track_id, voice_id)
+        if artifact is None:
+            self.schedule_compile(track_id, voice_id)
+        elif artifact.has_page_size(page_size):
+            payload = await self._page_from_artifact(artifact, track_id, voice_id, page, page_size)
+            if payload is not None:
+                return payload
+            self.schedule_compile(track_id, voice_id)
+
         # Load word timings
         timings_key = f"{track_id}:{voice_id}"
         word_timings = self.timings_cache.get(timings_key)
@@ -169,78 +409,21 @@ class ReadAlongService:
             self.timings_cache.set(timings_key, word_timings)
 
         if not word_timings:
-            return {
-                "track_id": track_id,
-                "voice_id": voice_id,
-                "page": page,
-                "page_size": page_size,
-                "total_words": 0,
-                "total_pages": 0,
-                "sourceText": "",
-                "mappedTokens": [],
-                "wordTimings": [],
-                "status": "no_timings",
-                "data_source": "file_storage_enhanced",
-            }
+            return self._empty_payload(track_id, voice_id, page, page_size, 0, 0, "no_timings")
 
         total_words = len(word_timings)
 
-        # Load source text
-        text_key = f"{track_id}"
-        original_text = self.text_cache.get(text_key)
-        
-        if original_text is None:
-            try:
-                original_text = await self.text_service.get_source_text(track_id, db)
-            except Exception as e:
-                logger.error(f"Failed to load text for {track_id}: {e}")
-                original_text = ""
-            
-            if not original_text:
-                original_text = " ".join([w.get("word", "") for w in word_timings])
-            
-            self.text_cache.set(text_key, original_text)
-
-        # Build page plan
-        plan_key = f"{track_id}:{voice_id}:{page_size}"
-        page_plan = self.plan_cache.get(plan_key)
-        
-        if page_plan is None:
-            async with self._cpu_sem:
-                page_plan = await run_in_threadpool(self._build_sentence_page_plan, word_timings, original_text, page_size)
-            self.plan_cache.set(plan_key, page_plan)
+        # Load source text and page plan
+        original_text = await self._get_original_text(track_id, word_timings, db)
+        page_plan = await self.get_page_plan(track_id, voice_id, page_size, word_timings, db)
 
         total_pages = len(page_plan)
         
         if total_pages == 0:
-            return {
-                "track_id": track_id,
-                "voice_id": voice_id,
-                "page": page,
-                "page_size": page_size,
-                "total_words": total_words,
-                "total_pages": 0,
-                "sourceText": "",
-                "mappedTokens": [],
-                "wordTimings": [],
-                "status": "no_timings",
-                "data_source": "file_storage_enhanced",
-            }
+            return self._empty_payload(track_id, voice_id, page, page_size, total_words, 0, "no_timings")
 
         if page < 0 or page >= total_pages:
-            return {
-                "track_id": track_id,
-                "voice_id": voice_id,
-                "page": page,
-                "page_size": page_size,
-                "total_words": total_words,
-                "total_pages": total_pages,
-                "sourceText": "",
-                "mappedTokens": [],
-                "wordTimings": [],
-                "status": "page_out_of_range",
-                "data_source": "file_storage_enhanced",
-            }
+            return self._empty_payload(track_id, voice_id, page, page_size, total_words, total_pages, "page_out_of_range")
 
         start_idx, end_idx_ex = page_plan[page]
         page_words = word_timings[start_idx:end_idx_ex]
@@ -407,27 +590,62 @@ class ReadAlongService:
         if not query or not word_timings:
             return []
 
-        plan_key = f"{track_id}:{voice_id}:{page_size}"
-        page_plan = self.plan_cache.get(plan_key)
-        if page_plan is None:
-            text_key = f"{track_id}"
-            original_text = self.text_cache.get(text_key)
-            if original_text is None:
-                try:
-                    original_text = await self.text_service.get_source_text(track_id, db)
-                except Exception:
-                    original_text = ""
-                if not original_text:
-                    original_text = " ".join([w.get("word", "") for w in word_timings])
-                self.text_cache.set(text_key, original_text)
-
-            async with self._cpu_sem:
-                page_plan = await run_in_threadpool(self._build_sentence_page_plan, word_timings, original_text, page_size)
-            self.plan_cache.set(plan_key, page_plan)
+        page_plan = await self.get_page_plan(track_id, voice_id, page_size, word_timings, db)
 
         async with self._cpu_sem:
             return await run_in_threadpool(self._search_impl, word_timings, query, page_size, track_id, voice_id, page_plan)
 
+    async def search_indexed(self, track_id: str, voice_id: str, query: str, page_size: int) -> Optional[List[Dict[str, Any]]]:
+        """Search through the voice's search.idx; None if it has none for this page size (use search_in_text)"""
+        index = await self.open_search_index(track_id, voice_id)
+        if index is None:
+            self.schedule_compile(track_id, voice_id)
+            return None
+        if not index.has_page_size(page_size):
+            return None
+        columns = await self.text_service.open_columnar_timings(track_id, voice_id)
+        if columns is None or len(columns) != index.word_count:
+            return None
+        if not query or not query.strip():
+            return []
+
+        async with self._cpu_sem:
+            return await run_in_threadpool(self._search_indexed_sync, index, columns, query, page_size)
+
+    def _search_indexed_sync(self, index: ReadAlongSearchIndex, columns, query: str, page_size: int) -> List[Dict[str, Any]]:
+        """Same matches and scores as _search_impl, from posting lists instead of a scan"""
+        q = query.lower().strip()
+        query_terms = [t for t in (normalize_term(w) for w in q.split()) if t]
+        total_words = index.word_count
+        matches_scored: List[Dict[str, Any]] = []
+        def _match(start_idx: int, length: int, score: int) -> Dict[str, Any]:
+            context_start = max(0, start_idx - 3)
+            context_end = min(total_words, start_idx + length + 3)
+            ctx_words = [columns.word(i) for i in range(context_start, context_end)]
+            return {
+                "page": index.page_of(page_size, start_idx),
+                "word_index": start_idx,
+                "position": start_idx,
+                "match": " ".join(ctx_words[start_idx - context_start:start_idx - context_start + length]),
+                "context": f"...{' '.join(ctx_words)}...",
+                "start_time": columns.starts[start_idx],
+                "end_time": columns.ends[start_idx + length - 1],
+                "phrase_length": length,
+                "_score": score,
+            }
+
+        if len(query_terms) > 1:
+            query_len = len(query_terms)
+            for start_idx in index.phrase_starts(query_terms):
+                window_text = " ".join(columns.word(i).lower() for i in range(start_idx, start_idx + query_len))
+                matches_scored.append(_match(start_idx, query_len, 5 if window_text == q else 4))
+        elif query_terms:
+            for score, word_index in index.term_matches(query_terms[0]):
+                matches_scored.append(_match(word_index, 1, score))
+
+        matches_scored.sort(key=lambda m: (-m.get("_score", 0), m.get("word_index", 0)))
+        return [{k: v for k, v in m.items() if k != "_score"} for m in matches_scored]
+
     def _fuzzy_phrase_match(self, query: str, text: str) -> bool:
         """Check if query matches text with some punctuation/spacing flexibility"""
         import re
@@ -721,36 +939,14 @@ class ReadAlongService:
                         "end_time": None,
                     })
 
-                tokens.append({
-                    "text": word_data["word"],
-                    "type": "word",
-                    "hasTimings": True,
-                    "start_time": word_data["start_time"],
-                    "end_time": word_data["end_time"],
-                    "timing_index": word_data.get("word_index", global_start_idx + word_idx),
-                    "page_index": word_idx,
-                    "word_index": word_data.get("word_index", global_start_idx + word_idx),
-                    "segment_index": word_data.get("segment_index"),
-                    "duration": word_data.get("duration", word_data["end_time"] - word_data["start_time"]),
-                })
+                tokens.append(self._word_token(word_data, word_idx, global_start_idx))
                 continue
 
             if pos_start > cursor:
                 between_text = full_text[cursor:pos_start]
                 _append_gap_text(between_text)
 
-            tokens.append({
-                "text": word_data["word"],
-                "type": "word",
-                "hasTimings": True,
-                "start_time": word_data["start_time"],
-                "end_time": word_data["end_time"],
-                "timing_index": word_data.get("word_index", global_start_idx + word_idx),
-                "page_index": word_idx,
-                "word_index": word_data.get("word_index", global_start_idx + word_idx),
-                "segment_index": word_data.get("segment_index"),
-                "duration": word_data.get("duration", word_data["end_time"] - word_data["start_time"]),
-            })
+            tokens.append(self._word_token(word_data, word_idx, global_start_idx))
 
             cursor = pos_end
 
@@ -760,6 +956,38 @@ class ReadAlongService:
 
         return tokens
 
+    @staticmethod
+    def _word_token(word_data: Dict[str, Any], word_idx: int, global_start_idx: int) -> Dict[str, Any]:
+        return {
+            "text": word_data["word"],
+            "type": "word",
+            "hasTimings": True,
+            "start_time": word_data["start_time"],
+            "end_time": word_data["end_time"],
+            "timing_index": word_data.get("word_index", global_start_idx + word_idx),
+            "page_index": word_idx,
+            "word_index": word_data.get("word_index", global_start_idx + word_idx),
+            "segment_index": word_data.get("segment_index"),
+            "duration": word_data.get("duration", word_data["end_time"] - word_data["start_time"]),
+        }
+
+    @staticmethod
+    def _pack_tokens(tokens: List[Dict[str, Any]]) -> List[Any]:
+        """Artifact form of a page's tokens: page index for words, text for everything else"""
+        return [t["page_index"] if t["type"] == "word" else t["text"] for t in tokens]
+
+    def _unpack_tokens(self, packed: List[Any], page_words: List[Dict[str, Any]], start_idx: int) -> List[Dict[str, Any]]:
+        return [
+            self._word_token(page_words[item], item, start_idx) if isinstance(item, int) else {
+                "text": item,
+                "type": "punctuation",
+                "hasTimings": False,
+                "start_time": None,
+                "end_time": None,
+            }
+            for item in packed
+        ]
+
     def _add_spacing_and_punctuation_natural(self, tokens: List[Dict[str, Any]], text: str) -> None:
         """Emit only: a single space for any whitespace run, and exact runs of non-word, non-space punctuation"""
         if not text:
@@ -924,12 +1152,8 @@ async def get_read_along_data(
     response.headers["Pragma"] = "no-cache"
     response.headers["Expires"] = "0"
     
-    def _fetch_track_album():
-        track = db.query(Track).filter(Track.id == track_id).first()
-        album = db.query(Album).filter(Album.id == track.album_id).first() if track else None
-        return track, album
-
-    track, album = await run_in_threadpool(_fetch_track_album)
+    track = await track_metadata_cache.get(track_id, db)
+    album = track.album if track else None
     
     if not track:
         raise HTTPException(status_code=404, detail="Track not found")
@@ -984,7 +1208,10 @@ async def get_read_along_data(
         has_text_data = (page_data.get("sourceText") and len(page_data["sourceText"]) > 0) or \
                        (page_data.get("mappedTokens") and len(page_data["mappedTokens"]) > 0)
 
-        if has_word_timings and not has_text_data:
+        if page_data.get("data_source") == "read_along_artifact":
+            # Already a slice of a mapped file; a page cache copy gains nothing
+            logger.debug(f"Not caching page {page} - served from read-along artifact")
+        elif has_word_timings and not has_text_data:
             logger.warning(
                 f"Not caching page {page} - has wordTimings but missing text data. "
                 f"sourceText length: {len(page_data.get('sourceText', ''))}, "
@@ -1015,12 +1242,8 @@ async def find_word_at_time(
     current_user: User = Depends(login_required),
 ):
     """Find word index at specific time"""
-    def _fetch_track_album():
-        track = db.query(Track).filter(Track.id == track_id).first()
-        album = db.query(Album).filter(Album.id == track.album_id).first() if track else None
-        return track, album
-
-    track, album = await run_in_threadpool(_fetch_track_album)
+    track = await track_metadata_cache.get(track_id, db)
+    album = track.album if track else None
     if not track or not album:
         raise HTTPException(status_code=404, detail="Track or album not found")
 
@@ -1084,12 +1307,8 @@ async def get_time_for_word(
     current_user: User = Depends(login_required),
 ):
     """Get time for a specific word index"""
-    def _fetch_track_album():
-        track = db.query(Track).filter(Track.id == track_id).first()
-        album = db.query(Album).filter(Album.id == track.album_id).first() if track else None
-        return track, album
-
-    track, album = await run_in_threadpool(_fetch_track_album)
+    track = await track_metadata_cache.get(track_id, db)
+    album = track.album if track else None
     if not track or not album:
         raise HTTPException(status_code=404, detail="Track or album not found")
 
@@ -1155,12 +1374,8 @@ async def get_page_info(
     current_user: User = Depends(login_required),
 ):
     """Get page information for a given word index or playback time using sentence-aware pagination"""
-    def _fetch_track_album():
-        track = db.query(Track).filter(Track.id == track_id).first()
-        album = db.query(Album).filter(Album.id == track.album_id).first() if track else None
-        return track, album
-
-    track, album = await run_in_threadpool(_fetch_track_album)
+    track = await track_metadata_cache.get(track_id, db)
+    album = track.album if track else None
     if not track or not album:
         raise HTTPException(status_code=404, detail="Track or album not found")
 
@@ -1201,23 +1416,7 @@ async def get_page_info(
         else:
             target_index, reason = 0, "default_zero"
 
-        plan_key = f"{track_id}:{voice_id}:{page_size}"
-        page_plan = read_along_service.plan_cache.get(plan_key)
-        if page_plan is None:
-            text_key = f"{track_id}"
-            original_text = read_along_service.text_cache.get(text_key)
-            if original_text is None:
-                try:
-                    original_text = await read_along_service.text_service.get_source_text(track_id, db)
-                except Exception:
-                    original_text = ""
-                if not original_text:
-                    original_text = " ".join([w.get("word", "") for w in words])
-                read_along_service.text_cache.set(text_key, original_text)
-            
-            async with read_along_service._cpu_sem:
-                page_plan = await run_in_threadpool(read_along_service._build_sentence_page_plan, words, original_text, page_size)
-            read_along_service.plan_cache.set(plan_key, page_plan)
+        page_plan = await read_along_service.get_page_plan(track_id, voice_id, page_size, words, db)
 
         total_pages = len(page_plan)
         
@@ -1267,12 +1466,8 @@ async def search_read_along_text(
     current_user: User = Depends(login_required),
 ):
     """Search for text within the read-along content (maps to sentence-aware pages)"""
-    def _fetch_track_album():
-        track = db.query(Track).filter(Track.id == track_id).first()
-        album = db.query(Album).filter(Album.id == track.album_id).first() if track else None
-        return track, album
-
-    track, album = await run_in_threadpool(_fetch_track_album)
+    track = await track_metadata_cache.get(track_id, db)
+    album = track.album if track else None
     if not track:
         raise HTTPException(status_code=404, detail="Track not found")
     if not album:
@@ -1294,11 +1489,12 @@ async def search_read_along_text(
     if getattr(track, "track_type", "audio") != "tts":
         raise HTTPException(status_code=400, detail="Track is not a TTS track")
 
-    from text_storage_service import text_storage_service
-    word_timings = await text_storage_service.get_word_timings(track_id, search_request.voice_id, db) or []
-
     page_size = min(search_request.page_size or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
-    matches = await read_along_service.search_in_text(word_timings, search_request.query, page_size, track_id, search_request.voice_id, db)
+    matches = await read_along_service.search_indexed(track_id, search_request.voice_id, search_request.query, page_size)
+    if matches is None:
+        from text_storage_service import text_storage_service
+        word_timings = await text_storage_service.get_word_timings(track_id, search_request.voice_id, db) or []
+        matches = await read_along_service.search_in_text(word_timings, search_request.query, page_size, track_id, search_request.voice_id, db)
 
     return {
         "track_id": track_id,
@@ -1312,6 +1508,50 @@ async def search_read_along_text(
         "punctuation_restored": True,
     }
 
+@router.get("/api/tracks/{track_id}/segment-timings/{voice_id}")
+async def get_segment_timings(
+    track_id: str,
+    voice_id: str,
+    segment: Optional[int] = Query(None, ge=0, description="One HLS segment; omit for all"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(login_required),
+):
+    """Binary per-segment word timings (segment_timings.bin) for client-side highlighting"""
+    track = await track_metadata_cache.get(track_id, db)
+    album = track.album if track else None
+    if not track or not album:
+        raise HTTPException(status_code=404, detail="Track or album not found")
+
+    has_access = False
+    if current_user.is_creator and album.created_by_id == current_user.id:
+        has_access = True
+    elif current_user.is_team and album.created_by_id == current_user.created_by:
+        has_access = True
+    elif current_user.created_by and album.created_by_id == current_user.created_by:
+        has_access = True
+
+    if not has_access:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    if not await check_read_along_access_async(current_user, album.created_by_id, db):
+        raise HTTPException(status_code=403, detail="Read-along access not available for your tier")
+
+    timings = await read_along_service.open_segment_timings(track_id, voice_id)
+    if timings is None:
+        raise HTTPException(status_code=404, detail="Segment timings not available")
+
+    etag = f'"{timings.mtime_ns:x}-{"all" if segment is None else segment}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        payload = timings.payload(segment)
+    except IndexError:
+        raise HTTPException(status_code=404, detail="Segment not found")
+    return Response(content=payload, media_type="application/octet-stream", headers=headers)
+
 @router.get("/api/admin/read-along/cache-stats")
 async def get_cache_statistics(current_user: User = Depends(login_required)):
     """Get read-along cache statistics for monitoring"""
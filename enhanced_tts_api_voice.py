@@ -33,6 +33,7 @@ from models import (
 )
 from auth import login_required
 from enhanced_tts_voice_service import enhanced_voice_tts_service
+from tts_voice_fanout import VoiceFanOut
 from storage import storage
 from hls_streaming import stream_manager
 from read_along_cache import clear_track_cache, clear_old_versions
@@ -416,6 +417,18 @@ class TTSCreateRequest(BaseModel):
 class VoiceChangeRequest(BaseModel):
     new_voice: str
 
+class VoiceFanOutRequest(BaseModel):
+    voices: List[str]
+
+    @validator('voices')
+    def validate_voices(cls, v):
+        voices = list(dict.fromkeys(v))
+        if not voices:
+            raise ValueError('At least one voice is required')
+        if len(voices) > voice_cache_manager.max_voices_popular:
+            raise ValueError(f'At most {voice_cache_manager.max_voices_popular} voices per fan-out')
+        return voices
+
 class TTSCreateResponse(BaseModel):
     track_id: str
     status: str
@@ -459,6 +472,14 @@ class VoiceSwitchResponse(BaseModel):
     processing_time: Optional[float] = None
     cached: bool = False
 
+class VoiceFanOutResponse(BaseModel):
+    track_id: str
+    old_voice: str
+    status: str
+    message: str
+    queued_voices: List[str]
+    voices: Dict[str, Dict]
+
 @router.get("/api/tracks/{track_id}/check-access")
 async def check_track_access(
     track_id: str,
@@ -813,8 +834,8 @@ async def get_tts_voice_progress(
         
         lock_key = f"{track_id}:{voice_id}"
         
-        if lock_key in enhanced_voice_tts_service.voice_switch_progress:
-            progress_data = enhanced_voice_tts_service.voice_switch_progress[lock_key]
+        progress_data = await enhanced_voice_tts_service.get_voice_switch_progress(lock_key)
+        if progress_data is not None:
             
             status = progress_data.get('status', 'processing')
             progress = min(100, max(0, progress_data.get('progress', 0)))
@@ -1274,6 +1295,139 @@ async def create_enhanced_voice_tts_track(
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create TTS track: {str(e)}")
 
+async def _validate_voice_request(
+    track_id: str, new_voice: str, current_user: User, db: AsyncSession
+) -> tuple[Track, str]:
+    """Access, track type and voice availability checks; returns (track, old_voice) or raises HTTPException"""
+    has_access, error_message, track, album = await check_unified_track_access(
+        track_id, current_user, db, new_voice, require_voice_access=True
+    )
+    if not has_access:
+        raise HTTPException(status_code=403, detail=error_message)
+    if getattr(track, 'track_type', 'audio') != 'tts':
+        raise HTTPException(status_code=400, detail="Track is not a TTS track")
+
+    available_voices = await get_available_voices(db)
+    if new_voice not in available_voices:
+        raise HTTPException(status_code=400, detail=f"Voice '{new_voice}' is not available")
+
+    old_voice = getattr(track, 'default_voice', None) or await get_first_available_voice(db)
+    return track, old_voice
+
+async def _admit_voice_generation(
+    track_id: str, track: Track, old_voice: str, new_voice: str, current_user: User, db: AsyncSession
+):
+    """
+    Cached / in-flight / voice limit / concurrency checks, then the generation
+    lock and progress entry. Returns None once new_voice is admitted (the caller
+    must start its worker), otherwise the response to send for it.
+    """
+    lock_key = f"{track_id}:{new_voice}"
+
+    generated_voices = await get_generated_voices_for_track(track_id)
+    if new_voice in generated_voices:
+        from duration_manager import duration_manager
+        try:
+            voice_duration = await duration_manager.get_voice_duration(track_id, new_voice, db)
+            if voice_duration <= 0:
+                voice_duration = await duration_manager.get_duration(track_id, db)
+        except Exception:
+            voice_duration = await duration_manager.get_duration(track_id, db)
+        return VoiceSwitchResponse(
+            track_id=track_id, old_voice=old_voice, new_voice=new_voice,
+            status="success",
+            message=f"Switched to {new_voice} (cached)",
+            voice_directory=f"voice-{new_voice}",
+            duration=voice_duration,
+            cached=True
+        )
+
+    from enhanced_tts_voice_service import enhanced_voice_tts_service
+    from voice_cache_manager import voice_cache_manager
+
+    # Check database if voice is already generating (DB-driven lock check)
+    is_generating = await voice_cache_manager.is_voice_generating(track_id, new_voice, db)
+    if is_generating:
+        prog = enhanced_voice_tts_service.voice_switch_progress.get(lock_key, {})
+        return VoiceSwitchResponse(
+            track_id=track_id, old_voice=old_voice, new_voice=new_voice,
+            status="processing",
+            message=prog.get("message", "Processing voice..."),
+            voice_directory=f"voice-{new_voice}",
+            processing_time=(time.time() - prog.get("start_time", time.time())),
+            cached=False
+        )
+
+    # USE DATABASE-BASED VOICE LIMIT ENFORCEMENT
+    creator_id = track.created_by_id
+
+    # Check voice limits using database-based tracking
+    can_proceed, error_msg = await voice_cache_manager.enforce_voice_limit(
+        track_id, new_voice, creator_id, db
+    )
+
+    if not can_proceed:
+        # Get current counts for detailed error response
+        cached_voices = await voice_cache_manager.get_cached_voices(track_id, db)
+        inflight_count = await voice_cache_manager.get_inflight_voice_count(track_id, db)
+        is_popular = await voice_cache_manager.is_track_popular(track_id, creator_id, db)
+        max_voices = voice_cache_manager.max_voices_popular if is_popular else voice_cache_manager.max_voices_regular
+
+        def pretty(v): return v.replace('en-US-','').replace('en-GB-','').replace('Neural','')
+        return JSONResponse(
+            status_code=429,
+            content={
+                "status": "limit_reached",
+                "message": error_msg or f"Voice limit reached.",
+                "limit": max_voices,
+                "cached_count": len(cached_voices),
+                "cached": sorted(pretty(v['voice_id']) for v in cached_voices),
+                "in_flight_count": inflight_count,
+                "requested": pretty(new_voice),
+                "can_start_more": False
+            }
+        )
+
+    can_start, concurrency_error = enhanced_voice_tts_service.try_start_generation_atomic(
+        current_user, track_id, new_voice
+    )
+    if not can_start:
+        return JSONResponse(
+            status_code=429,
+            content={
+                "status": "concurrency_limited",
+                "message": concurrency_error or "Concurrency limit reached.",
+                "requested": new_voice
+            }
+        )
+
+    if not await _acquire_generation_lock_atomic(track_id, 'voice_switch', voice_id=new_voice):
+        prog = enhanced_voice_tts_service.voice_switch_progress.get(lock_key, {})
+        return VoiceSwitchResponse(
+            track_id=track_id, old_voice=old_voice, new_voice=new_voice,
+            status="processing",
+            message=prog.get("message", "Processing voice..."),
+            voice_directory=f"voice-{new_voice}",
+            processing_time=(time.time() - prog.get("start_time", time.time())),
+            cached=False
+        )
+
+    # Database tracks generation status via voice_generation_status table
+    # No need for Redis lock - already marked in-flight by enforce_voice_limit()
+
+    enhanced_voice_tts_service.voice_switch_progress[lock_key] = {
+        'status': 'initializing',
+        'progress': 0,
+        'phase': 'starting',
+        'message': 'Preparing voice generation...',
+        'start_time': time.time(),
+        'user_id': current_user.id,
+        'chunks_completed': 0,
+        'total_chunks': 0
+    }
+    return None
+
+
 @router.post("/api/tracks/{track_id}/voice/switch", response_model=VoiceSwitchResponse)
 async def switch_voice_simplified(
     track_id: str,
@@ -1287,121 +1441,10 @@ async def switch_voice_simplified(
     
     async with voice_guard:
         async with async_session() as db:
-            has_access, error_message, track, album = await check_unified_track_access(
-                track_id, current_user, db, new_voice, require_voice_access=True
-            )
-            if not has_access:
-                raise HTTPException(status_code=403, detail=error_message)
-            if getattr(track, 'track_type', 'audio') != 'tts':
-                raise HTTPException(status_code=400, detail="Track is not a TTS track")
-            
-            available_voices = await get_available_voices(db)
-            if new_voice not in available_voices:
-                raise HTTPException(status_code=400, detail=f"Voice '{new_voice}' is not available")
-            
-            old_voice = getattr(track, 'default_voice', None) or await get_first_available_voice(db)
-            
-            generated_voices = await get_generated_voices_for_track(track_id)
-            if new_voice in generated_voices:
-                from duration_manager import duration_manager
-                try:
-                    voice_duration = await duration_manager.get_voice_duration(track_id, new_voice, db)
-                    if voice_duration <= 0:
-                        voice_duration = await duration_manager.get_duration(track_id, db)
-                except Exception:
-                    voice_duration = await duration_manager.get_duration(track_id, db)
-                return VoiceSwitchResponse(
-                    track_id=track_id, old_voice=old_voice, new_voice=new_voice,
-                    status="success",
-                    message=f"Switched to {new_voice} (cached)",
-                    voice_directory=f"voice-{new_voice}",
-                    duration=voice_duration,
-                    cached=True
-                )
-            
-            from enhanced_tts_voice_service import enhanced_voice_tts_service
-            from voice_cache_manager import voice_cache_manager
-
-            # Check database if voice is already generating (DB-driven lock check)
-            is_generating = await voice_cache_manager.is_voice_generating(track_id, new_voice, db)
-            if is_generating:
-                prog = enhanced_voice_tts_service.voice_switch_progress.get(lock_key, {})
-                return VoiceSwitchResponse(
-                    track_id=track_id, old_voice=old_voice, new_voice=new_voice,
-                    status="processing",
-                    message=prog.get("message", "Processing voice..."),
-                    voice_directory=f"voice-{new_voice}",
-                    processing_time=(time.time() - prog.get("start_time", time.time())),
-                    cached=False
-                )
-
-            # USE DATABASE-BASED VOICE LIMIT ENFORCEMENT
-            creator_id = track.created_by_id
-
-            # Check voice limits using database-based tracking
-            can_proceed, error_msg = await voice_cache_manager.enforce_voice_limit(
-                track_id, new_voice, creator_id, db
-            )
-
-            if not can_proceed:
-                # Get current counts for detailed error response
-                cached_voices = await voice_cache_manager.get_cached_voices(track_id, db)
-                inflight_count = await voice_cache_manager.get_inflight_voice_count(track_id, db)
-                is_popular = await voice_cache_manager.is_track_popular(track_id, creator_id, db)
-                max_voices = voice_cache_manager.max_voices_popular if is_popular else voice_cache_manager.max_voices_regular
-
-                def pretty(v): return v.replace('en-US-','').replace('en-GB-','').replace('Neural','')
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "status": "limit_reached",
-                        "message": error_msg or f"Voice limit reached.",
-                        "limit": max_voices,
-                        "cached_count": len(cached_voices),
-                        "cached": sorted(pretty(v['voice_id']) for v in cached_voices),
-                        "in_flight_count": inflight_count,
-                        "requested": pretty(new_voice),
-                        "can_start_more": False
-                    }
-                )
-            
-            can_start, concurrency_error = enhanced_voice_tts_service.try_start_generation_atomic(
-                current_user, track_id, new_voice
-            )
-            if not can_start:
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "status": "concurrency_limited",
-                        "message": concurrency_error or "Concurrency limit reached.",
-                        "requested": new_voice
-                    }
-                )
-            
-            if not await _acquire_generation_lock_atomic(track_id, 'voice_switch', voice_id=new_voice):
-                prog = enhanced_voice_tts_service.voice_switch_progress.get(lock_key, {})
-                return VoiceSwitchResponse(
-                    track_id=track_id, old_voice=old_voice, new_voice=new_voice,
-                    status="processing",
-                    message=prog.get("message", "Processing voice..."),
-                    voice_directory=f"voice-{new_voice}",
-                    processing_time=(time.time() - prog.get("start_time", time.time())),
-                    cached=False
-                )
-
-            # Database tracks generation status via voice_generation_status table
-            # No need for Redis lock - already marked in-flight by enforce_voice_limit()
-
-            enhanced_voice_tts_service.voice_switch_progress[lock_key] = {
-                'status': 'initializing',
-                'progress': 0,
-                'phase': 'starting',
-                'message': 'Preparing voice generation...',
-                'start_time': time.time(),
-                'user_id': current_user.id,
-                'chunks_completed': 0,
-                'total_chunks': 0
-            }
+            track, old_voice = await _validate_voice_request(track_id, new_voice, current_user, db)
+            response = await _admit_voice_generation(track_id, track, old_voice, new_voice, current_user, db)
+            if response is not None:
+                return response
     
     background_tasks.add_task(
         process_voice_switch_with_cleanup,
@@ -1423,6 +1466,73 @@ async def switch_voice_simplified(
         cached=False
     )
 
+async def _release_admitted_voice(track_id: str, voice: str, current_user: User):
+    """Undo _admit_voice_generation for a voice whose worker never started"""
+    from enhanced_tts_voice_service import enhanced_voice_tts_service
+
+    enhanced_voice_tts_service.voice_switch_progress.pop(f"{track_id}:{voice}", None)
+    try:
+        enhanced_voice_tts_service.complete_user_generation(current_user.id, track_id, voice)
+    except Exception:
+        pass
+    await _release_lock(track_id, success=False, voice_id=voice)
+
+@router.post("/api/tracks/{track_id}/voice/fan-out", response_model=VoiceFanOutResponse)
+async def fan_out_voices(
+    track_id: str,
+    request: VoiceFanOutRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(login_required)
+):
+    """
+    Generate several voices of a track as one job: the source text is loaded and
+    split once and all admitted voices share one chunk queue. Each voice goes
+    through the same admission as /voice/switch; the result per voice is reported.
+    """
+    voices = request.voices
+    results: Dict[str, Dict] = {}
+    admitted: List[str] = []
+
+    async with async_session() as db:
+        for voice in voices:
+            track, old_voice = await _validate_voice_request(track_id, voice, current_user, db)
+
+        try:
+            for voice in voices:
+                async with _get_voice_lock(track_id, voice):
+                    response = await _admit_voice_generation(track_id, track, old_voice, voice, current_user, db)
+                if response is None:
+                    admitted.append(voice)
+                    results[voice] = {'status': 'processing', 'voice_directory': f"voice-{voice}"}
+                elif isinstance(response, JSONResponse):
+                    results[voice] = json.loads(response.body)
+                else:
+                    results[voice] = response.dict()
+        except BaseException:
+            # No worker will run for the voices admitted so far: give back what admission took
+            for voice in admitted:
+                await _release_admitted_voice(track_id, voice, current_user)
+            raise
+
+    if admitted:
+        background_tasks.add_task(
+            process_voice_fanout,
+            track_id=track_id,
+            old_voice=old_voice,
+            voices=admitted,
+            user_id=current_user.id,
+            user=current_user
+        )
+
+    return VoiceFanOutResponse(
+        track_id=track_id,
+        old_voice=old_voice,
+        status="processing" if admitted else "skipped",
+        message=f"Generating {len(admitted)} of {len(voices)} voices..." if admitted else "No voice needed generation",
+        queued_voices=admitted,
+        voices=results
+    )
+
 @router.get("/api/tracks/{track_id}/voices")
 async def get_track_voices_simplified(
     track_id: str,
@@ -1589,8 +1699,8 @@ async def get_tts_progress(
 
         # Check in-memory progress first (for actively generating tracks)
         lock_key = f"{track_id}:{current_voice}"
-        if lock_key in enhanced_voice_tts_service.voice_switch_progress:
-            progress_data = enhanced_voice_tts_service.voice_switch_progress[lock_key]
+        progress_data = await enhanced_voice_tts_service.get_voice_switch_progress(lock_key)
+        if progress_data is not None:
             status = progress_data.get('status', 'processing')
             progress = progress_data.get('progress', 0)
 
@@ -2586,7 +2696,9 @@ async def process_voice_switch_with_cleanup(
     user_id: int,
     lock_key: str,
     user: User,
-    lock_already_held: bool = False
+    lock_already_held: bool = False,
+    resume_session_dir: Optional[Path] = None,
+    fanout: Optional[VoiceFanOut] = None
 ):
     from track_status_manager import TrackStatusManager
     
@@ -2620,7 +2732,9 @@ async def process_voice_switch_with_cleanup(
                 new_voice=new_voice,
                 db=db,
                 user=user,
-                already_locked=True
+                already_locked=True,
+                resume_session_dir=resume_session_dir,
+                fanout=fanout
             )
             
             if result['status'] != 'success':
@@ -2707,7 +2821,9 @@ async def process_voice_switch_with_cleanup(
             'file_url': file_url
         }
             
-    except Exception as e:
+    except (Exception, asyncio.CancelledError) as e:
+        if isinstance(e, asyncio.CancelledError) and enhanced_voice_tts_service.shutting_down:
+            raise  # shutdown: session, manifest and 'generating' lock stay for the resume
         async with async_session() as db:
             track = await db.get(Track, track_id)
             if track:
@@ -2763,13 +2879,62 @@ async def process_voice_switch_with_cleanup(
         
         asyncio.create_task(cleanup_progress())
 
+async def process_voice_fanout(
+    track_id: str,
+    old_voice: str,
+    voices: List[str],
+    user_id: int,
+    user: User
+):
+    """
+    Fan-out worker: load and split the source text once, then run every admitted
+    voice through process_voice_switch_with_cleanup on one shared chunk queue.
+    Without a plan (text missing, storage error) the voices run as plain switches.
+    """
+    fanout = None
+    try:
+        async with async_session() as db:
+            text_content = await text_storage_service.get_source_text(track_id, db, bypass_cache=True)
+        if text_content:
+            plan = await enhanced_voice_tts_service.get_chunk_plan(track_id, text_content)
+            fanout = VoiceFanOut(track_id, text_content, plan)
+            del text_content, plan
+    except Exception as e:
+        logger.error(f"Voice fan-out plan failed for {track_id}, running voices independently: {e}")
+
+    logger.info(
+        f"VOICE-FANOUT: {track_id} | {len(voices)} voices | "
+        f"{len(fanout.plan) if fanout else 'no shared'} chunks"
+    )
+    results = await asyncio.gather(*(
+        process_voice_switch_with_cleanup(
+            track_id=track_id,
+            old_voice=old_voice,
+            new_voice=voice,
+            user_id=user_id,
+            lock_key=f"{track_id}:{voice}",
+            user=user,
+            lock_already_held=True,
+            fanout=fanout
+        )
+        for voice in voices
+    ), return_exceptions=True)
+
+    failed = [voice for voice, result in zip(voices, results) if isinstance(result, BaseException)]
+    logger.info(
+        f"VOICE-FANOUT-DONE: {track_id} | {len(voices) - len(failed)}/{len(voices)} voices"
+        + (f" | failed: {', '.join(failed)}" if failed else "")
+        + (f" | {fanout.get_stats()}" if fanout else "")
+    )
+
 async def regenerate_tts_track_content(
     track_id: str,
     title: str,
     text_content: str,
     voice: str,
     user_id: int,
-    lock_already_held: bool = False
+    lock_already_held: bool = False,
+    resume_session_dir: Optional[Path] = None
 ):
     from track_status_manager import TrackStatusManager
     
@@ -2800,7 +2965,9 @@ async def regenerate_tts_track_content(
                 text_content=text_content,
                 voice=voice,
                 db=db,
-                user=user
+                user=user,
+                job_kind="regenerate",
+                resume_session_dir=resume_session_dir
             )
             
             if result['status'] != 'success':
@@ -2866,7 +3033,9 @@ async def regenerate_tts_track_content(
 
             cache_bust_value = int(track.updated_at.timestamp() * 1000) if track.updated_at else None
 
-        except Exception as e:
+        except (Exception, asyncio.CancelledError) as e:
+            if isinstance(e, asyncio.CancelledError) and enhanced_voice_tts_service.shutting_down:
+                raise  # shutdown: session, manifest and 'generating' lock stay for the resume
             if session_dir:
                 await armtree(Path(session_dir))
             
@@ -2925,7 +3094,8 @@ async def process_enhanced_voice_tts_track(
     text_content: str, 
     voice: str, 
     user_id: int,
-    lock_already_held: bool = False
+    lock_already_held: bool = False,
+    resume_session_dir: Optional[Path] = None
 ):
     from track_status_manager import TrackStatusManager
     from models import Track
@@ -2953,7 +3123,8 @@ async def process_enhanced_voice_tts_track(
                 text_content=text_content,
                 voice=voice,
                 db=db,
-                user=user
+                user=user,
+                resume_session_dir=resume_session_dir
             )
             
             if result['status'] != 'success':
@@ -3029,7 +3200,9 @@ async def process_enhanced_voice_tts_track(
                 'lock_held': True
             }
             
-        except Exception as e:
+        except (Exception, asyncio.CancelledError) as e:
+            if isinstance(e, asyncio.CancelledError) and enhanced_voice_tts_service.shutting_down:
+                raise  # shutdown: session, manifest and 'generating' lock stay for the resume
             await db.rollback()
             
             if session_dir_to_cleanup:
@@ -3067,4 +3240,106 @@ async def process_enhanced_voice_tts_track(
             
             asyncio.create_task(cleanup_progress())
 
+_RESUMED_TTS_JOBS: set = set()
+
+def _resumed_job_done(task: asyncio.Task):
+    _RESUMED_TTS_JOBS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Resumed TTS job {task.get_name()} failed: {task.exception()}")
+
+async def resume_interrupted_tts_jobs(manifests: List) -> int:
+    """
+    Restart TTS jobs interrupted by a container restart from their session
+    directories (see tts_job_manifest). StatusLock.clear_all_on_startup has kept
+    their locks, so each worker runs with lock_already_held=True and only
+    synthesizes the chunks the manifest does not have yet.
+    """
+    from models import VoiceGenerationStatus
+
+    resumed = 0
+    for manifest in manifests:
+        track_id, voice = manifest.track_id, manifest.voice
+        lock_key = f"{track_id}:{voice}"
+        try:
+            async with async_session() as db:
+                res = await db.execute(
+                    select(VoiceGenerationStatus).where(
+                        and_(
+                            VoiceGenerationStatus.track_id == track_id,
+                            VoiceGenerationStatus.voice_id == voice
+                        )
+                    )
+                )
+                voice_status = res.scalar_one_or_none()
+                track = await db.get(Track, track_id)
+                user = await db.get(User, manifest.user_id)
+                text_content = None
+                if manifest.kind != "voice_switch" and track:
+                    text_content = await text_storage_service.get_source_text(track_id, db, bypass_cache=True)
+
+            still_locked = voice_status is not None and voice_status.status == 'generating'
+            if not still_locked or not track or not user or (manifest.kind != "voice_switch" and not text_content):
+                logger.info(f"Not resuming TTS job {lock_key} ({manifest.kind}): lock, track, user or text is gone")
+                await manifest.discard()
+                await armtree(manifest.session_dir)
+                continue
+
+            enhanced_voice_tts_service.start_user_generation(user.id, track_id, voice)
+            enhanced_voice_tts_service.voice_switch_progress[lock_key] = {
+                'status': 'processing',
+                'progress': 5,
+                'phase': 'resuming',
+                'message': f'Resuming after restart ({manifest.completed_count} chunks kept)...',
+                'start_time': time.time(),
+                'user_id': user.id,
+                'chunks_completed': manifest.completed_count,
+                'total_chunks': manifest.total_chunks or 0
+            }
+
+            title = manifest.params.get('title') or track.title
+            if manifest.kind == "voice_switch":
+                worker = process_voice_switch_with_cleanup(
+                    track_id=track_id,
+                    old_voice=getattr(track, 'default_voice', None),
+                    new_voice=voice,
+                    user_id=user.id,
+                    lock_key=lock_key,
+                    user=user,
+                    lock_already_held=True,
+                    resume_session_dir=manifest.session_dir
+                )
+            elif manifest.kind == "regenerate":
+                worker = regenerate_tts_track_content(
+                    track_id=track_id,
+                    title=title,
+                    text_content=text_content,
+                    voice=voice,
+                    user_id=user.id,
+                    lock_already_held=True,
+                    resume_session_dir=manifest.session_dir
+                )
+            else:
+                worker = process_enhanced_voice_tts_track(
+                    track_id=track_id,
+                    title=title,
+                    text_content=text_content,
+                    voice=voice,
+                    user_id=user.id,
+                    lock_already_held=True,
+                    resume_session_dir=manifest.session_dir
+                )
+
+            task = asyncio.create_task(worker, name=f"tts_resume_{track_id}_{voice}")
+            _RESUMED_TTS_JOBS.add(task)
+            task.add_done_callback(_resumed_job_done)
+            resumed += 1
+            logger.info(
+                f"Resuming TTS job {lock_key} ({manifest.kind}): "
+                f"{manifest.completed_count}/{manifest.total_chunks or '?'} chunks on disk"
+            )
+        except Exception as e:
+            logger.error(f"Failed to resume TTS job {lock_key}: {e}", exc_info=True)
+
+    return resumed
+
 __all__ = ['router']
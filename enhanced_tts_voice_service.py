@@ -17,26 +17,37 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, desc, and_, or_, text, select, delete
 from datetime import datetime, timezone
 from models import Track, TTSTextSegment, TTSWordTiming, TTSTrackMeta, AvailableVoice, User
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
 from collections import deque
 import json
 import re
 import time
 import random
 from text_storage_service import text_storage_service, TextStorageError
+from progressive_hls import ProgressiveHLSSession
+from audio_frame_parser import AudioFrameCounter
+from mp3_concat import concat_mp3_files
+from tts_chunk_cache import tts_chunk_cache
+from tts_job_manifest import TTSJobManifest, TTS_SESSION_ROOT
+from tts_chunk_scheduler import ChunkLaneScheduler, BulkChunkScheduler
+from word_timing_merge import WordTimingMerger
+from tts_voice_fanout import VoiceFanOut
 from track_status_manager import TrackStatusManager
 import gc
+import hashlib
 import psutil
 
 # Import Redis state manager for multi-container support
 from redis_state.state_manager import RedisStateManager
+from redis_state.async_state_manager import AsyncRedisStateManager
+from adaptive_concurrency import edge_tts_concurrency, classify_failure
 
 logger = logging.getLogger(__name__)
 
 # ===========================
 # GLOBAL POOL CONFIGURATION
 # ===========================
-GLOBAL_MAX_CHUNK_SLOTS = 30        # system-wide concurrent Edge TTS limit
+GLOBAL_MAX_CHUNK_SLOTS = edge_tts_concurrency.limit  # starting Edge TTS limit; AIMD moves it at runtime
 PER_USER_HARD_CAP = 6             # max workers per user
 
 if PER_USER_HARD_CAP > GLOBAL_MAX_CHUNK_SLOTS:
@@ -45,7 +56,6 @@ if PER_USER_HARD_CAP > GLOBAL_MAX_CHUNK_SLOTS:
         f"cannot exceed GLOBAL_MAX_CHUNK_SLOTS ({GLOBAL_MAX_CHUNK_SLOTS})"
     )
 
-EDGE_TTS_SEMAPHORE = asyncio.Semaphore(GLOBAL_MAX_CHUNK_SLOTS)
 FFMPEG_SEMAPHORE   = asyncio.Semaphore(6)
 
 
@@ -229,6 +239,8 @@ class UserJobManager:
         """
         Register a new job for a user.
         First job for a user adds that user to the GLOBAL limiter.
+        A job whose info names a slot_job_id (a bulk series chapter) is only
+        tracked; its chunks take their slots from that job, so it gets no quota.
         """
         new_user = False
         async with self._lock:
@@ -254,7 +266,8 @@ class UserJobManager:
 
         # Add the job at per-user level
         limiter = await self._get_user_limiter(user_id)
-        await limiter.add_job(job_id)
+        if not meta.get("slot_job_id"):
+            await limiter.add_job(job_id)
 
         # Recompute both levels
         await self._recompute_fair_distribution()
@@ -365,6 +378,16 @@ class UserJobManager:
             async with limiter.slot(job_id):
                 yield
 
+    async def find_jobs_for_track(self, track_id: str) -> List[Tuple[int, str]]:
+        """(user_id, job_id) of every active job generating track_id"""
+        async with self._lock:
+            return [
+                (uid, jid)
+                for uid, jobs in self._user_jobs.items()
+                for jid, info in jobs.items()
+                if info.get("track_id") == track_id
+            ]
+
     async def get_user_status(self, user_id: int) -> Dict:
         """Return a snapshot of one user's limiter + job info."""
         async with self._lock:
@@ -404,6 +427,7 @@ class UserJobManager:
         status = {
             "max_slots": self.global_limiter.max_slots,
             "available_slots": self.global_limiter.available_slots,
+            "edge_tts_concurrency": edge_tts_concurrency.get_stats(),
             "active_users": len(active_users),
             "active_jobs": total_active_jobs,
             "is_oversubscribed": len(active_users) > self.global_limiter.max_slots,
@@ -444,6 +468,21 @@ CHUNK_BATCH_SIZE = 10
 MAX_WORKERS_PER_JOB = PER_USER_HARD_CAP  # Workers scale with user pool allocation
 GC_FREQUENCY = 5  # Run GC every N chunks per worker
 GC_THRESHOLD_PERCENT = 75  # Only run GC if memory > this %
+BULK_SYNTHESIS_WINDOW = int(os.getenv('TTS_BULK_SYNTHESIS_WINDOW', '3'))  # bulk chapters synthesizing at once
+BULK_PLAYABLE_POLL_SECONDS = 1.0
+BULK_PLAYABLE_TIMEOUT = float(os.getenv('TTS_BULK_PLAYABLE_TIMEOUT', '1800'))  # stop waiting for a chapter's HLS
+
+def _voice_stream_playable(voice_stream_dir: Path, variant_name: str) -> bool:
+    """Blocking; master playlist in place and a variant that lists segments (finished VOD or progressive EVENT)"""
+    try:
+        if not (voice_stream_dir / "master.m3u8").exists():
+            return False
+        content = (voice_stream_dir / variant_name / "playlist.m3u8").read_text()
+    except OSError:
+        return False
+    if '#EXTINF' not in content:
+        return False
+    return '#EXT-X-ENDLIST' in content or '#EXT-X-PLAYLIST-TYPE:EVENT' in content
 
 # Async/sync compatibility helpers
 def _is_async(db) -> bool:
@@ -534,7 +573,7 @@ class EnhancedVoiceAwareTTSService:
     """Enhanced TTS service with streaming, bounded concurrency, and optimal memory usage"""
     
     def __init__(self):
-        self.temp_dir = Path("/tmp/media_storage/tts")
+        self.temp_dir = TTS_SESSION_ROOT
         self.temp_dir.mkdir(exist_ok=True)
 
         # REPLACED: In-memory dicts with Redis for multi-container support
@@ -543,6 +582,8 @@ class EnhancedVoiceAwareTTSService:
 
         # Initialize Redis state manager for TTS operations
         self.tts_state = RedisStateManager("tts")
+        # Non-blocking view of the same keys for coroutines on the hot path
+        self.async_tts_state = AsyncRedisStateManager("tts", container_id=self.tts_state.container_id)
         
         self.max_words_per_chunk = 320
         self.min_words_per_chunk = 120
@@ -550,6 +591,7 @@ class EnhancedVoiceAwareTTSService:
         
         self.max_concurrent_chunks_per_user = PER_USER_HARD_CAP
         self.user_job_manager = UserJobManager(max_per_user=PER_USER_HARD_CAP)
+        edge_tts_concurrency.add_listener(self._on_edge_tts_limit_change)
         
         self.max_retry_attempts = 3
         self.initial_retry_delay = 1.0
@@ -560,6 +602,7 @@ class EnhancedVoiceAwareTTSService:
         self.max_concurrent_per_creator = 5
         
         self.text_service = text_storage_service
+        self._chunk_plan_locks: Dict[str, asyncio.Lock] = {}
 
         # REPLACED: In-memory bulk job tracking with Redis
         # self.bulk_jobs: Dict[str, Dict] = {}
@@ -573,8 +616,16 @@ class EnhancedVoiceAwareTTSService:
         self._memory_check_interval = 50
         self._operation_count = 0
 
+        # Set by the app lifespan: only then is a cancelled job kept for resume
+        self._shutting_down = False
+
         logger.info("EnhancedVoiceAwareTTSService initialized with Redis state management")
 
+    async def _on_edge_tts_limit_change(self, new_limit: int):
+        """AIMD moved the Edge TTS ceiling: resize GLOBAL and re-split it across users"""
+        await self.user_job_manager.global_limiter.update_max_slots(new_limit)
+        await self.user_job_manager._recompute_fair_distribution()
+
     # ===== Redis-Backed State Properties (Backward Compatibility) =====
 
     @property
@@ -735,6 +786,37 @@ class EnhancedVoiceAwareTTSService:
 
         return RedisCancelledJobs(self.tts_state)
 
+    # ===== Async accessors (same Redis keys as the properties above) =====
+
+    async def get_voice_switch_progress(self, lock_key: str) -> Optional[Dict]:
+        """Voice switch progress for 'track_id:voice_id' or None"""
+        return await self.async_tts_state.get_progress(f"voice_switch:{lock_key}")
+
+    async def is_job_cancelled(self, job_id: str) -> bool:
+        return await self.async_tts_state.is_in_set("cancelled_jobs", job_id)
+
+    @property
+    def shutting_down(self) -> bool:
+        return self._shutting_down
+
+    def begin_shutdown(self):
+        """Called by the app lifespan before workers are torn down"""
+        self._shutting_down = True
+        logger.info("TTS service shutting down: cancelled jobs keep their sessions for resume")
+
+    async def _is_interrupted(self, job_id: str, manifest: Optional[TTSJobManifest]) -> bool:
+        """
+        Cancelled by an app shutdown rather than by the user: keep the session,
+        manifest and 'generating' lock for the resume. Any other cancellation
+        cleans up like a failure.
+        """
+        if manifest is None or not self._shutting_down:
+            return False
+        try:
+            return not await self.is_job_cancelled(job_id)
+        except Exception:
+            return True
+
     # ===== End Compatibility Properties =====
 
     async def _check_and_cleanup_memory(self):
@@ -751,13 +833,15 @@ class EnhancedVoiceAwareTTSService:
         return f"{user.id}_{uuid.uuid4().hex[:8]}"
 
     @asynccontextmanager
-    async def tts_job(self, user: User, track_id: str, voice_id: str):
+    async def tts_job(self, user: User, track_id: str, voice_id: str, slot_job_id: Optional[str] = None):
+        """slot_job_id: draw chunk slots from that (bulk) job instead of getting a quota"""
         job_id = self._generate_job_id(user)
         job_info = {
             'track_id': track_id,
             'voice_id': voice_id,
             'user_id': user.id,
-            'is_creator': user.is_creator
+            'is_creator': user.is_creator,
+            'slot_job_id': slot_job_id
         }
         
         await self.user_job_manager.add_job(user.id, job_id, job_info)
@@ -765,8 +849,9 @@ class EnhancedVoiceAwareTTSService:
         try:
             yield job_id
             await self.user_job_manager.remove_job(user.id, job_id, success=True)
-        except Exception as e:
-            logger.error(f"Job {job_id} failed: {str(e)}")
+        except BaseException as e:
+            # BaseException: a cancelled job must release its limiter registration too
+            logger.error(f"Job {job_id} failed: {e!r}")
             await self.user_job_manager.remove_job(user.id, job_id, success=False)
             raise
 
@@ -803,6 +888,9 @@ class EnhancedVoiceAwareTTSService:
                 "started_at": meta.get("started_at"),
                 "completed_at": meta.get("completed_at"),
                 "eta_seconds": eta_seconds,
+                "first_playable_track_id": meta.get("first_playable_track_id"),
+                "first_playable_seconds": meta.get("first_playable_seconds"),
+                "makespan_seconds": meta.get("makespan_seconds"),
                 "user_id": meta.get("user_id"),
             }
 
@@ -906,6 +994,33 @@ class EnhancedVoiceAwareTTSService:
                 yield ' '.join(current_chunk)
 
 
+    def _chunk_plan_key(self, text: str) -> str:
+        splitter = f"{self.max_words_per_chunk}:{self.min_words_per_chunk}:"
+        return hashlib.sha256((splitter + text).encode('utf-8')).hexdigest()
+
+    async def get_chunk_plan(self, track_id: str, text: str) -> List[str]:
+        """
+        Chunk split of a track's source text, computed once and stored next to it.
+        Every voice of a track synthesizes the same chunks, so later voices (and
+        all voices of a fan-out) reuse the stored plan instead of re-splitting.
+        """
+        plan_key = await anyio.to_thread.run_sync(self._chunk_plan_key, text)
+        lock = self._chunk_plan_locks.setdefault(track_id, asyncio.Lock())
+        async with lock:
+            try:
+                plan = await self.text_service.get_chunk_plan(track_id, plan_key)
+            except TextStorageError:
+                plan = None
+            if plan is not None:
+                return plan
+
+            plan = [chunk async for chunk in self._split_text_into_chunks(text)]
+            try:
+                await self.text_service.store_chunk_plan(track_id, plan_key, plan)
+            except Exception as e:
+                logger.warning(f"Could not store chunk plan for {track_id}: {e}")
+            return plan
+
     def _natural_chunk_split(self, text: str, max_words_per_chunk: int, min_words_per_chunk: int) -> List[str]:
         """Synchronous chunk splitting - called in thread pool"""
         chunks: List[str] = []
@@ -1373,7 +1488,7 @@ class EnhancedVoiceAwareTTSService:
             try:
                 await asyncio.sleep(0.15)
 
-                async with EDGE_TTS_SEMAPHORE:
+                async with edge_tts_concurrency.request():
                     t0 = time.time()
 
                     # Keep the exact casing that works in your 7.2.1 env
@@ -1393,6 +1508,7 @@ class EnhancedVoiceAwareTTSService:
                     word_boundaries: List[Dict] = []
                     tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
                     file_size = 0
+                    frame_counter = AudioFrameCounter()
 
                     async with aiofiles.open(tmp_path, "wb") as f:
                         async for ev in communicate.stream():
@@ -1405,6 +1521,7 @@ class EnhancedVoiceAwareTTSService:
                                 if data:
                                     await f.write(data)
                                     file_size += len(data)
+                                    frame_counter.feed(data)
 
                             elif ev_type == "WordBoundary":
                                 start = ev["offset"] / 10_000_000
@@ -1436,7 +1553,11 @@ class EnhancedVoiceAwareTTSService:
                             await _aunlink(output_path)
                         await _arename(tmp_path, output_path)
 
-                    actual_duration = await self._measure_audio_duration(output_path)
+                    # Duration from MP3 frame headers seen while streaming; ffprobe only if unparseable
+                    if frame_counter.finish().is_valid:
+                        actual_duration = frame_counter.duration
+                    else:
+                        actual_duration = await self._measure_audio_duration(output_path)
                     if actual_duration <= 0:
                         raise RuntimeError(f"Duration measurement failed for chunk {chunk_index}")
 
@@ -1495,7 +1616,10 @@ class EnhancedVoiceAwareTTSService:
                     "service unavailable", "connection", "timeout", "temporary",
                     "busy", "overload", "tls", "reset by peer"
                 ]
-                is_retryable = any(k in msg for k in retryable_markers)
+                is_retryable = (
+                    any(k in msg for k in retryable_markers)
+                    or classify_failure(e) in ("throttle", "timeout")
+                )
 
                 if is_retryable and attempt < self.max_retry_attempts - 1:
                     base = self.initial_retry_delay * (self.retry_backoff_multiplier ** attempt)
@@ -1557,17 +1681,32 @@ class EnhancedVoiceAwareTTSService:
         user: User,
         job_id: str,
         progress_callback=None,
-        lock_key: Optional[str] = None
+        lock_key: Optional[str] = None,
+        chunk_sink=None,
+        manifest: Optional[TTSJobManifest] = None,
+        plan: Optional[List[str]] = None,
+        scheduler: Optional[ChunkLaneScheduler] = None,
+        lane_key: Optional[str] = None,
+        timing_merger: Optional[WordTimingMerger] = None
     ) -> Tuple[List[Path], float, Path]:
         """
         MODIFIED: Dynamic worker count based on job's allocated quota.
         Workers scale with user pool size (determined by fair limiter).
+        chunk_sink(index, path) is awaited as each chunk file is finished (any order).
+        With a manifest, chunks it already records are reused and new ones are recorded.
+        plan is the precomputed chunk split of the text (see get_chunk_plan); with a
+        scheduler (fan-out, bulk series), the plan runs as one lane of its shared queue.
+        timing_merger is handed each chunk's timing shard as soon as it exists.
         """
         try:
             text_content = chunks
             track_id = session_dir.name.split('_')[1] if '_' in session_dir.name else "unknown"
+            if scheduler and plan is None:
+                plan = [chunk async for chunk in self._split_text_into_chunks(text_content)]
+            lane_key = lane_key or f"{track_id}:{voice}"
+            slot_job_id = (scheduler.slot_job_id if scheduler else None) or job_id
             
-            estimated_chunks = max(1, len(text_content) // 2400)
+            estimated_chunks = len(plan) if plan is not None else max(1, len(text_content) // 2400)
             
             # ✅ Get job's actual allocated quota from limiter
             user_limiter = await self.user_job_manager._get_user_limiter(user.id)
@@ -1590,10 +1729,15 @@ class EnhancedVoiceAwareTTSService:
             
             async def producer():
                 chunk_index = 0
-                async for chunk_text in self._split_text_into_chunks(text_content):
-                    await chunk_queue.put((chunk_index, chunk_text))
-                    chunk_index += 1
-                    del chunk_text
+                if plan is not None:
+                    for chunk_text in plan:
+                        await chunk_queue.put((chunk_index, chunk_text))
+                        chunk_index += 1
+                else:
+                    async for chunk_text in self._split_text_into_chunks(text_content):
+                        await chunk_queue.put((chunk_index, chunk_text))
+                        chunk_index += 1
+                        del chunk_text
                 
                 # ✅ Send None signals based on actual worker count
                 for _ in range(worker_count):
@@ -1601,114 +1745,147 @@ class EnhancedVoiceAwareTTSService:
                 
                 return chunk_index
             
-            producer_task = asyncio.create_task(producer())
-
             results = []
             results_lock = asyncio.Lock()
             total_chunks_ref = [0]
 
-            async def worker(worker_id: int):
+            async def process_chunk(chunk_index: int, chunk_text: str, worker_id: int):
                 nonlocal completed_chunks, failed_chunks
-                processed_count = 0
 
-                while True:
-                    item = await chunk_queue.get()
-                    
-                    if item is None:
-                        break
-                    
-                    chunk_index, chunk_text = item
-
-                    if job_id in self._cancelled_jobs:
-                        raise asyncio.CancelledError(f"Job {job_id} was cancelled")
+                if await self.is_job_cancelled(job_id):
+                    raise asyncio.CancelledError(f"Job {job_id} was cancelled")
 
-                    chunk_start = time.time()
+                chunk_start = time.time()
+                chunk_file = session_dir / f"chunk_{chunk_index:04d}_{voice}.mp3"
 
-                    async with self.user_job_manager.slot(user.id, job_id):
-                        if job_id in self._cancelled_jobs:
-                            raise asyncio.CancelledError(f"Job {job_id} was cancelled")
+                # Finished before a restart, or same text + voice synthesized before:
+                # reuse it without taking a slot
+                resumed = await manifest.completed_chunk(chunk_index, chunk_text) if manifest else None
+                cached = resumed or await tts_chunk_cache.fetch(chunk_text, voice, chunk_file, chunk_index)
 
-                        try:
-                            chunk_file = session_dir / f"chunk_{chunk_index:04d}_{voice}.mp3"
+                async with (nullcontext() if cached else self.user_job_manager.slot(user.id, slot_job_id)):
+                    if await self.is_job_cancelled(job_id):
+                        raise asyncio.CancelledError(f"Job {job_id} was cancelled")
 
+                    try:
+                        if cached:
+                            duration, timings_path, file_size = cached
+                        else:
                             duration, timings_path, file_size = await self._generate_chunk_audio_to_file(
                                 chunk_text=chunk_text,
                                 voice=voice,
                                 output_path=chunk_file,
                                 chunk_index=chunk_index
                             )
+                            await tts_chunk_cache.store(chunk_text, voice, chunk_file, timings_path)
+
+                        if manifest and not resumed:
+                            await manifest.record_chunk(
+                                chunk_index, chunk_text, chunk_file, timings_path, duration, file_size
+                            )
 
-                            chunk_time = time.time() - chunk_start
-                            completed_chunks += 1
-                            processed_count += 1
+                        if timing_merger:
+                            await timing_merger.add_chunk(chunk_index, timings_path)
 
-                            del chunk_text
-                            await asyncio.sleep(0)
+                        if chunk_sink:
+                            await chunk_sink(chunk_index, chunk_file)
 
-                            if total_chunks_ref[0] > 0:
-                                progress_pct = completed_chunks / total_chunks_ref[0]
-                                elapsed = time.time() - generation_start
-                                avg_per_chunk = elapsed / completed_chunks
-                                eta = avg_per_chunk * (total_chunks_ref[0] - completed_chunks)
+                        chunk_time = time.time() - chunk_start
+                        completed_chunks += 1
+
+                        del chunk_text
+                        await asyncio.sleep(0)
+
+                        if total_chunks_ref[0] > 0:
+                            progress_pct = completed_chunks / total_chunks_ref[0]
+                            elapsed = time.time() - generation_start
+                            avg_per_chunk = elapsed / completed_chunks
+                            eta = avg_per_chunk * (total_chunks_ref[0] - completed_chunks)
                                 
-                                if chunk_index % 5 == 0 or chunk_index < 3:
-                                    logger.info(
-                                        f"TTS [{track_id}] {completed_chunks}/{total_chunks_ref[0]} ({int(progress_pct*100)}%) | "
-                                        f"ETA: {int(eta)}s | Worker-{worker_id}"
-                                    )
-
-                            if progress_callback:
-                                progress_callback(completed_chunks, total_chunks_ref[0] or estimated_chunks)
-
-                            if lock_key and total_chunks_ref[0] > 0:
-                                chunk_progress = 20 + (60 * completed_chunks / total_chunks_ref[0])
-                                self._update_voice_progress(
-                                    lock_key,
-                                    chunk_progress,
-                                    'generating',
-                                    f'Generated {completed_chunks}/{total_chunks_ref[0]} chunks...',
-                                    chunks_completed=completed_chunks,
-                                    total_chunks=total_chunks_ref[0]
+                            if chunk_index % 5 == 0 or chunk_index < 3:
+                                logger.info(
+                                    f"TTS [{track_id}] {completed_chunks}/{total_chunks_ref[0]} ({int(progress_pct*100)}%) | "
+                                    f"ETA: {int(eta)}s | Worker-{worker_id}"
                                 )
 
-                            async with results_lock:
-                                results.append({
-                                    'index': chunk_index,
-                                    'file': chunk_file,
-                                    'duration': duration,
-                                    'timings_path': timings_path,
-                                    'size': file_size
-                                })
+                        if progress_callback:
+                            await progress_callback(completed_chunks, total_chunks_ref[0] or estimated_chunks)
+
+                        if lock_key and total_chunks_ref[0] > 0:
+                            chunk_progress = 20 + (60 * completed_chunks / total_chunks_ref[0])
+                            await self._update_voice_progress(
+                                lock_key,
+                                chunk_progress,
+                                'generating',
+                                f'Generated {completed_chunks}/{total_chunks_ref[0]} chunks...',
+                                chunks_completed=completed_chunks,
+                                total_chunks=total_chunks_ref[0]
+                            )
 
-                            if processed_count % GC_FREQUENCY == 0:
-                                collected, mem_pct = await _force_garbage_collection()
-                                if collected > 0:
-                                    logger.debug(f"Worker-{worker_id}: GC freed {collected} objects (mem: {mem_pct:.1f}%)")
+                        async with results_lock:
+                            results.append({
+                                'index': chunk_index,
+                                'file': chunk_file,
+                                'duration': duration,
+                                'timings_path': timings_path,
+                                'size': file_size
+                            })
 
-                        except asyncio.CancelledError:
-                            raise
-                        except Exception as chunk_error:
-                            failed_chunks += 1
-                            logger.error(f"Chunk {chunk_index} FAILED: {str(chunk_error)}")
-                            raise
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as chunk_error:
+                        failed_chunks += 1
+                        logger.error(f"Chunk {chunk_index} FAILED: {str(chunk_error)}")
+                        raise
+
+            async def worker(worker_id: int):
+                processed_count = 0
+
+                while True:
+                    item = await chunk_queue.get()
+                    
+                    if item is None:
+                        break
+                    
+                    await process_chunk(item[0], item[1], worker_id)
+                    processed_count += 1
+
+                    if processed_count % GC_FREQUENCY == 0:
+                        collected, mem_pct = await _force_garbage_collection()
+                        if collected > 0:
+                            logger.debug(f"Worker-{worker_id}: GC freed {collected} objects (mem: {mem_pct:.1f}%)")
 
                 logger.info(f"Worker-{worker_id} finished, processed {processed_count} chunks")
 
-            # ✅ Spawn dynamic number of workers based on quota
-            workers = [
-                asyncio.create_task(worker(i), name=f"chunk_worker_{i}")
-                for i in range(worker_count)
-            ]
+            # ✅ Spawn dynamic number of workers based on quota; a scheduler lane
+            # contributes the same count to the shared pool instead
+            producer_task = None
+            workers = []
+            if not scheduler:
+                producer_task = asyncio.create_task(producer())
+                workers = [
+                    asyncio.create_task(worker(i), name=f"chunk_worker_{i}")
+                    for i in range(worker_count)
+                ]
 
             try:
-                total_chunks = await producer_task
-                total_chunks_ref[0] = total_chunks
-                logger.info(f"TTS [{track_id}]: Producer finished, {total_chunks} chunks total")
-                
-                await asyncio.gather(*workers)
+                if scheduler:
+                    total_chunks = len(plan)
+                    total_chunks_ref[0] = total_chunks
+                    if manifest:
+                        await manifest.set_total_chunks(total_chunks)
+                    await scheduler.run_lane(lane_key, plan, process_chunk, worker_count)
+                else:
+                    total_chunks = await producer_task
+                    total_chunks_ref[0] = total_chunks
+                    if manifest:
+                        await manifest.set_total_chunks(total_chunks)
+                    logger.info(f"TTS [{track_id}]: Producer finished, {total_chunks} chunks total")
+                    
+                    await asyncio.gather(*workers)
 
                 if lock_key:
-                    self._update_voice_progress(
+                    await self._update_voice_progress(
                         lock_key,
                         80,
                         'concatenating',
@@ -1719,6 +1896,8 @@ class EnhancedVoiceAwareTTSService:
 
             except asyncio.CancelledError:
                 logger.warning(f"TTS-CANCELLED [{track_id}]")
+                if await self._is_interrupted(job_id, manifest):
+                    raise  # shutdown: finished chunks stay for the resume
                 for i in range(total_chunks_ref[0] or estimated_chunks):
                     chunk_file = session_dir / f"chunk_{i:04d}_{voice}.mp3"
                     if await _aexists(chunk_file):
@@ -1743,12 +1922,14 @@ class EnhancedVoiceAwareTTSService:
                     if not w.done():
                         w.cancel()
                 await asyncio.gather(*workers, return_exceptions=True)
+                if producer_task and not producer_task.done():
+                    producer_task.cancel()
 
             results.sort(key=lambda x: x['index'])
             chunk_files = [r['file'] for r in results]
 
             if lock_key:
-                self._update_voice_progress(
+                await self._update_voice_progress(
                     lock_key,
                     85,
                     'organizing',
@@ -1763,7 +1944,7 @@ class EnhancedVoiceAwareTTSService:
             for idx, result in enumerate(results):
                 if lock_key and idx % 10 == 0:
                     timing_progress = 85 + (5 * idx / len(results))
-                    self._update_voice_progress(
+                    await self._update_voice_progress(
                         lock_key,
                         timing_progress,
                         'organizing',
@@ -1785,7 +1966,7 @@ class EnhancedVoiceAwareTTSService:
                     await _force_garbage_collection()
 
             if lock_key:
-                self._update_voice_progress(
+                await self._update_voice_progress(
                     lock_key,
                     90,
                     'finalizing',
@@ -1796,7 +1977,7 @@ class EnhancedVoiceAwareTTSService:
             speed_ratio = total_duration / generation_time if generation_time > 0 else 0
 
             if lock_key:
-                self._update_voice_progress(
+                await self._update_voice_progress(
                     lock_key,
                     95,
                     'finalizing',
@@ -1820,7 +2001,7 @@ class EnhancedVoiceAwareTTSService:
                 )
 
             if lock_key:
-                self._update_voice_progress(
+                await self._update_voice_progress(
                     lock_key,
                     100,
                     'complete',
@@ -1837,13 +2018,112 @@ class EnhancedVoiceAwareTTSService:
             raise
 
 
+    async def _generate_and_assemble_audio(
+        self,
+        text_content: str,
+        track_id: str,
+        voice: str,
+        session_dir: Path,
+        final_audio_path: Path,
+        user: User,
+        job_id: str,
+        progress_callback=None,
+        lock_key: Optional[str] = None,
+        manifest: Optional[TTSJobManifest] = None,
+        plan: Optional[List[str]] = None,
+        scheduler: Optional[ChunkLaneScheduler] = None,
+        timing_merger: Optional[WordTimingMerger] = None
+    ) -> Tuple[List[Path], float, Path, int]:
+        """
+        Generate all chunks and build final_audio_path.
+        When the voice has no stream yet, chunks are segmented into an EVENT playlist
+        while generation runs (progressive_hls); otherwise, or if that fails, the
+        chunks are spliced afterwards (mp3_concat, ffmpeg only if their formats
+        differ) and HLS is prepared from the final MP3.
+        timing_merger packs the word timings while the chunks are generated.
+        """
+        progressive = None
+        if ProgressiveHLSSession.can_start(track_id, voice):
+            progressive = ProgressiveHLSSession(track_id, voice, final_audio_path)
+            try:
+                await progressive.start()
+            except Exception as start_error:
+                logger.warning(f"Progressive HLS unavailable for {track_id} ({voice}): {start_error}")
+                await progressive.abort()
+                progressive = None
+
+        try:
+            chunk_files, total_duration, timings_dir = await self._generate_chunks_in_parallel(
+                chunks=text_content,
+                voice=voice,
+                session_dir=session_dir,
+                user=user,
+                job_id=job_id,
+                progress_callback=progress_callback,
+                lock_key=lock_key,
+                chunk_sink=progressive.add_chunk if progressive else None,
+                manifest=manifest,
+                plan=plan,
+                scheduler=scheduler,
+                lane_key=f"{track_id}:{voice}",
+                timing_merger=timing_merger
+            )
+        except (Exception, asyncio.CancelledError):
+            if progressive:
+                await progressive.abort()
+            raise
+
+        final_size = None
+        if progressive:
+            try:
+                final_size = await progressive.finish(len(chunk_files))
+            except Exception as finish_error:
+                logger.error(f"Progressive HLS failed, falling back to concat: {track_id} ({voice}): {finish_error}")
+                await progressive.abort()
+
+        if final_size is None:
+            spliced = await anyio.to_thread.run_sync(concat_mp3_files, chunk_files, final_audio_path)
+            if spliced:
+                final_size = spliced.size
+                if timing_merger:
+                    total_duration = await anyio.to_thread.run_sync(timing_merger.align, spliced.chunk_durations)
+                else:
+                    total_duration = await anyio.to_thread.run_sync(
+                        self._align_shard_durations, timings_dir, spliced.chunk_durations
+                    )
+                logger.info(
+                    f"TTS-SPLICE [{track_id}]: {len(chunk_files)} chunks, {spliced.frames} frames, "
+                    f"{total_duration:.1f}s, {final_size / 1024 / 1024:.1f} MiB"
+                )
+            else:
+                final_size = await self._concatenate_audio_files(chunk_files, final_audio_path, voice)
+
+        return chunk_files, total_duration, timings_dir, final_size
+
+    @staticmethod
+    def _align_shard_durations(timings_dir: Path, durations: List[float]) -> float:
+        """
+        Make each timing shard's duration the frame-accurate one of its spliced
+        chunk (shards measured by ffprobe may be off), so merged word offsets
+        line up with the final MP3. Blocking; returns the total duration.
+        """
+        for index, duration in enumerate(durations):
+            shard_path = timings_dir / f"chunk_{index:04d}.json"
+            shard = json.loads(shard_path.read_text())
+            if abs(float(shard.get("duration", 0.0)) - duration) > 0.0005:
+                shard["duration"] = duration
+                tmp_path = shard_path.with_suffix(".json.tmp")
+                tmp_path.write_text(json.dumps(shard))
+                os.replace(tmp_path, shard_path)
+        return sum(durations)
+
     async def _concatenate_audio_files(
         self, 
         chunk_files: List[Path], 
         output_path: Path,
         voice: str
     ) -> int:
-        """Concatenate audio files using ffmpeg"""
+        """Concatenate audio files using ffmpeg (chunks that cannot be spliced byte-wise)"""
         try:
             missing_files = []
             for i, chunk_file in enumerate(chunk_files):
@@ -2390,8 +2670,29 @@ class EnhancedVoiceAwareTTSService:
         logger.info(f"BULK-COMPLETE: Created {split_count} tracks for {base_track_id}, returning {len(tracks_data)} in response")
         
         return response
+    async def _update_bulk_job(self, bulk_queue_id: str, increments: Optional[Dict[str, int]] = None, **fields) -> Optional[Dict]:
+        """
+        Read-modify-write of a bulk job's Redis record. Editing the dict that
+        bulk_jobs[...] returns only changes a local copy.
+        """
+        async with self._bulk_lock:
+            meta = await self.async_tts_state.get_session(f"bulk_job:{bulk_queue_id}")
+            if meta is None:
+                return None
+            for key, amount in (increments or {}).items():
+                meta[key] = int(meta.get(key, 0) or 0) + amount
+            meta.update(fields)
+            await self.async_tts_state.create_session(f"bulk_job:{bulk_queue_id}", meta, ttl=7200)
+            return meta
+
     async def _process_bulk_queue(self, bulk_queue_id: str, track_jobs: List[Dict], db, user: User):
-        """Process bulk TTS queue with memory optimization"""
+        """
+        Process a bulk series through one BulkChunkScheduler. All chapters' chunks
+        share the user's workers in chapter order (idle workers steal from later
+        chapters), and each chapter is assembled, uploaded and segmented as soon
+        as its own chunks are done. The time to the first playable chapter and
+        the makespan are recorded on the bulk job.
+        """
         from database import AsyncSessionLocal, get_db
         from storage import storage
         from sqlalchemy import select
@@ -2399,157 +2700,56 @@ class EnhancedVoiceAwareTTSService:
 
         logger.info(f"BULK-PROCESS: {bulk_queue_id} | {len(track_jobs)} tracks")
 
-        async with self._bulk_lock:
-            bulk_metadata = self.bulk_jobs.get(bulk_queue_id)
-            if not bulk_metadata:
-                logger.error(f"Bulk queue {bulk_queue_id} not found")
-                return
-            bulk_metadata['status'] = 'processing'
-
-        max_workers = min(
-            len(track_jobs),
-            self.max_concurrent_per_creator if getattr(user, "is_creator", False) else self.max_concurrent_per_user
-        ) or 1
-
-        logger.info(f"BULK-PROCESS: Starting {max_workers} workers")
-
-        job_queue = asyncio.Queue()
-        for job in track_jobs:
-            await job_queue.put(job)
-
-        async def worker(worker_id: int):
-            processed_count = 0
-            
-            while True:
-                try:
-                    track_job = await asyncio.wait_for(job_queue.get(), timeout=1.0)
-                except asyncio.TimeoutError:
-                    if job_queue.empty():
-                        break
-                    continue
+        bulk_metadata = await self._update_bulk_job(bulk_queue_id, status='processing')
+        if not bulk_metadata:
+            logger.error(f"Bulk queue {bulk_queue_id} not found")
+            return
+        bulk_started = float(bulk_metadata.get('started_at') or time.time())
+        first_playable: List[str] = []
+        playable_watchers: Set[asyncio.Task] = set()
+
+        async def record_when_playable(track_id: str, voice: str):
+            """
+            upload_tts_media_with_voice only queues HLS preparation: the chapter is
+            playable once its stream can be served, which this waits for
+            """
+            from hls_streaming import stream_manager
+            voice_stream_dir = stream_manager.segment_dir / track_id / f"voice-{voice}"
+            variant_name = stream_manager.hls_manager.default_bitrate["name"]
+            deadline = time.time() + BULK_PLAYABLE_TIMEOUT
+            while not first_playable and time.time() < deadline:
+                if await anyio.to_thread.run_sync(_voice_stream_playable, voice_stream_dir, variant_name):
+                    if first_playable:
+                        return
+                    first_playable.append(track_id)
+                    first_playable_seconds = round(time.time() - bulk_started, 1)
+                    await self._update_bulk_job(
+                        bulk_queue_id,
+                        first_playable_track_id=track_id,
+                        first_playable_seconds=first_playable_seconds
+                    )
+                    logger.info(f"BULK-FIRST-PLAYABLE: {bulk_queue_id} | {track_id} after {first_playable_seconds}s")
+                    return
+                await asyncio.sleep(BULK_PLAYABLE_POLL_SECONDS)
 
-                track_id = track_job['track_id']
-                voice = track_job['voice']
-                title = track_job['title']
-                album_id = track_job.get('album_id')
+        async def process_track(track_job: Dict, scheduler: BulkChunkScheduler):
+            track_id = track_job['track_id']
+            voice = track_job['voice']
+            title = track_job['title']
+            locked = False
 
+            async def fail_track(error: BaseException):
                 try:
-                    from models import Track
-
-                    async with AsyncSessionLocal() as check_db:
-                        existing = await check_db.get(Track, track_id)
-                        if not existing:
-                            logger.error(f"Track {track_id} not found! Skipping.")
-                            async with self._bulk_lock:
-                                if bulk_queue_id in self.bulk_jobs:
-                                    self.bulk_jobs[bulk_queue_id]['failed_segments'] += 1
-                            continue
-
-                    from status_lock import status_lock
-                    lock_db = next(get_db())
-                    try:
-                        locked, reason = await status_lock.try_lock_voice(
-                            track_id=track_id,
-                            voice_id=voice,
-                            process_type='tts_bulk',
-                            db=lock_db
-                        )
-                        if not locked:
-                            logger.error(f"Could not lock {track_id}: {reason}")
-                            async with self._bulk_lock:
-                                if bulk_queue_id in self.bulk_jobs:
-                                    self.bulk_jobs[bulk_queue_id]['failed_segments'] += 1
-                            continue
-                    finally:
-                        lock_db.close()
-
-                    async with AsyncSessionLocal() as worker_db:
-                        segment_text = await self.text_service.get_source_text(track_id, worker_db)
-                        if not segment_text:
-                            raise ValueError(f"No stored text for {track_id}")
-
+                    async with AsyncSessionLocal() as fail_db:
                         from models import Track as TrackModel
-                        track_obj = await worker_db.get(TrackModel, track_id)
-                        if track_obj:
-                            await TrackStatusManager.mark_generating(track_obj, worker_db, process_type='tts_bulk', voice=voice)
-                            await worker_db.commit()
-
-                        result = await self.create_tts_track_with_voice(
-                            track_id=track_id,
-                            title=title,
-                            text_content=segment_text,
-                            voice=voice,
-                            db=worker_db,
-                            user=user,
-                            bulk_split_count=1,
-                            bulk_series_title=None,
-                            bulk_queue_id=bulk_queue_id
-                        )
-                        
-                        # Free segment text
-                        del segment_text
-                        
-                        if result.get('status') != 'success':
-                            raise ValueError(f"TTS generation failed: {result}")
-
-                        if track_obj:
-                            await TrackStatusManager.mark_segmenting(track_obj, worker_db, voice=voice)
-                            await worker_db.commit()
-
-                        file_url, upload_metadata = await storage.upload_tts_media_with_voice(
-                            audio_file_path=Path(result['audio_file_path']),
-                            track_id=track_id,
-                            voice=voice,
-                            creator_id=user.id,
-                            db=worker_db,
-                            word_timings=None,  # Fixed: Pass None instead of dict
-                            word_timings_path=Path(result.get('word_timings_path')) if result.get('word_timings_path') else None,  # New parameter
-                            session_dir=result.get('session_dir'),
-                            lock_already_held=True  # ✅ TTS worker already holds the lock
-                        )
-                        
-                        tres = await worker_db.execute(select(TrackModel).where(TrackModel.id == track_id))
-                        t = tres.scalar_one_or_none()
-                        if t:
-                            t.file_path = file_url
-                            t.default_voice = voice
-                            t.track_type = 'tts'
-                            t.duration = result['duration']
-                            t.updated_at = datetime.now(timezone.utc)
-                            if upload_metadata and 'voice_directory' in upload_metadata:
-                                t.voice_directory = upload_metadata['voice_directory']
-                            available_voices = getattr(t, 'available_voices', []) or []
-                            if voice not in available_voices:
-                                available_voices.append(voice)
-                                t.available_voices = available_voices
-                            await worker_db.commit()
-
-                    async with self._bulk_lock:
-                        if bulk_queue_id in self.bulk_jobs:
-                            self.bulk_jobs[bulk_queue_id]['completed_segments'] += 1
-
-                    logger.info(f"Track {track_id} done (worker {worker_id})")
-                    processed_count += 1
-                    
-                    # GC every N tracks
-                    if processed_count % GC_FREQUENCY == 0:
-                        collected, mem_pct = await _force_garbage_collection()
-                        if collected > 0:
-                            logger.debug(f"Bulk worker-{worker_id}: GC freed {collected} objects (mem: {mem_pct:.1f}%)")
-
-                except Exception as e:
-                    logger.error(f"Track {track_id} processing failed: {e}")
-
-                    try:
-                        async with AsyncSessionLocal() as fail_db:
-                            from models import Track as TrackModel
-                            track_fail = await fail_db.get(TrackModel, track_id)
-                            if track_fail:
-                                await TrackStatusManager.mark_failed(track_fail, fail_db, e, 'bulk_generation')
-                                await fail_db.commit()
-                    except Exception:
-                        pass
+                        track_fail = await fail_db.get(TrackModel, track_id)
+                        if track_fail:
+                            await TrackStatusManager.mark_failed(track_fail, fail_db, error, 'bulk_generation')
+                            await fail_db.commit()
+                except Exception:
+                    pass
 
+                if locked:
                     from status_lock import status_lock
                     unlock_db = next(get_db())
                     try:
@@ -2557,33 +2757,184 @@ class EnhancedVoiceAwareTTSService:
                     finally:
                         unlock_db.close()
 
-                    async with self._bulk_lock:
-                        if bulk_queue_id in self.bulk_jobs:
-                            self.bulk_jobs[bulk_queue_id]['failed_segments'] += 1
+                await self._update_bulk_job(bulk_queue_id, increments={'failed_segments': 1})
 
+            try:
+                from models import Track
+
+                async with AsyncSessionLocal() as check_db:
+                    existing = await check_db.get(Track, track_id)
+                    if not existing:
+                        logger.error(f"Track {track_id} not found! Skipping.")
+                        await self._update_bulk_job(bulk_queue_id, increments={'failed_segments': 1})
+                        return
+
+                from status_lock import status_lock
+                lock_db = next(get_db())
+                try:
+                    locked, reason = await status_lock.try_lock_voice(
+                        track_id=track_id,
+                        voice_id=voice,
+                        process_type='tts_bulk',
+                        db=lock_db
+                    )
+                    if not locked:
+                        logger.error(f"Could not lock {track_id}: {reason}")
+                        await self._update_bulk_job(bulk_queue_id, increments={'failed_segments': 1})
+                        return
                 finally:
-                    job_queue.task_done()
+                    lock_db.close()
+
+                async with AsyncSessionLocal() as worker_db:
+                    segment_text = await self.text_service.get_source_text(track_id, worker_db)
+                    if not segment_text:
+                        raise ValueError(f"No stored text for {track_id}")
+
+                    from models import Track as TrackModel
+                    track_obj = await worker_db.get(TrackModel, track_id)
+                    if track_obj:
+                        await TrackStatusManager.mark_generating(track_obj, worker_db, process_type='tts_bulk', voice=voice)
+                        await worker_db.commit()
+
+                    result = await self.create_tts_track_with_voice(
+                        track_id=track_id,
+                        title=title,
+                        text_content=segment_text,
+                        voice=voice,
+                        db=worker_db,
+                        user=user,
+                        bulk_split_count=1,
+                        bulk_series_title=None,
+                        bulk_queue_id=bulk_queue_id,
+                        bulk_scheduler=scheduler
+                    )
+                    
+                    # Free segment text
+                    del segment_text
+                    
+                    if result.get('status') != 'success':
+                        raise ValueError(f"TTS generation failed: {result}")
+
+                    if track_obj:
+                        await TrackStatusManager.mark_segmenting(track_obj, worker_db, voice=voice)
+                        await worker_db.commit()
+
+                    file_url, upload_metadata = await storage.upload_tts_media_with_voice(
+                        audio_file_path=Path(result['audio_file_path']),
+                        track_id=track_id,
+                        voice=voice,
+                        creator_id=user.id,
+                        db=worker_db,
+                        word_timings=None,  # Fixed: Pass None instead of dict
+                        word_timings_path=Path(result.get('word_timings_path')) if result.get('word_timings_path') else None,  # New parameter
+                        session_dir=result.get('session_dir'),
+                        lock_already_held=True  # ✅ TTS worker already holds the lock
+                    )
+                    
+                    tres = await worker_db.execute(select(TrackModel).where(TrackModel.id == track_id))
+                    t = tres.scalar_one_or_none()
+                    if t:
+                        t.file_path = file_url
+                        t.default_voice = voice
+                        t.track_type = 'tts'
+                        t.duration = result['duration']
+                        t.updated_at = datetime.now(timezone.utc)
+                        if upload_metadata and 'voice_directory' in upload_metadata:
+                            t.voice_directory = upload_metadata['voice_directory']
+                        available_voices = getattr(t, 'available_voices', []) or []
+                        if voice not in available_voices:
+                            available_voices.append(voice)
+                            t.available_voices = available_voices
+                        await worker_db.commit()
+
+                meta = await self._update_bulk_job(bulk_queue_id, increments={'completed_segments': 1})
+                if not first_playable:
+                    watcher = asyncio.create_task(record_when_playable(track_id, voice))
+                    playable_watchers.add(watcher)
+                    watcher.add_done_callback(playable_watchers.discard)
+
+                logger.info(f"Track {track_id} done (part {track_job['segment_index'] + 1})")
+
+                # GC every N tracks
+                if meta and meta.get('completed_segments', 0) % GC_FREQUENCY == 0:
+                    collected, mem_pct = await _force_garbage_collection()
+                    if collected > 0:
+                        logger.debug(f"Bulk {bulk_queue_id}: GC freed {collected} objects (mem: {mem_pct:.1f}%)")
+
+            except asyncio.CancelledError as e:
+                if self._shutting_down:
+                    raise  # shutdown: the chapter's session and lock stay for the resume
+                logger.warning(f"Track {track_id} cancelled")
+                try:
+                    await fail_track(e)
+                except Exception as cleanup_error:
+                    logger.error(f"Track {track_id} cancel cleanup failed: {cleanup_error}")
+                raise
 
-            logger.info(f"Worker {worker_id} finished, processed {processed_count} tracks")
+            except Exception as e:
+                logger.error(f"Track {track_id} processing failed: {e}")
+                await fail_track(e)
+
+        voice = track_jobs[0]['voice'] if track_jobs else "default"
+        async with self.tts_job(user, bulk_queue_id, voice) as bulk_job_id:
+            scheduler = BulkChunkScheduler(bulk_queue_id, workers=MAX_WORKERS_PER_JOB, slot_job_id=bulk_job_id)
+            window = asyncio.Semaphore(BULK_SYNTHESIS_WINDOW)
+
+            async def run_track(track_job: Dict):
+                """Hold a window slot until the chapter's chunks are done, not until its upload is"""
+                lane_key = f"{track_job['track_id']}:{track_job['voice']}"
+                synthesized = scheduler.expect_lane(lane_key, track_job['segment_index'])
+                pipeline = asyncio.create_task(process_track(track_job, scheduler))
+                waiter = asyncio.create_task(synthesized.wait())
+                try:
+                    await asyncio.wait({pipeline, waiter}, return_when=asyncio.FIRST_COMPLETED)
+                    window.release()
+                    await pipeline
+                except asyncio.CancelledError:
+                    pipeline.cancel()
+                    raise
+                finally:
+                    waiter.cancel()
+                    scheduler.forget_lane(lane_key)
 
-        workers = [asyncio.create_task(worker(i)) for i in range(max_workers)]
-        await job_queue.join()
-        
-        for w in workers:
-            w.cancel()
+            logger.info(
+                f"BULK-PROCESS: {bulk_queue_id} | {MAX_WORKERS_PER_JOB} workers | "
+                f"{BULK_SYNTHESIS_WINDOW} chapters synthesizing at once"
+            )
+            tasks = []
             try:
-                await w
-            except asyncio.CancelledError:
-                pass
-        
-        async with self._bulk_lock:
-            if bulk_queue_id in self.bulk_jobs:
-                meta = self.bulk_jobs[bulk_queue_id]
-                done = meta['completed_segments']
-                fail = meta['failed_segments']
-                meta['status'] = 'completed' if fail == 0 else ('partial_success' if done > 0 else 'failed')
-                meta['completed_at'] = time.time()
-                logger.info(f"BULK-DONE: {bulk_queue_id} | {done} success | {fail} failed")
+                for track_job in sorted(track_jobs, key=lambda j: j['segment_index']):
+                    await window.acquire()
+                    tasks.append(asyncio.create_task(run_track(track_job), name=f"bulk_track_{track_job['track_id']}"))
+                # A chapter cancelled on its own (e.g. track deleted) must not stop the series
+                await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            scheduler_stats = scheduler.get_stats()
+
+        makespan_seconds = round(time.time() - bulk_started, 1)
+        meta = await self._update_bulk_job(
+            bulk_queue_id,
+            completed_at=time.time(),
+            makespan_seconds=makespan_seconds,
+            scheduler={'steals': scheduler_stats['steals'], 'chunks_completed': scheduler_stats['chunks_completed']}
+        )
+        if meta:
+            done = meta.get('completed_segments', 0)
+            fail = meta.get('failed_segments', 0)
+            await self._update_bulk_job(
+                bulk_queue_id,
+                status='completed' if fail == 0 else ('partial_success' if done > 0 else 'failed')
+            )
+            logger.info(
+                f"BULK-DONE: {bulk_queue_id} | {done} success | {fail} failed | "
+                f"first playable {meta.get('first_playable_seconds')}s | makespan {makespan_seconds}s | "
+                f"{scheduler_stats['steals']} steals"
+            )
 
     async def create_tts_track_with_voice(
         self,
@@ -2598,9 +2949,16 @@ class EnhancedVoiceAwareTTSService:
         bulk_series_title: str = None,
         bulk_queue_id: str = None,
         starting_order: int = 0,
-        visibility_status: str = "visible"
+        visibility_status: str = "visible",
+        job_kind: str = "create",
+        resume_session_dir: Optional[Path] = None,
+        bulk_scheduler: Optional[BulkChunkScheduler] = None
     ) -> Dict:
-        """Pure TTS generation - NO status management"""
+        """
+        Pure TTS generation - NO status management.
+        resume_session_dir continues an interrupted job from its manifest.
+        bulk_scheduler runs the chunks as one priority lane of a bulk series.
+        """
         from sqlalchemy import select
 
         if not user:
@@ -2625,8 +2983,10 @@ class EnhancedVoiceAwareTTSService:
                 visibility_status=visibility_status
             )
 
-        async with self.tts_job(user, track_id, voice or "default") as job_id:
+        slot_job_id = bulk_scheduler.slot_job_id if bulk_scheduler else None
+        async with self.tts_job(user, track_id, voice or "default", slot_job_id=slot_job_id) as job_id:
             session_dir = None
+            manifest = None
             start_time = time.time()
 
             current_task = asyncio.current_task()
@@ -2646,14 +3006,32 @@ class EnhancedVoiceAwareTTSService:
                 if validated_voice != voice:
                     voice = validated_voice
 
-                timestamp = int(datetime.now(timezone.utc).timestamp() * 1000)
-                session_id = uuid.uuid4().hex[:8]
-                session_dir = self.temp_dir / f"tts_{track_id}_{voice}_{timestamp}_{session_id}"
-                await _amkdir(session_dir)
+                if resume_session_dir:
+                    manifest = await anyio.to_thread.run_sync(TTSJobManifest.load, Path(resume_session_dir))
 
-                # Store text for recovery
-                logger.info(f"TTS-TEXT: Storing source text for {track_id}")
-                await text_storage_service.store_source_text(track_id, text_content, db)
+                if manifest:
+                    session_dir = manifest.session_dir
+                    logger.info(f"TTS-RESUME: {track_id} | {voice} | {manifest.completed_count} chunks on disk")
+                    await manifest.bind_text(text_content)
+                else:
+                    timestamp = int(datetime.now(timezone.utc).timestamp() * 1000)
+                    session_id = uuid.uuid4().hex[:8]
+                    session_dir = self.temp_dir / f"tts_{track_id}_{voice}_{timestamp}_{session_id}"
+                    await _amkdir(session_dir)
+
+                    # Store text for recovery
+                    logger.info(f"TTS-TEXT: Storing source text for {track_id}")
+                    await text_storage_service.store_source_text(track_id, text_content, db)
+
+                    manifest = await TTSJobManifest.create(
+                        session_dir,
+                        kind=job_kind,
+                        track_id=track_id,
+                        voice=voice,
+                        user_id=user.id,
+                        text=text_content,
+                        params={'title': title}
+                    )
                 
                 # Update DB metadata
                 if db:
@@ -2689,24 +3067,31 @@ class EnhancedVoiceAwareTTSService:
                 collected, mem_pct = await _force_garbage_collection()
                 logger.debug(f"Text freed: GC collected {collected} objects (mem: {mem_pct:.1f}%)")
 
-                # MODIFIED: Pass text directly to _generate_chunks_in_parallel (now streaming)
-                chunk_files, total_duration, timings_dir = await self._generate_chunks_in_parallel(
-                    chunks=source_text,  # Now accepts text string
+                # Stored with the text, so the track's later voices skip the split
+                plan = await self.get_chunk_plan(track_id, source_text)
+
+                final_audio_path = session_dir / f"tts_{track_id}_{voice}.mp3"
+                timing_merger = WordTimingMerger(track_id, voice)
+                chunk_files, total_duration, timings_dir, final_size = await self._generate_and_assemble_audio(
+                    text_content=source_text,
+                    track_id=track_id,
                     voice=voice,
                     session_dir=session_dir,
+                    final_audio_path=final_audio_path,
                     user=user,
-                    job_id=job_id
+                    job_id=job_id,
+                    manifest=manifest,
+                    plan=plan,
+                    scheduler=bulk_scheduler,
+                    timing_merger=timing_merger
                 )
                 
-                del source_text
+                del source_text, plan
                 await _force_garbage_collection()
 
-                final_audio_path = session_dir / f"tts_{track_id}_{voice}.mp3"
-                final_size = await self._concatenate_audio_files(chunk_files, final_audio_path, voice)
-
                 # MODIFIED: _load_and_merge_timings now returns summary dict
                 timing_summary = await self._load_and_merge_timings(
-                    timings_dir, track_id, voice, db, session_dir=session_dir
+                    timings_dir, track_id, voice, db, merger=timing_merger
                 )
 
                 try:
@@ -2757,6 +3142,11 @@ class EnhancedVoiceAwareTTSService:
                 }
 
             except asyncio.CancelledError:
+                if await self._is_interrupted(job_id, manifest):
+                    logger.warning(f"TTS-INTERRUPTED: {track_id} | {voice} - session kept for resume")
+                    raise
+                if manifest:
+                    await manifest.discard()
                 if session_dir and await _aexists(session_dir):
                     try:
                         await self._cleanup_session_directory(session_dir)
@@ -2767,6 +3157,8 @@ class EnhancedVoiceAwareTTSService:
             except Exception as e:
                 logger.error(f"TTS-FAILED: {track_id} | {str(e)}")
 
+                if manifest:
+                    await manifest.discard()
                 if session_dir and await _aexists(session_dir):
                     try:
                         await self._cleanup_session_directory(session_dir)
@@ -2777,124 +3169,6 @@ class EnhancedVoiceAwareTTSService:
                 self._job_tasks.pop(job_id, None)
 
 
-    async def _load_and_merge_timings_streaming(self, timings_dir: Path, track_id: str, voice: str, db, *, session_dir: Optional[Path] = None) -> Dict:
-        """
-        FIX #3: Stream timing merge directly to storage instead of building huge list.
-        Memory stays O(1) instead of O(total_words).
-        Returns a summary dict instead of full timings.
-        """
-        if not isinstance(timings_dir, Path):
-            raise TypeError(f"Expected Path for timings_dir, got {type(timings_dir)}")
-
-        if not await _aexists(timings_dir):
-            raise FileNotFoundError(f"Timings directory not found: {timings_dir}")
-
-        timing_files = sorted(timings_dir.glob("chunk_*.json"))
-        if not timing_files:
-            raise ValueError(f"No timing files found in {timings_dir}")
-
-        # Choose output location
-        stream_dir = session_dir or timings_dir.parent
-        timings_stream_path = stream_dir / f"word-timings_{track_id}_{voice}.jsonl"
-
-        cumulative_time = 0.0
-        batch_size = 50
-        word_batch = []
-        total_words = 0
-        total_duration = 0.0
-
-        # Open NDJSON file for streaming write
-        async with aiofiles.open(timings_stream_path, "w") as out_f:
-            for i, tf_path in enumerate(timing_files):
-                if not await _aexists(tf_path):
-                    continue
-                
-                async with aiofiles.open(tf_path, "r") as f:
-                    content = await f.read()
-                
-                if not content:
-                    continue
-
-                shard = await anyio.to_thread.run_sync(json.loads, content)
-                chunk_duration = float(shard.get("duration", 0.0))
-                word_boundaries = shard.get("word_boundaries", []) or []
-                
-                for timing in word_boundaries:
-                    t = dict(timing)
-                    
-                    original_start = float(t.get("start_time", 0))
-                    original_end = float(t.get("end_time", 0))
-                    
-                    t["start_time"] = original_start + cumulative_time
-                    t["end_time"] = original_end + cumulative_time
-                    t["chunk_cumulative_offset"] = cumulative_time
-                    t["global_word_index"] = total_words
-                    
-                    word_batch.append(t)
-                    total_words += 1
-
-                cumulative_time += max(0.0, chunk_duration)
-                
-                # Stream to storage + NDJSON file
-                if len(word_batch) >= batch_size * 20:
-                    await self.text_service.append_word_timings(track_id, voice, word_batch, db)
-                    
-                    # Write to NDJSON file
-                    lines = await anyio.to_thread.run_sync(
-                        lambda b=word_batch: "\n".join(json.dumps(x) for x in b) + "\n"
-                    )
-                    await out_f.write(lines)
-                    
-                    word_batch = []
-                    await _force_garbage_collection()
-
-            # Store remaining batch
-            if word_batch:
-                await self.text_service.append_word_timings(track_id, voice, word_batch, db)
-                
-                # Write final batch to NDJSON
-                lines = await anyio.to_thread.run_sync(
-                    lambda b=word_batch: "\n".join(json.dumps(x) for x in b) + "\n"
-                )
-                await out_f.write(lines)
-
-        if total_words == 0:
-            raise ValueError(f"No usable timings loaded from {len(timing_files)} files")
-
-        total_duration = cumulative_time
-        logger.info(f"Merged {total_words} words (streamed), total duration: {total_duration:.3f}s")
-        
-        # Add DB update from BUG #3 here
-        if db:
-            try:
-                res = await _exec(db, select(TTSTrackMeta).where(TTSTrackMeta.track_id == track_id))
-                tm = res.scalar_one_or_none()
-                if tm:
-                    if voice not in (tm.available_voices or []):
-                        tm.available_voices = (tm.available_voices or []) + [voice]
-                    if not tm.default_voice:
-                        tm.default_voice = voice
-                    tm.total_duration = float(total_duration)
-                    tm.processing_status = 'ready'
-                    tm.completed_at = datetime.now(timezone.utc)
-                    tm.progress_percentage = 100.0
-                    await _commit(db)
-            except Exception:
-                try: 
-                    await _rollback(db)
-                except Exception: 
-                    pass
-        
-        # Return summary dict instead of full timings
-        return {
-            'total_words': total_words,
-            'total_duration': total_duration,
-            'track_id': track_id,
-            'voice': voice,
-            'chunks_processed': len(timing_files),
-            'timings_file_path': str(timings_stream_path)  # New
-        }
-
     async def _load_and_merge_timings(
         self, 
         timings_dir: Path, 
@@ -2902,11 +3176,12 @@ class EnhancedVoiceAwareTTSService:
         voice: str, 
         db, 
         *, 
-        session_dir: Optional[Path] = None
+        merger: Optional[WordTimingMerger] = None
     ) -> Dict:
         """
-        MODIFIED: Now streams to storage and returns summary dict.
-        Memory: O(1) instead of O(total_words).
+        Store the job's merged word timings as the voice's timing file.
+        merger has normally packed every chunk while the job ran; without one,
+        the shards in timings_dir are merged here.
         Returns: Summary dict with file path, not full timings list.
         """
         if not isinstance(timings_dir, Path):
@@ -2915,74 +3190,17 @@ class EnhancedVoiceAwareTTSService:
         if not await _aexists(timings_dir):
             raise FileNotFoundError(f"Timings directory not found: {timings_dir}")
 
-        timing_files = sorted(timings_dir.glob("chunk_*.json"))
-        if not timing_files:
+        total_chunks = len(await anyio.to_thread.run_sync(lambda: list(timings_dir.glob("chunk_*.json"))))
+        if not total_chunks:
             raise ValueError(f"No timing files found in {timings_dir}")
 
-        stream_dir = session_dir or timings_dir.parent
-        timings_stream_path = stream_dir / f"word-timings_{track_id}_{voice}.jsonl"
-
-        cumulative_time = 0.0
-        batch_size = 50
-        word_batch = []
-        total_words = 0
-        total_duration = 0.0
+        if merger is None:
+            merger = await WordTimingMerger.from_directory(timings_dir, track_id, voice)
 
-        async with aiofiles.open(timings_stream_path, "w") as out_f:
-            for i, tf_path in enumerate(timing_files):
-                if not await _aexists(tf_path):
-                    continue
-                
-                async with aiofiles.open(tf_path, "r") as f:
-                    content = await f.read()
-                
-                if not content:
-                    continue
-
-                shard = await anyio.to_thread.run_sync(json.loads, content)
-                chunk_duration = float(shard.get("duration", 0.0))
-                word_boundaries = shard.get("word_boundaries", []) or []
-                
-                for timing in word_boundaries:
-                    t = dict(timing)
-                    
-                    original_start = float(t.get("start_time", 0))
-                    original_end = float(t.get("end_time", 0))
-                    
-                    t["start_time"] = original_start + cumulative_time
-                    t["end_time"] = original_end + cumulative_time
-                    t["chunk_cumulative_offset"] = cumulative_time
-                    t["global_word_index"] = total_words
-                    
-                    word_batch.append(t)
-                    total_words += 1
-
-                cumulative_time += max(0.0, chunk_duration)
-                
-                if len(word_batch) >= batch_size * 20:
-                    await self.text_service.append_word_timings(track_id, voice, word_batch, db)
-                    
-                    lines = await anyio.to_thread.run_sync(
-                        lambda b=word_batch: "\n".join(json.dumps(x) for x in b) + "\n"
-                    )
-                    await out_f.write(lines)
-                    
-                    word_batch = []
-                    await _force_garbage_collection()
-
-            if word_batch:
-                await self.text_service.append_word_timings(track_id, voice, word_batch, db)
-                
-                lines = await anyio.to_thread.run_sync(
-                    lambda b=word_batch: "\n".join(json.dumps(x) for x in b) + "\n"
-                )
-                await out_f.write(lines)
-
-        if total_words == 0:
-            raise ValueError(f"No usable timings loaded from {len(timing_files)} files")
-
-        total_duration = cumulative_time
-        logger.info(f"Merged {total_words} words (streamed), total duration: {total_duration:.3f}s")
+        stored = await self.text_service.store_packed_word_timings(track_id, voice, merger.finish(total_chunks))
+        total_words = merger.word_count
+        total_duration = merger.total_duration
+        logger.info(f"Merged {total_words} words, total duration: {total_duration:.3f}s")
         
         if db:
             try:
@@ -3009,8 +3227,8 @@ class EnhancedVoiceAwareTTSService:
             'total_duration': total_duration,
             'track_id': track_id,
             'voice': voice,
-            'chunks_processed': len(timing_files),
-            'timings_file_path': str(timings_stream_path)
+            'chunks_processed': total_chunks,
+            'timings_file_path': stored['absolute_path']
         }
 
 
@@ -3020,9 +3238,16 @@ class EnhancedVoiceAwareTTSService:
         new_voice: str,
         db,
         user: User,
-        already_locked: bool = False
+        already_locked: bool = False,
+        resume_session_dir: Optional[Path] = None,
+        fanout: Optional[VoiceFanOut] = None
     ) -> Dict:
-        """Efficient voice switching with S4 backup check"""
+        """
+        Efficient voice switching with S4 backup check.
+        resume_session_dir continues an interrupted generation from its manifest.
+        fanout supplies the already loaded text and chunk plan and runs this
+        voice's chunks on the fan-out's shared queue.
+        """
         logger.info(f"VOICE-SWITCH: {track_id} | {new_voice}")
 
         if not already_locked:
@@ -3034,6 +3259,7 @@ class EnhancedVoiceAwareTTSService:
         async with self.tts_job(user, track_id, new_voice) as job_id:
             start_time = time.time()
             lock_key = f"{track_id}:{new_voice}"
+            manifest = None
 
             try:
                 logger.info(f"Checking S3/S4 for voice: {new_voice}")
@@ -3046,6 +3272,9 @@ class EnhancedVoiceAwareTTSService:
                 if voice_package:
                     logger.info(f"Found voice in S3/S4: {new_voice} ({voice_package['duration']:.2f}s)")
 
+                    if resume_session_dir:
+                        await self._cleanup_session_directory(Path(resume_session_dir))
+
                     await self._store_voice_word_timings(
                         track_id, new_voice,
                         voice_package['word_timings'],
@@ -3094,41 +3323,65 @@ class EnhancedVoiceAwareTTSService:
 
                 logger.info(f"Voice not in S3/S4, generating: {new_voice}")
 
-                full_text = await self.text_service.get_source_text(track_id, db, bypass_cache=True)
-                if not full_text:
-                    raise ValueError(f"No source text found for {track_id}")
-
-                session_dir = self.temp_dir / f"voice_switch_{track_id}_{new_voice}_{uuid.uuid4().hex[:8]}"
-                await _amkdir(session_dir)
+                if fanout:
+                    full_text, plan = fanout.text, fanout.plan
+                else:
+                    full_text = await self.text_service.get_source_text(track_id, db, bypass_cache=True)
+                    if not full_text:
+                        raise ValueError(f"No source text found for {track_id}")
+                    plan = await self.get_chunk_plan(track_id, full_text)
+
+                if resume_session_dir:
+                    manifest = await anyio.to_thread.run_sync(TTSJobManifest.load, Path(resume_session_dir))
+
+                if manifest:
+                    session_dir = manifest.session_dir
+                    logger.info(f"VOICE-SWITCH-RESUME: {track_id} | {new_voice} | {manifest.completed_count} chunks on disk")
+                    await manifest.bind_text(full_text)
+                else:
+                    session_dir = self.temp_dir / f"voice_switch_{track_id}_{new_voice}_{uuid.uuid4().hex[:8]}"
+                    await _amkdir(session_dir)
+                    manifest = await TTSJobManifest.create(
+                        session_dir,
+                        kind="voice_switch",
+                        track_id=track_id,
+                        voice=new_voice,
+                        user_id=user.id,
+                        text=full_text
+                    )
 
-                def progress_callback(completed, total):
+                async def progress_callback(completed, total):
                     progress = 20 + (60 * completed / total)
-                    self._update_voice_progress(
+                    await self._update_voice_progress(
                         lock_key, progress, 'generating',
                         f'Generating {new_voice}: {completed}/{total} chunks',
                         chunks_completed=completed, total_chunks=total
                     )
 
-                # MODIFIED: Pass text directly to _generate_chunks_in_parallel
-                chunk_files, total_duration, timings_dir = await self._generate_chunks_in_parallel(
-                    chunks=full_text,  # Now accepts text string
+                final_audio_path = session_dir / f"complete_{track_id}_{new_voice}.mp3"
+                timing_merger = WordTimingMerger(track_id, new_voice)
+                chunk_files, total_duration, timings_dir, final_size = await self._generate_and_assemble_audio(
+                    text_content=full_text,
+                    track_id=track_id,
                     voice=new_voice,
                     session_dir=session_dir,
+                    final_audio_path=final_audio_path,
                     user=user,
                     job_id=job_id,
                     progress_callback=progress_callback,
-                    lock_key=lock_key
+                    lock_key=lock_key,
+                    manifest=manifest,
+                    plan=plan,
+                    scheduler=fanout,
+                    timing_merger=timing_merger
                 )
                 
-                del full_text
+                del full_text, plan
                 await _force_garbage_collection()
 
-                final_audio_path = session_dir / f"complete_{track_id}_{new_voice}.mp3"
-                final_size = await self._concatenate_audio_files(chunk_files, final_audio_path, new_voice)
-
                 # MODIFIED: _load_and_merge_timings now returns summary dict
                 timing_summary = await self._load_and_merge_timings(
-                    timings_dir, track_id, new_voice, db, session_dir=session_dir
+                    timings_dir, track_id, new_voice, db, merger=timing_merger
                 )
 
                 try:
@@ -3165,7 +3418,18 @@ class EnhancedVoiceAwareTTSService:
                     'source': 'tts_generation'
                 }
 
+            except asyncio.CancelledError:
+                if await self._is_interrupted(job_id, manifest):
+                    raise
+                if manifest:
+                    await manifest.discard()
+                if not already_locked:
+                    self.complete_user_generation(user.id, track_id, new_voice)
+                raise
+
             except Exception:
+                if manifest:
+                    await manifest.discard()
                 if not already_locked:
                     self.complete_user_generation(user.id, track_id, new_voice)
                 raise
@@ -3224,8 +3488,9 @@ class EnhancedVoiceAwareTTSService:
         except Exception as e:
             logger.error(f"Error cleaning up session directory: {str(e)}")
 
-    def _update_voice_progress(self, lock_key: str, progress: float, phase: str, message: str, **kwargs):
-        if lock_key in self.voice_switch_progress:
+    async def _update_voice_progress(self, lock_key: str, progress: float, phase: str, message: str, **kwargs):
+        current = await self.get_voice_switch_progress(lock_key)
+        if current is not None:
             if progress >= 100:
                 status = 'complete'
             elif phase in ['generating', 'concatenating', 'organizing', 'finalizing']:
@@ -3235,7 +3500,7 @@ class EnhancedVoiceAwareTTSService:
             else:
                 status = 'generating'
 
-            self.voice_switch_progress[lock_key].update({
+            current.update({
                 'status': status,
                 'progress': min(100, max(0, progress)),
                 'phase': phase,
@@ -3243,6 +3508,7 @@ class EnhancedVoiceAwareTTSService:
                 'updated_at': time.time(),
                 **kwargs
             })
+            await self.async_tts_state.set_progress(f"voice_switch:{lock_key}", current, ttl=1800)
 
             # Schedule WebSocket broadcast if we're in an async context
             try:
@@ -25,9 +25,10 @@ from storage import storage as storage_manager
 from duration_manager import duration_manager
 from hls_storage_config import check_hls_storage_before_track_creation
 from background_preparation import BackgroundPreparationManager
+from segment_word_timings import SegmentTimingsWriter
 
 # Redis state managers for multi-container support
-from redis_state.state.progress import progress_state
+from redis_state.state.progress import progress_state, async_progress_state
 from redis_state.cache.word_timing import word_timing_cache as redis_word_timing
 from redis_state.state.conversion import conversion_state
 
@@ -375,7 +376,6 @@ class BaseHLSManager:
 
         # Initialize time-based progress
         total_segments_estimate = math.ceil(total_duration / segment_duration) if segment_duration > 0 else 0
-        self.segment_progress.setdefault(progress_key, {})
         initial_payload = {
             'status': 'creating_segments',
             'total_duration': total_duration,
@@ -392,8 +392,8 @@ class BaseHLSManager:
             'segments_completed': 0,
             'total_segments': total_segments_estimate
         }
-        self.segment_progress[progress_key] = initial_payload
-        self._queue_segment_ws_broadcast(progress_key, self.segment_progress[progress_key])
+        prog = await async_progress_state.set(progress_key, dict(initial_payload))
+        self._queue_segment_ws_broadcast(progress_key, prog)
 
         # FFmpeg command
         args = [
@@ -427,7 +427,7 @@ class BaseHLSManager:
 
         last_logged_percent = -1
 
-        def _update_time_progress(current_time_seconds: float):
+        async def _update_time_progress(current_time_seconds: float):
             """Update progress based on processing time"""
             nonlocal last_logged_percent
             
@@ -438,8 +438,7 @@ class BaseHLSManager:
             current_time = min(current_time_seconds, total_duration)
             percentage = (current_time / total_duration) * 100.0
             
-            # Update progress record
-            prog = self.segment_progress.get(progress_key, {})
+            # Update progress record (this task is the only writer while segmenting)
             segments_completed = max(0, math.floor(current_time / segment_duration)) if segment_duration > 0 else 0
             prog.update({
                 'current_duration': current_time,
@@ -454,7 +453,7 @@ class BaseHLSManager:
                 'segments_completed': segments_completed,
                 'total_segments': total_segments_estimate
             })
-            self.segment_progress[progress_key] = prog
+            await async_progress_state.set(progress_key, prog)
             self._queue_segment_ws_broadcast(progress_key, prog)
             
             # Log every 10% for reasonable granularity
@@ -488,7 +487,7 @@ class BaseHLSManager:
                         continue
 
                 if current_time is not None:
-                    _update_time_progress(current_time)
+                    await _update_time_progress(current_time)
 
         # Start monitoring
         stderr_task = asyncio.create_task(_stderr_monitor())
@@ -499,8 +498,7 @@ class BaseHLSManager:
             await asyncio.gather(stderr_task, return_exceptions=True)
 
         if process.returncode != 0:
-            error_payload = self.segment_progress.setdefault(progress_key, {})
-            error_payload.update({
+            error_payload = await async_progress_state.update(progress_key, {
                 'status': 'error',
                 'message': f'HLS segmentation failed (code {process.returncode})'
             })
@@ -523,8 +521,8 @@ class BaseHLSManager:
             'segments_completed': len(actual_segments),
             'total_segments': len(actual_segments) or total_segments_estimate
         }
-        self.segment_progress[progress_key].update(final_progress)
-        self._queue_segment_ws_broadcast(progress_key, self.segment_progress[progress_key])
+        final_payload = await async_progress_state.update(progress_key, final_progress)
+        self._queue_segment_ws_broadcast(progress_key, final_payload)
 
         logger.info(f"HLS segmentation complete: {self._format_duration(total_duration)} -> {len(actual_segments)} segments")
         if progress_key in self._segment_ws_state:
@@ -537,7 +535,8 @@ class BaseHLSManager:
         return self.conversion_locks[file_hash]
 
     async def _save_segment_index(
-        self, variant_dir: Path, durations: List[float], start_number: int = 0
+        self, variant_dir: Path, durations: List[float], start_number: int = 0,
+        pipeline: str = "single_pass_time_based", word_mapping_pending: bool = False
     ):
         try:
             starts = []
@@ -554,7 +553,8 @@ class BaseHLSManager:
                 "total_duration": acc,
                 "measured": True,
                 "optimized_single_pass": True,
-                "pipeline": "single_pass_time_based",
+                "pipeline": pipeline,
+                "word_mapping_pending": word_mapping_pending,
                 "container": HLS_SEGMENT_CONTAINER,
                 "uses_database_duration": True,
                 "duration_source": "duration_manager"
@@ -641,6 +641,14 @@ class BaseHLSManager:
         """Calculate overlap between two time ranges"""
         return max(0.0, min(a2, b2) - max(a1, b1))
 
+    def _schedule_read_along_compile(self, track_id: str, voice_id: str):
+        """Compile the read-along artifact once word mapping has settled the voice's timings"""
+        try:
+            from enhanced_read_along_api import read_along_service
+            read_along_service.schedule_compile(track_id, voice_id)
+        except Exception as e:
+            logger.warning(f"Read-along compile not scheduled for {track_id}:{voice_id}: {e}")
+
     async def _map_words_to_segments_precise(
         self,
         track_id: str,
@@ -670,6 +678,8 @@ class BaseHLSManager:
         can_append = hasattr(text_storage_service, "append_word_timings")
 
         enhanced_all: List[Dict] = [] if not can_append else None
+        # Per-segment sidecar for client-side highlighting (segment_timings.bin)
+        sidecar = SegmentTimingsWriter(starts, durs)
 
         def map_one(w: Dict) -> Optional[Dict]:
             ws = float(w["start_time"])
@@ -703,7 +713,6 @@ class BaseHLSManager:
 
             seg_idx = int(best_idx)
             seg_offset = max(0.0, ws - starts[seg_idx])
-            seg_end_offset = max(seg_offset, min(durs[seg_idx], we - starts[seg_idx]))
 
             enhanced_word = {
                 "word": w.get("word", ""),
@@ -731,6 +740,7 @@ class BaseHLSManager:
                 mapped = map_one(w)
                 if mapped is not None:
                     enhanced_batch.append(mapped)
+                    sidecar.add(mapped["segment_index"], mapped["start_time"], mapped["end_time"])
 
             mapped_total += len(enhanced_batch)
 
@@ -753,6 +763,12 @@ class BaseHLSManager:
             )
             del enhanced_all
 
+        try:
+            sidecar_path = text_storage_service._get_segment_timing_path(track_id, voice_id)
+            await anyio.to_thread.run_sync(sidecar.write, sidecar_path)
+        except Exception as e:
+            logger.warning(f"Segment timing sidecar not written for {track_id}/{voice_id}: {e}")
+
         # Update cache with metrics
         cache_key = f"{track_id}:{voice_id}"
         self.word_timing_cache[cache_key] = {
@@ -804,6 +820,7 @@ class BaseHLSManager:
                     total_duration=total_duration
                 )
                 logger.info(f"Background word mapping complete: {track_id} ({len(word_timings)} words)")
+                self._schedule_read_along_compile(track_id, voice_id)
             else:
                 logger.warning(f"No word timings found for background mapping: {track_id}/{voice_id}")
         
@@ -818,8 +835,7 @@ class BaseHLSManager:
 
     async def clear_segment_progress(self, progress_key: str):
         try:
-            if progress_key in self.segment_progress:
-                self.segment_progress.pop(progress_key, None)
+            await async_progress_state.pop(progress_key)
             if progress_key in self._segment_ws_state:
                 self._segment_ws_state.pop(progress_key, None)
         except Exception as e:
@@ -965,9 +981,10 @@ class BaseHLSManager:
             await self.cache.set_metadata(progress_key, stream_info)
 
             # Final progress update
-            if progress_key in self.segment_progress:
+            complete_payload = await async_progress_state.get(progress_key)
+            if complete_payload is not None:
                 word_status = "words mapping in background" if words_mapped == -1 else f"{words_mapped} words mapped"
-                self.segment_progress[progress_key].update({
+                complete_payload.update({
                     'status': 'complete',
                     'percentage': 100,
                     'current_duration': initial_duration,
@@ -981,7 +998,8 @@ class BaseHLSManager:
                     'segments_completed': len(measured_durations),
                     'total_segments': len(measured_durations)
                 })
-                self._queue_segment_ws_broadcast(progress_key, self.segment_progress[progress_key])
+                await async_progress_state.set(progress_key, complete_payload)
+                self._queue_segment_ws_broadcast(progress_key, complete_payload)
 
             word_log = "words mapping async" if words_mapped == -1 else f"{words_mapped} words"
             logger.info(f"HLS Pipeline Complete: {progress_key} ({len(measured_durations)} segments, {word_log})")
@@ -990,13 +1008,15 @@ class BaseHLSManager:
         except Exception as e:
             progress_key = self._get_progress_key(track_id, voice_id)
             logger.error(f"HLS Pipeline Failed: {progress_key} - {str(e)}")
-            if progress_key in self.segment_progress:
-                self.segment_progress[progress_key].update({
+            error_payload = await async_progress_state.get(progress_key)
+            if error_payload is not None:
+                error_payload.update({
                     'status': 'error',
                     'message': f'Error: {str(e)}',
                     'error': str(e)
                 })
-                self._queue_segment_ws_broadcast(progress_key, self.segment_progress[progress_key])
+                await async_progress_state.set(progress_key, error_payload)
+                self._queue_segment_ws_broadcast(progress_key, error_payload)
                 if progress_key in self._segment_ws_state:
                     self._segment_ws_state.pop(progress_key, None)
             raise
@@ -634,7 +634,10 @@ class StreamManager:
                 master_ok, index_ok = await asyncio.get_event_loop().run_in_executor(
                     None, lambda: (master_playlist_path.exists(), index_path.exists())
                 )
-                
+
+                # Segmented progressively during TTS generation; only word mapping is left
+                progressive_ready = False
+
                 if master_ok and index_ok:
                     playlist_complete = await self._is_playlist_complete(master_playlist_path)
                     segments_exist = await asyncio.get_event_loop().run_in_executor(
@@ -642,6 +645,11 @@ class StreamManager:
                     )
                     
                     if playlist_complete and segments_exist:
+                        progressive_ready = (await self.get_segment_index(track_id, voice)).get(
+                            "word_mapping_pending", False
+                        )
+
+                    if playlist_complete and segments_exist and not progressive_ready:
                         logger.info(f"Using existing voice stream: {track_id} ({voice})")
 
                         initial_duration = await self.hls_manager._extract_duration_with_fallback(
@@ -698,19 +706,23 @@ class StreamManager:
                     "cache_type": "file_based",
                 }
 
-                await self.hls_manager._create_master_playlist(
-                    voice_stream_dir, [self.hls_manager.default_bitrate]
-                )
+                if progressive_ready:
+                    logger.info(f"Progressive voice stream already segmented, mapping words: {voice}")
+                    playlist_path = variant_dir / "playlist.m3u8"
+                else:
+                    await self.hls_manager._create_master_playlist(
+                        voice_stream_dir, [self.hls_manager.default_bitrate]
+                    )
 
-                logger.info(f"Direct single-pass voice segmentation: {voice}")
-                playlist_path = await self.hls_manager._hls_from_source_direct_with_progress(
-                    source_path=file_path,
-                    variant_dir=variant_dir,
-                    playlist_name="playlist.m3u8",
-                    segment_duration=segment_duration,
-                    total_duration=initial_duration,
-                    progress_key=progress_key,
-                )
+                    logger.info(f"Direct single-pass voice segmentation: {voice}")
+                    playlist_path = await self.hls_manager._hls_from_source_direct_with_progress(
+                        source_path=file_path,
+                        variant_dir=variant_dir,
+                        playlist_name="playlist.m3u8",
+                        segment_duration=segment_duration,
+                        total_duration=initial_duration,
+                        progress_key=progress_key,
+                    )
 
                 measured_durations = self.hls_manager._parse_m3u8_durations(playlist_path)
                 logger.info(f"Voice playlist: {len(measured_durations)} measured durations")
@@ -752,6 +764,9 @@ class StreamManager:
                                 consolidated = await text_storage_service.consolidate_timing_shards(track_id, voice, db)
                                 if consolidated:
                                     logger.info(f"[Word Mapping] Shards consolidated successfully")
+
+                            # Compiled only now: the mapping and consolidation rewrite timings.cols
+                            self.hls_manager._schedule_read_along_compile(track_id, voice)
                             
                         except Exception as mapping_error:
                             logger.error(f"[Word Mapping] Failed: {track_id}/{voice} - {mapping_error}")
@@ -760,7 +775,8 @@ class StreamManager:
                         logger.warning(f"[Word Mapping] Skipped - no word timings available: {track_id}/{voice}")
 
                 await self.hls_manager._save_segment_index(
-                    variant_dir, measured_durations, start_number=0
+                    variant_dir, measured_durations, start_number=0,
+                    pipeline="progressive_event" if progressive_ready else "single_pass_time_based",
                 )
 
                 if db and track_id:
@@ -0,0 +1,243 @@
+"""
+Hot segment memory cache
+
+When a new chapter drops, hundreds of listeners fetch the first few segments
+of the same track within minutes. This keeps those opening segments in memory
+(per uvicorn worker) so they are served without touching disk.
+
+- Only segment indexes 0..HOT_SEGMENT_MAX_INDEX are cached
+- LRU eviction with byte-size accounting (HOT_SEGMENT_CACHE_MAX_MB)
+- Entries are tied to (mtime_ns, size) of the file and the track's content_version;
+  invalidate_track() drops a track when its content changes
+- prewarm_popular_tracks() loads the opening segments of
+  PopularTracksService.get_popular_track_ids() for every creator
+"""
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HOT_SEGMENT_CACHE_MAX_BYTES = int(os.getenv('HOT_SEGMENT_CACHE_MAX_MB', '256')) * 1024 * 1024
+HOT_SEGMENT_MAX_INDEX = int(os.getenv('HOT_SEGMENT_MAX_INDEX', '10'))  # segment_00000 .. segment_00010
+HOT_SEGMENT_MAX_ENTRY_BYTES = 4 * 1024 * 1024
+HOT_SEGMENT_PREWARM_INTERVAL = 600  # 10 minutes
+
+
+class HotSegmentCache:
+    """Byte-bounded LRU of segment bodies keyed by file path"""
+
+    def __init__(self, max_bytes: int = HOT_SEGMENT_CACHE_MAX_BYTES, max_index: int = HOT_SEGMENT_MAX_INDEX):
+        self.max_bytes = max_bytes
+        self.max_index = max_index
+        # path -> (data, mtime_ns, size, track_id, content_version)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes_served = 0
+        self.prewarmed = 0
+
+    def is_hot(self, segment_index: int, segment_stat) -> bool:
+        return (
+            0 <= segment_index <= self.max_index
+            and 0 < segment_stat.st_size <= HOT_SEGMENT_MAX_ENTRY_BYTES
+            and self.max_bytes > 0
+        )
+
+    def get(self, segment_path: Path, segment_stat, content_version: Optional[int]) -> Optional[bytes]:
+        key = str(segment_path)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        data, mtime_ns, size, _, cached_version = entry
+        if (mtime_ns != segment_stat.st_mtime_ns or size != segment_stat.st_size
+                or (content_version is not None and cached_version != content_version)):
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def put(self, segment_path: Path, segment_stat, data: bytes, track_id: str, content_version: Optional[int]):
+        key = str(segment_path)
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (data, segment_stat.st_mtime_ns, segment_stat.st_size, str(track_id), content_version)
+        self.current_bytes += len(data)
+        while self.current_bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= len(entry[0])
+
+    async def get_or_load(
+        self,
+        segment_path: Path,
+        segment_stat,
+        segment_index: int,
+        track_id: str,
+        content_version: Optional[int]
+    ) -> Optional[bytes]:
+        """
+        Return the segment body from memory, reading it into the cache on a miss.
+        Returns None for segments that aren't eligible (served from disk instead).
+        """
+        if not self.is_hot(segment_index, segment_stat):
+            return None
+
+        data = self.get(segment_path, segment_stat, content_version)
+        if data is not None:
+            self.hits += 1
+            self.bytes_served += len(data)
+            return data
+
+        self.misses += 1
+        key = str(segment_path)
+
+        # Collapse concurrent misses for the same segment into one read
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            data = await asyncio.to_thread(_read_exact, segment_path, segment_stat.st_size)
+            if data is not None:
+                self.put(segment_path, segment_stat, data, track_id, content_version)
+            future.set_result(data)
+            return data
+        except Exception as e:
+            future.set_result(None)
+            logger.debug(f"Hot segment load failed for {segment_path}: {e}")
+            return None
+        finally:
+            if not future.done():
+                # Loader cancelled: waiters fall back to disk instead of hanging on the shield
+                future.set_result(None)
+            self._loading.pop(key, None)
+
+    def invalidate_track(self, track_id: str):
+        """Drop every cached segment of a track (content changed)"""
+        track_id = str(track_id)
+        stale = [key for key, entry in self._entries.items() if entry[3] == track_id]
+        for key in stale:
+            self._drop(key)
+        self.invalidations += len(stale)
+
+    async def prewarm_track(self, track_id: str, voice_id: Optional[str], content_version: Optional[int]) -> int:
+        """Load the opening segments of every quality of a track/voice"""
+        from hls_streaming import stream_manager
+
+        base_dir = stream_manager.segment_dir / str(track_id)
+        if voice_id:
+            base_dir = base_dir / f"voice-{voice_id}"
+
+        try:
+            quality_dirs = await asyncio.to_thread(lambda: [p for p in base_dir.iterdir() if p.is_dir()])
+        except (FileNotFoundError, NotADirectoryError):
+            return 0
+
+        loaded = 0
+        for quality_dir in quality_dirs:
+            for index in range(self.max_index + 1):
+                segment_path = quality_dir / f"segment_{index:05d}.ts"
+                try:
+                    segment_stat = await asyncio.to_thread(os.stat, segment_path)
+                except (FileNotFoundError, NotADirectoryError):
+                    break
+                if not self.is_hot(index, segment_stat):
+                    continue
+                if self.get(segment_path, segment_stat, content_version) is not None:
+                    continue
+                data = await asyncio.to_thread(_read_exact, segment_path, segment_stat.st_size)
+                if data is not None:
+                    self.put(segment_path, segment_stat, data, track_id, content_version)
+                    loaded += 1
+        self.prewarmed += loaded
+        return loaded
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes_cached': self.current_bytes,
+            'max_bytes': self.max_bytes,
+            'max_segment_index': self.max_index,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'bytes_served_from_memory': self.bytes_served,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'prewarmed_segments': self.prewarmed
+        }
+
+
+def _read_exact(path: Path, size: int) -> Optional[bytes]:
+    with open(path, 'rb') as f:
+        data = f.read(size)
+    return data if len(data) == size else None
+
+
+# Global singleton instance (one per worker)
+hot_segment_cache = HotSegmentCache()
+
+
+async def prewarm_popular_tracks() -> int:
+    """Pre-warm opening segments for every creator's popular tracks"""
+    from database import SessionLocal
+    from models import User, UserRole
+    from popular_tracks_service import popular_tracks_service
+    from track_metadata_cache import track_metadata_cache
+
+    def _active_creator_ids(db) -> list:
+        return [
+            row[0] for row in db.query(User.id).filter(
+                User.role == UserRole.CREATOR,
+                User.is_active == True
+            ).all()
+        ]
+
+    loaded = 0
+    db = SessionLocal()
+    try:
+        creator_ids = await asyncio.to_thread(_active_creator_ids, db)
+        for creator_id in creator_ids:
+            track_ids = await popular_tracks_service.get_popular_track_ids(creator_id, db)
+            for track_id in track_ids:
+                meta = await track_metadata_cache.get(track_id, db)
+                if not meta:
+                    continue
+                voice_id = meta.default_voice if meta.is_tts else None
+                loaded += await hot_segment_cache.prewarm_track(track_id, voice_id, meta.content_version)
+    finally:
+        await asyncio.to_thread(db.close)
+    return loaded
+
+
+async def hot_segment_prewarm_loop():
+    """Background task: periodically pre-warm popular tracks' opening segments"""
+    while True:
+        try:
+            loaded = await prewarm_popular_tracks()
+            if loaded:
+                logger.info(f"🔥 Pre-warmed {loaded} hot segments ({hot_segment_cache.current_bytes / 1024 / 1024:.1f}MB cached)")
+            await asyncio.sleep(HOT_SEGMENT_PREWARM_INTERVAL)
+        except asyncio.CancelledError:
+            logger.info("Hot segment pre-warm task cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Error in hot segment pre-warm: {e}")
+            await asyncio.sleep(60)
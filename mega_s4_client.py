@@ -8,6 +8,9 @@ from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import hashlib
 import hmac
+import inspect
+import re
+import time
 from urllib.parse import quote
 
 import aiohttp
@@ -19,6 +22,26 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+MB = 1024 * 1024
+
+# Files at or above this size go through S3 multipart upload
+MULTIPART_THRESHOLD = int(os.getenv("MEGA_S4_MULTIPART_THRESHOLD_MB", "64")) * MB
+MULTIPART_PART_SIZE = max(5, int(os.getenv("MEGA_S4_PART_SIZE_MB", "16"))) * MB  # S3 minimum part size is 5 MiB
+MULTIPART_CONCURRENCY = int(os.getenv("MEGA_S4_PART_CONCURRENCY", "4"))
+MULTIPART_MAX_PARTS = 10000
+MULTIPART_RESUME_ROUNDS = 3  # passes over failed parts before giving up on an upload
+# Sign single PUTs with UNSIGNED-PAYLOAD instead of hashing the file first (HTTPS only)
+UNSIGNED_PAYLOAD = os.getenv("MEGA_S4_UNSIGNED_PAYLOAD", "false").lower() == "true"
+STREAM_CHUNK_SIZE = 1 * MB
+
+# Objects at or above this size are fetched with concurrent Range GETs
+RANGED_DOWNLOAD_THRESHOLD = int(os.getenv("MEGA_S4_RANGED_DOWNLOAD_THRESHOLD_MB", "32")) * MB
+RANGED_DOWNLOAD_CONNECTIONS = int(os.getenv("MEGA_S4_DOWNLOAD_CONNECTIONS", "8"))
+RANGED_DOWNLOAD_RANGE_SIZE = int(os.getenv("MEGA_S4_DOWNLOAD_RANGE_MB", "8")) * MB
+RANGE_MAX_RETRIES = 3
+RANGE_READ_TIMEOUT = 60.0  # seconds without data before a range is retried
+PROGRESS_CALLBACK_INTERVAL = 0.5
+
 def _parse_endpoints() -> List[str]:
     """Read MEGA_S4_ENDPOINTS (comma-separated). Fallback to MEGA_S4_ENDPOINT."""
     endpoints_env = os.getenv("MEGA_S4_ENDPOINTS", "").strip()
@@ -39,6 +62,57 @@ def _is_retryable_exception(e: Exception) -> bool:
     keywords = ("timeout", "temporar", "connect", "network", "ssl", "tls", "reset", "unreachable", "refused")
     return any(k in msg for k in keywords)
 
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _read_part(path: Path, offset: int, length: int) -> Tuple[bytes, str]:
+    """Read one multipart part from disk and hash it (runs in a worker thread)"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+    if len(data) != length:
+        raise IOError(f"Short read on {path}: wanted {length} bytes at {offset}, got {len(data)}")
+    return data, hashlib.sha256(data).hexdigest()
+
+async def _iter_file(path: Path):
+    async with aiofiles.open(path, "rb") as f:
+        while True:
+            chunk = await f.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+def _open_preallocated(path: Path, size: int) -> int:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if size:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, 0, size)
+            else:
+                os.ftruncate(fd, size)
+    except OSError:
+        os.ftruncate(fd, size)
+    return fd
+
+def _pwrite_all(fd: int, data: bytes, offset: int):
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+def _response_error(response: aiohttp.ClientResponse, text: str) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(
+        request_info=response.request_info,
+        history=response.history,
+        status=response.status,
+        message=text
+    )
+
 class MegaS4Client:
     """MEGA S4 Object Storage Client - S3-compatible API with automatic retry + endpoint failover"""
 
@@ -53,6 +127,16 @@ class MegaS4Client:
         self.endpoint = self.endpoints[0]  # current/active endpoint
         self._endpoint_idx = 0
 
+        # Multipart upload tuning
+        self.multipart_threshold = MULTIPART_THRESHOLD
+        self.part_size = MULTIPART_PART_SIZE
+        self.part_concurrency = max(1, MULTIPART_CONCURRENCY)
+
+        # Ranged download tuning
+        self.ranged_download_threshold = RANGED_DOWNLOAD_THRESHOLD
+        self.download_connections = max(1, RANGED_DOWNLOAD_CONNECTIONS)
+        self.download_range_size = max(MB, RANGED_DOWNLOAD_RANGE_SIZE)
+
         # Validate configuration
         if not self.access_key or not self.secret_key:
             raise ValueError("Missing MEGA S4 credentials. Check your .env file.")
@@ -99,14 +183,20 @@ class MegaS4Client:
 
     def _create_signature(
         self, method: str, path: str, headers: Dict[str, str],
-        query_params: Dict[str, str] = None, payload: bytes = b""
+        query_params: Dict[str, str] = None, payload: bytes = b"",
+        payload_hash: Optional[str] = None
     ) -> str:
-        """Create AWS Signature Version 4 with canonical request format"""
+        """
+        Create AWS Signature Version 4 with canonical request format.
+        Pass `payload_hash` (precomputed hex digest or "UNSIGNED-PAYLOAD") for
+        bodies that are streamed rather than held in memory.
+        """
         now = datetime.utcnow()
         amz_date = now.strftime("%Y%m%dT%H%M%SZ")
         date_stamp = now.strftime("%Y%m%d")
 
-        payload_hash = hashlib.sha256(payload).hexdigest()
+        if payload_hash is None:
+            payload_hash = hashlib.sha256(payload).hexdigest()
 
         # Host header must reflect the current endpoint
         headers["x-amz-date"] = amz_date
@@ -303,39 +393,44 @@ class MegaS4Client:
         """
         Upload file to S4 with per-endpoint retries and automatic failover.
 
-        NOTE: This implementation reads the whole file to compute the SHA256
-        for SigV4. It keeps your existing behavior. If you later want true
-        streaming + UNSIGNED-PAYLOAD, we can add that too.
+        The file is never loaded whole: files of `multipart_threshold` bytes or
+        more go through S3 multipart upload (`part_size` parts, `part_concurrency`
+        in flight, each hashed for SigV4 as it is read); smaller files are
+        streamed from disk in a single PUT.
         """
         self._ensure_started()
+        local_path = Path(local_path)
+        file_size = (await asyncio.to_thread(local_path.stat)).st_size
+
+        if file_size >= self.multipart_threshold:
+            async def _attempt():
+                return await self._upload_multipart(local_path, object_key, content_type, file_size)
+        else:
+            if UNSIGNED_PAYLOAD:
+                payload_hash = "UNSIGNED-PAYLOAD"
+            else:
+                payload_hash = await asyncio.to_thread(_sha256_file, local_path)
+
+            async def _attempt_once():
+                headers = {"Content-Type": content_type, "Content-Length": str(file_size)}
+                path = f"/{self.bucket_name}/{object_key}"
+                self._create_signature("PUT", path, headers, payload_hash=payload_hash)
+                url = f"{self.endpoint}{path}"
+                async with self.session.put(url, headers=headers, data=_iter_file(local_path)) as response:
+                    if response.status in (200, 201):
+                        logger.info("Uploaded %s (%s bytes) to %s", object_key, file_size, self.endpoint)
+                        return True
+                    error_text = await response.text()
+                    raise _response_error(response, error_text)
 
-        # Read file (for payload hash in signature)
-        async with aiofiles.open(local_path, "rb") as f:
-            file_data = await f.read()
-        file_size = len(file_data)
-
-        async def _attempt_once():
-            headers = {"Content-Type": content_type, "Content-Length": str(file_size)}
-            path = f"/{self.bucket_name}/{object_key}"
-            self._create_signature("PUT", path, headers, payload=file_data)
-            url = f"{self.endpoint}{path}"
-            async with self.session.put(url, headers=headers, data=file_data) as response:
-                if response.status in (200, 201):
-                    logger.info("Uploaded %s (%s bytes) to %s", object_key, file_size, self.endpoint)
-                    return True
-                error_text = await response.text()
-                raise aiohttp.ClientResponseError(
-                    request_info=response.request_info,
-                    history=response.history,
-                    status=response.status,
-                    message=error_text
-                )
+            async def _attempt():
+                return await self._with_failover("upload_file", _attempt_once)
 
         # Retry loop (per current endpoint) + failover on retryable failures
         last_err: Optional[Exception] = None
         for attempt in range(1, max_retries + 1):
             try:
-                return await self._with_failover("upload_file", _attempt_once)
+                return await _attempt()
             except Exception as e:
                 last_err = e
                 if attempt < max_retries:
@@ -348,6 +443,172 @@ class MegaS4Client:
 
         raise Exception(f"Upload failed after {max_retries} attempts: {last_err}")
 
+    # ----------------------- multipart upload -----------------------
+
+    def _query_url(self, path: str, query_params: Dict[str, str]) -> str:
+        qs = "&".join([f"{quote(k, safe='')}={quote(str(v), safe='')}" for k, v in query_params.items()])
+        return f"{self.endpoint}{path}?{qs}"
+
+    async def _upload_multipart(self, local_path: Path, object_key: str, content_type: str, file_size: int) -> bool:
+        """
+        Multipart upload with parallel parts. Parts that fail (after per-part
+        failover) are resumed in further rounds against the same UploadId,
+        reconciled with ListParts first; the upload is aborted if parts are
+        still missing after MULTIPART_RESUME_ROUNDS.
+        """
+        # Grow parts for very large files so we stay under the 10,000 part limit
+        part_size = max(self.part_size, -(-file_size // MULTIPART_MAX_PARTS))
+        parts = [
+            (number, offset, min(part_size, file_size - offset))
+            for number, offset in enumerate(range(0, file_size, part_size), start=1)
+        ]
+
+        upload_id = await self._with_failover(
+            "create_multipart_upload",
+            lambda: self._create_multipart_upload(object_key, content_type)
+        )
+        logger.info("Started multipart upload of %s: %d parts x %d bytes (upload_id=%s)",
+                    object_key, len(parts), part_size, upload_id)
+
+        etags: Dict[int, str] = {}
+        try:
+            for round_number in range(1, MULTIPART_RESUME_ROUNDS + 1):
+                pending = [part for part in parts if part[0] not in etags]
+                if not pending:
+                    break
+                if round_number > 1:
+                    # A part may have landed even though we saw an error
+                    uploaded = await self._with_failover(
+                        "list_parts", lambda: self._list_parts(object_key, upload_id)
+                    )
+                    for number, offset, length in pending:
+                        etag, size = uploaded.get(number, (None, None))
+                        if etag and size == length:
+                            etags[number] = etag
+                    pending = [part for part in parts if part[0] not in etags]
+                    logger.warning("Resuming multipart upload of %s: %d part(s) left (round %d)",
+                                   object_key, len(pending), round_number)
+                await self._upload_parts(local_path, object_key, upload_id, pending, etags)
+
+            missing = [number for number, _, _ in parts if number not in etags]
+            if missing:
+                raise RuntimeError(f"Multipart upload of {object_key} is missing parts {missing[:10]}")
+
+            await self._with_failover(
+                "complete_multipart_upload",
+                lambda: self._complete_multipart_upload(object_key, upload_id, etags)
+            )
+        except BaseException:
+            await asyncio.shield(self._abort_multipart_upload(object_key, upload_id))
+            raise
+
+        logger.info("Uploaded %s (%s bytes, %d parts) to %s", object_key, file_size, len(parts), self.endpoint)
+        return True
+
+    async def _upload_parts(self, local_path: Path, object_key: str, upload_id: str, parts, etags: Dict[int, str]):
+        semaphore = asyncio.Semaphore(self.part_concurrency)
+
+        async def _one(number: int, offset: int, length: int):
+            async with semaphore:
+                try:
+                    etags[number] = await self._with_failover(
+                        "upload_part",
+                        lambda: self._upload_part(local_path, object_key, upload_id, number, offset, length)
+                    )
+                except Exception as e:
+                    logger.warning("Part %d of %s failed: %s", number, object_key, e)
+
+        await asyncio.gather(*(_one(*part) for part in parts))
+
+    async def _create_multipart_upload(self, object_key: str, content_type: str) -> str:
+        headers = {"Content-Type": content_type}
+        query_params = {"uploads": ""}
+        path = f"/{self.bucket_name}/{object_key}"
+        self._create_signature("POST", path, headers, query_params)
+        async with self.session.post(self._query_url(path, query_params), headers=headers) as response:
+            text = await response.text()
+            if response.status != 200:
+                raise _response_error(response, text)
+        match = re.search(r"<UploadId>(.*?)</UploadId>", text)
+        if not match:
+            raise RuntimeError(f"CreateMultipartUpload returned no UploadId for {object_key}")
+        return match.group(1)
+
+    async def _upload_part(
+        self, local_path: Path, object_key: str, upload_id: str, number: int, offset: int, length: int
+    ) -> str:
+        # Only this part is held in memory, and only while it is in flight
+        data, payload_hash = await asyncio.to_thread(_read_part, local_path, offset, length)
+        headers = {"Content-Length": str(length)}
+        query_params = {"partNumber": str(number), "uploadId": upload_id}
+        path = f"/{self.bucket_name}/{object_key}"
+        self._create_signature("PUT", path, headers, query_params, payload_hash=payload_hash)
+        async with self.session.put(self._query_url(path, query_params), headers=headers, data=data) as response:
+            if response.status == 200:
+                etag = response.headers.get("ETag")
+                if not etag:
+                    raise RuntimeError(f"UploadPart {number} of {object_key} returned no ETag")
+                return etag
+            text = await response.text()
+            raise _response_error(response, text)
+
+    async def _list_parts(self, object_key: str, upload_id: str) -> Dict[int, Tuple[str, int]]:
+        """Parts already stored for an upload: {part_number: (etag, size)}"""
+        uploaded: Dict[int, Tuple[str, int]] = {}
+        marker = "0"
+        while True:
+            headers: Dict[str, str] = {}
+            query_params = {"uploadId": upload_id, "part-number-marker": marker}
+            path = f"/{self.bucket_name}/{object_key}"
+            self._create_signature("GET", path, headers, query_params)
+            async with self.session.get(self._query_url(path, query_params), headers=headers) as response:
+                text = await response.text()
+                if response.status != 200:
+                    raise _response_error(response, text)
+
+            for part_xml in re.findall(r"<Part>(.*?)</Part>", text, re.S):
+                number = re.search(r"<PartNumber>(\d+)</PartNumber>", part_xml)
+                etag = re.search(r"<ETag>(.*?)</ETag>", part_xml)
+                size = re.search(r"<Size>(\d+)</Size>", part_xml)
+                if number and etag and size:
+                    uploaded[int(number.group(1))] = (etag.group(1).replace("&quot;", '"'), int(size.group(1)))
+
+            next_marker = re.search(r"<NextPartNumberMarker>(\d+)</NextPartNumberMarker>", text)
+            if "<IsTruncated>true</IsTruncated>" not in text or not next_marker:
+                return uploaded
+            marker = next_marker.group(1)
+
+    async def _complete_multipart_upload(self, object_key: str, upload_id: str, etags: Dict[int, str]):
+        body = "<CompleteMultipartUpload>" + "".join(
+            f"<Part><PartNumber>{number}</PartNumber><ETag>{etags[number]}</ETag></Part>"
+            for number in sorted(etags)
+        ) + "</CompleteMultipartUpload>"
+        payload = body.encode("utf-8")
+
+        headers = {"Content-Type": "application/xml", "Content-Length": str(len(payload))}
+        query_params = {"uploadId": upload_id}
+        path = f"/{self.bucket_name}/{object_key}"
+        self._create_signature("POST", path, headers, query_params, payload=payload)
+        async with self.session.post(self._query_url(path, query_params), headers=headers, data=payload) as response:
+            text = await response.text()
+            # S3 can report a failed completion inside a 200 response
+            if response.status != 200 or "<Error>" in text:
+                raise _response_error(response, text)
+
+    async def _abort_multipart_upload(self, object_key: str, upload_id: str):
+        """Best effort - lifecycle rules clean up anything this misses"""
+        try:
+            headers: Dict[str, str] = {}
+            query_params = {"uploadId": upload_id}
+            path = f"/{self.bucket_name}/{object_key}"
+            self._create_signature("DELETE", path, headers, query_params)
+            async with self.session.delete(self._query_url(path, query_params), headers=headers) as response:
+                if response.status not in (200, 204, 404):
+                    logger.warning("Abort of multipart upload %s for %s returned %s",
+                                   upload_id, object_key, response.status)
+        except Exception as e:
+            logger.warning("Failed to abort multipart upload %s for %s: %s", upload_id, object_key, e)
+
     async def object_exists(self, object_key: str) -> bool:
         """HEAD an object, with failover."""
         self._ensure_started()
@@ -398,6 +659,162 @@ class MegaS4Client:
 
         return await self._with_failover("download_file_stream", _do)
 
+    async def get_object_size(self, object_key: str) -> Optional[int]:
+        """HEAD an object and return its size (None if it doesn't exist), with failover."""
+        self._ensure_started()
+
+        async def _do():
+            headers: Dict[str, str] = {}
+            path = f"/{self.bucket_name}/{object_key}"
+            self._create_signature("HEAD", path, headers)
+            url = f"{self.endpoint}{path}"
+            async with self.session.head(url, headers=headers) as response:
+                if response.status == 200:
+                    return int(response.headers.get("Content-Length", 0))
+                elif response.status == 404:
+                    return None
+                txt = await response.text()
+                raise _response_error(response, txt)
+
+        return await self._with_failover("get_object_size", _do)
+
+    async def download_file_ranged(
+        self,
+        object_key: str,
+        local_path: Path,
+        size: Optional[int] = None,
+        progress_callback=None,
+    ) -> int:
+        """
+        Download an object into `local_path` with concurrent Range GETs.
+
+        The file is preallocated and each range is written at its offset with
+        os.pwrite, so ranges land in any order. A failed range is retried
+        (RANGE_MAX_RETRIES, each attempt with endpoint failover) from the last
+        byte it wrote. Objects below `ranged_download_threshold` use a single
+        connection through the same path.
+
+        `progress_callback(downloaded, total)` (sync or async) is called at most
+        every PROGRESS_CALLBACK_INTERVAL seconds and once at the end.
+
+        Returns the number of bytes written; the partial file is removed on failure.
+        """
+        self._ensure_started()
+        local_path = Path(local_path)
+        if size is None:
+            size = await self.get_object_size(object_key)
+            if size is None:
+                raise FileNotFoundError(f"S4 object not found: {object_key}")
+
+        if size >= self.ranged_download_threshold:
+            range_size = max(self.download_range_size, -(-size // 10000))
+            connections = self.download_connections
+        else:
+            range_size = max(size, 1)
+            connections = 1
+        ranges = [(start, min(start + range_size, size) - 1) for start in range(0, size, range_size)]
+
+        progress = {"downloaded": 0, "reported_at": 0.0}
+
+        async def _report(force: bool = False):
+            if not progress_callback:
+                return
+            now = time.monotonic()
+            if not force and now - progress["reported_at"] < PROGRESS_CALLBACK_INTERVAL:
+                return
+            progress["reported_at"] = now
+            result = progress_callback(progress["downloaded"], size)
+            if inspect.isawaitable(result):
+                await result
+
+        fd = await asyncio.to_thread(_open_preallocated, local_path, size)
+        started = time.monotonic()
+        try:
+            semaphore = asyncio.Semaphore(connections)
+
+            async def _fetch(start: int, end: int):
+                async with semaphore:
+                    offset = start
+                    for attempt in range(1, RANGE_MAX_RETRIES + 1):
+                        try:
+                            async def _on_bytes(count: int):
+                                nonlocal offset
+                                offset += count
+                                progress["downloaded"] += count
+                                await _report()
+
+                            await self._with_failover(
+                                "download_range",
+                                lambda: self._download_range(object_key, fd, offset, end, size, _on_bytes)
+                            )
+                            return
+                        except Exception as e:
+                            if attempt == RANGE_MAX_RETRIES:
+                                raise
+                            delay = 2 ** (attempt - 1)
+                            logger.warning("Range %d-%d of %s failed at byte %d (attempt %d/%d): %s; retrying in %ds",
+                                           start, end, object_key, offset, attempt, RANGE_MAX_RETRIES, e, delay)
+                            await asyncio.sleep(delay)
+
+            tasks = [asyncio.create_task(_fetch(start, end)) for start, end in ranges]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            await _report(force=True)
+        except BaseException:
+            await asyncio.to_thread(os.close, fd)
+            fd = None
+            try:
+                local_path.unlink()
+            except FileNotFoundError:
+                pass
+            raise
+        finally:
+            if fd is not None:
+                await asyncio.to_thread(os.close, fd)
+
+        elapsed = max(time.monotonic() - started, 1e-3)
+        logger.info("Ranged download of %s: %d bytes in %.1fs (%.1f MB/s, %d range(s), %d connection(s))",
+                    object_key, size, elapsed, size / MB / elapsed, len(ranges), connections)
+        return size
+
+    async def _download_range(self, object_key: str, fd: int, start: int, end: int, size: int, on_bytes):
+        """GET bytes start..end (inclusive) and pwrite them at their offset"""
+        if start > end:
+            return
+        headers: Dict[str, str] = {"Range": f"bytes={start}-{end}"}
+        path = f"/{self.bucket_name}/{object_key}"
+        self._create_signature("GET", path, headers)
+        url = f"{self.endpoint}{path}"
+        async with self.session.get(url, headers=headers) as response:
+            # A server may ignore Range for a request covering the whole object
+            if response.status != 206 and not (response.status == 200 and start == 0 and end == size - 1):
+                txt = await response.text()
+                raise _response_error(response, txt)
+
+            offset = start
+            buffer = bytearray()
+            while True:
+                chunk = await asyncio.wait_for(response.content.read(STREAM_CHUNK_SIZE), timeout=RANGE_READ_TIMEOUT)
+                if chunk:
+                    buffer += chunk
+                if buffer and (len(buffer) >= STREAM_CHUNK_SIZE or not chunk):
+                    await asyncio.to_thread(_pwrite_all, fd, bytes(buffer), offset)
+                    offset += len(buffer)
+                    await on_bytes(len(buffer))
+                    buffer.clear()
+                if not chunk:
+                    break
+
+            if offset != end + 1:
+                raise aiohttp.ClientPayloadError(
+                    f"Range {start}-{end} of {object_key} ended early at byte {offset}"
+                )
+
     async def delete_object(self, object_key: str) -> bool:
         """DELETE object, with failover."""
         self._ensure_started()
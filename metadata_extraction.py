@@ -9,6 +9,7 @@ import json
 from datetime import datetime
 from sqlalchemy.orm import Session
 from worker_config import worker_config
+from audio_frame_parser import probe_audio_file
 
 logger = logging.getLogger(__name__)
 
@@ -99,8 +100,12 @@ class MetadataExtractionQueue:
         logger.info("Metadata extraction workers stopped")
 
     async def _extract_metadata(self, file_path: Path) -> Optional[Dict]:
-        """Extract metadata using ffprobe."""
+        """Extract metadata from MP3/ADTS frame headers, ffprobe for anything else."""
         try:
+            probed = await asyncio.to_thread(probe_audio_file, file_path)
+            if probed:
+                return {**probed, 'extracted_at': datetime.utcnow().isoformat()}
+
             cmd = [
                 'ffprobe',
                 '-v', 'error',
@@ -0,0 +1,237 @@
+"""
+Streaming MP3 concatenation without ffmpeg
+
+Every Edge TTS chunk of a job has the same voice, sample rate and bitrate, so
+joining them does not need a demux/remux: the final MP3 is the chunks' frames
+back to back. The old ffmpeg `-f concat -c:a copy` pass read and rewrote the
+whole book through a subprocess (under FFMPEG_SEMAPHORE) for the same result.
+
+concat_mp3_files():
+
+- walks every chunk with AudioFrameCounter, which gives the exact audio
+  payload range (leading ID3v2 and Xing/Info/VBRI frames and trailing
+  ID3v1/junk excluded), the frame count and a frame-accurate duration
+- refuses (returns None) when a chunk is not clean MP3/ADTS or the chunks'
+  signatures (codec, version, layer, sample rate, channels) differ, so the
+  caller can fall back to ffmpeg
+- writes one fresh Xing/Info frame for Layer III output (frame count, byte
+  count and a seek TOC built from the chunk boundaries), then splices every
+  payload with os.copy_file_range (in-kernel copy), falling back to large
+  buffered reads/writes
+
+Blocking; run it in a thread.
+"""
+
+import logging
+import os
+import struct
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from audio_frame_parser import AudioFrameCounter, PROBE_READ_SIZE, _parse_mpeg_header
+
+logger = logging.getLogger(__name__)
+
+COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+_XING_FLAGS = 0x0001 | 0x0002 | 0x0004  # frames, bytes, TOC
+_XING_TAG_SIZE = 4 + 4 + 4 + 4 + 100
+
+
+@dataclass
+class ChunkLayout:
+    path: Path
+    start: int
+    end: int
+    frames: int
+    duration: float
+    signature: tuple
+    first_header: bytes
+    is_cbr: bool
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+@dataclass
+class ConcatResult:
+    size: int
+    frames: int
+    duration: float
+    chunk_durations: List[float]
+
+
+def inspect_chunk(path: Path) -> Optional[ChunkLayout]:
+    """Payload layout of one chunk, or None if it cannot be spliced byte-wise"""
+    counter = AudioFrameCounter()
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                data = f.read(PROBE_READ_SIZE)
+                if not data:
+                    break
+                counter.feed(data)
+                if counter.unrecognized:
+                    return None
+    except OSError as e:
+        logger.debug(f"Cannot inspect {path}: {e}")
+        return None
+    counter.finish()
+
+    if not counter.is_valid or counter.interior_junk or counter.audio_start is None:
+        return None
+    return ChunkLayout(
+        path=path,
+        start=counter.audio_start,
+        end=counter.audio_end,
+        frames=counter.frames,
+        duration=counter.duration,
+        signature=counter.signature,
+        first_header=counter.first_header,
+        is_cbr=counter.is_cbr,
+    )
+
+
+def _side_info_size(version: str, channels: int) -> int:
+    if version == "1":
+        return 32 if channels == 2 else 17
+    return 17 if channels == 2 else 9
+
+
+def _build_xing_frame(first_header: bytes, frames: int, payload_bytes: int, toc: bytes, cbr: bool) -> bytes:
+    """A silent Layer III frame carrying an Info (CBR) or Xing (VBR) tag, matching first_header"""
+    b1 = first_header[1] | 0x01  # no CRC
+    b3 = first_header[3]
+    rate_bits = first_header[2] & 0x0C
+    channels = 1 if (b3 >> 6) == 3 else 2
+
+    for bitrate_index in range(1, 15):
+        header = bytes((0xFF, b1, (bitrate_index << 4) | rate_bits, b3))
+        parsed = _parse_mpeg_header(header, 0)
+        if parsed is None:
+            continue
+        length, _, _, _, version, _ = parsed
+        tag_offset = 4 + _side_info_size(version, channels)
+        if length >= tag_offset + _XING_TAG_SIZE:
+            break
+    else:
+        raise ValueError("No bitrate leaves room for a Xing tag")
+
+    frame = bytearray(length)
+    frame[0:4] = header
+    frame[tag_offset:tag_offset + _XING_TAG_SIZE] = (
+        (b"Info" if cbr else b"Xing")
+        + struct.pack(">III", _XING_FLAGS, frames, payload_bytes + length)
+        + toc
+    )
+    return bytes(frame)
+
+
+def _build_toc(layouts: Sequence[ChunkLayout], total_duration: float, header_length: int, total_bytes: int) -> bytes:
+    """Xing seek table: file position (1/256ths) at each percent of duration, linear within chunks"""
+    points = [(0.0, header_length)]
+    elapsed, position = 0.0, header_length
+    for layout in layouts:
+        elapsed += layout.duration
+        position += layout.size
+        points.append((elapsed, position))
+
+    toc = bytearray(100)
+    segment = 0
+    for percent in range(100):
+        target = total_duration * percent / 100
+        while segment < len(points) - 2 and points[segment + 1][0] < target:
+            segment += 1
+        (t0, p0), (t1, p1) = points[segment], points[segment + 1]
+        fraction = (target - t0) / (t1 - t0) if t1 > t0 else 0.0
+        toc[percent] = min(255, int(256 * (p0 + fraction * (p1 - p0)) / total_bytes))
+    return bytes(toc)
+
+
+def _copy_range(src_fd: int, dst_fd: int, offset: int, count: int):
+    """Append src[offset:offset + count] to dst"""
+    if hasattr(os, "copy_file_range"):
+        try:
+            while count > 0:
+                copied = os.copy_file_range(src_fd, dst_fd, min(count, 1 << 30), offset_src=offset)
+                if copied == 0:
+                    raise OSError("copy_file_range returned 0 before the end of the range")
+                offset += copied
+                count -= copied
+            return
+        except OSError as e:
+            logger.debug(f"copy_file_range unavailable ({e}), using buffered copy")
+
+    while count > 0:
+        data = os.pread(src_fd, min(count, COPY_BUFFER_SIZE), offset)
+        if not data:
+            raise OSError("Chunk shorter than its inspected payload")
+        os.write(dst_fd, data)
+        offset += len(data)
+        count -= len(data)
+
+
+def concat_mp3_files(chunk_files: Sequence[Path], output_path: Path) -> Optional[ConcatResult]:
+    """
+    Splice chunk payloads into output_path (atomically). Returns None, without
+    touching output_path, when the chunks are not byte-wise compatible.
+    """
+    if not chunk_files:
+        return None
+
+    layouts = []
+    for path in chunk_files:
+        layout = inspect_chunk(Path(path))
+        if layout is None:
+            logger.info(f"Streaming concat not possible: {path} is not clean MP3/ADTS")
+            return None
+        if layouts and layout.signature != layouts[0].signature:
+            logger.info(f"Streaming concat not possible: {path} differs in format from {layouts[0].path}")
+            return None
+        layouts.append(layout)
+
+    first = layouts[0]
+    frames = sum(layout.frames for layout in layouts)
+    duration = sum(layout.duration for layout in layouts)
+    payload_bytes = sum(layout.size for layout in layouts)
+
+    header = b""
+    codec, (version, layer, _), _ = first.signature
+    if codec == "mp3" and layer == 3:
+        bitrates = {layout.first_header[2] >> 4 for layout in layouts}
+        cbr = len(bitrates) == 1 and all(layout.is_cbr for layout in layouts)
+        probe = _build_xing_frame(first.first_header, frames, payload_bytes, bytes(100), cbr)
+        toc = _build_toc(layouts, duration, len(probe), payload_bytes + len(probe))
+        header = _build_xing_frame(first.first_header, frames, payload_bytes, toc, cbr)
+
+    tmp_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        dst_fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if header:
+                os.write(dst_fd, header)
+            for layout in layouts:
+                src_fd = os.open(layout.path, os.O_RDONLY)
+                try:
+                    _copy_range(src_fd, dst_fd, layout.start, layout.size)
+                finally:
+                    os.close(src_fd)
+        finally:
+            os.close(dst_fd)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return ConcatResult(
+        size=len(header) + payload_bytes,
+        frames=frames,
+        duration=duration,
+        chunk_durations=[layout.duration for layout in layouts],
+    )
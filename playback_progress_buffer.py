@@ -0,0 +1,450 @@
+"""
+Write-behind buffer for playback progress
+
+Client heartbeats (POST /api/progress/save) are the largest write volume we
+have. Instead of loading and committing PlaybackProgress/TrackPlays/Track on
+every heartbeat, the latest state per (user, track) lives in Redis and a
+background flusher bulk-upserts it into Postgres.
+
+Redis layout (namespace "playback_progress"):
+
+    playback_progress:state:{user_id}:{track_id}  hash  latest PlaybackProgress fields
+                                                        + pending TrackPlays/Track deltas (d_*)
+    playback_progress:user:{user_id}              set   track_ids with buffered state
+    playback_progress:dirty                       set   "{user_id}:{track_id}" awaiting flush
+
+- Flushes every PROGRESS_FLUSH_INTERVAL seconds, or as soon as
+  PROGRESS_MAX_DIRTY entries are waiting
+- SPOP hands each dirty entry to exactly one worker/replica
+- A failed batch is retried row by row; rows that still fail (track or user
+  deleted in the meantime) are dropped
+- PROGRESS_WRITE_BEHIND=false, or Redis being unreachable, writes through
+- Shutdown drains the dirty set (flush_all)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from models import PlaybackProgress, TrackPlays, Track
+from redis_state.async_state_manager import AsyncRedisStateManager
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_WRITE_BEHIND = os.getenv('PROGRESS_WRITE_BEHIND', 'true').lower() == 'true'
+PROGRESS_FLUSH_INTERVAL = float(os.getenv('PROGRESS_FLUSH_INTERVAL', '10'))
+PROGRESS_MAX_DIRTY = int(os.getenv('PROGRESS_MAX_DIRTY', '2000'))
+PROGRESS_FLUSH_BATCH = 500
+PROGRESS_STATE_TTL = 86400  # buffered state doubles as the read cache for a day
+
+STATE_FIELDS = (
+    'position', 'duration', 'completed', 'completion_rate', 'play_count',
+    'counted_as_listen', 'counted_as_completion', 'word_position',
+    'last_voice_id', 'device_info', 'last_played'
+)
+DELTA_FIELDS = ('d_listens', 'd_completions', 'd_play_time', 'd_rate_sum', 'd_rate_n', 'd_access')
+
+
+def _encode(state: Dict[str, Any]) -> Dict[str, str]:
+    """State dict -> Redis hash mapping (None is stored as '')"""
+    encoded = {}
+    for field in STATE_FIELDS:
+        value = state.get(field)
+        if field == 'device_info':
+            encoded[field] = json.dumps(value) if value is not None else ''
+        elif field == 'last_played':
+            encoded[field] = str(value.timestamp()) if value else ''
+        elif isinstance(value, bool):
+            encoded[field] = '1' if value else '0'
+        else:
+            encoded[field] = '' if value is None else str(value)
+    return encoded
+
+
+def _decode(raw: Dict[str, str]) -> Dict[str, Any]:
+    """Redis hash -> state dict with the same types as the PlaybackProgress columns"""
+    def _float(name):
+        value = raw.get(name)
+        return float(value) if value else 0.0
+
+    def _int(name):
+        value = raw.get(name)
+        return int(value) if value else None
+
+    last_played = raw.get('last_played')
+    device_info = raw.get('device_info')
+    return {
+        'position': _float('position'),
+        'duration': _float('duration'),
+        'completed': raw.get('completed') == '1',
+        'completion_rate': _float('completion_rate'),
+        'play_count': _int('play_count') or 0,
+        'counted_as_listen': raw.get('counted_as_listen') == '1',
+        'counted_as_completion': raw.get('counted_as_completion') == '1',
+        'word_position': _int('word_position'),
+        'last_voice_id': raw.get('last_voice_id') or None,
+        'device_info': json.loads(device_info) if device_info else None,
+        'last_played': datetime.fromtimestamp(float(last_played), tz=timezone.utc) if last_played else None,
+    }
+
+
+def _decode_deltas(raw: Dict[str, str]) -> Dict[str, float]:
+    return {field: float(raw.get(field) or 0) for field in DELTA_FIELDS}
+
+
+def state_from_record(record: PlaybackProgress) -> Dict[str, Any]:
+    return {
+        'position': record.position or 0.0,
+        'duration': record.duration or 0.0,
+        'completed': bool(record.completed),
+        'completion_rate': record.completion_rate or 0.0,
+        'play_count': record.play_count or 0,
+        'counted_as_listen': bool(record.counted_as_listen),
+        'counted_as_completion': bool(record.counted_as_completion),
+        'word_position': record.word_position,
+        'last_voice_id': record.last_voice_id,
+        'device_info': record.device_info,
+        'last_played': record.last_played,
+    }
+
+
+class PlaybackProgressBuffer:
+    """Latest playback state per (user, track) in Redis, flushed to Postgres in batches"""
+
+    def __init__(
+        self,
+        flush_interval: float = PROGRESS_FLUSH_INTERVAL,
+        max_dirty: int = PROGRESS_MAX_DIRTY,
+        write_behind: bool = PROGRESS_WRITE_BEHIND
+    ):
+        self._manager = AsyncRedisStateManager("playback_progress")
+        self.flush_interval = flush_interval
+        self.max_dirty = max_dirty
+        self.write_behind = write_behind
+        self._flush_requested: Optional[asyncio.Event] = None
+        self.buffered_saves = 0
+        self.write_through_saves = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.rows_dropped = 0
+        self.flush_errors = 0
+
+    # ===== Keys =====
+
+    def _state_key(self, user_id: int, track_id: str) -> str:
+        return self._manager._key("state", str(user_id), str(track_id))
+
+    def _user_key(self, user_id: int) -> str:
+        return self._manager._key("user", str(user_id))
+
+    def _dirty_key(self) -> str:
+        return self._manager._key("dirty")
+
+    # ===== Reads =====
+
+    async def get_buffered(self, user_id: int, track_id: str) -> Optional[Dict[str, Any]]:
+        """Buffered state for one track, or None if it isn't in Redis"""
+        raw = await self._manager.redis.hgetall(self._state_key(user_id, track_id))
+        return _decode(raw) if raw and raw.get('last_played') else None
+
+    async def get_state(self, user_id: int, track_id: str, db) -> Optional[Dict[str, Any]]:
+        """Latest state: Redis first, then the PlaybackProgress row (None if neither exists)"""
+        state = await self.get_buffered(user_id, track_id)
+        if state is not None:
+            return state
+
+        def _load():
+            record = db.query(PlaybackProgress).filter(
+                PlaybackProgress.user_id == user_id,
+                PlaybackProgress.track_id == track_id
+            ).first()
+            return state_from_record(record) if record else None
+
+        return await asyncio.to_thread(_load)
+
+    async def get_user_buffered(self, user_id: int) -> Dict[str, Dict[str, Any]]:
+        """All buffered states of a user: {track_id: state}"""
+        track_ids = list(await self._manager.redis.smembers(self._user_key(user_id)) or [])
+        if not track_ids:
+            return {}
+        pipe = self._manager.pipeline(transaction=False)
+        for track_id in track_ids:
+            pipe.hgetall(self._state_key(user_id, track_id))
+        results = await pipe.execute()
+
+        states = {}
+        for track_id, raw in zip(track_ids, results):
+            if raw and raw.get('last_played'):
+                states[track_id] = _decode(raw)
+        return states
+
+    # ===== Writes =====
+
+    async def save(self, user_id: int, track_id: str, state: Dict[str, Any], deltas: Dict[str, float]):
+        """Buffer the new state and accumulated deltas; writes through when Redis is unavailable"""
+        if self.write_behind:
+            state_key = self._state_key(user_id, track_id)
+            user_key = self._user_key(user_id)
+            dirty_key = self._dirty_key()
+
+            pipe = self._manager.pipeline(transaction=True)
+            pipe.hset(state_key, mapping=_encode(state))
+            for field, amount in deltas.items():
+                if not amount:
+                    continue
+                if isinstance(amount, float):
+                    pipe.hincrbyfloat(state_key, field, amount)
+                else:
+                    pipe.hincrby(state_key, field, amount)
+            pipe.expire(state_key, PROGRESS_STATE_TTL)
+            pipe.sadd(user_key, str(track_id))
+            pipe.expire(user_key, PROGRESS_STATE_TTL)
+            pipe.sadd(dirty_key, f"{user_id}:{track_id}")
+            pipe.scard(dirty_key)
+            results = await pipe.execute()
+
+            # SCARD is at least 1 right after SADD - 0 means the fallback value
+            dirty = results[-1] if results else 0
+            if dirty:
+                self.buffered_saves += 1
+                if dirty >= self.max_dirty:
+                    self.request_flush()
+                return
+
+        self.write_through_saves += 1
+        row = (user_id, str(track_id), state, {field: float(amount) for field, amount in deltas.items()})
+        await asyncio.to_thread(self._write_rows, [row])
+
+    # ===== Flushing =====
+
+    def request_flush(self):
+        if self._flush_requested is not None:
+            self._flush_requested.set()
+
+    async def flush(self, limit: int = PROGRESS_FLUSH_BATCH) -> int:
+        """Move up to `limit` dirty entries from Redis into Postgres; returns rows written"""
+        _, written = await self._flush_batch(limit)
+        return written
+
+    async def flush_all(self) -> int:
+        """Drain the dirty set (interval flush and shutdown)"""
+        total = 0
+        while True:
+            popped, written = await self._flush_batch(PROGRESS_FLUSH_BATCH)
+            total += written
+            if popped < PROGRESS_FLUSH_BATCH or not written:
+                return total
+
+    async def _flush_batch(self, limit: int) -> Tuple[int, int]:
+        pipe = self._manager.pipeline(transaction=False)
+        pipe.spop(self._dirty_key(), limit)
+        members = (await pipe.execute())[0] or []
+        if not members:
+            return 0, 0
+
+        entries: List[Tuple[int, str]] = []
+        for member in members:
+            user_id, _, track_id = member.partition(':')
+            entries.append((int(user_id), track_id))
+
+        # Snapshot state and take the deltas atomically, so concurrent saves
+        # accumulate into the next flush instead of being lost
+        snapshot = self._manager.pipeline(transaction=True)
+        for user_id, track_id in entries:
+            state_key = self._state_key(user_id, track_id)
+            snapshot.hgetall(state_key)
+            snapshot.hdel(state_key, *DELTA_FIELDS)
+        results = await snapshot.execute()
+
+        rows = []
+        for index, (user_id, track_id) in enumerate(entries):
+            raw = results[index * 2] if results else None
+            if raw and raw.get('last_played'):
+                rows.append((user_id, track_id, _decode(raw), _decode_deltas(raw)))
+        if not rows:
+            return len(members), 0
+
+        try:
+            written = await asyncio.to_thread(self._write_rows, rows)
+        except Exception as e:
+            self.flush_errors += 1
+            logger.error(f"Playback progress flush failed, re-queueing {len(rows)} entries: {e}")
+            await self._requeue(rows)
+            return len(members), 0
+
+        self.flushes += 1
+        self.rows_flushed += written
+        self.rows_dropped += len(rows) - written
+        return len(members), written
+
+    async def _requeue(self, rows):
+        pipe = self._manager.pipeline(transaction=False)
+        for user_id, track_id, _, deltas in rows:
+            state_key = self._state_key(user_id, track_id)
+            for field, amount in deltas.items():
+                if amount:
+                    pipe.hincrbyfloat(state_key, field, amount)
+            pipe.sadd(self._dirty_key(), f"{user_id}:{track_id}")
+        await pipe.execute()
+
+    def _write_rows(self, rows) -> int:
+        """Bulk upsert PlaybackProgress/TrackPlays and bump Track access stats (thread pool)"""
+        from database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            try:
+                self._upsert(db, rows)
+                db.commit()
+                return len(rows)
+            except Exception as e:
+                db.rollback()
+                if len(rows) == 1:
+                    raise
+                logger.warning(f"Batch upsert of {len(rows)} progress rows failed, retrying one by one: {e}")
+
+            written = 0
+            for row in rows:
+                try:
+                    self._upsert(db, [row])
+                    db.commit()
+                    written += 1
+                except Exception as e:
+                    db.rollback()
+                    logger.warning(f"Dropping buffered progress for user {row[0]} track {row[1]}: {e}")
+            return written
+        finally:
+            db.close()
+
+    @staticmethod
+    def _upsert(db, rows):
+        now = datetime.now(timezone.utc)
+
+        progress_rows = []
+        plays_rows = []
+        access_rows = {}
+        for user_id, track_id, state, deltas in rows:
+            last_played = state['last_played'] or now
+            progress_rows.append({
+                'user_id': user_id,
+                'track_id': track_id,
+                'position': state['position'],
+                'duration': state['duration'],
+                'completed': state['completed'],
+                'completion_rate': state['completion_rate'],
+                'play_count': state['play_count'],
+                'counted_as_listen': state['counted_as_listen'],
+                'counted_as_completion': state['counted_as_completion'],
+                'word_position': state['word_position'],
+                'last_voice_id': state['last_voice_id'],
+                'device_info': state['device_info'],
+                'last_played': last_played,
+                'updated_at': now,
+            })
+            if deltas['d_rate_n'] or deltas['d_listens'] or deltas['d_completions']:
+                plays_rows.append({
+                    'user_id': user_id,
+                    'track_id': track_id,
+                    'play_count': int(deltas['d_listens']),
+                    'completions_count': int(deltas['d_completions']),
+                    'total_play_time': deltas['d_play_time'],
+                    'completion_rate': deltas['d_rate_sum'] / deltas['d_rate_n'] if deltas['d_rate_n'] else None,
+                    'last_played': last_played,
+                })
+            if deltas['d_access']:
+                count, latest = access_rows.get(track_id, (0, last_played))
+                access_rows[track_id] = (count + int(deltas['d_access']), max(latest, last_played))
+
+        stmt = insert(PlaybackProgress)
+        excluded = stmt.excluded
+        db.execute(
+            stmt.on_conflict_do_update(
+                constraint='uq_user_track_progress',
+                set_={column: getattr(excluded, column) for column in progress_rows[0] if column not in ('user_id', 'track_id')}
+            ),
+            progress_rows
+        )
+
+        if plays_rows:
+            stmt = insert(TrackPlays)
+            excluded = stmt.excluded
+            prior_plays = func.coalesce(TrackPlays.play_count, 0) + func.coalesce(TrackPlays.completions_count, 0)
+            db.execute(
+                stmt.on_conflict_do_update(
+                    constraint='uq_track_user_plays',
+                    set_={
+                        'play_count': func.coalesce(TrackPlays.play_count, 0) + excluded.play_count,
+                        'completions_count': func.coalesce(TrackPlays.completions_count, 0) + excluded.completions_count,
+                        'total_play_time': func.coalesce(TrackPlays.total_play_time, 0) + excluded.total_play_time,
+                        # Running average, weighted like TrackPlays.increment_play (one sample per flush)
+                        'completion_rate': func.coalesce(
+                            (func.coalesce(TrackPlays.completion_rate, excluded.completion_rate) * func.greatest(prior_plays, 1)
+                             + excluded.completion_rate) / (func.greatest(prior_plays, 1) + 1),
+                            TrackPlays.completion_rate
+                        ),
+                        'last_played': func.greatest(TrackPlays.last_played, excluded.last_played),
+                        'updated_at': now,
+                    }
+                ),
+                plays_rows
+            )
+
+        for track_id, (count, last_accessed) in access_rows.items():
+            db.query(Track).filter(Track.id == track_id).update(
+                {
+                    Track.last_accessed: func.greatest(Track.last_accessed, last_accessed),
+                    Track.access_count: func.coalesce(Track.access_count, 0) + count
+                },
+                synchronize_session=False
+            )
+
+    # ===== Metrics =====
+
+    async def get_stats(self) -> Dict[str, Any]:
+        return {
+            'write_behind': self.write_behind,
+            'flush_interval_seconds': self.flush_interval,
+            'max_dirty': self.max_dirty,
+            'dirty_entries': await self._manager.redis.scard(self._dirty_key()),
+            'buffered_saves': self.buffered_saves,
+            'write_through_saves': self.write_through_saves,
+            'flushes': self.flushes,
+            'rows_flushed': self.rows_flushed,
+            'rows_dropped': self.rows_dropped,
+            'flush_errors': self.flush_errors
+        }
+
+
+# Global singleton instance
+playback_progress_buffer = PlaybackProgressBuffer()
+
+
+async def playback_progress_flush_loop():
+    """Background task: flush buffered progress on the interval or when too much is dirty"""
+    buffer = playback_progress_buffer
+    buffer._flush_requested = asyncio.Event()
+    while True:
+        try:
+            try:
+                await asyncio.wait_for(buffer._flush_requested.wait(), timeout=buffer.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            buffer._flush_requested.clear()
+
+            started = time.monotonic()
+            written = await buffer.flush_all()
+            if written:
+                logger.debug(f"Flushed {written} playback progress rows in {time.monotonic() - started:.2f}s")
+        except asyncio.CancelledError:
+            logger.info("Playback progress flush task cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Error in playback progress flush loop: {e}")
+            await asyncio.sleep(5)
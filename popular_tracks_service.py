@@ -18,12 +18,15 @@ from sqlalchemy import func, desc, select
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from models import Track, Album, TrackPlays
+from bounded_cache import BoundedCache
 import anyio
 
 logger = logging.getLogger(__name__)
 
 # Configuration - single source of truth
 POPULAR_ALBUMS_LIMIT = 25  # Top 25 albums by play count (ALL tracks in these albums get 5 voices)
+POPULAR_CACHE_TTL = 300  # 5 minutes
+POPULAR_CACHE_MAX_ENTRIES = 5000  # one entry per creator
 
 
 # Async/sync DB compatibility helpers
@@ -43,8 +46,8 @@ class PopularTracksService:
     """Centralized service for popular track/album logic"""
 
     def __init__(self):
-        self.cache = {}  # Simple in-memory cache
-        self.cache_ttl = 300  # 5 minutes
+        self.cache = BoundedCache("popular_tracks", max_entries=POPULAR_CACHE_MAX_ENTRIES, ttl=POPULAR_CACHE_TTL)
+        self.cache_ttl = POPULAR_CACHE_TTL
 
     async def get_popular_track_ids(self, creator_id: int, db) -> List[str]:
         """
@@ -56,14 +59,12 @@ class PopularTracksService:
 
         Returns: List of track IDs that should get 5 voices
         """
-        import time
         cache_key = f"popular_track_ids:{creator_id}"
 
         # Check cache
-        if cache_key in self.cache:
-            cached_data = self.cache[cache_key]
-            if time.time() - cached_data['timestamp'] < self.cache_ttl:
-                return cached_data['track_ids']
+        cached_ids = self.cache.get(cache_key)
+        if cached_ids is not None:
+            return cached_ids
 
         try:
             # Step 1: Get top 25 albums by total play count
@@ -111,10 +112,7 @@ class PopularTracksService:
                 track_ids = []
 
             # Cache result
-            self.cache[cache_key] = {
-                'track_ids': track_ids,
-                'timestamp': time.time()
-            }
+            self.cache.set(cache_key, track_ids)
 
             logger.info(f"Total popular tracks for creator {creator_id}: {len(track_ids)} (from {len(popular_album_ids)} popular albums)")
             return track_ids
@@ -8,8 +8,10 @@ from typing import List, Optional
 import logging
 
 from database import get_db
-from models import User, Track, Album, PlaybackProgress, TrackPlays
+from models import User, Track, Album, PlaybackProgress
 from auth import login_required
+from track_metadata_cache import track_metadata_cache
+from playback_progress_buffer import playback_progress_buffer, state_from_record
 
 logger = logging.getLogger(__name__)
 
@@ -35,17 +37,12 @@ async def save_progress(
             raise HTTPException(status_code=400, detail="Invalid track ID")
 
         # Validate track existence
-        track = db.query(Track).filter(Track.id == track_id).first()
+        track = await track_metadata_cache.get(track_id, db)
         if not track:
             raise HTTPException(status_code=404, detail="Track not found")
 
-        # Get or create progress record
-        progress_record = db.query(PlaybackProgress).filter(
-            and_(
-                PlaybackProgress.user_id == current_user.id,
-                PlaybackProgress.track_id == track_id
-            )
-        ).first()
+        # Latest state from the write-behind buffer (falls back to the DB row)
+        previous = await playback_progress_buffer.get_state(current_user.id, track_id, db)
 
         now = datetime.now(timezone.utc)
         duration = max(1, progress.get('duration', 0))
@@ -55,119 +52,74 @@ async def save_progress(
         is_listen = completion_rate >= 60  # Listen threshold
         is_completed = progress.get('completed', False) or completion_rate >= 90  # Completion threshold
 
-        # Get or create TrackPlays record
-        track_plays = db.query(TrackPlays).filter(
-            and_(
-                TrackPlays.user_id == current_user.id,
-                TrackPlays.track_id == track_id
-            )
-        ).first()
-
-        if not track_plays:
-            track_plays = TrackPlays(
-                user_id=current_user.id,
-                track_id=track_id,
-                play_count=0,
-                completions_count=0
-            )
-            db.add(track_plays)
-
-        if progress_record:
+        if previous:
             # Check if incoming save is older than what we already have
-            if client_time and progress_record.last_played:
+            if client_time and previous['last_played']:
                 client_timestamp = datetime.fromtimestamp(client_time / 1000, tz=timezone.utc)
-                if client_timestamp < progress_record.last_played:
+                if client_timestamp < previous['last_played']:
                     logger.warning(f"Rejected stale progress save for track {track_id}: "
-                                 f"client_time={client_timestamp} < last_played={progress_record.last_played}")
+                                 f"client_time={client_timestamp} < last_played={previous['last_played']}")
                     return {
                         "status": "rejected_stale",
                         "reason": "Server has newer progress",
-                        "server_position": progress_record.position,
-                        "server_timestamp": progress_record.last_played.isoformat()
+                        "server_position": previous['position'],
+                        "server_timestamp": previous['last_played'].isoformat()
                     }
-
-            # Update existing record
-            progress_record.position = current_position
-            progress_record.duration = duration
-            progress_record.device_info = progress.get('device_info')
-            progress_record.updated_at = now
-            progress_record.last_played = now
-            progress_record.completion_rate = completion_rate
-
-            # Store word position for voice-independent position tracking
-            word_position_data = progress.get('word_position', {})
-            if word_position_data and word_position_data.get('word_index') is not None:
-                progress_record.word_position = word_position_data.get('word_index')
-                progress_record.last_voice_id = word_position_data.get('voice_id')
-
-            # 🎯 60% THRESHOLD: Count as "listen" (engagement metric)
-            if is_listen and not progress_record.counted_as_listen:
-                progress_record.counted_as_listen = True
-                track_plays.play_count = (track_plays.play_count or 0) + 1
-                logger.info(f"✅ Counted as LISTEN (60%) for track {track_id}")
-
-            # 🎯 90% THRESHOLD: Count as "completion"
-            if is_completed and not progress_record.counted_as_completion:
-                progress_record.counted_as_completion = True
-                progress_record.completed = True
-                progress_record.play_count = (progress_record.play_count or 0) + 1
-                track_plays.completions_count = (track_plays.completions_count or 0) + 1
-                logger.info(f"✅ Counted as COMPLETION (90%) for track {track_id}")
-
-            # Allow uncompleting if user seeks back below 90%
-            if not is_completed and progress_record.completed:
-                progress_record.completed = False
-
-            # Update TrackPlays metrics
-            track_plays.increment_play(
-                completion_rate=completion_rate,
-                play_time=current_position
-            )
-
+            state = dict(previous)
         else:
-            # Create new record
-            word_position_data = progress.get('word_position', {})
-            word_index = word_position_data.get('word_index') if word_position_data else None
-            voice_id = word_position_data.get('voice_id') if word_position_data else None
-
-            progress_record = PlaybackProgress(
-                user_id=current_user.id,
-                track_id=track_id,
-                position=current_position,
-                duration=duration,
-                completed=is_completed,
-                device_info=progress.get('device_info'),
-                completion_rate=completion_rate,
-                play_count=1 if is_completed else 0,
-                counted_as_listen=is_listen,  # Set flag if already at 60%
-                counted_as_completion=is_completed,  # Set flag if already at 90%
-                last_played=now,
-                word_position=word_index,
-                last_voice_id=voice_id
-            )
-            db.add(progress_record)
-
-            # Count initial thresholds if already met
-            if is_listen:
-                track_plays.play_count = (track_plays.play_count or 0) + 1
-                logger.info(f"✅ NEW: Counted as LISTEN (60%) for track {track_id}")
-
-            if is_completed:
-                track_plays.completions_count = (track_plays.completions_count or 0) + 1
-                logger.info(f"✅ NEW: Counted as COMPLETION (90%) for track {track_id}")
+            state = {
+                'completed': False,
+                'play_count': 0,
+                'counted_as_listen': False,
+                'counted_as_completion': False,
+                'word_position': None,
+                'last_voice_id': None
+            }
 
-            # Update metrics
-            track_plays.increment_play(
-                completion_rate=completion_rate,
-                play_time=current_position
-            )
+        # Increments applied to TrackPlays / Track when the buffer is flushed
+        deltas = {
+            'd_listens': 0,
+            'd_completions': 0,
+            'd_play_time': float(current_position),
+            'd_rate_sum': float(completion_rate),
+            'd_rate_n': 1,
+            'd_access': 1
+        }
 
-        # Update track statistics
-        track.last_accessed = now
-        track.access_count = (track.access_count or 0) + 1
+        state.update(
+            position=current_position,
+            duration=duration,
+            device_info=progress.get('device_info'),
+            last_played=now,
+            completion_rate=completion_rate
+        )
+
+        # Store word position for voice-independent position tracking
+        word_position_data = progress.get('word_position') or {}
+        if word_position_data.get('word_index') is not None:
+            state['word_position'] = word_position_data.get('word_index')
+            state['last_voice_id'] = word_position_data.get('voice_id')
+
+        # 🎯 60% THRESHOLD: Count as "listen" (engagement metric)
+        if is_listen and not state['counted_as_listen']:
+            state['counted_as_listen'] = True
+            deltas['d_listens'] = 1
+            logger.info(f"✅ Counted as LISTEN (60%) for track {track_id}")
+
+        # 🎯 90% THRESHOLD: Count as "completion"
+        if is_completed and not state['counted_as_completion']:
+            state['counted_as_completion'] = True
+            state['completed'] = True
+            state['play_count'] = (state['play_count'] or 0) + 1
+            deltas['d_completions'] = 1
+            logger.info(f"✅ Counted as COMPLETION (90%) for track {track_id}")
+
+        # Allow uncompleting if user seeks back below 90%
+        if not is_completed and state['completed']:
+            state['completed'] = False
 
         try:
-            db.commit()
+            await playback_progress_buffer.save(current_user.id, track_id, state, deltas)
             logger.info(f"Saved progress for track {track_id}: {completion_rate:.1f}% complete")
             return {
                 "status": "success",
@@ -176,7 +128,6 @@ async def save_progress(
                 "is_completed": is_completed
             }
         except Exception as db_error:
-            db.rollback()
             logger.error(f"Database error saving progress: {str(db_error)}")
             raise HTTPException(status_code=500, detail="Database error")
 
@@ -199,33 +150,29 @@ async def load_progress(
     """Load playback progress for a track with optional voice translation"""
     try:
         # Validate track exists
-        track = db.query(Track).filter(Track.id == track_id).first()
+        track = await track_metadata_cache.get(track_id, db)
         if not track:
             raise HTTPException(status_code=404, detail="Track not found")
 
-        progress = db.query(PlaybackProgress).filter(
-            and_(
-                PlaybackProgress.user_id == current_user.id,
-                PlaybackProgress.track_id == track_id
-            )
-        ).first()
+        # Buffered state first - the DB row can lag by one flush interval
+        progress = await playback_progress_buffer.get_state(current_user.id, track_id, db)
 
         if progress:
             result = {
-                "position": progress.position,
-                "duration": progress.duration,
-                "completed": progress.completed,
-                "completion_rate": progress.completion_rate,
-                "play_count": progress.play_count,
-                "last_played": progress.last_played.isoformat() if progress.last_played else None,
-                "device_info": progress.device_info,
-                "word_position": progress.word_position,
-                "last_voice_id": progress.last_voice_id
+                "position": progress['position'],
+                "duration": progress['duration'],
+                "completed": progress['completed'],
+                "completion_rate": progress['completion_rate'],
+                "play_count": progress['play_count'],
+                "last_played": progress['last_played'].isoformat() if progress['last_played'] else None,
+                "device_info": progress['device_info'],
+                "word_position": progress['word_position'],
+                "last_voice_id": progress['last_voice_id']
             }
 
             # If voice is specified and different from saved voice, translate word position
-            if (voice and progress.last_voice_id and voice != progress.last_voice_id
-                and progress.word_position is not None and track.track_type == 'tts'):
+            if (voice and progress['last_voice_id'] and voice != progress['last_voice_id']
+                and progress['word_position'] is not None and track.track_type == 'tts'):
                 try:
                     # Import here to avoid circular dependency
                     from text_storage_service import text_storage_service
@@ -233,13 +180,13 @@ async def load_progress(
                     # Get word timings for the new voice
                     word_timings = await text_storage_service.get_word_timings(str(track_id), voice, db)
 
-                    if word_timings and progress.word_position < len(word_timings):
+                    if word_timings and progress['word_position'] < len(word_timings):
                         # Translate word position to time in new voice
-                        new_time = word_timings[progress.word_position].get('start_time', progress.position)
+                        new_time = word_timings[progress['word_position']].get('start_time', progress['position'])
                         result['position'] = new_time
                         result['voice_translated'] = True
-                        logger.info(f"Translated progress for track {track_id}: word {progress.word_position} "
-                                  f"from voice {progress.last_voice_id} to {voice} (time: {new_time}s)")
+                        logger.info(f"Translated progress for track {track_id}: word {progress['word_position']} "
+                                  f"from voice {progress['last_voice_id']} to {voice} (time: {new_time}s)")
                 except Exception as e:
                     logger.warning(f"Failed to translate word position for track {track_id}: {str(e)}")
                     # Fall back to original position if translation fails
@@ -275,6 +222,9 @@ async def get_in_progress_tracks(
     try:
         logger.info(f"Fetching in-progress tracks for user: {current_user.email}, limit: {limit}")
 
+        # Saves since the last flush only exist in the write-behind buffer
+        buffered = await playback_progress_buffer.get_user_buffered(current_user.id)
+
         query = db.query(PlaybackProgress).filter(
             and_(
                 PlaybackProgress.user_id == current_user.id,
@@ -284,14 +234,24 @@ async def get_in_progress_tracks(
         ).order_by(PlaybackProgress.last_played.desc())
 
         if limit is not None:
-            query = query.limit(limit)
-
-        in_progress = query.all()
+            # Buffered entries may supersede some of these rows
+            query = query.limit(limit + len(buffered))
+
+        states = {str(record.track_id): state_from_record(record) for record in query.all()}
+        states.update(buffered)
+        oldest = datetime.min.replace(tzinfo=timezone.utc)
+        in_progress = sorted(
+            ((tid, state) for tid, state in states.items() if not state['completed'] and state['position'] > 0),
+            key=lambda item: item[1]['last_played'] or oldest,
+            reverse=True
+        )
+        if limit is not None:
+            in_progress = in_progress[:limit]
 
-        logger.info(f"Retrieved {len(in_progress)} progress records.")
+        logger.info(f"Retrieved {len(in_progress)} progress records ({len(buffered)} buffered).")
 
         # Build a list of track IDs
-        track_ids = [progress.track_id for progress in in_progress]
+        track_ids = [track_id for track_id, _ in in_progress]
         logger.info(f"Track IDs: {track_ids}")
 
         # Fetch tracks
@@ -313,10 +273,10 @@ async def get_in_progress_tracks(
 
         # Build the result list with visibility filtering
         in_progress_tracks = []
-        for progress in in_progress:
-            track = track_dict.get(progress.track_id)
+        for progress_track_id, progress in in_progress:
+            track = track_dict.get(progress_track_id)
             if not track:
-                logger.warning(f"Track not found for track_id: {progress.track_id}")
+                logger.warning(f"Track not found for track_id: {progress_track_id}")
                 continue  # Skip if track not found
 
             # Apply visibility filtering based on user role
@@ -344,12 +304,12 @@ async def get_in_progress_tracks(
                 "title": track.title,
                 "cover_path": cover_path,
                 "album_title": album.title if album else 'Unknown Album',
-                "progress": (progress.position / progress.duration * 100) if progress.duration > 0 else 0,
-                "position": float(progress.position),
-                "duration": float(progress.duration),
-                "completion_rate": progress.completion_rate,
-                "last_played": progress.last_played.isoformat() if progress.last_played else None,
-                "device_info": progress.device_info
+                "progress": (progress['position'] / progress['duration'] * 100) if progress['duration'] > 0 else 0,
+                "position": float(progress['position']),
+                "duration": float(progress['duration']),
+                "completion_rate": progress['completion_rate'],
+                "last_played": progress['last_played'].isoformat() if progress['last_played'] else None,
+                "device_info": progress['device_info']
             }
             in_progress_tracks.append(track_info)
             logger.info(f"Added track to in-progress: {track_info}")
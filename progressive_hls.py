@@ -0,0 +1,267 @@
+"""
+Progressive TTS -> HLS segmentation
+
+The classic TTS pipeline is three full passes: generate every Edge TTS chunk,
+ffmpeg-concat them into one MP3, then re-encode that MP3 into HLS. A long book
+is unplayable until all three finish.
+
+ProgressiveHLSSession collapses the last two passes into the first:
+
+- One long-running ffmpeg HLS segmenter reads MP3 from stdin for the whole job
+- Chunks are handed over as they finish (in any order); a feeder task writes
+  them to ffmpeg strictly in index order and tees the same bytes into the final
+  MP3, so no separate concat pass is needed
+- The variant playlist is written as an EVENT playlist that grows with every
+  segment; master.m3u8 is published as soon as the first segment exists, so
+  listeners can start while later chunks are still being generated
+- finish() rewrites the playlist to VOD and writes index.json with
+  word_mapping_pending=True; prepare_hls_stream_with_voice sees that marker,
+  skips segmentation and only runs word mapping
+- abort() kills ffmpeg and removes the partial voice stream; the caller falls
+  back to the classic concat + segment path
+
+Segments use the same encode settings as
+BaseHLSManager._hls_from_source_direct_with_progress, so progressive and
+classic streams are interchangeable.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+from collections import deque
+from pathlib import Path
+from typing import Dict, Optional
+
+import aiofiles
+
+logger = logging.getLogger(__name__)
+
+PROGRESSIVE_HLS_ENABLED = os.getenv('TTS_PROGRESSIVE_HLS', 'true').lower() in ('1', 'true', 'yes')
+PROGRESSIVE_FEED_READ_SIZE = 256 * 1024
+PROGRESSIVE_PUBLISH_POLL = 1.0  # seconds between checks for the first segment
+PROGRESSIVE_PIPELINE = "progressive_event"
+
+
+class ProgressiveHLSSession:
+    """Feeds TTS chunks in order into one ffmpeg EVENT-playlist segmenter"""
+
+    def __init__(self, track_id: str, voice: str, output_path: Path):
+        from storage import get_stream_manager
+
+        self.track_id = track_id
+        self.voice = voice
+        self.output_path = output_path
+        self.hls_manager = get_stream_manager().hls_manager
+        self.voice_stream_dir = self.hls_manager.segment_dir / track_id / f"voice-{voice}"
+        self.variant_dir = self.voice_stream_dir / self.hls_manager.default_bitrate["name"]
+        self.playlist_path = self.variant_dir / "playlist.m3u8"
+        self.master_path = self.voice_stream_dir / "master.m3u8"
+
+        self.chunks_fed = 0
+        self.bytes_written = 0
+        self.published = False
+        self._pending: Dict[int, Path] = {}
+        self._total_chunks: Optional[int] = None
+        self._wakeup = asyncio.Event()
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._output = None
+        self._feeder: Optional[asyncio.Task] = None
+        self._publisher: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._stderr_tail = deque(maxlen=20)
+
+    @staticmethod
+    def can_start(track_id: str, voice: str) -> bool:
+        """Only segment progressively into a voice directory nobody is being served from"""
+        if not PROGRESSIVE_HLS_ENABLED or shutil.which("ffmpeg") is None:
+            return False
+        from storage import get_stream_manager
+
+        master = get_stream_manager().hls_manager.segment_dir / track_id / f"voice-{voice}" / "master.m3u8"
+        return not master.exists()
+
+    def _ffmpeg_args(self):
+        from hls_core import FFMPEG_THREADS
+
+        segment_duration = self.hls_manager.default_bitrate["segment_duration"]
+        return [
+            "ffmpeg", "-y",
+            "-f", "mp3",
+            "-i", "pipe:0",
+            "-threads", str(FFMPEG_THREADS),
+            "-preset", "ultrafast",
+            "-c:a", "aac",
+            "-b:a", "64k",
+            "-ar", "22050",
+            "-ac", "1",
+            "-f", "hls",
+            "-hls_playlist_type", "event",
+            "-hls_segment_type", "mpegts",
+            "-hls_segment_filename", str(self.variant_dir / "segment_%05d.ts"),
+            "-hls_time", str(segment_duration),
+            "-hls_list_size", "0",
+            # temp_file: segments and playlist only appear once fully written
+            "-hls_flags", "split_by_time+temp_file",
+            "-avoid_negative_ts", "make_zero",
+            "-fflags", "+genpts+bitexact+flush_packets",
+            "-nostats",
+            "-loglevel", "warning",
+            str(self.playlist_path),
+        ]
+
+    async def start(self):
+        await asyncio.to_thread(self.variant_dir.mkdir, parents=True, exist_ok=True)
+        self._output = await aiofiles.open(self.output_path, 'wb')
+        self._process = await asyncio.create_subprocess_exec(
+            *self._ffmpeg_args(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+        self._feeder = asyncio.create_task(self._feed(), name=f"progressive_hls_feed_{self.track_id}")
+        self._publisher = asyncio.create_task(self._publish_when_ready())
+        logger.info(f"Progressive HLS started: {self.track_id} ({self.voice})")
+
+    async def add_chunk(self, index: int, path: Path):
+        """Hand over a finished chunk; never blocks the TTS worker on ffmpeg"""
+        if self._feeder is None or self._feeder.done():
+            return
+        self._pending[index] = path
+        self._wakeup.set()
+
+    async def _feed(self):
+        next_index = 0
+        while True:
+            path = self._pending.pop(next_index, None)
+            if path is None:
+                if self._total_chunks is not None and next_index >= self._total_chunks:
+                    break
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            async with aiofiles.open(path, 'rb') as f:
+                while True:
+                    data = await f.read(PROGRESSIVE_FEED_READ_SIZE)
+                    if not data:
+                        break
+                    self._process.stdin.write(data)
+                    await self._output.write(data)
+                    await self._process.stdin.drain()
+                    self.bytes_written += len(data)
+
+            next_index += 1
+            self.chunks_fed = next_index
+
+        self._process.stdin.close()
+
+    async def _drain_stderr(self):
+        async for raw in self._process.stderr:
+            line = raw.decode('utf-8', 'ignore').strip()
+            if line:
+                self._stderr_tail.append(line)
+
+    async def _publish_when_ready(self):
+        while not await asyncio.to_thread(self.playlist_path.exists):
+            await asyncio.sleep(PROGRESSIVE_PUBLISH_POLL)
+        await self._publish_master()
+
+    async def _publish_master(self):
+        if self.published:
+            return
+        await self.hls_manager._create_master_playlist(
+            self.voice_stream_dir, [self.hls_manager.default_bitrate]
+        )
+        self.published = True
+        logger.info(
+            f"Progressive HLS live: {self.track_id} ({self.voice}) after {self.chunks_fed} chunks"
+        )
+
+    def _finalize_playlist(self):
+        content = self.playlist_path.read_text(encoding="utf-8")
+        content = content.replace("#EXT-X-PLAYLIST-TYPE:EVENT", "#EXT-X-PLAYLIST-TYPE:VOD")
+        if "#EXT-X-ENDLIST" not in content:
+            content = content.rstrip("\n") + "\n#EXT-X-ENDLIST\n"
+        tmp_path = self.playlist_path.with_suffix(".m3u8.tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, self.playlist_path)
+
+    async def finish(self, total_chunks: int, timeout: float = 600) -> int:
+        """
+        Feed the remaining chunks, let ffmpeg flush, finalize EVENT -> VOD and
+        write index.json. Returns the size of the teed final MP3.
+        """
+        self._total_chunks = total_chunks
+        self._wakeup.set()
+
+        await self._feeder
+        await self._output.close()
+        self._output = None
+
+        try:
+            await asyncio.wait_for(self._process.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Progressive HLS segmenter did not finish within {timeout:.0f}s")
+        await asyncio.gather(self._stderr_task, return_exceptions=True)
+
+        if self._process.returncode != 0:
+            raise RuntimeError(
+                f"Progressive HLS segmentation failed (code {self._process.returncode}): "
+                f"{' | '.join(self._stderr_tail)}"
+            )
+
+        self._publisher.cancel()
+        await asyncio.gather(self._publisher, return_exceptions=True)
+
+        await asyncio.to_thread(self._finalize_playlist)
+        await self._publish_master()
+
+        durations = await asyncio.to_thread(self.hls_manager._parse_m3u8_durations, self.playlist_path)
+        await self.hls_manager._save_segment_index(
+            self.variant_dir,
+            durations,
+            start_number=0,
+            pipeline=PROGRESSIVE_PIPELINE,
+            word_mapping_pending=True,
+        )
+
+        logger.info(
+            f"Progressive HLS complete: {self.track_id} ({self.voice}) - "
+            f"{total_chunks} chunks, {len(durations)} segments, {sum(durations):.1f}s"
+        )
+        return self.bytes_written
+
+    async def abort(self):
+        """Stop the segmenter and remove the partial stream so the classic path can take over"""
+        for task in (self._feeder, self._publisher):
+            if task and not task.done():
+                task.cancel()
+        await asyncio.gather(
+            *(t for t in (self._feeder, self._publisher) if t), return_exceptions=True
+        )
+
+        if self._process and self._process.returncode is None:
+            try:
+                self._process.kill()
+            except ProcessLookupError:
+                pass
+            await self._process.wait()
+        if self._stderr_task:
+            await asyncio.gather(self._stderr_task, return_exceptions=True)
+
+        if self._output is not None:
+            try:
+                await self._output.close()
+            except Exception:
+                pass
+            self._output = None
+
+        try:
+            await asyncio.to_thread(self.master_path.unlink, missing_ok=True)
+            await asyncio.to_thread(shutil.rmtree, self.voice_stream_dir, True)
+        except Exception as e:
+            logger.warning(f"Progressive HLS cleanup failed for {self.track_id} ({self.voice}): {e}")
+
+        logger.warning(f"Progressive HLS aborted: {self.track_id} ({self.voice})")
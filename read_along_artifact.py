@@ -0,0 +1,170 @@
+"""
+Precompiled read-along artifact
+
+ReadAlongService built a voice's read-along pages lazily: the first request
+per worker and page size mapped every timing word onto the source text,
+planned the sentence-safe pages and tokenized the requested page, and all
+of it lived in per-process LRUs that page 0 requests flushed for every
+track. Each worker paid the full span mapping again after every flush.
+
+readalong.bin sits next to timings.cols and holds that work, done once
+when the voice's timings are stored:
+
+    header  magic "RAL1", version, flags, word count, page size count,
+            index bytes
+    index   msgpack: {"text_chars": n, "pages": {size: [[start, end,
+            blob offset, blob bytes], ...]}}
+    spans   int32[2n]  [start, end) of each word in the source text (-1: unmapped)
+    blobs   one msgpack [sourceText, tokens] per page, per size
+
+- tokens are packed: a word token is its index on the page (its timing
+  fields are the page's word timings, which timings.cols already holds),
+  any other token is its text; ReadAlongService expands them back into
+  the mappedTokens dicts. Pages stay ~10 bytes per word instead of ~200
+- a worker mmaps the file; a page is one msgpack.unpackb over its slice,
+  so nothing is recomputed and nothing but the page is read
+- every size in READ_ALONG_PAGE_SIZES is compiled (the reader's page size
+  choices); other sizes fall back to the lazy path
+- writes are atomic (tmp + rename) so readers never map a half-written file
+"""
+
+import mmap
+import os
+import struct
+import uuid
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import msgpack
+
+ARTIFACT_MAGIC = b"RAL1"
+ARTIFACT_VERSION = 1
+
+READ_ALONG_PAGE_SIZES = tuple(
+    int(size) for size in os.getenv("READ_ALONG_PAGE_SIZES", "100,250,500,750,1000").split(",") if size.strip()
+)
+
+_HEADER = struct.Struct("<4sHHIIQ")  # magic, version, flags, words, page sizes, index bytes
+
+
+class ReadAlongArtifactError(ValueError):
+    pass
+
+
+class ReadAlongArtifactWriter:
+    """Collects spans and compiled pages; build() returns the file contents"""
+
+    def __init__(self, word_count: int, text_chars: int):
+        self.word_count = word_count
+        self.text_chars = text_chars
+        self._spans = array("i")
+        self._pages: Dict[int, List[List[int]]] = {}
+        self._blobs = bytearray()
+
+    def set_spans(self, spans: Sequence[Tuple[int, int]]):
+        if len(spans) != self.word_count:
+            raise ReadAlongArtifactError(f"{len(spans)} spans for {self.word_count} words")
+        self._spans = array("i")
+        for start, end in spans:
+            self._spans.append(start)
+            self._spans.append(end)
+
+    def add_page(self, page_size: int, start: int, end: int, source_text: str, tokens: List[Union[int, str]]):
+        blob = msgpack.packb([source_text, tokens], use_bin_type=True)
+        self._pages.setdefault(page_size, []).append([start, end, len(self._blobs), len(blob)])
+        self._blobs += blob
+
+    def build(self) -> bytes:
+        index = msgpack.packb({"text_chars": self.text_chars, "pages": self._pages}, use_bin_type=True)
+        header = _HEADER.pack(ARTIFACT_MAGIC, ARTIFACT_VERSION, 0, self.word_count, len(self._pages), len(index))
+        return b"".join((header, index, self._spans.tobytes(), bytes(self._blobs)))
+
+    def write(self, path: Path):
+        """Blocking; atomic (tmp + rename)"""
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            tmp.write_bytes(self.build())
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+class ReadAlongArtifact:
+    """Read-only view over a readalong.bin buffer (an mmap or bytes)"""
+
+    def __init__(self, buffer, path: Optional[Path] = None):
+        self.path = path
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ReadAlongArtifactError("Read-along artifact shorter than its header")
+        magic, version, _flags, count, _sizes, index_size = _HEADER.unpack_from(view)
+        if magic != ARTIFACT_MAGIC or version != ARTIFACT_VERSION:
+            raise ReadAlongArtifactError(f"Not a read-along artifact (magic {magic!r}, version {version})")
+
+        pos = _HEADER.size
+        try:
+            index = msgpack.unpackb(view[pos:pos + index_size], raw=False, strict_map_key=False)
+        except (ValueError, msgpack.exceptions.UnpackException) as e:
+            raise ReadAlongArtifactError(f"Unreadable read-along index: {e}")
+        pos += index_size
+        spans_size = 2 * count * array("i").itemsize
+        if pos + spans_size > len(view):
+            raise ReadAlongArtifactError("Read-along artifact size does not match its header")
+
+        self._view = view
+        self._spans = view[pos:pos + spans_size].cast("i")
+        self._blobs = view[pos + spans_size:]
+        self._pages: Dict[int, List[List[int]]] = {int(size): entries for size, entries in index["pages"].items()}
+        self.text_chars = index.get("text_chars", 0)
+        self.word_count = count
+
+    @classmethod
+    def open(cls, path: Path) -> "ReadAlongArtifact":
+        """Blocking; maps the file read-only"""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, path)
+        except Exception:
+            mapped.close()
+            raise
+
+    def close(self):
+        """Unmap now; if a page slice is still referenced, the mapping goes with it instead"""
+        try:
+            for view in (self._spans, self._blobs, self._view):
+                view.release()
+            if isinstance(self._buffer, mmap.mmap):
+                self._buffer.close()
+        except BufferError:
+            pass
+
+    @property
+    def page_sizes(self) -> Iterable[int]:
+        return self._pages.keys()
+
+    def has_page_size(self, page_size: int) -> bool:
+        return page_size in self._pages
+
+    def page_plan(self, page_size: int) -> List[Tuple[int, int]]:
+        """(start_idx, end_idx_exclusive) per page, as _build_sentence_page_plan returns it"""
+        return [(entry[0], entry[1]) for entry in self._pages[page_size]]
+
+    def page_count(self, page_size: int) -> int:
+        return len(self._pages[page_size])
+
+    def page_bounds(self, page_size: int, page: int) -> Tuple[int, int]:
+        entry = self._pages[page_size][page]
+        return entry[0], entry[1]
+
+    def page(self, page_size: int, page: int) -> Tuple[str, List[Union[int, str]]]:
+        """(sourceText, packed tokens) of one page, unpacked from its slice"""
+        _start, _end, offset, size = self._pages[page_size][page]
+        source_text, tokens = msgpack.unpackb(self._blobs[offset:offset + size], raw=False)
+        return source_text, tokens
+
+    def span(self, index: int) -> Tuple[int, int]:
+        return self._spans[2 * index], self._spans[2 * index + 1]
@@ -264,6 +264,8 @@ def increment_version(track_id: str, db: Session) -> int:
             old_version = track.content_version or 0
             track.content_version = old_version + 1
             db.commit()
+            from authorization_service import AuthorizationService
+            AuthorizationService.mark_track_revoked(str(track_id))
             logger.info(f"Version incremented: {track_id} v{old_version} → v{track.content_version}")
             return track.content_version
     except Exception as e:
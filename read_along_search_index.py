@@ -0,0 +1,270 @@
+"""
+Inverted word index for read-along search
+
+ReadAlongService._search_impl answered every query by walking all words of
+the book: it rebuilt a word -> page dict for the whole book, lowercased
+every word and substring-tested it, and for phrases joined a window of
+words at every position. On a 150k-word book that was hundreds of
+milliseconds of CPU per keystroke in the search box.
+
+search.idx sits next to readalong.bin and is compiled with it:
+
+    header      magic "RAS1", version, flags, word count, term count,
+                posting count, page size count
+    page sizes  uint32[s]     the page sizes word_pages covers
+    term chars  uint32[T+1]   byte offsets of each term in the term table
+    postings at uint32[T+1]   offset of each term's posting list
+    postings    uint32[P]     word indices of each term, ascending
+    word terms  uint32[n]     term id of each word
+    word pages  uint32[s*n]   page of each word, one run per page size
+    terms       UTF-8 normalized terms, sorted, back to back
+
+- terms are sorted, so an exact term is a binary search and a prefix is
+  the contiguous id range [lower_bound(p), lower_bound(p + 0xff)); infix
+  matches search the term table (unique terms, not words)
+- a phrase walks the shortest posting list of its exact terms and checks
+  the other positions against word terms (the last term may be a prefix:
+  an id range check), so no window of words is ever rebuilt
+- word pages answers "which page" with one lookup per match
+"""
+
+import mmap
+import os
+import re
+import struct
+import uuid
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+SEARCH_INDEX_MAGIC = b"RAS1"
+SEARCH_INDEX_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIII")  # magic, version, flags, words, terms, postings, page sizes
+_EDGE_PUNCT = re.compile(r"^[\W_]+|[\W_]+$", re.UNICODE)
+_PREFIX_END = b"\xff"  # never occurs in UTF-8, so p + 0xff sorts after every term starting with p
+
+
+class SearchIndexError(ValueError):
+    pass
+
+
+def normalize_term(word: str) -> str:
+    """Lowercase, straight apostrophes, no leading/trailing punctuation ("Don’t," -> "don't")"""
+    return _EDGE_PUNCT.sub("", (word or "").lower().replace("\u2019", "'").replace("\u2018", "'"))
+
+
+class SearchIndexWriter:
+    """Builds search.idx from a voice's words and its page plans"""
+
+    def __init__(self, words: Sequence[str]):
+        terms_of = [normalize_term(w) for w in words]
+        vocab = sorted(set(terms_of))
+        ids = {term: i for i, term in enumerate(vocab)}
+
+        self.word_count = len(terms_of)
+        self._word_terms = array("I", (ids[term] for term in terms_of))
+
+        counts = [0] * len(vocab)
+        for term_id in self._word_terms:
+            counts[term_id] += 1
+        self._posting_offsets = array("I", [0])
+        for count in counts:
+            self._posting_offsets.append(self._posting_offsets[-1] + count)
+
+        # Counting sort: word indices land in ascending order within each term
+        self._postings = array("I", bytes(4 * self.word_count))
+        cursor = list(self._posting_offsets[:-1])
+        for word_index, term_id in enumerate(self._word_terms):
+            self._postings[cursor[term_id]] = word_index
+            cursor[term_id] += 1
+
+        self._term_chars = array("I", [0])
+        self._terms = bytearray()
+        for term in vocab:
+            self._terms += term.encode("utf-8")
+            self._term_chars.append(len(self._terms))
+
+        self._page_sizes = array("I")
+        self._word_pages = array("I")
+
+    def add_page_plan(self, page_size: int, plan: Iterable[Tuple[int, int]]):
+        pages = array("I", bytes(4 * self.word_count))
+        for page, (start, end) in enumerate(plan):
+            pages[start:end] = array("I", [page]) * (end - start)
+        self._page_sizes.append(page_size)
+        self._word_pages += pages
+
+    def build(self) -> bytes:
+        header = _HEADER.pack(
+            SEARCH_INDEX_MAGIC, SEARCH_INDEX_VERSION, 0, self.word_count,
+            len(self._term_chars) - 1, len(self._postings), len(self._page_sizes)
+        )
+        return b"".join((
+            header,
+            self._page_sizes.tobytes(),
+            self._term_chars.tobytes(),
+            self._posting_offsets.tobytes(),
+            self._postings.tobytes(),
+            self._word_terms.tobytes(),
+            self._word_pages.tobytes(),
+            bytes(self._terms),
+        ))
+
+    def write(self, path: Path):
+        """Blocking; atomic (tmp + rename)"""
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            tmp.write_bytes(self.build())
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+class ReadAlongSearchIndex:
+    """Read-only view over a search.idx buffer (an mmap or bytes)"""
+
+    def __init__(self, buffer, path: Optional[Path] = None):
+        self.path = path
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise SearchIndexError("Search index shorter than its header")
+        magic, version, _flags, count, terms, postings, sizes = _HEADER.unpack_from(view)
+        if magic != SEARCH_INDEX_MAGIC or version != SEARCH_INDEX_VERSION:
+            raise SearchIndexError(f"Not a read-along search index (magic {magic!r}, version {version})")
+
+        pos = _HEADER.size
+        sections = []
+        for length in (sizes, terms + 1, terms + 1, postings, count, sizes * count):
+            sections.append(view[pos:pos + 4 * length].cast("I"))
+            pos += 4 * length
+        page_sizes, self._term_chars, self._posting_offsets, self._postings, self._word_terms, self._word_pages = sections
+        if pos + self._term_chars[terms] != len(view):
+            raise SearchIndexError("Search index size does not match its header")
+
+        self._view = view
+        self._sections = sections
+        self._terms = view[pos:]
+        self._terms_at = pos
+        self._page_runs: Dict[int, int] = {size: i * count for i, size in enumerate(page_sizes)}
+        self.term_count = terms
+        self.word_count = count
+
+    @classmethod
+    def open(cls, path: Path) -> "ReadAlongSearchIndex":
+        """Blocking; maps the file read-only"""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, path)
+        except Exception:
+            mapped.close()
+            raise
+
+    def close(self):
+        try:
+            for view in (*self._sections, self._terms, self._view):
+                view.release()
+            if isinstance(self._buffer, mmap.mmap):
+                self._buffer.close()
+        except BufferError:
+            pass
+
+    # ------------------------------------------------------------- terms
+
+    def _term_bytes(self, term_id: int) -> bytes:
+        return bytes(self._terms[self._term_chars[term_id]:self._term_chars[term_id + 1]])
+
+    def _lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def term_id(self, term: str) -> Optional[int]:
+        key = term.encode("utf-8")
+        i = self._lower_bound(key)
+        return i if i < self.term_count and self._term_bytes(i) == key else None
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """[lo, hi) of the term ids starting with prefix"""
+        key = prefix.encode("utf-8")
+        return self._lower_bound(key), self._lower_bound(key + _PREFIX_END)
+
+    def _terms_containing(self, text: str) -> Iterator[int]:
+        """Ids of the terms with text anywhere in them (one pass over the term table)"""
+        key = text.encode("utf-8")
+        table = self._buffer if isinstance(self._buffer, mmap.mmap) else bytes(self._terms)
+        base = self._terms_at if table is self._buffer else 0
+        end = base + self._term_chars[self.term_count]
+        pos = table.find(key, base, end)
+        while pos != -1:
+            term_id = bisect_right(self._term_chars, pos - base) - 1
+            term_end = base + self._term_chars[term_id + 1]
+            if pos + len(key) <= term_end:
+                yield term_id
+                pos = term_end
+            else:
+                pos += 1
+            pos = table.find(key, pos, end)
+
+    def postings(self, term_id: int) -> memoryview:
+        return self._postings[self._posting_offsets[term_id]:self._posting_offsets[term_id + 1]]
+
+    # ----------------------------------------------------------- queries
+
+    def term_matches(self, term: str) -> List[Tuple[int, int]]:
+        """(score, word index) of the words matching one term: 3 exact, 2 prefix, 1 infix"""
+        if not term:
+            return []
+        lo, hi = self.prefix_range(term)
+        exact = lo if lo < hi and self._term_bytes(lo) == term.encode("utf-8") else None
+        matches: List[Tuple[int, int]] = []
+        for term_id in range(lo, hi):
+            score = 3 if term_id == exact else 2
+            matches.extend((score, word_index) for word_index in self.postings(term_id))
+        for term_id in self._terms_containing(term):
+            if not lo <= term_id < hi:
+                matches.extend((1, word_index) for word_index in self.postings(term_id))
+        return matches
+
+    def phrase_starts(self, terms: Sequence[str]) -> List[int]:
+        """Word indices where terms occur in sequence; the last term also matches as a prefix"""
+        if len(terms) < 2 or not all(terms):
+            return []
+        ids = [self.term_id(term) for term in terms[:-1]]
+        if None in ids:
+            return []
+        last_lo, last_hi = self.prefix_range(terms[-1])
+        if last_lo >= last_hi:
+            return []
+
+        # Drive the walk from the shortest posting list
+        anchor = min(range(len(ids)), key=lambda i: len(self.postings(ids[i])))
+        last = len(terms) - 1
+        word_terms = self._word_terms
+        starts = []
+        for position in self.postings(ids[anchor]):
+            start = position - anchor
+            if start < 0 or start + last >= self.word_count:
+                continue
+            if not last_lo <= word_terms[start + last] < last_hi:
+                continue
+            if all(word_terms[start + i] == term_id for i, term_id in enumerate(ids)):
+                starts.append(start)
+        return starts
+
+    # ------------------------------------------------------------- pages
+
+    def has_page_size(self, page_size: int) -> bool:
+        return page_size in self._page_runs
+
+    def page_of(self, page_size: int, word_index: int) -> int:
+        return self._word_pages[self._page_runs[page_size] + word_index]
@@ -14,11 +14,17 @@ Usage:
     # Import core components
     from redis_state.config import redis_client
     from redis_state.state_manager import RedisStateManager
+
+    # Async (non-blocking) variants for coroutines
+    from redis_state.config import async_redis_client
+    from redis_state.async_state_manager import AsyncRedisStateManager
+    from redis_state.state import async_progress_state, async_upload_state
 """
 
 # Core components
-from redis_state.config import redis_client, ResilientRedisClient, ResilientAsyncRedisClient
+from redis_state.config import redis_client, ResilientRedisClient, ResilientAsyncRedisClient, async_redis_client
 from redis_state.state_manager import RedisStateManager, RedisStateConfig
+from redis_state.async_state_manager import AsyncRedisStateManager
 
 # State managers
 from redis_state.state import (
@@ -28,6 +34,11 @@ from redis_state.state import (
     download_state,
     album_download_state,
     track_download_state,
+    async_progress_state,
+    async_conversion_state,
+    async_upload_state,
+    async_album_download_state,
+    async_track_download_state,
 )
 
 # Caches
@@ -43,8 +54,10 @@ __all__ = [
     'redis_client',
     'ResilientRedisClient',
     'ResilientAsyncRedisClient',
+    'async_redis_client',
     'RedisStateManager',
     'RedisStateConfig',
+    'AsyncRedisStateManager',
     # State
     'progress_state',
     'conversion_state',
@@ -52,6 +65,11 @@ __all__ = [
     'download_state',
     'album_download_state',
     'track_download_state',
+    'async_progress_state',
+    'async_conversion_state',
+    'async_upload_state',
+    'async_album_download_state',
+    'async_track_download_state',
     # Cache
     'text_cache',
     'word_timing_cache',
@@ -0,0 +1,509 @@
+"""
+Async variant of the generic Redis state manager.
+
+Same namespaces, key layout, TTLs and return values as RedisStateManager, so
+sync and async callers can share state - but every operation is awaited on the
+pooled async client (redis_state.config.async_redis_client) instead of
+blocking the event loop for a network round trip.
+
+Multi-key reads (get_sessions, get_all_sessions) use MGET, and pipeline()
+exposes the client pipeline for callers that batch their own commands.
+
+Usage:
+    upload_state = AsyncRedisStateManager("upload")
+    await upload_state.create_session(upload_id, {...})
+
+    pipe = upload_state.pipeline(transaction=False)
+    pipe.sadd(upload_state._set_key(f"chunks:{upload_id}"), "3")
+    pipe.get(upload_state._session_key(upload_id))
+    added, raw_session = await pipe.execute()
+"""
+
+import json
+import time
+import logging
+from typing import Dict, Optional, Any, List, Set
+from datetime import datetime, timezone
+from redis_state.config import async_redis_client
+from redis_state.state_manager import RedisStateManager, RedisStateConfig, DateTimeEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRedisStateManager(RedisStateManager):
+    """
+    Awaitable RedisStateManager.
+
+    Inherits key generation and status TTL rules from RedisStateManager; every
+    Redis operation is overridden with a coroutine.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        container_id: Optional[str] = None,
+        config: Optional[RedisStateConfig] = None
+    ):
+        self.namespace = namespace
+        self.redis = async_redis_client
+        self.container_id = container_id or f"container_{time.time()}"
+        self.config = config or RedisStateConfig()
+
+        logger.info(f"AsyncRedisStateManager initialized: namespace={namespace}, container={self.container_id}")
+
+    def pipeline(self, transaction: bool = True):
+        """Batch several commands into one round trip"""
+        return self.redis.pipeline(transaction=transaction)
+
+    def _decode_session(self, session_id: str, raw: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not raw:
+            return None
+        session = json.loads(raw)
+        session.setdefault("session_id", session_id)
+        return session
+
+    # ===== Session Management =====
+
+    async def create_session(
+        self,
+        session_id: str,
+        data: Dict[str, Any],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """Create a new session with data (see RedisStateManager.create_session)"""
+        try:
+            session_data = dict(data)
+            session_data["session_id"] = session_id
+            session_data.update({
+                "container_id": self.container_id,
+                "created_at": time.time(),
+                "updated_at": time.time(),
+            })
+
+            value = json.dumps(session_data, cls=DateTimeEncoder)
+            success = await self.redis.set(self._session_key(session_id), value, ex=ttl or self.config.SESSION_TTL)
+
+            if success:
+                logger.debug(f"[{self.namespace}] Created session: {session_id}")
+            else:
+                logger.error(f"[{self.namespace}] Failed to create session: {session_id}")
+
+            return success
+
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error creating session {session_id}: {e}")
+            return False
+
+    async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve session data or None if not found"""
+        try:
+            return self._decode_session(session_id, await self.redis.get(self._session_key(session_id)))
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting session {session_id}: {e}")
+            return None
+
+    async def get_sessions(self, session_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Retrieve several sessions in one round trip"""
+        session_ids = list(session_ids)
+        try:
+            raw_values = await self.redis.mget([self._session_key(sid) for sid in session_ids])
+            return {sid: self._decode_session(sid, raw) for sid, raw in zip(session_ids, raw_values)}
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting sessions: {e}")
+            return {sid: None for sid in session_ids}
+
+    async def update_session(
+        self,
+        session_id: str,
+        updates: Dict[str, Any],
+        extend_ttl: bool = True
+    ) -> bool:
+        """Merge updates into an existing session"""
+        try:
+            session = await self.get_session(session_id)
+            if not session:
+                logger.warning(f"[{self.namespace}] Cannot update non-existent session: {session_id}")
+                return False
+
+            session.update(updates)
+            session["session_id"] = session_id
+            session["updated_at"] = time.time()
+
+            key = self._session_key(session_id)
+            value = json.dumps(session, cls=DateTimeEncoder)
+
+            if extend_ttl:
+                ttl = self._get_ttl_for_status(session.get("status", "active"))
+                success = await self.redis.set(key, value, ex=ttl)
+            else:
+                success = await self.redis.set(key, value)
+
+            if not success:
+                logger.error(f"[{self.namespace}] Failed to update session: {session_id}")
+
+            return success
+
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error updating session {session_id}: {e}")
+            return False
+
+    async def delete_session(self, session_id: str) -> bool:
+        """Delete a session"""
+        try:
+            deleted = await self.redis.delete(self._session_key(session_id))
+            if deleted:
+                logger.info(f"[{self.namespace}] Deleted session: {session_id}")
+            return deleted > 0
+
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error deleting session {session_id}: {e}")
+            return False
+
+    async def get_all_sessions(self) -> List[Dict[str, Any]]:
+        """Get all sessions in this namespace (SCAN + one MGET)"""
+        try:
+            prefix = f"{self.namespace}:{self.config.SESSION_SUFFIX}:"
+            keys = await self.redis.scan_keys(match=self._session_key("*"))
+            if not keys:
+                return []
+
+            raw_values = await self.redis.mget(keys)
+            sessions = []
+            for key, raw in zip(keys, raw_values):
+                session_id = key[len(prefix):] if key.startswith(prefix) else key
+                try:
+                    session = self._decode_session(session_id, raw)
+                except Exception as e:
+                    logger.warning(f"[{self.namespace}] Error parsing session {key}: {e}")
+                    continue
+                if session:
+                    sessions.append(session)
+            return sessions
+
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting all sessions: {e}")
+            return []
+
+    # ===== Lock Management =====
+
+    async def acquire_lock(
+        self,
+        resource_id: str,
+        timeout: Optional[int] = None,
+        owner_id: Optional[str] = None
+    ) -> bool:
+        """Acquire exclusive lock on a resource (SET NX)"""
+        try:
+            owner = owner_id or self.container_id
+            locked = await self.redis.set(
+                self._lock_key(resource_id), owner, ex=timeout or self.config.LOCK_TTL, nx=True
+            )
+            if locked:
+                logger.debug(f"[{self.namespace}] Acquired lock: {resource_id} by {owner}")
+            return bool(locked)
+
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error acquiring lock {resource_id}: {e}")
+            return False
+
+    async def release_lock(self, resource_id: str) -> bool:
+        """Release lock on a resource"""
+        try:
+            deleted = await self.redis.delete(self._lock_key(resource_id))
+            if deleted:
+                logger.debug(f"[{self.namespace}] Released lock: {resource_id}")
+            return deleted > 0
+
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error releasing lock {resource_id}: {e}")
+            return False
+
+    async def extend_lock(self, resource_id: str, additional_time: Optional[int] = None) -> bool:
+        """Extend lock TTL"""
+        try:
+            return await self.redis.expire(self._lock_key(resource_id), additional_time or self.config.LOCK_TTL)
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error extending lock {resource_id}: {e}")
+            return False
+
+    async def is_locked(self, resource_id: str) -> bool:
+        """Check if resource is locked"""
+        try:
+            return await self.redis.exists(self._lock_key(resource_id)) > 0
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error checking lock {resource_id}: {e}")
+            return False
+
+    async def get_lock_owner(self, resource_id: str) -> Optional[str]:
+        """Get the owner of a lock"""
+        try:
+            return await self.redis.get(self._lock_key(resource_id))
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting lock owner {resource_id}: {e}")
+            return None
+
+    # ===== Progress Tracking =====
+
+    async def set_progress(
+        self,
+        job_id: str,
+        progress_data: Dict[str, Any],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """Set progress information for a job"""
+        try:
+            data = {
+                **progress_data,
+                "updated_at": time.time(),
+                "container_id": self.container_id
+            }
+            value = json.dumps(data, cls=DateTimeEncoder)
+            return await self.redis.set(self._progress_key(job_id), value, ex=ttl or self.config.PROGRESS_TTL)
+
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error setting progress {job_id}: {e}")
+            return False
+
+    async def get_progress(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get progress information for a job"""
+        try:
+            data = await self.redis.get(self._progress_key(job_id))
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting progress {job_id}: {e}")
+            return None
+
+    async def delete_progress(self, job_id: str) -> bool:
+        """Delete progress tracking"""
+        try:
+            return await self.redis.delete(self._progress_key(job_id)) > 0
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error deleting progress {job_id}: {e}")
+            return False
+
+    # ===== Status Tracking =====
+
+    async def set_status(
+        self,
+        entity_id: str,
+        status: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        ttl: Optional[int] = None
+    ) -> bool:
+        """Set status for an entity"""
+        try:
+            data = {
+                "status": status,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "container_id": self.container_id,
+                **(metadata or {})
+            }
+            value = json.dumps(data, cls=DateTimeEncoder)
+            if ttl is None:
+                ttl = self._get_ttl_for_status(status)
+            return await self.redis.set(self._status_key(entity_id), value, ex=ttl)
+
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error setting status {entity_id}: {e}")
+            return False
+
+    async def get_status(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """Get status for an entity"""
+        try:
+            data = await self.redis.get(self._status_key(entity_id))
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting status {entity_id}: {e}")
+            return None
+
+    async def delete_status(self, entity_id: str) -> bool:
+        """Delete status tracking"""
+        try:
+            return await self.redis.delete(self._status_key(entity_id)) > 0
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error deleting status {entity_id}: {e}")
+            return False
+
+    # ===== Set Operations =====
+
+    async def add_to_set(self, set_name: str, *values: Any) -> int:
+        """Add values to a set"""
+        try:
+            return await self.redis.sadd(self._set_key(set_name), *[str(v) for v in values])
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error adding to set {set_name}: {e}")
+            return 0
+
+    async def remove_from_set(self, set_name: str, *values: Any) -> int:
+        """Remove values from a set"""
+        try:
+            return await self.redis.srem(self._set_key(set_name), *[str(v) for v in values])
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error removing from set {set_name}: {e}")
+            return 0
+
+    async def get_set_members(self, set_name: str) -> Set[str]:
+        """Get all members of a set"""
+        try:
+            return await self.redis.smembers(self._set_key(set_name))
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting set members {set_name}: {e}")
+            return set()
+
+    async def is_in_set(self, set_name: str, value: Any) -> bool:
+        """Check if value is in set"""
+        try:
+            return bool(await self.redis.sismember(self._set_key(set_name), str(value)))
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error checking set membership {set_name}: {e}")
+            return False
+
+    async def get_set_count(self, set_name: str) -> int:
+        """Get number of items in set"""
+        try:
+            return await self.redis.scard(self._set_key(set_name))
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting set count {set_name}: {e}")
+            return 0
+
+    # ===== Counter Operations =====
+
+    async def increment_counter(self, counter_name: str, amount: int = 1) -> int:
+        """Increment a counter (single INCRBY regardless of amount)"""
+        try:
+            return await self.redis.incrby(self._counter_key(counter_name), amount)
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error incrementing counter {counter_name}: {e}")
+            return 0
+
+    async def decrement_counter(self, counter_name: str, amount: int = 1) -> int:
+        """Decrement a counter"""
+        try:
+            return await self.redis.decrby(self._counter_key(counter_name), amount)
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error decrementing counter {counter_name}: {e}")
+            return 0
+
+    async def get_counter(self, counter_name: str) -> int:
+        """Get counter value"""
+        try:
+            value = await self.redis.get(self._counter_key(counter_name))
+            return int(value) if value else 0
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting counter {counter_name}: {e}")
+            return 0
+
+    async def reset_counter(self, counter_name: str) -> bool:
+        """Reset counter to 0"""
+        try:
+            return await self.redis.delete(self._counter_key(counter_name)) > 0
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error resetting counter {counter_name}: {e}")
+            return False
+
+    # ===== Hash Operations =====
+
+    async def set_hash_field(self, hash_name: str, field: str, value: Any) -> bool:
+        """Set a field in a hash"""
+        try:
+            str_value = json.dumps(value, cls=DateTimeEncoder) if not isinstance(value, str) else value
+            await self.redis.hset(self._hash_key(hash_name), field, str_value)
+            return True
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error setting hash field {hash_name}.{field}: {e}")
+            return False
+
+    async def get_hash_field(self, hash_name: str, field: str) -> Optional[Any]:
+        """Get a field from a hash"""
+        try:
+            value = await self.redis.hget(self._hash_key(hash_name), field)
+            if value:
+                try:
+                    return json.loads(value)
+                except ValueError:
+                    return value
+            return None
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting hash field {hash_name}.{field}: {e}")
+            return None
+
+    async def get_hash_all(self, hash_name: str) -> Dict[str, Any]:
+        """Get all fields from a hash"""
+        try:
+            data = await self.redis.hgetall(self._hash_key(hash_name))
+            result = {}
+            for field, value in data.items():
+                try:
+                    result[field] = json.loads(value)
+                except ValueError:
+                    result[field] = value
+            return result
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting hash {hash_name}: {e}")
+            return {}
+
+    # ===== Cleanup & Utilities =====
+
+    async def cleanup_old_keys(self, max_age_seconds: int = 3600) -> int:
+        """Clean up old completed/failed sessions and statuses"""
+        try:
+            cleaned = 0
+            now = time.time()
+
+            for session in await self.get_all_sessions():
+                age = now - session.get("updated_at", now)
+                if age > max_age_seconds and session.get("status") in ["completed", "failed", "cancelled"]:
+                    session_id = session.get("id") or session.get("session_id") or session.get("upload_id")
+                    if session_id and await self.delete_session(session_id):
+                        cleaned += 1
+
+            keys = await self.redis.scan_keys(match=self._status_key("*"))
+            stale = []
+            for key, raw in zip(keys, await self.redis.mget(keys)):
+                try:
+                    status_data = json.loads(raw) if raw else None
+                    timestamp_str = status_data.get("timestamp") if status_data else None
+                    if timestamp_str:
+                        age = (datetime.now(timezone.utc) - datetime.fromisoformat(timestamp_str)).total_seconds()
+                        if age > max_age_seconds and status_data.get("status") in ["completed", "failed"]:
+                            stale.append(key)
+                except Exception as e:
+                    logger.warning(f"[{self.namespace}] Error checking key {key}: {e}")
+            if stale:
+                cleaned += await self.redis.delete(*stale)
+
+            if cleaned > 0:
+                logger.info(f"[{self.namespace}] Cleaned up {cleaned} old keys")
+            return cleaned
+
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error cleaning up old keys: {e}")
+            return 0
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get statistics about this namespace"""
+        try:
+            stats = {"namespace": self.namespace, "container_id": self.container_id}
+            for name, key_fn in (
+                ("sessions", self._session_key),
+                ("progress", self._progress_key),
+                ("locks", self._lock_key),
+                ("statuses", self._status_key),
+                ("sets", self._set_key),
+                ("counters", self._counter_key),
+                ("hashes", self._hash_key),
+            ):
+                stats[name] = len(await self.redis.scan_keys(match=key_fn("*")))
+            return stats
+
+        except Exception as e:
+            logger.error(f"[{self.namespace}] Error getting stats: {e}")
+            return {"error": str(e)}
+
+    def __repr__(self) -> str:
+        return f"AsyncRedisStateManager(namespace='{self.namespace}', container='{self.container_id}')"
+
+
+__all__ = [
+    "AsyncRedisStateManager",
+]
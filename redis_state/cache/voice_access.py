@@ -1,15 +1,34 @@
 """
 Redis-backed voice access tracking using generic RedisStateManager.
 Shares voice access metrics across all containers for accurate cleanup decisions.
+
+Segment requests only touch an in-process accumulator; a background task
+flushes it every FLUSH_INTERVAL seconds with one pipelined round-trip:
+
+    voice_access:hits:{track_id}              hash   {voice}:count (HINCRBY), {voice}:last (HSET)
+    voice_access:segments:{track_id}:{voice}  bitmap SETBIT per segment index
+    voice_access:unique:{track_id}:{voice}    HLL    PFADD per segment id (O(1) unique count)
 """
+import asyncio
 import logging
 import time
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
+from redis_state.config import ResilientRedisPipeline
 from redis_state.state_manager import RedisStateManager
 
 logger = logging.getLogger(__name__)
 
 
+class _PendingAccess:
+    """Unflushed access counters for one (track, voice)"""
+    __slots__ = ('count', 'last_access', 'segments')
+
+    def __init__(self):
+        self.count = 0
+        self.last_access = 0.0
+        self.segments = set()
+
+
 class RedisVoiceAccessTracker:
     """
     Voice access tracker using generic RedisStateManager.
@@ -17,14 +36,31 @@ class RedisVoiceAccessTracker:
     """
 
     ACCESS_TTL = 7200  # 2 hours (matches original cache_ttl)
+    FLUSH_INTERVAL = 5.0  # seconds between pipelined flushes
+    VOICE_IDLE_TIMEOUT = 600
 
     def __init__(self, container_id: Optional[str] = None):
         # Use generic manager with "voice_access" namespace
         self._manager = RedisStateManager("voice_access", container_id=container_id)
         self.container_id = self._manager.container_id
         self.cache_ttl = self.ACCESS_TTL
+        self._pending: Dict[Tuple[str, str], _PendingAccess] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.flush_errors = 0
         logger.info(f"RedisVoiceAccessTracker initialized: container={self.container_id}")
 
+    # ===== Keys =====
+
+    def _hits_key(self, track_id: str) -> str:
+        return self._manager._key("hits", str(track_id))
+
+    def _segments_key(self, track_id: str, voice_id: str) -> str:
+        return self._manager._key("segments", str(track_id), str(voice_id))
+
+    def _unique_key(self, track_id: str, voice_id: str) -> str:
+        return self._manager._key("unique", str(track_id), str(voice_id))
+
     @property
     def voice_access_cache(self):
         """Dict-like interface for backward compatibility"""
@@ -34,103 +70,207 @@ class RedisVoiceAccessTracker:
 
             def __contains__(self, track_id: str) -> bool:
                 """Check if track has voice access data"""
-                return self.parent._manager.get_session(f"track:{track_id}") is not None
+                return bool(self.parent._get_track_activity(track_id))
 
             def __getitem__(self, track_id: str) -> Dict:
                 """Get voice access data for track"""
-                data = self.parent._manager.get_session(f"track:{track_id}")
-                if data is None:
-                    # Return empty dict like original behavior
-                    return {}
-                return data
-
-            def __setitem__(self, track_id: str, value: Dict):
-                """Set voice access data for track"""
-                self.parent._manager.create_session(
-                    f"track:{track_id}",
-                    value,
-                    ttl=self.parent.ACCESS_TTL
-                )
+                return self.parent._get_track_activity(track_id)
 
             def get(self, track_id: str, default=None) -> Optional[Dict]:
                 """Get voice access data with default"""
-                return self.parent._manager.get_session(f"track:{track_id}") or default
+                return self.parent._get_track_activity(track_id) or default
 
             def pop(self, track_id: str, default=None) -> Optional[Dict]:
                 """Remove and return voice access data"""
-                data = self.parent._manager.get_session(f"track:{track_id}")
-                if data:
-                    self.parent._manager.delete_session(f"track:{track_id}")
+                data = self.parent._get_track_activity(track_id)
+                for voice_id in data:
+                    self.parent.clear_voice(track_id, voice_id)
                 return data if data else default
 
             def keys(self):
                 """Get all tracked track IDs (note: this is expensive in Redis)"""
-                # Note: RedisStateManager doesn't expose keys(), so we can't implement this efficiently
-                # The original code used this in cleanup_old_entries()
-                # We'll rely on Redis TTL for cleanup instead
+                # We rely on Redis TTL for cleanup instead
                 logger.warning("voice_access_cache.keys() called - not efficiently implemented in Redis")
                 return []
 
         return VoiceAccessDict(self)
 
+    # ===== Recording =====
+
     def record_segment_access(self, track_id: str, voice_id: str, segment_id: str = None):
-        """Record segment access - updates Redis state"""
-        # Get current track data
-        track_data = self._manager.get_session(f"track:{track_id}") or {}
-
-        # Get or create voice data
-        if voice_id not in track_data:
-            track_data[voice_id] = {
-                'last_access': time.time(),
-                'segment_count': 0,
-                'segments_accessed': []  # Use list instead of set for JSON serialization
-            }
+        """Record segment access in memory - flushed to Redis in the background"""
+        key = (str(track_id), str(voice_id))
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingAccess()
+        pending.count += 1
+        pending.last_access = time.time()
+        if segment_id is not None:
+            pending.segments.add(str(segment_id))
+        self._ensure_flusher()
 
-        voice_data = track_data[voice_id]
-        voice_data['last_access'] = time.time()
-        voice_data['segment_count'] += 1
+    def _ensure_flusher(self):
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Sync context (scripts, worker threads) - write through
+            batch = self._take_pending()
+            if not self._flush_sync(batch):
+                self._requeue(batch)
+            return
+        self._flush_task = loop.create_task(self._flush_loop())
 
-        if segment_id:
-            segments = voice_data.get('segments_accessed', [])
-            if segment_id not in segments:
-                segments.append(segment_id)
-            voice_data['segments_accessed'] = segments
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.sleep(self.FLUSH_INTERVAL)
+                await self.flush()
+            except asyncio.CancelledError:
+                await self.flush()
+                raise
+            except Exception as e:
+                logger.error(f"Voice access flush loop error: {e}")
 
-        # Update in Redis
-        self._manager.create_session(f"track:{track_id}", track_data, ttl=self.ACCESS_TTL)
+    def _take_pending(self) -> Dict[Tuple[str, str], _PendingAccess]:
+        batch, self._pending = self._pending, {}
+        return batch
 
-        logger.debug(f"Voice access recorded: track={track_id}, voice={voice_id}, segment={segment_id}")
+    def _requeue(self, batch: Dict[Tuple[str, str], _PendingAccess]):
+        """Merge a batch that failed to flush back under what was recorded since"""
+        for key, failed in batch.items():
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = failed
+                continue
+            pending.count += failed.count
+            pending.last_access = max(pending.last_access, failed.last_access)
+            pending.segments |= failed.segments
+
+    async def flush(self):
+        """Push accumulated accesses to Redis without blocking the event loop"""
+        batch = self._take_pending()
+        if batch and not await asyncio.to_thread(self._flush_sync, batch):
+            self._requeue(batch)  # on the loop, so it cannot race record_segment_access
+
+    def _flush_sync(self, batch: Dict[Tuple[str, str], _PendingAccess]) -> bool:
+        """Blocking; False if the batch did not reach Redis and must be retried"""
+        if not batch:
+            return True
+        try:
+            # The resilient wrapper answers fallback values when Redis is down;
+            # the raw pipeline raises, so a failed flush is noticed and retried
+            pipe = self._manager.redis.pipeline(transaction=False)
+            if isinstance(pipe, ResilientRedisPipeline):
+                pipe = pipe.pipeline
+                if pipe is None:
+                    raise ConnectionError("Redis unavailable")
+            touched = set()
+            for (track_id, voice_id), pending in batch.items():
+                hits_key = self._hits_key(track_id)
+                pipe.hincrby(hits_key, f"{voice_id}:count", pending.count)
+                pipe.hset(hits_key, f"{voice_id}:last", pending.last_access)
+                touched.add(hits_key)
+                if pending.segments:
+                    segments_key = self._segments_key(track_id, voice_id)
+                    for segment_id in pending.segments:
+                        if segment_id.isdigit():
+                            pipe.setbit(segments_key, int(segment_id), 1)
+                            touched.add(segments_key)
+                    unique_key = self._unique_key(track_id, voice_id)
+                    pipe.pfadd(unique_key, *pending.segments)
+                    touched.add(unique_key)
+            for key in touched:
+                pipe.expire(key, self.ACCESS_TTL)
+            pipe.execute()
+            self.flushes += 1
+            logger.debug(f"Flushed voice access for {len(batch)} track/voice pairs")
+            return True
+        except Exception as e:
+            self.flush_errors += 1
+            logger.error(f"Failed to flush voice access to Redis ({len(batch)} pairs kept for retry): {e}")
+            return False
+
+    # ===== Reads =====
+
+    def _get_track_activity(self, track_id: str) -> Dict[str, Dict]:
+        """All voices with recorded access for a track: {voice_id: {...}}"""
+        track_id = str(track_id)
+        fields = self._manager.redis.hgetall(self._hits_key(track_id)) or {}
+        voices = {field.rsplit(':', 1)[0] for field in fields}
+        voices.update(voice for (tid, voice) in self._pending if tid == track_id)
+        return {voice: self.get_voice_activity(track_id, voice) for voice in voices}
 
     def get_voice_activity(self, track_id: str, voice_id: str) -> Dict:
         """Get recent activity for a voice"""
-        track_data = self._manager.get_session(f"track:{track_id}")
+        track_id, voice_id = str(track_id), str(voice_id)
+        pipe = self._manager.redis.pipeline(transaction=False)
+        pipe.hmget(self._hits_key(track_id), [f"{voice_id}:count", f"{voice_id}:last"])
+        pipe.pfcount(self._unique_key(track_id, voice_id))
+        try:
+            (count, last_access), unique_segments = pipe.execute()
+        except (TypeError, ValueError):
+            count, last_access, unique_segments = None, None, 0
+
+        segment_count = int(count) if count else 0
+        last_access = float(last_access) if last_access else None
+        unique_segments = int(unique_segments or 0)
 
-        if track_data and voice_id in track_data:
-            data = track_data[voice_id]
-            time_since_access = time.time() - data['last_access']
+        pending = self._pending.get((track_id, voice_id))
+        if pending is not None:
+            segment_count += pending.count
+            last_access = max(last_access or 0.0, pending.last_access)
+            # Upper bound until the next flush merges them into the HLL
+            unique_segments += len(pending.segments)
 
+        if not segment_count:
             return {
-                'is_active': time_since_access < 600,  # VOICE_IDLE_TIMEOUT from original
-                'last_access': data['last_access'],
-                'time_since_access': time_since_access,
-                'segment_count': data['segment_count'],
-                'unique_segments': len(data.get('segments_accessed', []))
+                'is_active': False,
+                'last_access': None,
+                'time_since_access': float('inf'),
+                'segment_count': 0,
+                'unique_segments': 0
             }
 
+        time_since_access = time.time() - last_access
         return {
-            'is_active': False,
-            'last_access': None,
-            'time_since_access': float('inf'),
-            'segment_count': 0,
-            'unique_segments': 0
+            'is_active': time_since_access < self.VOICE_IDLE_TIMEOUT,
+            'last_access': last_access,
+            'time_since_access': time_since_access,
+            'segment_count': segment_count,
+            'unique_segments': unique_segments
         }
 
+    # ===== Cleanup =====
+
+    def clear_voice(self, track_id: str, voice_id: str):
+        """Forget all access data for a voice (e.g. after its cache was removed)"""
+        track_id, voice_id = str(track_id), str(voice_id)
+        self._pending.pop((track_id, voice_id), None)
+        try:
+            pipe = self._manager.redis.pipeline(transaction=False)
+            pipe.hdel(self._hits_key(track_id), f"{voice_id}:count", f"{voice_id}:last")
+            pipe.delete(self._segments_key(track_id, voice_id), self._unique_key(track_id, voice_id))
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to clear voice access for {track_id}/{voice_id}: {e}")
+
     def cleanup_old_entries(self):
         """Remove old entries - now handled by Redis TTL"""
         # Original implementation iterated over self.voice_access_cache.keys()
         # With Redis, TTL handles cleanup automatically
         logger.debug("Cleanup called - Redis TTL handles automatic expiration")
 
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'pending_pairs': len(self._pending),
+            'pending_accesses': sum(p.count for p in self._pending.values()),
+            'flush_interval_seconds': self.FLUSH_INTERVAL,
+            'flushes': self.flushes,
+            'flush_errors': self.flush_errors
+        }
+
 
 # Global instance
 voice_access_tracker = RedisVoiceAccessTracker()
@@ -1,9 +1,11 @@
 import os
+import time
+import asyncio
 import logging
 from typing import Any, Optional, List, Set, Dict, Union
 from redis import Redis
-from redis.asyncio import Redis as AsyncRedis
-from redis.exceptions import ConnectionError, RedisError
+from redis.asyncio import Redis as AsyncRedis, ConnectionPool as AsyncConnectionPool
+from redis.exceptions import ConnectionError, TimeoutError, RedisError
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -47,6 +49,10 @@ FALLBACK_REDIS_CONFIG = {
     "retry_on_timeout": True
 }
 
+# Async pool settings (one pool per event loop, shared by every async caller)
+REDIS_ASYNC_MAX_CONNECTIONS = int(os.getenv('REDIS_ASYNC_MAX_CONNECTIONS', 64))
+REDIS_HEALTH_CHECK_INTERVAL = 30
+
 if REDIS_PASSWORD:
     REDIS_CONFIG["password"] = REDIS_PASSWORD
 
@@ -310,20 +316,7 @@ class ResilientRedisPipeline:
     
     def _get_fallback_value(self, command_name: str) -> Any:
         """Return appropriate fallback value based on command type"""
-        if command_name in ['sadd', 'srem', 'scard', 'incr', 'decr', 'lpush', 'rpush']:
-            return 0
-        elif command_name in ['get', 'hget']:
-            return None
-        elif command_name in ['keys', 'lrange', 'hmget']:
-            return []
-        elif command_name in ['smembers']:
-            return set()
-        elif command_name in ['hgetall']:
-            return {}
-        elif command_name in ['sismember', 'set', 'expire', 'ltrim']:
-            return False
-        else:
-            return None
+        return _pipeline_fallback_value(command_name)
     
     def execute(self) -> List:
         """Execute pipeline commands with fallback handling"""
@@ -338,169 +331,325 @@ class ResilientRedisPipeline:
             return self.fallback_values
 
 
+def _pipeline_fallback_value(command_name: str) -> Any:
+    """Return appropriate fallback value based on command type"""
+    if command_name in ['sadd', 'srem', 'scard', 'incr', 'incrby', 'decr', 'hincrby', 'lpush', 'rpush', 'exists', 'delete']:
+        return 0
+    elif command_name in ['get', 'hget']:
+        return None
+    elif command_name in ['keys', 'lrange', 'hmget', 'mget']:
+        return []
+    elif command_name in ['smembers']:
+        return set()
+    elif command_name in ['hgetall']:
+        return {}
+    elif command_name in ['sismember', 'set', 'expire', 'ltrim']:
+        return False
+    else:
+        return None
+
+
 class ResilientAsyncRedisClient:
-    """Async version of the resilient Redis client wrapper"""
-    
+    """
+    Async version of the resilient Redis client wrapper.
+
+    Commands share one pooled connection set per event loop (no per-command
+    PING like the sync client). A failed connection is marked unavailable and
+    retried at most every RECONNECT_INTERVAL seconds, returning fallback values
+    in between so request handlers never stall on a dead Redis.
+    """
+
+    RECONNECT_INTERVAL = 5.0
+
     def __init__(
         self,
         primary_url: str = REDIS_URL,
         fallback_url: str = FALLBACK_REDIS_URL,
         default_ttl: int = 86400,
-        max_retries: int = 2
+        max_retries: int = 2,
+        max_connections: int = REDIS_ASYNC_MAX_CONNECTIONS
     ):
         self.primary_url = primary_url
         self.fallback_url = fallback_url
         self.default_ttl = default_ttl
         self.max_retries = max_retries
+        self.max_connections = max_connections
         self._primary_client = None
         self._fallback_client = None
         self._primary_available = False
         self._fallback_available = False
-    
+        self._loop = None
+        self._next_connect_attempt = 0.0
+
+    def _create_client(self, url: str, password: Optional[str]) -> AsyncRedis:
+        pool = AsyncConnectionPool.from_url(
+            url,
+            password=password,
+            max_connections=self.max_connections,
+            encoding="utf-8",
+            decode_responses=True,
+            socket_timeout=2.0,
+            socket_connect_timeout=2.0,
+            retry_on_timeout=True,
+            health_check_interval=REDIS_HEALTH_CHECK_INTERVAL
+        )
+        return AsyncRedis.from_pool(pool)
+
+    def _bind_loop(self) -> None:
+        """Pools are tied to the loop that opened them - start over on a new loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._primary_client = None
+            self._fallback_client = None
+            self._primary_available = False
+            self._fallback_available = False
+            self._next_connect_attempt = 0.0
+
     async def _init_connections(self) -> None:
         """Initialize Redis connections"""
+        self._bind_loop()
+        if self._primary_available or self._fallback_available:
+            return
+        if time.monotonic() < self._next_connect_attempt:
+            return
+
         # Try primary connection
-        if not self._primary_client:
-            try:
-                self._primary_client = AsyncRedis.from_url(
-                    self.primary_url,
-                    encoding="utf-8",
-                    decode_responses=True,
-                    socket_timeout=2.0,
-                    socket_connect_timeout=2.0,
-                    retry_on_timeout=True
-                )
-                await self._primary_client.ping()
-                self._primary_available = True
-                logger.info("Connected to primary async Redis successfully")
-            except Exception as e:
-                logger.warning(f"Primary async Redis connection failed: {e}")
-                self._primary_available = False
-        
+        try:
+            if not self._primary_client:
+                self._primary_client = self._create_client(self.primary_url, REDIS_PASSWORD)
+            await self._primary_client.ping()
+            self._primary_available = True
+            logger.info("Connected to primary async Redis successfully")
+            return
+        except Exception as e:
+            logger.warning(f"Primary async Redis connection failed: {e}")
+            self._primary_available = False
+
         # Try fallback connection if primary failed
-        if not self._primary_available and not self._fallback_client:
-            try:
-                self._fallback_client = AsyncRedis.from_url(
-                    self.fallback_url,
-                    encoding="utf-8",
-                    decode_responses=True,
-                    socket_timeout=2.0,
-                    socket_connect_timeout=2.0,
-                    retry_on_timeout=True
-                )
-                await self._fallback_client.ping()
-                self._fallback_available = True
-                logger.info("Connected to fallback async Redis successfully")
-            except Exception as e:
-                logger.warning(f"Fallback async Redis connection failed: {e}")
-                self._fallback_available = False
-    
+        try:
+            if not self._fallback_client:
+                self._fallback_client = self._create_client(self.fallback_url, FALLBACK_REDIS_PASSWORD)
+            await self._fallback_client.ping()
+            self._fallback_available = True
+            logger.info("Connected to fallback async Redis successfully")
+        except Exception as e:
+            logger.warning(f"Fallback async Redis connection failed: {e}")
+            self._fallback_available = False
+            self._next_connect_attempt = time.monotonic() + self.RECONNECT_INTERVAL
+
     async def _get_client(self) -> Optional[AsyncRedis]:
         """Get available Redis client or None if all are unavailable"""
         await self._init_connections()
-        
-        # Check primary client
-        if self._primary_available:
-            try:
-                await self._primary_client.ping()
-                return self._primary_client
-            except Exception:
-                logger.warning("Primary async Redis is no longer available")
-                self._primary_available = False
-        
-        # Check fallback client
-        if self._fallback_available:
-            try:
-                await self._fallback_client.ping()
-                return self._fallback_client
-            except Exception:
-                logger.warning("Fallback async Redis is no longer available")
-                self._fallback_available = False
-        
-        # Try to reconnect if both are unavailable
-        await self._init_connections()
-        
-        # Return available client or None
+
         if self._primary_available:
             return self._primary_client
         elif self._fallback_available:
             return self._fallback_client
         else:
             return None
-    
+
+    def _mark_unavailable(self, client: AsyncRedis) -> None:
+        if client is self._primary_client:
+            logger.warning("Primary async Redis is no longer available")
+            self._primary_available = False
+        elif client is self._fallback_client:
+            logger.warning("Fallback async Redis is no longer available")
+            self._fallback_available = False
+
     async def _execute_with_fallback(self, method: str, *args, fallback_value: Any = None, **kwargs) -> Any:
         """Execute Redis command with fallback value on failure"""
         client = await self._get_client()
-        
+
         if not client:
             logger.warning(f"Async Redis unavailable for {method}, using fallback value")
             return fallback_value
-        
+
         for attempt in range(self.max_retries):
             try:
                 redis_method = getattr(client, method)
                 return await redis_method(*args, **kwargs)
-            except Exception as e:
+            except (ConnectionError, TimeoutError) as e:
                 logger.warning(f"Async Redis error on attempt {attempt+1}/{self.max_retries}: {e}")
-                if attempt == self.max_retries - 1:
-                    logger.error(f"All async Redis attempts failed for {method}, using fallback value")
-                    return fallback_value
-                # Try to get a working client for next attempt
-                client = await self._get_client()
-                if not client:
-                    logger.error("No async Redis connection available, using fallback value")
-                    return fallback_value
-    
-    # Implement the Redis methods you need for async usage
+                self._mark_unavailable(client)
+            except RedisError as e:
+                logger.warning(f"Async Redis error on attempt {attempt+1}/{self.max_retries}: {e}")
+            if attempt == self.max_retries - 1:
+                logger.error(f"All async Redis attempts failed for {method}, using fallback value")
+                return fallback_value
+            # Try to get a working client for next attempt
+            client = await self._get_client()
+            if not client:
+                logger.error("No async Redis connection available, using fallback value")
+                return fallback_value
+
+    # Key-value operations
     async def get(self, key: str) -> Optional[str]:
         """Get value for key or None on failure"""
         return await self._execute_with_fallback('get', key, fallback_value=None)
-    
+
+    async def mget(self, keys: List[str]) -> List:
+        """Get several keys in one round trip, list of None on failure"""
+        if not keys:
+            return []
+        return await self._execute_with_fallback('mget', keys, fallback_value=[None] * len(keys))
+
     async def set(self, key: str, value: str, ex: int = None, nx: bool = False) -> bool:
         """Set key to value with optional expiration, return True on success or False on failure"""
         return await self._execute_with_fallback('set', key, value, ex=ex or self.default_ttl, nx=nx, fallback_value=False)
-    
+
     async def delete(self, *keys) -> int:
         """Delete keys, return number of keys deleted or 0 on failure"""
         return await self._execute_with_fallback('delete', *keys, fallback_value=0)
-    
+
+    async def exists(self, *keys) -> int:
+        """Check if keys exist, return count of existing keys or 0 on failure"""
+        return await self._execute_with_fallback('exists', *keys, fallback_value=0)
+
     async def incr(self, key: str) -> int:
         """Increment value, return new value or 1 on failure"""
         return await self._execute_with_fallback('incr', key, fallback_value=1)
-    
+
+    async def incrby(self, key: str, amount: int) -> int:
+        """Increment value by amount, return new value or 0 on failure"""
+        return await self._execute_with_fallback('incrby', key, amount, fallback_value=0)
+
+    async def decrby(self, key: str, amount: int) -> int:
+        """Decrement value by amount, return new value or 0 on failure"""
+        return await self._execute_with_fallback('decrby', key, amount, fallback_value=0)
+
+    # Set operations
     async def sadd(self, key: str, *values) -> int:
         """Add values to set, return number of items added or 0 on failure"""
         return await self._execute_with_fallback('sadd', key, *values, fallback_value=0)
-    
+
     async def srem(self, key: str, *values) -> int:
         """Remove values from set, return number of items removed or 0 on failure"""
         return await self._execute_with_fallback('srem', key, *values, fallback_value=0)
-    
+
     async def scard(self, key: str) -> int:
         """Return set cardinality (number of elements) or 0 on failure"""
         return await self._execute_with_fallback('scard', key, fallback_value=0)
-    
+
     async def smembers(self, key: str) -> Set:
         """Return all members of the set or empty set on failure"""
         return await self._execute_with_fallback('smembers', key, fallback_value=set())
-    
+
     async def sismember(self, key: str, value) -> bool:
         """Return True if value is in set, False otherwise or on failure"""
         return await self._execute_with_fallback('sismember', key, value, fallback_value=False)
-    
+
+    # Hash operations
+    async def hget(self, key: str, field: str) -> Optional[str]:
+        """Get hash field or None on failure"""
+        return await self._execute_with_fallback('hget', key, field, fallback_value=None)
+
+    async def hset(self, key: str, field: str, value: str) -> int:
+        """Set hash field, return 1 if field is new or 0 if field existed"""
+        return await self._execute_with_fallback('hset', key, field, value, fallback_value=0)
+
+    async def hgetall(self, key: str) -> Dict:
+        """Get all hash fields and values, return dict or empty dict on failure"""
+        return await self._execute_with_fallback('hgetall', key, fallback_value={})
+
+    # Other operations
+    async def keys(self, pattern: str) -> List:
+        """Find keys matching pattern, return list or empty list on failure"""
+        return await self._execute_with_fallback('keys', pattern, fallback_value=[])
+
+    async def scan_keys(self, match: str = None, count: int = 500) -> List:
+        """Collect keys matching pattern using SCAN, empty list on failure"""
+        client = await self._get_client()
+        if not client:
+            return []
+        try:
+            return [key async for key in client.scan_iter(match=match, count=count)]
+        except Exception as e:
+            logger.warning(f"Async scan failed: {e}, returning empty list")
+            return []
+
+    # Expiration operations
+    async def expire(self, key: str, seconds: int) -> bool:
+        """Set key expiration, return True if key exists or False on failure"""
+        return await self._execute_with_fallback('expire', key, seconds, fallback_value=False)
+
+    # Pub/Sub operations
+    async def publish(self, channel: str, message: str) -> int:
+        """Publish message to channel, return number of subscribers or 0 on failure"""
+        return await self._execute_with_fallback('publish', channel, message, fallback_value=0)
+
+    # Transaction support
+    def pipeline(self, transaction: bool = True) -> 'ResilientAsyncRedisPipeline':
+        """Return a pipeline object; commands are sent in one round trip on execute()"""
+        return ResilientAsyncRedisPipeline(self, transaction=transaction)
+
     async def close(self) -> None:
         """Close Redis connections"""
-        if self._primary_client:
-            await self._primary_client.close()
-        if self._fallback_client:
-            await self._fallback_client.close()
+        for client in (self._primary_client, self._fallback_client):
+            if client:
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    logger.debug(f"Error closing async Redis client: {e}")
+        self._primary_client = None
+        self._fallback_client = None
+        self._primary_available = False
+        self._fallback_available = False
+
+
+class ResilientAsyncRedisPipeline:
+    """Buffers commands and replays them on a pooled connection in execute()"""
+
+    def __init__(self, parent_client: ResilientAsyncRedisClient, transaction: bool = True):
+        self.parent = parent_client
+        self.transaction = transaction
+        self.commands = []
+        self.fallback_values = []
+
+    def __getattr__(self, name: str):
+        """Capture Redis commands to the pipeline"""
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def wrapper(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            self.fallback_values.append(_pipeline_fallback_value(name))
+            return self
+        return wrapper
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    async def execute(self) -> List:
+        """Execute pipeline commands with fallback handling"""
+        if not self.commands:
+            return []
+
+        client = await self.parent._get_client()
+        if not client:
+            logger.warning("Async Redis unavailable for pipeline, using fallback values")
+            return list(self.fallback_values)
+
+        try:
+            async with client.pipeline(transaction=self.transaction) as pipe:
+                for name, args, kwargs in self.commands:
+                    getattr(pipe, name)(*args, **kwargs)
+                return await pipe.execute()
+        except (ConnectionError, TimeoutError) as e:
+            self.parent._mark_unavailable(client)
+            logger.error(f"Async pipeline execution failed: {e}")
+        except Exception as e:
+            logger.error(f"Async pipeline execution failed: {e}")
+        return list(self.fallback_values)
 
 
 # Create global instances
 redis_client = ResilientRedisClient()
 
+# Shared async client - one connection pool per event loop
+async_redis_client = ResilientAsyncRedisClient()
+
 # Function to get async Redis client
 async def get_async_redis() -> ResilientAsyncRedisClient:
-    client = ResilientAsyncRedisClient()
-    await client._init_connections()
-    return client
\ No newline at end of file
+    await async_redis_client._init_connections()
+    return async_redis_client
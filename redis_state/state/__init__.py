@@ -7,10 +7,11 @@ Provides shared state management across containers for:
 - Upload/download state management
 """
 
-from redis_state.state.progress import progress_state
-from redis_state.state.conversion import conversion_state
-from redis_state.state.upload import upload_state
+from redis_state.state.progress import progress_state, async_progress_state
+from redis_state.state.conversion import conversion_state, async_conversion_state
+from redis_state.state.upload import upload_state, async_upload_state
 from redis_state.state.download import album_download_state, track_download_state
+from redis_state.state.download import async_album_download_state, async_track_download_state
 
 # Legacy support
 from redis_state.state.download import get_album_download_state, get_track_download_state
@@ -25,4 +26,10 @@ __all__ = [
     'track_download_state',
     'get_album_download_state',
     'get_track_download_state',
+    # Async facades
+    'async_progress_state',
+    'async_conversion_state',
+    'async_upload_state',
+    'async_album_download_state',
+    'async_track_download_state',
 ]
@@ -6,6 +6,7 @@ import logging
 import asyncio
 from typing import Dict, Optional, Any
 from redis_state.state_manager import RedisStateManager
+from redis_state.async_state_manager import AsyncRedisStateManager
 
 logger = logging.getLogger(__name__)
 
@@ -133,5 +134,36 @@ class RedisConversionState:
         return RegenerationLockDict(self)
 
 
-# Global instance
+class AsyncRedisConversionState:
+    """Awaitable counterpart of RedisConversionState (same keys)"""
+
+    CONVERSION_TTL = RedisConversionState.CONVERSION_TTL
+    LOCK_TTL = RedisConversionState.LOCK_TTL
+
+    def __init__(self, container_id: Optional[str] = None):
+        self._manager = AsyncRedisStateManager("conversion", container_id=container_id)
+        self.container_id = self._manager.container_id
+
+    async def get_active(self, conversion_id: str, default=None):
+        return await self._manager.get_session(f"active:{conversion_id}") or default
+
+    async def set_active(self, conversion_id: str, value: Dict) -> bool:
+        return await self._manager.create_session(f"active:{conversion_id}", value, ttl=self.CONVERSION_TTL)
+
+    async def pop_active(self, conversion_id: str, default=None):
+        data = await self._manager.get_session(f"active:{conversion_id}")
+        if data:
+            await self._manager.delete_session(f"active:{conversion_id}")
+        return data if data else default
+
+    async def acquire_segment_lock(self, lock_id: str, timeout: Optional[int] = None) -> bool:
+        """Distributed lock shared with RedisConversionState.segment_locks"""
+        return await self._manager.acquire_lock(f"seg_lock:{lock_id}", timeout=timeout or self.LOCK_TTL)
+
+    async def release_segment_lock(self, lock_id: str) -> bool:
+        return await self._manager.release_lock(f"seg_lock:{lock_id}")
+
+
+# Global instances
 conversion_state = RedisConversionState()
+async_conversion_state = AsyncRedisConversionState(container_id=conversion_state.container_id)
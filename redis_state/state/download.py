@@ -12,9 +12,12 @@ Usage:
     track_download_state = get_track_download_state()
 """
 
+import json
 import logging
+from datetime import datetime, timezone
 from typing import Dict, Optional, Any, List
-from redis_state.state_manager import RedisStateManager
+from redis_state.state_manager import RedisStateManager, DateTimeEncoder
+from redis_state.async_state_manager import AsyncRedisStateManager
 
 logger = logging.getLogger(__name__)
 
@@ -278,6 +281,75 @@ class RedisDownloadState:
         return stats
 
 
+class AsyncRedisDownloadState:
+    """
+    Awaitable counterpart of RedisDownloadState for progress updates made from
+    download workers and status polling. Same namespace and keys.
+    """
+
+    ACTIVE_TTL = 7200  # 2 hours, matches active_downloads.__setitem__
+
+    def __init__(self, namespace: str, container_id: Optional[str] = None):
+        self._manager = AsyncRedisStateManager(namespace, container_id=container_id)
+        self.container_id = self._manager.container_id
+        self.namespace = namespace
+
+    # ===== Active downloads =====
+
+    async def contains(self, download_id: str) -> bool:
+        return await self._manager.get_session(download_id) is not None
+
+    async def get(self, download_id: str, default=None) -> Optional[Dict]:
+        data = await self._manager.get_session(download_id)
+        return data if data else default
+
+    async def set(self, download_id: str, value: Dict) -> bool:
+        value.setdefault("container_id", self.container_id)
+        value.setdefault("download_id", download_id)
+        return await self._manager.create_session(download_id, value, ttl=self.ACTIVE_TTL)
+
+    async def update(self, download_id: str, updates: Dict) -> bool:
+        """Merge fields into an active download (no-op if it doesn't exist)"""
+        return await self._manager.update_session(download_id, updates, extend_ttl=True)
+
+    async def pop(self, download_id: str, default=None):
+        data = await self._manager.get_session(download_id)
+        if data:
+            await self._manager.delete_session(download_id)
+            return data
+        return default
+
+    # ===== Completed downloads =====
+
+    async def get_completed(self, download_id: str, default=None) -> Optional[Dict]:
+        status = await self._manager.get_status(download_id)
+        if status and status.get("status") == "completed":
+            return status
+        return default
+
+    async def set_completed(self, download_id: str, value: Dict) -> bool:
+        return await self._manager.set_status(download_id, "completed", metadata=value)
+
+    async def complete(self, download_id: str, value: Dict) -> bool:
+        """Move a download from active to completed in one round trip"""
+        manager = self._manager
+        data = {
+            "status": "completed",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "container_id": self.container_id,
+            **value
+        }
+        pipe = manager.pipeline(transaction=True)
+        pipe.set(
+            manager._status_key(download_id),
+            json.dumps(data, cls=DateTimeEncoder),
+            ex=manager._get_ttl_for_status("completed")
+        )
+        pipe.delete(manager._session_key(download_id))
+        results = await pipe.execute()
+        return bool(results and results[0])
+
+
 # ===== Global Singleton Instances =====
 
 _album_download_state = None
@@ -323,6 +395,8 @@ def get_track_download_state(container_id: Optional[str] = None) -> RedisDownloa
 # Global instances for direct imports
 album_download_state = RedisDownloadState("download:album")
 track_download_state = RedisDownloadState("download:track")
+async_album_download_state = AsyncRedisDownloadState("download:album", container_id=album_download_state.container_id)
+async_track_download_state = AsyncRedisDownloadState("download:track", container_id=track_download_state.container_id)
 download_state = album_download_state  # Alias for backward compatibility
 
 # Backward compatibility exports
@@ -333,4 +407,7 @@ __all__ = [
     "album_download_state",
     "track_download_state",
     "download_state",
+    "AsyncRedisDownloadState",
+    "async_album_download_state",
+    "async_track_download_state",
 ]
@@ -5,6 +5,7 @@ Ensures progress visibility across all containers for multi-container deployment
 import logging
 from typing import Dict, Optional, Any
 from redis_state.state_manager import RedisStateManager
+from redis_state.async_state_manager import AsyncRedisStateManager
 
 logger = logging.getLogger(__name__)
 
@@ -163,5 +164,57 @@ class RedisProgressState:
         return ProgressDict(self)
 
 
-# Global instance
+class AsyncRedisProgressState:
+    """
+    Awaitable counterpart of RedisProgressState.segment_progress for coroutines.
+    Same keys and memory fallback, so sync readers see what async writers store.
+    """
+
+    PROGRESS_TTL = RedisProgressState.PROGRESS_TTL
+
+    def __init__(self, container_id: Optional[str] = None, memory_fallback: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._manager = AsyncRedisStateManager("progress", container_id=container_id)
+        self.container_id = self._manager.container_id
+        self._memory_fallback = memory_fallback if memory_fallback is not None else {}
+
+    async def contains(self, progress_key: str) -> bool:
+        if await self._manager.get_session(progress_key) is not None:
+            return True
+        return progress_key in self._memory_fallback
+
+    async def get(self, progress_key: str, default=None):
+        data = await self._manager.get_session(progress_key)
+        if data is not None:
+            return data
+        return self._memory_fallback.get(progress_key, default)
+
+    async def set(self, progress_key: str, value: Dict) -> Dict:
+        success = await self._manager.create_session(progress_key, value, ttl=self.PROGRESS_TTL)
+        if success:
+            self._memory_fallback.pop(progress_key, None)
+        else:
+            self._memory_fallback[progress_key] = value
+        return value
+
+    async def update(self, progress_key: str, updates: Dict) -> Dict:
+        """Merge updates into existing progress and return the merged dict"""
+        existing = await self.get(progress_key)
+        merged = dict(existing or {})
+        merged.update(updates)
+        return await self.set(progress_key, merged)
+
+    async def pop(self, progress_key: str, default=None):
+        data = await self._manager.get_session(progress_key)
+        if data:
+            await self._manager.delete_session(progress_key)
+            return data
+        fallback = self._memory_fallback.pop(progress_key, None)
+        return fallback if fallback is not None else default
+
+
+# Global instances
 progress_state = RedisProgressState()
+async_progress_state = AsyncRedisProgressState(
+    container_id=progress_state.container_id,
+    memory_fallback=progress_state._memory_fallback
+)
@@ -7,9 +7,11 @@ while maintaining the exact same API as redis_upload_state.py for backward compa
 Migration: redis_upload_state.py (specialized) → RedisStateManager("upload") (generic)
 """
 
+import json
 import logging
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple
 from redis_state.state_manager import RedisStateManager
+from redis_state.async_state_manager import AsyncRedisStateManager
 
 logger = logging.getLogger(__name__)
 
@@ -336,6 +338,87 @@ class RedisUploadState:
         return self._manager._get_ttl_for_status(status)
 
 
+class AsyncRedisUploadState:
+    """
+    Awaitable counterpart of RedisUploadState for the chunk upload path.
+    Same namespace and keys, so sessions created by either are interchangeable.
+    """
+
+    SESSION_TTL = RedisUploadState.SESSION_TTL
+    LOCK_TTL = RedisUploadState.LOCK_TTL
+
+    def __init__(self, container_id: Optional[str] = None):
+        self._manager = AsyncRedisStateManager("upload", container_id=container_id)
+        self.container_id = self._manager.container_id
+
+    # ===== Session Management =====
+
+    async def create_session(self, upload_data: Dict[str, Any]) -> bool:
+        upload_id = upload_data.get("upload_id")
+        if not upload_id:
+            logger.error("Cannot create session without upload_id")
+            return False
+        return await self._manager.create_session(upload_id, upload_data, ttl=self.SESSION_TTL)
+
+    async def get_session(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        return await self._manager.get_session(upload_id)
+
+    async def update_session(self, upload_id: str, updates: Dict[str, Any]) -> bool:
+        return await self._manager.update_session(upload_id, updates, extend_ttl=True)
+
+    async def delete_session(self, upload_id: str) -> bool:
+        await self._manager.redis.delete(self._manager._set_key(f"chunks:{upload_id}"))
+        return await self._manager.delete_session(upload_id)
+
+    async def get_all_active_uploads(self) -> List[Dict[str, Any]]:
+        return await self._manager.get_all_sessions()
+
+    # ===== Chunk Tracking =====
+
+    async def register_chunk(self, upload_id: str, chunk_index: int) -> bool:
+        return await self._manager.add_to_set(f"chunks:{upload_id}", str(chunk_index)) > 0
+
+    async def get_received_chunks_count(self, upload_id: str) -> int:
+        return await self._manager.get_set_count(f"chunks:{upload_id}")
+
+    async def register_chunk_and_get_session(
+        self,
+        upload_id: str,
+        chunk_index: int
+    ) -> Tuple[Optional[Dict[str, Any]], int]:
+        """
+        Register a received chunk and read back the session and received-chunk
+        count in a single pipelined round trip.
+
+        Returns:
+            (session data or None, number of chunks received)
+        """
+        manager = self._manager
+        chunks_key = manager._set_key(f"chunks:{upload_id}")
+        pipe = manager.pipeline(transaction=False)
+        pipe.sadd(chunks_key, str(chunk_index))
+        pipe.scard(chunks_key)
+        pipe.get(manager._session_key(upload_id))
+        _, received, raw_session = await pipe.execute()
+
+        session = None
+        if raw_session:
+            try:
+                session = json.loads(raw_session)
+                session.setdefault("session_id", upload_id)
+            except ValueError as e:
+                logger.error(f"Error decoding upload session {upload_id}: {e}")
+        return session, received or 0
+
+    # ===== Lock Management =====
+
+    async def acquire_lock(self, upload_id: str, timeout: Optional[int] = None) -> bool:
+        return await self._manager.acquire_lock(upload_id, timeout=timeout or self.LOCK_TTL)
+
+    async def release_lock(self, upload_id: str) -> bool:
+        return await self._manager.release_lock(upload_id)
+
+
 # Global singleton instance (same interface as old version)
 _redis_upload_state = None
 
@@ -360,6 +443,7 @@ def get_redis_upload_state(container_id: Optional[str] = None) -> RedisUploadSta
 
 # Global instance for direct imports
 upload_state = RedisUploadState()
+async_upload_state = AsyncRedisUploadState(container_id=upload_state.container_id)
 
 # Backward compatibility exports
-__all__ = ["RedisUploadState", "get_redis_upload_state", "upload_state"]
+__all__ = ["RedisUploadState", "get_redis_upload_state", "upload_state", "AsyncRedisUploadState", "async_upload_state"]
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Benchmark: worker memory of the in-process caches over a day of traffic
+
+Replays a day of requests against two versions of the caches that
+WordTimingOptimizer, SmartVoiceSegmentService, PopularTracksService and
+ReadAlongService keep per worker:
+
+- legacy    the plain dicts they used before BoundedCache (segment_cache and
+            user_behavior never dropped anything, popular track ids were
+            only checked for age on read, generation results were deleted
+            30 s after being stored, read-along LRUs capped entries only)
+- bounded   BoundedCache with the budgets and TTLs the services configure
+
+Every value is a real object of the shape the service stores (word dicts,
+segment bytes, id lists), so the retained memory is measured with
+tracemalloc rather than estimated. The replay has its own clock, so TTLs
+play out over the simulated day in seconds.
+
+Requests come from --log, an access log in nginx combined or uvicorn
+format. Timestamps are used when present; otherwise lines are spread
+evenly over the day. These requests are replayed:
+
+    /hls/{track}/voice/{voice}/{quality}/segment_{n}.ts
+    /api/tracks/{track}/word-at-time[-fast]?time=..&voice_id=..
+    /api/tracks/{track}/read-along/{voice}
+
+Without --log, a synthetic day is generated: listening sessions on
+Zipf-distributed tracks. Each session fetches a read-along page, then
+plays segments in order and polls word-at-time between them.
+
+Usage:
+    python scripts/bench_cache_memory.py --sessions 2000 --tracks 3000
+    python scripts/bench_cache_memory.py --log /var/log/nginx/access.log
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict, deque
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import efficient_word_timing_api as word_api
+import enhanced_read_along_api as read_along_api
+import popular_tracks_service as popular_api
+import smart_voice_segments as voice_api
+from bounded_cache import BoundedCache
+
+DAY_SECONDS = 86400
+SEGMENT_SECONDS = 30
+WORDS_PER_SEGMENT = 90
+SEGMENT_BYTES = 240 * 1024  # 30 s at 64 kbps
+POPULAR_IDS = 200
+VOICES = ("en-US-AvaNeural", "en-US-AndrewNeural", "en-GB-SoniaNeural", "en-US-EmmaNeural", "en-US-BrianNeural")
+
+_REQUEST = re.compile(r'"(?:GET|POST) (\S+)')
+_STAMP = re.compile(r"\[(\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2})")
+_VOICE_SEGMENT = re.compile(r"^/hls/([^/]+)/voice/([^/]+)/[^/]+/segment_(\d+)\.ts$")
+_WORD_AT_TIME = re.compile(r"^/api/tracks/([^/]+)/word-at-time(?:-fast)?$")
+_READ_ALONG = re.compile(r"^/api/tracks/([^/]+)/read-along/([^/]+)$")
+
+
+# ----------------------------------------------------------------- traffic
+
+def synthetic_day(sessions: int, tracks: int, seed: int = 7):
+    """(time, kind, track, voice, arg) events of listening sessions over one day"""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(tracks)]
+    picks = rng.choices(range(tracks), weights=weights, k=sessions)
+    events = []
+    for track in picks:
+        track_id, voice = f"track-{track}", rng.choice(VOICES)
+        t = rng.uniform(0, DAY_SECONDS)
+        segment = rng.choice((0, 0, 0, rng.randint(0, 200)))
+        events.append((t, "read_along", track_id, voice, None))
+        for _ in range(int(rng.expovariate(1 / 20)) + 1):
+            events.append((t, "segment", track_id, voice, segment))
+            for poll in range(0, SEGMENT_SECONDS, 5):
+                events.append((t + poll, "word_at", track_id, voice, segment * SEGMENT_SECONDS + poll))
+            t += SEGMENT_SECONDS
+            segment += 1 if rng.random() < 0.9 else rng.randint(2, 40)
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def log_day(path: Path):
+    """The same events parsed from an access log"""
+    lines = path.read_text(errors="replace").splitlines()
+    events, first = [], None
+    for number, line in enumerate(lines):
+        request = _REQUEST.search(line)
+        if not request:
+            continue
+        stamp = _STAMP.search(line)
+        if stamp:
+            t = datetime.strptime(stamp.group(1), "%d/%b/%Y:%H:%M:%S").timestamp()
+            first = t if first is None else first
+            t -= first
+        else:
+            t = number * DAY_SECONDS / max(1, len(lines))
+        url = urlsplit(request.group(1))
+        query = parse_qs(url.query)
+        if m := _VOICE_SEGMENT.match(url.path):
+            events.append((t, "segment", m.group(1), m.group(2), int(m.group(3))))
+        elif (m := _WORD_AT_TIME.match(url.path)) and "time" in query and "voice_id" in query:
+            events.append((t, "word_at", m.group(1), query["voice_id"][0], float(query["time"][0])))
+        elif m := _READ_ALONG.match(url.path):
+            events.append((t, "read_along", m.group(1), m.group(2), None))
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+# ------------------------------------------------------------------ values
+
+def segment_words(track: str, segment: int):
+    base = segment * SEGMENT_SECONDS
+    return [
+        {"word": f"w{i}", "start_time": base + i / 3, "end_time": base + i / 3 + 0.25, "duration": 0.25,
+         "segment_index": segment, "global_index": segment * WORDS_PER_SEGMENT + i}
+        for i in range(WORDS_PER_SEGMENT)
+    ]
+
+
+def book_words(count: int):
+    return [
+        {"word": f"w{i}", "start_time": i / 3, "end_time": i / 3 + 0.25, "duration": 0.25, "segment_index": i // 90}
+        for i in range(count)
+    ]
+
+
+def popular_ids(creator: int):
+    return [f"track-{creator}-{i}" for i in range(POPULAR_IDS)]
+
+
+# ------------------------------------------------------------------ caches
+
+class LegacyCaches:
+    """Plain dicts, as the services kept them before BoundedCache"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.segment_cache = {}
+        self.user_behavior = {}
+        self.popular = {}
+        self.generation_results = {}
+        self._result_expiry = deque()
+        self.timings = OrderedDict()
+        self.texts = OrderedDict()
+        self.hits = self.misses = 0
+
+    def _lru(self, lru, key, cap, make):
+        value = lru.get(key)
+        if value is None:
+            self.misses += 1
+            value = lru[key] = make()
+            if len(lru) > cap:
+                lru.popitem(last=False)
+        else:
+            self.hits += 1
+            lru.move_to_end(key)
+        return value
+
+    def word_at(self, track, voice, segment):
+        key = f"{track}:{voice}:seg_{segment}"
+        if key in self.segment_cache:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.segment_cache[key] = {"words": segment_words(track, segment), "cached_at": self.clock(), "segment_index": segment}
+
+    def segment(self, track, voice, segment, generated):
+        key = f"{track}:{voice}"
+        behavior = self.user_behavior.setdefault(key, {"last_segment": segment, "jump_history": [], "total_requests": 0})
+        behavior["jump_history"] = (behavior["jump_history"] + [{"from": behavior["last_segment"], "to": segment}])[-10:]
+        behavior["last_segment"] = segment
+        behavior["total_requests"] += 1
+        if generated:
+            # asyncio.sleep(30) cleanup task per result
+            now = self.clock()
+            while self._result_expiry and self._result_expiry[0][0] <= now:
+                self.generation_results.pop(self._result_expiry.popleft()[1], None)
+            lock_key = f"{key}:{segment}"
+            self.generation_results[lock_key] = {"audio_data": bytes(SEGMENT_BYTES), "duration": 30.0}
+            self._result_expiry.append((now + voice_api.GENERATION_RESULT_TTL, lock_key))
+
+    def popular_lookup(self, creator):
+        key = f"popular_track_ids:{creator}"
+        cached = self.popular.get(key)
+        if cached and self.clock() - cached["timestamp"] < popular_api.POPULAR_CACHE_TTL:
+            self.hits += 1
+            return
+        self.misses += 1
+        self.popular[key] = {"track_ids": popular_ids(creator), "timestamp": self.clock()}
+
+    def read_along(self, track, voice, words):
+        self._lru(self.timings, f"{track}:{voice}", read_along_api.TIMINGS_CACHE_MAX, lambda: book_words(words))
+        self._lru(self.texts, track, read_along_api.TEXT_CACHE_MAX, lambda: "word " * words)
+
+    def entries(self):
+        return {
+            "segment_cache": len(self.segment_cache), "user_behavior": len(self.user_behavior),
+            "popular": len(self.popular), "generation_results": len(self.generation_results),
+            "timings": len(self.timings), "texts": len(self.texts),
+        }
+
+    def hit_ratio(self):
+        return self.hits / max(1, self.hits + self.misses)
+
+
+class BoundedCaches:
+    """BoundedCache with the budgets each service configures"""
+
+    def __init__(self, clock):
+        self.segment_cache = BoundedCache(
+            "bench.word_timing.segments", max_entries=word_api.SEGMENT_CACHE_MAX_ENTRIES,
+            max_bytes=word_api.SEGMENT_CACHE_MAX_BYTES, ttl=word_api.WORD_CACHE_TTL,
+            sizeof=lambda words: len(words) * word_api.WORD_DICT_BYTES, clock=clock,
+        )
+        self.user_behavior = BoundedCache(
+            "bench.smart_voice.user_behavior", max_entries=voice_api.USER_BEHAVIOR_MAX_ENTRIES,
+            ttl=voice_api.USER_BEHAVIOR_TTL, clock=clock,
+        )
+        self.popular = BoundedCache(
+            "bench.popular_tracks", max_entries=popular_api.POPULAR_CACHE_MAX_ENTRIES,
+            ttl=popular_api.POPULAR_CACHE_TTL, clock=clock,
+        )
+        self.generation_results = BoundedCache(
+            "bench.smart_voice.generation_results", max_bytes=voice_api.GENERATION_RESULTS_MAX_BYTES,
+            ttl=voice_api.GENERATION_RESULT_TTL, sizeof=lambda result: len(result["audio_data"]), clock=clock,
+        )
+        self.timings = BoundedCache(
+            "bench.read_along.timings", max_entries=read_along_api.TIMINGS_CACHE_MAX,
+            max_bytes=read_along_api.TIMINGS_CACHE_MAX_BYTES,
+            sizeof=lambda words: len(words) * read_along_api.WORD_DICT_BYTES, clock=clock,
+        )
+        self.texts = BoundedCache(
+            "bench.read_along.texts", max_entries=read_along_api.TEXT_CACHE_MAX,
+            max_bytes=read_along_api.TEXT_CACHE_MAX_BYTES, clock=clock,
+        )
+        self.caches = (self.segment_cache, self.user_behavior, self.popular,
+                       self.generation_results, self.timings, self.texts)
+
+    def word_at(self, track, voice, segment):
+        key = f"{track}:{voice}:seg_{segment}"
+        if self.segment_cache.get(key) is None:
+            self.segment_cache.set(key, segment_words(track, segment))
+
+    def segment(self, track, voice, segment, generated):
+        key = f"{track}:{voice}"
+        behavior = self.user_behavior.peek(key)
+        if behavior is None:
+            behavior = {"last_segment": segment, "jump_history": [], "total_requests": 0}
+        behavior["jump_history"] = (behavior["jump_history"] + [{"from": behavior["last_segment"], "to": segment}])[-10:]
+        behavior["last_segment"] = segment
+        behavior["total_requests"] += 1
+        self.user_behavior.set(key, behavior)
+        if generated:
+            self.generation_results.set(f"{key}:{segment}", {"audio_data": bytes(SEGMENT_BYTES), "duration": 30.0})
+
+    def popular_lookup(self, creator):
+        key = f"popular_track_ids:{creator}"
+        if self.popular.get(key) is None:
+            self.popular.set(key, popular_ids(creator))
+
+    def read_along(self, track, voice, words):
+        key = f"{track}:{voice}"
+        if self.timings.get(key) is None:
+            self.timings.set(key, book_words(words))
+        if self.texts.get(track) is None:
+            self.texts.set(track, "word " * words)
+
+    def entries(self):
+        return {cache.name.split(".")[-1]: len(cache) for cache in self.caches}
+
+    def hit_ratio(self):
+        hits = sum(cache.hits for cache in self.caches)
+        return hits / max(1, hits + sum(cache.misses for cache in self.caches))
+
+
+# ------------------------------------------------------------------ replay
+
+def replay(make_caches, events, creators: int, words: int):
+    clock = {"now": 0.0}
+    generated = set()
+    tracemalloc.start()
+    caches = make_caches(lambda: clock["now"])
+    started = time.perf_counter()
+    hourly = []
+    for t, kind, track, voice, arg in events:
+        if int(t // 3600) > len(hourly):
+            hourly.append(tracemalloc.get_traced_memory()[0])
+        clock["now"] = t
+        if kind == "segment":
+            key = (track, voice, arg)
+            caches.segment(track, voice, arg, key not in generated)
+            generated.add(key)
+            caches.popular_lookup(hash(track) % creators)
+        elif kind == "word_at":
+            caches.word_at(track, voice, int(arg // SEGMENT_SECONDS))
+        else:
+            caches.read_along(track, voice, words)
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return caches, retained, peak, elapsed, hourly
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", type=Path, help="access log to replay instead of a synthetic day")
+    parser.add_argument("--sessions", type=int, default=2000, help="listening sessions in the synthetic day")
+    parser.add_argument("--tracks", type=int, default=3000, help="TTS tracks in the synthetic catalog")
+    parser.add_argument("--creators", type=int, default=200, help="creators the tracks belong to")
+    parser.add_argument("--book-words", type=int, default=3000, help="words per read-along voice timing list")
+    args = parser.parse_args()
+
+    events = log_day(args.log) if args.log else synthetic_day(args.sessions, args.tracks)
+    print(f"{len(events)} requests over {events[-1][0] / 3600:.1f}h\n" if events else "no requests")
+    if not events:
+        return
+
+    print(f"{'':<9} {'retained':>10} {'peak':>10} {'hit ratio':>10} {'replay':>8}  entries")
+    for name, make_caches in (("legacy", LegacyCaches), ("bounded", BoundedCaches)):
+        caches, retained, peak, elapsed, hourly = replay(make_caches, events, args.creators, args.book_words)
+        print(f"{name:<9} {retained / 1e6:>8.1f}MB {peak / 1e6:>8.1f}MB {caches.hit_ratio() * 100:>9.1f}% "
+              f"{elapsed:>7.1f}s  {caches.entries()}")
+        if hourly:
+            print(f"{'':<9} hourly MB: {' '.join(f'{b / 1e6:.0f}' for b in hourly)}")
+        del caches
+
+
+if __name__ == "__main__":
+    main()
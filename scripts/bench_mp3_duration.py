@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-chunk TTS duration measurement, ffprobe vs frame headers
+
+Builds a synthetic "book" of Edge-TTS-shaped chunks (MPEG-2 Layer III,
+24 kHz mono, 48 kbit/s) and measures every chunk's duration two ways:
+
+- ffprobe   one subprocess per chunk (the old _measure_audio_duration)
+- frames    audio_frame_parser.AudioFrameCounter fed in the small pieces
+            communicate.stream() delivers, i.e. no extra pass and no subprocess
+
+Pass --source-dir to measure real *.mp3 files instead of synthetic ones.
+
+Usage:
+    python scripts/bench_mp3_duration.py --hours 10 --chunk-seconds 150
+"""
+
+import argparse
+import asyncio
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audio_frame_parser import AudioFrameCounter
+
+# MPEG-2 Layer III, no CRC, 48 kbit/s, 24 kHz, mono: 144-byte frames of 576 samples
+FRAME_HEADER = bytes((0xFF, 0xF3, 0x64, 0xC0))
+FRAME_BYTES = 144
+FRAME_SECONDS = 576 / 24000
+STREAM_PIECE = 4096  # roughly what edge_tts yields per audio event
+
+
+def make_book(directory: Path, chunks: int, chunk_seconds: float):
+    frame = FRAME_HEADER + bytes(FRAME_BYTES - len(FRAME_HEADER))
+    body = frame * int(chunk_seconds / FRAME_SECONDS)
+    paths = []
+    for i in range(chunks):
+        path = directory / f"chunk_{i:04d}.mp3"
+        path.write_bytes(body)
+        paths.append(path)
+    return paths
+
+
+async def ffprobe_duration(path: Path) -> float:
+    proc = await asyncio.create_subprocess_exec(
+        "ffprobe", "-v", "error", "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1", str(path),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, _ = await proc.communicate()
+    return float(stdout.decode().strip() or 0)
+
+
+async def run_ffprobe(paths, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(path):
+        async with semaphore:
+            return await ffprobe_duration(path)
+
+    return await asyncio.gather(*(one(p) for p in paths))
+
+
+def run_frames(paths):
+    durations = []
+    for path in paths:
+        data = path.read_bytes()  # stands in for bytes already in hand from the stream
+        counter = AudioFrameCounter()
+        for offset in range(0, len(data), STREAM_PIECE):
+            counter.feed(data[offset:offset + STREAM_PIECE])
+        durations.append(counter.finish().duration)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=10.0, help="synthetic book length")
+    parser.add_argument("--chunk-seconds", type=float, default=150.0, help="audio per TTS chunk")
+    parser.add_argument("--concurrency", type=int, default=6, help="parallel ffprobe processes (TTS workers)")
+    parser.add_argument("--source-dir", type=Path, default=None, help="measure these *.mp3 files instead")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.source_dir:
+            paths = sorted(args.source_dir.glob("*.mp3"))
+        else:
+            chunks = max(1, int(args.hours * 3600 / args.chunk_seconds))
+            paths = make_book(Path(tmp), chunks, args.chunk_seconds)
+        if not paths:
+            sys.exit("no chunks to measure")
+
+        total_mb = sum(p.stat().st_size for p in paths) / 1e6
+        print(f"{len(paths)} chunks, {total_mb:.1f} MB\n")
+
+        started = time.perf_counter()
+        frame_durations = run_frames(paths)
+        frames_wall = time.perf_counter() - started
+        print(f"{'frame headers':<14} subprocesses=0{'':<6} wall={frames_wall:7.3f}s   "
+              f"audio={sum(frame_durations) / 3600:.2f}h")
+
+        if shutil.which("ffprobe") is None:
+            print(f"{'ffprobe':<14} not installed; the old path spawns {len(paths)} subprocesses per book")
+            return
+
+        started = time.perf_counter()
+        probe_durations = asyncio.run(run_ffprobe(paths, args.concurrency))
+        probe_wall = time.perf_counter() - started
+        print(f"{'ffprobe':<14} subprocesses={len(paths):<6} wall={probe_wall:7.3f}s   "
+              f"audio={sum(probe_durations) / 3600:.2f}h")
+
+        drift = max(abs(a - b) for a, b in zip(frame_durations, probe_durations))
+        print(f"\nsaved per book: {len(paths)} subprocesses, {probe_wall - frames_wall:.2f}s wall "
+              f"({probe_wall / frames_wall:.1f}x); max per-chunk difference {drift * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: event-loop lag of Redis state calls on the hot request paths
+
+Runs N concurrent simulated chunk uploads (the per-chunk state traffic of
+chunked_upload.upload_chunk plus a segment progress write) twice:
+
+- sync   RedisUploadState / RedisProgressState (blocking client, PING per command)
+- async  AsyncRedisUploadState / AsyncRedisProgressState (pooled client, pipelined)
+
+A heartbeat task sleeps HEARTBEAT_MS in a loop and records how late it wakes
+up; that overshoot is the time the event loop was blocked and could not serve
+any other request.
+
+Needs a reachable Redis (REDIS_HOST / REDIS_PORT, or --redis-host/--redis-port).
+Keys are written under fresh upload/progress ids and deleted afterwards.
+
+Usage:
+    python scripts/bench_redis_event_loop_lag.py --uploads 64 --chunks 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+HEARTBEAT_MS = 5
+
+
+async def heartbeat(stop: asyncio.Event, lags: list):
+    interval = HEARTBEAT_MS / 1000
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - started - interval) * 1000)
+
+
+async def sync_upload(upload_id: str, chunks: int):
+    from redis_state.state.progress import progress_state
+    from redis_state.state.upload import upload_state
+
+    upload_state.create_session({"upload_id": upload_id, "total_chunks": chunks})
+    for index in range(chunks):
+        # Pre-change upload_chunk: register, then read the session and count back
+        upload_state.register_chunk(upload_id, index)
+        session = upload_state.get_session(upload_id)
+        received = upload_state.get_received_chunks_count(upload_id)
+        upload_state.update_session(upload_id, {"last_chunk": index})
+        progress_state.segment_progress[upload_id] = {"received": received, "total": session["total_chunks"]}
+        await asyncio.sleep(0)
+    upload_state.delete_session(upload_id)
+    progress_state.segment_progress.pop(upload_id, None)
+
+
+async def async_upload(upload_id: str, chunks: int):
+    from redis_state.state.progress import async_progress_state
+    from redis_state.state.upload import async_upload_state
+
+    await async_upload_state.create_session({"upload_id": upload_id, "total_chunks": chunks})
+    for index in range(chunks):
+        session, received = await async_upload_state.register_chunk_and_get_session(upload_id, index)
+        await async_upload_state.update_session(upload_id, {"last_chunk": index})
+        await async_progress_state.set(upload_id, {"received": received, "total": session["total_chunks"]})
+    await async_upload_state.delete_session(upload_id)
+    await async_progress_state.pop(upload_id, None)
+
+
+async def run(worker, uploads: int, chunks: int):
+    stop = asyncio.Event()
+    lags = []
+    monitor = asyncio.create_task(heartbeat(stop, lags))
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(f"{prefix}-{i}", chunks) for i in range(uploads)))
+    wall = time.perf_counter() - started
+    stop.set()
+    await monitor
+    return wall, lags
+
+
+def measure(label, worker, uploads, chunks):
+    wall, lags = asyncio.run(run(worker, uploads, chunks))
+    lags = sorted(lags) or [0.0]
+    p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+    print(f"{label:<32} {uploads * chunks / wall:>9.0f} chunks/s   "
+          f"loop lag p50={statistics.median(lags):>7.2f}ms p99={p99:>7.2f}ms max={lags[-1]:>7.2f}ms   "
+          f"wall={wall:.3f}s")
+    return wall, p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=64, help="concurrent uploads")
+    parser.add_argument("--chunks", type=int, default=50, help="chunks per upload")
+    parser.add_argument("--redis-host", default=None)
+    parser.add_argument("--redis-port", type=int, default=None)
+    args = parser.parse_args()
+
+    # redis_state.config reads these at import time
+    if args.redis_host:
+        os.environ["REDIS_HOST"] = args.redis_host
+    if args.redis_port:
+        os.environ["REDIS_PORT"] = str(args.redis_port)
+
+    from redis_state.config import redis_client
+    if redis_client._get_client() is None:
+        sys.exit(f"Redis not reachable at {os.getenv('REDIS_HOST', 'redis')}:{os.getenv('REDIS_PORT', '6379')}")
+
+    print(f"{args.uploads} concurrent uploads x {args.chunks} chunks, heartbeat every {HEARTBEAT_MS}ms\n")
+
+    sync = measure("sync RedisStateManager", sync_upload, args.uploads, args.chunks)
+    pipelined = measure("AsyncRedisStateManager pipelined", async_upload, args.uploads, args.chunks)
+
+    print(f"\nthroughput: {sync[0] / pipelined[0]:.2f}x, p99 loop lag: "
+          f"{sync[1]:.2f}ms -> {pipelined[1]:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
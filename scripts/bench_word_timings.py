@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark: word-timing lookups, v4 packed lists vs mapped columns
+
+Builds a synthetic book (150k words by default, ~0.33s per word) and times
+the two read paths of TrackCentricTextStorageService:
+
+- v4        timings.zst decompressed and unpacked into a list of dicts (a
+            cache miss), then get_word_timings_range's per-call starts list
+            and bisect, and a word-at-time scan over the same list
+- columnar  timings.cols mapped once (ColumnarWordTimings.open), then
+            range() / index_at() bisecting the columns in place
+
+Reports load time, per-lookup latency, bytes allocated per lookup
+(tracemalloc) and the size of each file.
+
+Usage:
+    python scripts/bench_word_timings.py --words 150000 --lookups 2000
+"""
+
+import argparse
+import bisect
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from text_storage_service import TrackCentricTextStorageService
+from word_timing_columns import ColumnarWordTimings
+
+WORD_SECONDS = 0.33
+
+
+def make_words(count: int):
+    rng = random.Random(7)
+    words, t = [], 0.0
+    for i in range(count):
+        duration = rng.uniform(0.15, 0.3)
+        words.append({"word": f"word{i % 5000}", "start_time": t, "end_time": t + duration, "duration": duration})
+        t += WORD_SECONDS
+    return words
+
+
+def v4_range(words, start, end, limit=10000):
+    # get_word_timings_range before the columnar path
+    starts = [w.get("start_time", 0.0) for w in words]
+    i = max(0, bisect.bisect_left(starts, start) - 5)
+    result = []
+    for w in words[i:]:
+        if w["start_time"] > end:
+            break
+        if w.get("end_time", w["start_time"]) >= start:
+            result.append(w)
+            if len(result) >= limit:
+                break
+    return result
+
+
+def timed(fn, queries):
+    started = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    return (time.perf_counter() - started) / len(queries)
+
+
+def allocated(fn, queries):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    peak = 0
+    for query in queries:
+        tracemalloc.reset_peak()
+        fn(*query)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=150_000, help="words in the synthetic book")
+    parser.add_argument("--lookups", type=int, default=2000, help="queries per measurement")
+    parser.add_argument("--window", type=float, default=30.0, help="seconds covered by a range query")
+    args = parser.parse_args()
+
+    storage = TrackCentricTextStorageService.__new__(TrackCentricTextStorageService)
+    storage.compression_level = 3
+    words = make_words(args.words)
+    packed = storage._pack_word_timings_v4(words)
+    compressed = storage._compress_data(packed)
+    del words
+
+    book_seconds = args.words * WORD_SECONDS
+    rng = random.Random(11)
+    range_queries = [(t, t + args.window) for t in (rng.uniform(0, book_seconds) for _ in range(args.lookups))]
+    time_queries = [(rng.uniform(0, book_seconds),) for _ in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cols_path = Path(tmp) / "timings.cols"
+        storage._columns_from_v4(packed).write(cols_path)
+
+        started = time.perf_counter()
+        v4_words = storage._unpack_word_timings_v4(storage._decompress_data(compressed))
+        v4_load = time.perf_counter() - started
+
+        started = time.perf_counter()
+        columns = ColumnarWordTimings.open(cols_path)
+        cols_load = time.perf_counter() - started
+
+        def v4_at(t):
+            starts = [w["start_time"] for w in v4_words]
+            return bisect.bisect_right(starts, t) - 1
+
+        print(f"{args.words} words, {book_seconds / 3600:.1f}h; "
+              f"timings.zst {len(compressed) / 1e6:.2f} MB, timings.cols {cols_path.stat().st_size / 1e6:.2f} MB\n")
+        print(f"{'':<10} {'load':>10} {'range':>12} {'at-time':>12} {'range alloc':>13} {'at-time alloc':>14}")
+        rows = (
+            ("v4", v4_load, lambda s, e: v4_range(v4_words, s, e), v4_at),
+            ("columnar", cols_load, lambda s, e: columns.range(s, e), columns.index_at),
+        )
+        for name, load, range_fn, at_fn in rows:
+            range_cost = timed(range_fn, range_queries)
+            at_cost = timed(at_fn, time_queries)
+            range_alloc = allocated(range_fn, range_queries[:200])
+            at_alloc = allocated(at_fn, time_queries[:200])
+            print(f"{name:<10} {load * 1000:>8.1f}ms {range_cost * 1e6:>10.1f}us {at_cost * 1e6:>10.1f}us "
+                  f"{range_alloc:>12}B {at_alloc:>13}B")
+
+        lo, hi = columns.range(*range_queries[0])
+        assert [w["word"] for w in columns.words(lo, hi)] == [w["word"] for w in v4_range(v4_words, *range_queries[0])]
+        columns.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Segment delivery for HLS .ts files
+
+Serves an already-stat'ed segment with a stable ETag (size + mtime),
+If-None-Match -> 304, single-range Range -> 206/416, and a body that is sent
+with sendfile when the ASGI server supports the zero-copy extension, or with
+large os.pread blocks otherwise (instead of 64 KiB aiofiles reads).
+"""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+
+class SegmentFileResponse(Response):
+    """
+    Sends a byte range of an on-disk segment.
+
+    Uses the ASGI zero-copy extension (sendfile) when the server advertises it;
+    otherwise reads with os.pread in large blocks - a whole HLS segment is
+    normally a single thread hop and a single bytes object.
+    """
+
+    chunk_size = 1024 * 1024
+
+    def __init__(self, path: Path, offset: int, length: int, status_code: int = 200,
+                 headers: Optional[Dict[str, str]] = None, media_type: str = 'video/mp2t'):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if scope.get("method") == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        fd = await asyncio.to_thread(os.open, self.path, os.O_RDONLY)
+        try:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": fd,
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False,
+                })
+                return
+
+            position = self.offset
+            remaining = self.length
+            while remaining > 0:
+                chunk = await asyncio.to_thread(os.pread, fd, min(self.chunk_size, remaining), position)
+                if not chunk:
+                    break
+                position += len(chunk)
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # File shrank underneath us - terminate the body cleanly
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            os.close(fd)
+
+def segment_etag(segment_stat) -> str:
+    """Stable ETag for an immutable segment file (size + mtime)"""
+    return f'"{segment_stat.st_size:x}-{segment_stat.st_mtime_ns:x}"'
+
+def _parse_byte_range(range_header: str, size: int) -> Optional[tuple]:
+    """
+    Parse a single 'bytes=' range. Returns (start, end) inclusive, None to ignore
+    the header (multi-range / malformed), or (-1, -1) when unsatisfiable.
+    """
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, sep, last = spec.strip().partition('-')
+    if not sep:
+        return None
+    try:
+        if first == '':
+            suffix = int(last)
+            if suffix <= 0:
+                return (-1, -1)
+            return (max(0, size - suffix), size - 1)
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return (-1, -1)
+    if end < start:
+        return None
+    return (start, min(end, size - 1))
+
+def build_segment_response(request: Request, segment_path: Path, segment_stat, headers: Dict[str, str],
+                           body: Optional[bytes] = None) -> Response:
+    """
+    Segment response honouring If-None-Match and single-range Range requests.
+    When `body` is given (hot segment cache) it is served from memory instead of disk.
+    """
+    size = segment_stat.st_size
+    etag = segment_etag(segment_stat)
+    headers = {
+        **headers,
+        'ETag': etag,
+        'Accept-Ranges': 'bytes',
+        'Access-Control-Expose-Headers': 'ETag, Content-Range, Content-Length',
+    }
+    headers.pop('Content-Length', None)
+    headers.pop('Content-Type', None)
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and (if_none_match.strip() == '*' or etag in [t.strip().removeprefix('W/') for t in if_none_match.split(',')]):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get('range')
+    if_range = request.headers.get('if-range')
+    byte_range = None
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = _parse_byte_range(range_header, size)
+
+    if byte_range == (-1, -1):
+        headers['Content-Range'] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        headers['Content-Range'] = f"bytes {start}-{end}/{size}"
+        headers['Content-Length'] = str(length)
+        if body is not None:
+            return Response(content=body[start:end + 1], status_code=206, headers=headers, media_type='video/mp2t')
+        return SegmentFileResponse(segment_path, start, length, status_code=206, headers=headers)
+
+    headers['Content-Length'] = str(size)
+    if body is not None:
+        return Response(content=body, headers=headers, media_type='video/mp2t')
+    return SegmentFileResponse(segment_path, 0, size, headers=headers)
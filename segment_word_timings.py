@@ -0,0 +1,211 @@
+"""
+Per-segment word timing sidecar
+
+The player kept highlighting in sync by calling the word-at-time APIs over
+and over while audio played. WordTimingOptimizer guessed the HLS segment
+from a fixed SEGMENT_DURATION (the real ffmpeg segments drift from it),
+scanned every word of the book for that segment and kept the result in an
+unbounded dict.
+
+segment_timings.bin is written next to index.json by
+BaseHLSManager._map_words_to_segments_precise, from the same measured
+segment durations index.json records:
+
+    header     magic "SWS1", version, flags, first segment, segment count,
+               word count, reserved
+    starts     float64[s]   segment start (seconds)
+    durations  float64[s]   measured segment duration (seconds)
+    first      uint32[s+1]  word index range of each segment: [first[i], first[i+1])
+    offsets    uint16[2n]   start/end of each word in ms from its segment's
+               start (uint32 when flags & WIDE_OFFSETS)
+
+- word indices are positions in the voice's stored timings (the same
+  indices as read-along pages and the word-at-time APIs)
+- payload(segment) is the same format holding one segment, so the player
+  fetches one small blob per segment and parses both with the same code
+- a word's end is clamped to its segment's duration; the next segment's
+  words take over from there
+"""
+
+import mmap
+import os
+import struct
+import uuid
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Optional, Tuple
+
+SEGMENT_TIMINGS_MAGIC = b"SWS1"
+SEGMENT_TIMINGS_VERSION = 1
+
+WIDE_OFFSETS = 0x01  # offsets are uint32 (a segment longer than 65.5 s)
+
+_HEADER = struct.Struct("<4sHHIIII")  # magic, version, flags, first segment, segments, words, reserved
+_NARROW_MAX_MS = 0xFFFF
+
+
+class SegmentTimingsError(ValueError):
+    pass
+
+
+def _pack(first_segment: int, starts: array, durations: array, first: array, offsets: array, wide: bool) -> bytes:
+    header = _HEADER.pack(
+        SEGMENT_TIMINGS_MAGIC, SEGMENT_TIMINGS_VERSION, WIDE_OFFSETS if wide else 0,
+        first_segment, len(starts), len(offsets) // 2, 0
+    )
+    return b"".join((header, starts.tobytes(), durations.tobytes(), first.tobytes(), offsets.tobytes()))
+
+
+class SegmentTimingsWriter:
+    """Collects mapped words in order; build() returns the file contents"""
+
+    def __init__(self, starts, durations):
+        self._starts = array("d", starts)
+        self._durations = array("d", durations)
+        self._segments = array("I")
+        self._offsets = array("I")
+        self._max_ms = 0
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    def add(self, segment_index: int, start: float, end: float):
+        """Append the next word (absolute seconds); segments never go backwards"""
+        if self._segments and segment_index < self._segments[-1]:
+            segment_index = self._segments[-1]
+        seg_start = self._starts[segment_index]
+        duration_ms = int(round(self._durations[segment_index] * 1000))
+        start_ms = min(max(0, int(round((start - seg_start) * 1000))), duration_ms)
+        end_ms = min(max(start_ms, int(round((end - seg_start) * 1000))), duration_ms)
+        self._segments.append(segment_index)
+        self._offsets.append(start_ms)
+        self._offsets.append(end_ms)
+        self._max_ms = max(self._max_ms, end_ms)
+
+    def build(self) -> bytes:
+        counts = [0] * len(self._starts)
+        for segment_index in self._segments:
+            counts[segment_index] += 1
+        first = array("I", [0])
+        for count in counts:
+            first.append(first[-1] + count)
+        wide = self._max_ms > _NARROW_MAX_MS
+        offsets = self._offsets if wide else array("H", self._offsets)
+        return _pack(0, self._starts, self._durations, first, offsets, wide)
+
+    def write(self, path: Path):
+        """Blocking; atomic (tmp + rename)"""
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            tmp.write_bytes(self.build())
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+class SegmentWordTimings:
+    """Read-only view over a segment_timings.bin buffer (an mmap or bytes)"""
+
+    def __init__(self, buffer, path: Optional[Path] = None, mtime_ns: int = 0):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise SegmentTimingsError("Segment timings shorter than their header")
+        magic, version, flags, first_segment, segments, words, _reserved = _HEADER.unpack_from(view)
+        if magic != SEGMENT_TIMINGS_MAGIC or version != SEGMENT_TIMINGS_VERSION:
+            raise SegmentTimingsError(f"Not a segment timings file (magic {magic!r}, version {version})")
+
+        self.wide = bool(flags & WIDE_OFFSETS)
+        pos = _HEADER.size
+        sections = []
+        for code, length in (("d", segments), ("d", segments), ("I", segments + 1), ("I" if self.wide else "H", 2 * words)):
+            size = length * array(code).itemsize
+            sections.append(view[pos:pos + size].cast(code))
+            pos += size
+        if pos != len(view):
+            raise SegmentTimingsError("Segment timings size does not match their header")
+
+        self._view = view
+        self.starts, self.durations, self._first, self._offsets = sections
+        self.first_segment = first_segment
+        self.segment_count = segments
+        self.word_count = words
+
+    @classmethod
+    def open(cls, path: Path) -> "SegmentWordTimings":
+        """Blocking; maps the file read-only"""
+        with open(path, "rb") as f:
+            mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, path, mtime_ns)
+        except Exception:
+            mapped.close()
+            raise
+
+    def close(self):
+        try:
+            for view in (self.starts, self.durations, self._first, self._offsets, self._view):
+                view.release()
+            if isinstance(self._buffer, mmap.mmap):
+                self._buffer.close()
+        except BufferError:
+            pass
+
+    # ------------------------------------------------------------- lookups
+
+    def segment_range(self, segment_index: int) -> Tuple[int, int]:
+        """[first, end) word indices of a segment"""
+        local = segment_index - self.first_segment
+        return self._first[local], self._first[local + 1]
+
+    def segment_at(self, time: float) -> int:
+        """Segment playing at time (clamped to the segments held)"""
+        local = min(max(0, bisect_right(self.starts, time) - 1), self.segment_count - 1)
+        return self.first_segment + local
+
+    def word_times(self, word_index: int) -> Tuple[float, float]:
+        """Absolute (start, end) seconds of a word"""
+        local = bisect_right(self._first, word_index) - 1
+        base = self.starts[local]
+        i = 2 * (word_index - self._first[0])
+        return base + self._offsets[i] / 1000.0, base + self._offsets[i + 1] / 1000.0
+
+    def word_at(self, time: float) -> int:
+        """Index of the last word started by time, -1 before the first"""
+        if not self.segment_count:
+            return -1
+        segment_index = self.segment_at(time)
+        first, end = self.segment_range(segment_index)
+        local = segment_index - self.first_segment
+        target_ms = (time - self.starts[local]) * 1000.0
+        lo = 2 * (first - self._first[0])
+        i = bisect_right(self._offsets[lo:lo + 2 * (end - first):2], target_ms) - 1
+        if i >= 0:
+            return first + i
+        return first - 1 if first > self._first[0] else -1
+
+    # ------------------------------------------------------------- payloads
+
+    def payload(self, segment_index: Optional[int] = None) -> bytes:
+        """The whole file, or the same format holding only segment_index"""
+        if segment_index is None:
+            return bytes(self._view)
+        local = segment_index - self.first_segment
+        if not 0 <= local < self.segment_count:
+            raise IndexError(f"Segment {segment_index} out of range")
+        first, end = self._first[local], self._first[local + 1]
+        lo = 2 * (first - self._first[0])
+        code = "I" if self.wide else "H"
+        return _pack(
+            segment_index,
+            array("d", [self.starts[local]]),
+            array("d", [self.durations[local]]),
+            array("I", [first, end]),
+            array(code, self._offsets[lo:lo + 2 * (end - first)]),
+            self.wide,
+        )
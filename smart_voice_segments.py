@@ -16,6 +16,7 @@ from models import TTSTextSegment, TTSWordTiming, TTSTrackMeta, Track
 from datetime import datetime, timezone
 import numpy as np
 import logging
+from bounded_cache import BoundedCache
 
 logger = logging.getLogger(__name__)
 
@@ -26,10 +27,18 @@ logger = logging.getLogger(__name__)
 BASE_HLS_DIR = Path(os.path.expanduser("~")) / ".hls_streaming"
 SEGMENTS_DIR = BASE_HLS_DIR / "segments"
 DEFAULT_VOICE_ID = "en-US-AvaNeural"
+USER_BEHAVIOR_MAX_ENTRIES = 20000
+USER_BEHAVIOR_TTL = 3600  # a listener idle this long starts over as 'linear'
+GENERATION_RESULT_TTL = 30
+GENERATION_RESULTS_MAX_BYTES = 64 * 1024 * 1024
 
 # Simple in-memory processing locks
 generation_locks = {}
-generation_results = {}
+# Finished segments handed to requests that waited on the same generation
+generation_results = BoundedCache(
+    "smart_voice.generation_results", max_bytes=GENERATION_RESULTS_MAX_BYTES,
+    ttl=GENERATION_RESULT_TTL, sizeof=lambda result: len(result['audio_data']),
+)
 
 # ========================================
 # PURE VOICE-SPECIFIC SEGMENT SERVICE WITH SMART BUFFERING
@@ -47,7 +56,9 @@ class SmartVoiceSegmentService:
         self.buffer_size = 5  # Default buffer size
         self.concurrent_limit = 3  # Max concurrent generations
         self.active_buffers = {}  # Track active buffering per voice
-        self.user_behavior = {}  # Track user seeking patterns
+        self.user_behavior = BoundedCache(  # Track user seeking patterns
+            "smart_voice.user_behavior", max_entries=USER_BEHAVIOR_MAX_ENTRIES, ttl=USER_BEHAVIOR_TTL
+        )
         self.buffer_tasks = {}  # Track buffer generation tasks
 
     async def get_voice_segment(
@@ -189,18 +200,18 @@ class SmartVoiceSegmentService:
         behavior_key = f"{track_id}:{voice_id}"
         current_time = time.time()
         
-        if behavior_key not in self.user_behavior:
-            self.user_behavior[behavior_key] = {
+        behavior = self.user_behavior.peek(behavior_key)
+        if behavior is None:
+            self.user_behavior.set(behavior_key, {
                 'last_segment': segment_index,
                 'last_time': current_time,
                 'seek_pattern': 'linear',
                 'jump_history': [],
                 'total_requests': 1,
                 'created_at': current_time
-            }
+            })
             return
         
-        behavior = self.user_behavior[behavior_key]
         last_segment = behavior['last_segment']
         time_diff = current_time - behavior['last_time']
         
@@ -239,6 +250,7 @@ class SmartVoiceSegmentService:
         behavior['last_segment'] = segment_index
         behavior['last_time'] = current_time
         behavior['total_requests'] += 1
+        self.user_behavior.set(behavior_key, behavior)  # restart its TTL
         
         logger.debug(f"🧠 User behavior: {behavior['seek_pattern']}, jump: {jump_distance}, avg: {avg_jump:.1f}")
 
@@ -969,9 +981,8 @@ class SmartVoiceSegmentService:
         
         while time.time() - start_time < timeout:
             # Check if generation completed
-            if lock_key in generation_results:
-                result = generation_results[lock_key]
-                del generation_results[lock_key]  # Clean up result
+            result = generation_results.pop(lock_key)
+            if result is not None:
                 return result['audio_data'], result['duration']
             
             # Check if generation is still active
@@ -986,19 +997,12 @@ class SmartVoiceSegmentService:
     def _store_generation_result(self, lock_key: str, audio_data: bytes, duration: float):
         """Store generation result for concurrent requests"""
         
-        generation_results[lock_key] = {
+        # Expires after GENERATION_RESULT_TTL if nobody was waiting for it
+        generation_results.set(lock_key, {
             'audio_data': audio_data,
             'duration': duration,
             'generated_at': time.time()
-        }
-        
-        # Clean up old results after 30 seconds
-        async def cleanup_result():
-            await asyncio.sleep(30)
-            if lock_key in generation_results:
-                del generation_results[lock_key]
-        
-        asyncio.create_task(cleanup_result())
+        })
     
     # ========================================
     # UTILITY METHODS (PRESERVED)
@@ -10,11 +10,11 @@ Key Principle:
 import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Tuple
+from typing import Optional, Sequence, Tuple
 from pathlib import Path
 
 import anyio
-from sqlalchemy import select, update, or_, and_, not_
+from sqlalchemy import select, update, or_, and_, not_, tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -460,27 +460,46 @@ class StatusLock:
             logger.error(f"Validation error for {track_id}/{voice_id}: {e}", exc_info=True)
             return False
 
-    async def clear_all_on_startup(self, db: Session) -> int:
+    async def clear_all_on_startup(self, db: Session, resumable_jobs: Sequence = ()) -> int:
         """
         Clear all processing tracks at startup (server restarted).
         Mark interrupted tracks as failed so users can retry.
         Also cleans up interrupted voice-specific processing.
 
+        resumable_jobs (TTSJobManifest) keep their lock, with a fresh
+        started_at, so the resumed worker still owns the track/voice.
+
         PRESERVES LOGIC FROM simple_track_lock.clear_all_locks_on_startup()
         """
         try:
             cleaned_count = 0
+            resume_keys = {(job.track_id, job.voice) for job in resumable_jobs}
 
             # 0. Clean up interrupted voice generations in database
             from models import VoiceGenerationStatus
 
             try:
-                # Mark all generating voices as failed on startup
                 now = datetime.now(timezone.utc)
+                interrupted = VoiceGenerationStatus.status == 'generating'
+                if resume_keys:
+                    resume_filter = tuple_(
+                        VoiceGenerationStatus.track_id, VoiceGenerationStatus.voice_id
+                    ).in_(list(resume_keys))
+                    result = await _exec(
+                        db,
+                        update(VoiceGenerationStatus)
+                        .where(interrupted, resume_filter)
+                        .values(started_at=now)
+                    )
+                    resumed = result.rowcount if hasattr(result, 'rowcount') else 0
+                    logger.info(f"✅ Keeping {resumed} interrupted voice generations locked for resume")
+                    interrupted = and_(interrupted, not_(resume_filter))
+
+                # Mark all other generating voices as failed on startup
                 result = await _exec(
                     db,
                     update(VoiceGenerationStatus)
-                    .where(VoiceGenerationStatus.status == 'generating')
+                    .where(interrupted)
                     .values(
                         status='failed',
                         completed_at=now,
@@ -502,6 +521,9 @@ class StatusLock:
             processing_tracks = res.scalars().all() or []
 
             for track in processing_tracks:
+                if (track.id, track.processing_voice) in resume_keys:
+                    continue
+
                 # Check if track is actually complete despite processing status
                 is_complete = (
                     track.hls_ready and
@@ -574,9 +596,10 @@ class StatusLock:
                     voice_id = item.replace('voice-', '')
                     voice_path = track_path / item
 
-                    # Check if voice HLS is incomplete
+                    # Check if voice HLS is incomplete (no master yet, or a
+                    # progressive EVENT playlist that was never finalized)
                     master_playlist = voice_path / "master.m3u8"
-                    if not os.path.exists(master_playlist):
+                    if not os.path.exists(master_playlist) or self._has_open_event_playlist(voice_path):
                         # Incomplete voice processing - was interrupted
                         logger.info(f"Cleaning up interrupted voice processing: {track_id}/{voice_id}")
 
@@ -595,6 +618,17 @@ class StatusLock:
             logger.error(f"Error cleaning up interrupted voices: {e}", exc_info=True)
             return 0
 
+    @staticmethod
+    def _has_open_event_playlist(voice_path: Path) -> bool:
+        for playlist in voice_path.glob("*/playlist.m3u8"):
+            try:
+                content = playlist.read_text(encoding="utf-8")
+            except OSError:
+                continue
+            if "#EXT-X-PLAYLIST-TYPE:EVENT" in content and "#EXT-X-ENDLIST" not in content:
+                return True
+        return False
+
     async def cleanup_stale_locks(self, db: Session) -> int:
         """
         Clear locks older than LOCK_TIMEOUT_MINUTES (90 minutes).
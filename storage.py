@@ -13,6 +13,7 @@ from datetime import datetime, timezone
 import os
 from typing import Optional, Dict, List, Tuple
 import json
+import time
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -25,9 +26,12 @@ from upload_queue import upload_queue, WriteStatus
 from metadata_extraction import metadata_queue
 from mega_upload_manager import mega_upload_manager
 from text_storage_service import text_storage_service
+from tts_job_manifest import retire_manifest
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_PROGRESS_INTERVAL = float(os.getenv("DOWNLOAD_PROGRESS_INTERVAL", "1.0"))  # seconds between progress writes
+
 # Async/sync DB compatibility helpers
 def _is_async(db) -> bool:
     """Check if database session is async"""
@@ -804,6 +808,12 @@ class MediaStorage:
                 word_timings = None
                 word_timings_path = None
 
+            # A stored timing file (merged during generation) is uploaded as it is
+            timings_file = None
+            if word_timings_path and Path(word_timings_path).suffix != '.jsonl':
+                timings_file = Path(word_timings_path)
+                word_timings_path = None
+
             # Only convert JSONL → list when we will actually upload timings to S4
             if (not skip_s4_upload) and word_timings_path and await aio_exists(word_timings_path) and word_timings is None:
                 logger.info(f"Converting streaming timings to list format: {word_timings_path}")
@@ -863,7 +873,8 @@ class MediaStorage:
             if not skip_s4_upload:
                 await self._upload_tts_package(
                     track_id, voice, temp_path, word_timings,
-                    creator_id, is_voice_switch, db, use_upsert
+                    creator_id, is_voice_switch, db, use_upsert,
+                    timings_file=timings_file
                 )
             else:
                 logger.info(f"Skipping S4 upload: {track_id}/{voice}")
@@ -905,6 +916,10 @@ class MediaStorage:
 
             logger.info(f"Storage: Queued HLS for {track_id} ({voice})")
 
+            # Generation is handed on; a restart must not resume it any more
+            if session_dir:
+                await retire_manifest(Path(session_dir))
+
             return file_url, {
                 'voice': voice,
                 'voice_directory': f'voice-{voice}',
@@ -1316,8 +1331,8 @@ class MediaStorage:
             logger.error(f"TTS metadata extraction failed: {e}")
             return {'duration': 0, 'is_tts': True}
 
-    async def _upload_tts_package(self, track_id: str, voice: str, audio_path: Path, word_timings: List[Dict], creator_id: int, is_voice_switch: bool, db, use_upsert: bool = False):
-        """Upload TTS package structure to S4 - streaming only, no memory fallback"""
+    async def _upload_tts_package(self, track_id: str, voice: str, audio_path: Path, word_timings: List[Dict], creator_id: int, is_voice_switch: bool, db, use_upsert: bool = False, timings_file: Optional[Path] = None):
+        """Upload TTS package structure to S4 - streaming only, no memory fallback (timings_file: already stored timings)"""
         logger.info(f"TTS-UPLOAD: Starting upload for {track_id}/{voice} (is_voice_switch={is_voice_switch}, use_upsert={use_upsert})")
         
         try:
@@ -1363,8 +1378,9 @@ class MediaStorage:
                 logger.info(f"TTS-UPLOAD: Skipped audio upload (already exists)")
 
             # Handle timings upload
-            if word_timings:
-                logger.info(f"TTS-UPLOAD: Processing {len(word_timings)} word timings for {track_id}/{voice}")
+            if word_timings or timings_file:
+                if word_timings:
+                    logger.info(f"TTS-UPLOAD: Processing {len(word_timings)} word timings for {track_id}/{voice}")
                 voice_timings_path = self.tts_package_manager.get_voice_timings_path(track_id, voice)
                 
                 should_upload_timings = True
@@ -1378,7 +1394,11 @@ class MediaStorage:
                     except Exception as check_error:
                         logger.warning(f"TTS-UPLOAD: Could not check timings existence: {check_error}")
                 
-                if should_upload_timings:
+                if should_upload_timings and timings_file:
+                    local_timings_file = timings_file
+                    if not await text_storage_service._exists(local_timings_file):
+                        raise RuntimeError(f"Timings file not found: {local_timings_file}")
+                elif should_upload_timings:
                     # Write timings to disk via text_storage_service, then upload the file
                     logger.info(f"TTS-UPLOAD: Storing word timings to disk via text_storage_service")
                     try:
@@ -1396,7 +1416,8 @@ class MediaStorage:
                     local_timings_file = text_storage_service._get_timing_file_path(track_id, voice)
                     if not await text_storage_service._exists(local_timings_file):
                         raise RuntimeError(f"Timings file not created: {local_timings_file}")
-                    
+                
+                if should_upload_timings:
                     file_size = (await text_storage_service._stat(local_timings_file)).st_size
                     logger.info(f"TTS-UPLOAD: Uploading timings file to S4 ({file_size} bytes) -> {voice_timings_path}")
                     
@@ -1510,57 +1531,90 @@ class MediaStorage:
                     "total_size": 0
                 }
 
+            last_report = {"at": 0.0}
+
+            async def _report_progress(updates: Dict, force: bool = False):
+                # Throttled, and update() runs in a thread: a Redis-backed progress
+                # entry writes on update() and must not block the loop per chunk
+                entry = self.download_progress.get(file_hash) if track_progress else None
+                if entry is None:
+                    return
+                now = time.monotonic()
+                if not force and now - last_report["at"] < DOWNLOAD_PROGRESS_INTERVAL:
+                    return
+                last_report["at"] = now
+                await anyio.to_thread.run_sync(entry.update, updates)
+
             from mega_s4_client import mega_s4_client
             if not mega_s4_client._started:
                 await mega_s4_client.start()
             
             object_key = mega_s4_client.generate_object_key(filename, prefix="audio")
-            response = await mega_s4_client.download_file_stream(object_key)
-            if not response:
-                logger.error(f"Failed to start S4 download for {filename}")
-                if track_progress:
-                    self.download_progress.pop(file_hash, None)
-                return None
 
-            try:
-                cl = None
+            # Large sources (regeneration of evicted HLS tracks) use concurrent Range GETs
+            object_size = await mega_s4_client.get_object_size(object_key)
+            if object_size is not None and object_size >= mega_s4_client.ranged_download_threshold:
+                async def _on_progress(downloaded: int, total: int):
+                    await _report_progress({
+                        "status": "downloading",
+                        "current_size": downloaded,
+                        "total_size": total,
+                        "percentage": int(100 * downloaded / total) if total else 0
+                    }, force=downloaded >= total)
+
                 try:
-                    cl = response.headers.get('Content-Length') or response.headers.get('content-length')
-                except Exception:
-                    pass
-                total = int(cl) if cl else 0
-                if track_progress:
-                    self.download_progress[file_hash]['total_size'] = total
-                
-                current_size = 0
-                async with aiofiles.open(temp_path, 'wb') as f:
+                    await mega_s4_client.download_file_ranged(
+                        object_key, temp_path, size=object_size, progress_callback=_on_progress
+                    )
+                except Exception as download_error:
+                    logger.error(f"Ranged download error: {download_error}")
+                    if track_progress:
+                        self.download_progress.pop(file_hash, None)
+                    return None
+            else:
+                response = await mega_s4_client.download_file_stream(object_key)
+                if not response:
+                    logger.error(f"Failed to start S4 download for {filename}")
+                    if track_progress:
+                        self.download_progress.pop(file_hash, None)
+                    return None
+
+                try:
+                    cl = None
                     try:
-                        async for chunk in response.content.iter_chunked(65536):
-                            await f.write(chunk)
-                            current_size += len(chunk)
-                            if track_progress:
-                                self.download_progress[file_hash].update({
-                                    "current_size": current_size,
-                                    "status": "downloading"
-                                })
+                        cl = response.headers.get('Content-Length') or response.headers.get('content-length')
+                    except Exception:
+                        pass
+                    total = int(cl) if cl else 0
+                    if track_progress:
+                        self.download_progress[file_hash]['total_size'] = total
+                
+                    current_size = 0
+                    async with aiofiles.open(temp_path, 'wb') as f:
+                        try:
+                            async for chunk in response.content.iter_chunked(65536):
+                                await f.write(chunk)
+                                current_size += len(chunk)
+                                updates = {"current_size": current_size, "status": "downloading"}
                                 if total > 0:
-                                    self.download_progress[file_hash]["percentage"] = int(100 * current_size / total)
-                    except Exception as read_error:
-                        logger.error(f"Error reading chunk: {read_error}")
-                        raise
-            except Exception as download_error:
-                logger.error(f"Download error: {download_error}")
-                if track_progress:
-                    self.download_progress.pop(file_hash, None)
-                return None
-            finally:
-                try:
-                    if response and not response.closed:
-                        close_result = response.close()
-                        if hasattr(close_result, '__await__'):
-                            await close_result
-                except Exception as close_error:
-                    logger.warning(f"Error closing response: {close_error}")
+                                    updates["percentage"] = int(100 * current_size / total)
+                                await _report_progress(updates, force=0 < total <= current_size)
+                        except Exception as read_error:
+                            logger.error(f"Error reading chunk: {read_error}")
+                            raise
+                except Exception as download_error:
+                    logger.error(f"Download error: {download_error}")
+                    if track_progress:
+                        self.download_progress.pop(file_hash, None)
+                    return None
+                finally:
+                    try:
+                        if response and not response.closed:
+                            close_result = response.close()
+                            if hasattr(close_result, '__await__'):
+                                await close_result
+                    except Exception as close_error:
+                        logger.warning(f"Error closing response: {close_error}")
 
             if not await aio_exists(temp_path) or (await aio_stat(temp_path)).st_size == 0:
                 logger.error(f"S4 download failed for {filename}")
@@ -1627,19 +1681,13 @@ class MediaStorage:
             # Cancel active TTS generation
             try:
                 from enhanced_tts_voice_service import enhanced_voice_tts_service
-                for user_id, limiter in enhanced_voice_tts_service.user_job_manager._user_limiters.items():
-                    jobs_to_cancel = []
-                    async with limiter._condition:
-                        for job_id in limiter.desired.keys():
-                            job_info = enhanced_voice_tts_service.user_job_manager._user_jobs.get(user_id, {}).get(job_id)
-                            if job_info and job_info.get('track_id') == track_id:
-                                jobs_to_cancel.append((user_id, job_id))
-                    for user_id, job_id in jobs_to_cancel:
-                        try:
-                            logger.info(f"Cancelling TTS generation for deleted track: {track_id}, job: {job_id}")
-                            await enhanced_voice_tts_service.cancel_job(job_id, track_id)
-                        except Exception as job_cancel_error:
-                            logger.warning(f"Could not cancel TTS job {job_id} for track {track_id}: {job_cancel_error}")
+                jobs_to_cancel = await enhanced_voice_tts_service.user_job_manager.find_jobs_for_track(track_id)
+                for user_id, job_id in jobs_to_cancel:
+                    try:
+                        logger.info(f"Cancelling TTS generation for deleted track: {track_id}, job: {job_id}")
+                        await enhanced_voice_tts_service.cancel_job(job_id, track_id)
+                    except Exception as job_cancel_error:
+                        logger.warning(f"Could not cancel TTS job {job_id} for track {track_id}: {job_cancel_error}")
             except Exception as cancel_error:
                 logger.warning(f"Could not cancel TTS jobs for {track_id}: {cancel_error}")
             
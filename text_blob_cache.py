@@ -0,0 +1,368 @@
+"""
+Host-shared tier for the text storage cache
+
+TrackCentricTextStorageService caches decompressed source texts and merged
+word timings in Redis (redis_state.cache.text). Every hit was a blocking
+Redis GET of the whole pickled entry plus an exists + stat thread hop to
+compare the file's mtime, and every uvicorn worker on a host then held its
+own copy of what it fetched.
+
+SharedBlobCache sits in front of that tier, in a directory on the host
+(tmpfs by default) that all workers share:
+
+    blobs/<hh>/<hash>.bin   decompressed content, named by its blake2b hash
+                            (identical content is stored once)
+    keys/<cache key>        JSON: content hash, version, text or bytes,
+                            source file mtime at the time it was cached
+    versions.tbl            uint64[VERSION_SLOTS], mmap'd by every worker
+
+- a worker maps each blob it reads once and keeps the mapping; a hit is a
+  dict lookup plus one read of the key's version slot, no syscall and no
+  Redis round trip, and the pages are shared by every worker on the host
+- writes through TrackCentricTextStorageService bump the key's version
+  slot (under flock), which every worker sees on its next get; that
+  replaces the per-hit stat
+- changes made outside this host are caught by re-checking the source
+  file's mtime at most once per TEXT_BLOB_REVALIDATE_SECONDS per key
+- prune() keeps the directory under TEXT_BLOB_CACHE_MB, oldest blobs first,
+  and removes key files whose blob is gone; the budget is clamped to
+  TEXT_BLOB_FS_SHARE of the filesystem holding the directory (Docker gives
+  /dev/shm 64 MB unless the container sets shm_size)
+"""
+
+import errno
+
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Union
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DIR = Path("/dev/shm") if Path("/dev/shm").is_dir() else Path(tempfile.gettempdir())
+BLOB_CACHE_DIR = Path(os.getenv("TEXT_BLOB_CACHE_DIR", str(_DEFAULT_DIR / "text_blob_cache")))
+BLOB_CACHE_MAX_BYTES = int(os.getenv("TEXT_BLOB_CACHE_MB", "2048")) * 1024 * 1024
+BLOB_REVALIDATE_SECONDS = float(os.getenv("TEXT_BLOB_REVALIDATE_SECONDS", "30"))
+BLOB_FS_SHARE = float(os.getenv("TEXT_BLOB_FS_SHARE", "0.5"))  # most of the filesystem the cache may use
+BLOB_OPEN_MAX = 512  # blob mappings kept per worker
+
+VERSION_SLOTS = 1 << 16
+
+
+class _Mapped(NamedTuple):
+    version: int
+    view: memoryview
+    mapped: Optional[mmap.mmap]
+    is_text: bool
+    validated_at: float
+
+
+class SharedBlobCache:
+    """Decompressed blobs mapped from a host-local directory, invalidated by shared version counters"""
+
+    def __init__(self, directory: Path = BLOB_CACHE_DIR, max_bytes: int = BLOB_CACHE_MAX_BYTES,
+                 revalidate_seconds: float = BLOB_REVALIDATE_SECONDS):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self._open: "OrderedDict[str, _Mapped]" = OrderedDict()
+        self._versions = None
+        self._versions_map = None
+        self.enabled = False
+
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.stale = 0
+        self.writes = 0
+        self.write_errors = 0
+        self.pruned = 0
+
+        try:
+            (self.directory / "blobs").mkdir(parents=True, exist_ok=True)
+            (self.directory / "keys").mkdir(parents=True, exist_ok=True)
+            fs = os.statvfs(self.directory)
+            fs_limit = int(fs.f_frsize * fs.f_blocks * BLOB_FS_SHARE)
+            if fs_limit < self.max_bytes:
+                logger.warning(
+                    f"Shared text cache: {self.directory} holds {fs.f_frsize * fs.f_blocks // (1024 * 1024)} MB, "
+                    f"budget clamped to {fs_limit // (1024 * 1024)} MB"
+                )
+                self.max_bytes = fs_limit
+            self._open_versions()
+            self.enabled = True
+        except OSError as e:
+            logger.warning(f"Shared text cache disabled ({self.directory}): {e}")
+
+    # ------------------------------------------------------------ versions
+
+    def _open_versions(self):
+        path = self.directory / "versions.tbl"
+        size = 8 * VERSION_SLOTS
+        with open(path, "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                # Back every page now: a sparse page first touched through the mmap
+                # on a full tmpfs is a SIGBUS, an ENOSPC here only disables the cache
+                self._preallocate(f.fileno(), size)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            self._versions_map = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_WRITE)
+        self._versions = memoryview(self._versions_map).cast("Q")
+        self._versions_path = path
+
+    @staticmethod
+    def _preallocate(fd: int, size: int):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError as e:
+            if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL):
+                raise
+        existing = os.fstat(fd).st_size
+        if existing < size:
+            os.pwrite(fd, bytes(size - existing), existing)
+
+    @staticmethod
+    def _slot(key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % VERSION_SLOTS
+
+    def version(self, key: str) -> int:
+        """Current version of key; read it before the source file so put() can tell if it changed meanwhile"""
+        return self._versions[self._slot(key)] if self.enabled else 0
+
+    def invalidate(self, key: str):
+        """Blocking; every worker's next get(key) misses"""
+        if not self.enabled:
+            return
+        slot = self._slot(key)
+        with open(self._versions_path, "r+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                self._versions[slot] += 1
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        self._key_path(key).unlink(missing_ok=True)
+        self._drop(key)
+
+    # --------------------------------------------------------------- paths
+
+    def _key_path(self, key: str) -> Path:
+        return self.directory / "keys" / quote(key, safe="")
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.directory / "blobs" / digest[:2] / f"{digest}.bin"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    # -------------------------------------------------------------- lookups
+
+    @staticmethod
+    def _content(entry: _Mapped) -> Union[str, bytes]:
+        return str(entry.view, "utf-8") if entry.is_text else bytes(entry.view)
+
+    def get(self, key: str) -> Optional[Union[str, bytes]]:
+        """Non-blocking: only mappings this worker already holds. None means call load()"""
+        entry = self._open.get(key)
+        if entry is None or not self.enabled:
+            return None
+        if entry.version != self._versions[self._slot(key)]:
+            self.stale += 1
+            self._drop(key)
+            return None
+        if time.monotonic() - entry.validated_at > self.revalidate_seconds:
+            return None
+        self._open.move_to_end(key)
+        self.hits += 1
+        return self._content(entry)
+
+    def load(self, key: str) -> Optional[Union[str, bytes]]:
+        """Blocking; map key's blob (cached by any worker on this host) if it is still current"""
+        if not self.enabled:
+            return None
+        version = self._versions[self._slot(key)]
+        try:
+            meta = json.loads(self._key_path(key).read_bytes())
+        except (OSError, ValueError):
+            self._drop(key)
+            self.misses += 1
+            return None
+        if meta.get("version") != version or not self._source_current(meta):
+            self.stale += 1
+            self.misses += 1
+            self._drop(key)
+            return None
+
+        entry = self._open.get(key)
+        if entry is None or entry.version != version:
+            try:
+                view, mapped = self._map(self._blob_path(meta["hash"]))
+            except (OSError, KeyError):
+                self.misses += 1
+                return None
+            self._drop(key)
+            entry = _Mapped(version, view, mapped, bool(meta.get("text")), time.monotonic())
+        else:
+            entry = entry._replace(validated_at=time.monotonic())
+        self._open[key] = entry
+        self._open.move_to_end(key)
+        while len(self._open) > BLOB_OPEN_MAX:
+            self._release(self._open.popitem(last=False)[1])
+        self.loads += 1
+        self.hits += 1
+        return self._content(entry)
+
+    @staticmethod
+    def _source_current(meta: Dict) -> bool:
+        source = meta.get("source")
+        if not source:
+            return True
+        try:
+            return os.stat(source).st_mtime_ns == meta.get("source_mtime_ns")
+        except OSError:
+            return False
+
+    @staticmethod
+    def _map(path: Path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(b""), None
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(mapped), mapped
+
+    def _drop(self, key: str):
+        entry = self._open.pop(key, None)
+        if entry is not None:
+            self._release(entry)
+
+    @staticmethod
+    def _release(entry: _Mapped):
+        try:
+            entry.view.release()
+            if entry.mapped is not None:
+                entry.mapped.close()
+        except BufferError:
+            pass
+
+    # --------------------------------------------------------------- writes
+
+    def put(self, key: str, content: Union[str, bytes], source: Optional[Path] = None, version: Optional[int] = None):
+        """
+        Blocking; store content for key at the key's current version. With version
+        (read before the content was), skip it if key was invalidated since.
+        """
+        if not self.enabled:
+            return
+        current = self._versions[self._slot(key)]
+        if version is not None and version != current:
+            return
+        is_text = isinstance(content, str)
+        data = content.encode("utf-8") if is_text else bytes(content)
+        if len(data) > self.max_bytes // 4:
+            return
+        source_mtime_ns = 0
+        if source is not None:
+            try:
+                source_mtime_ns = os.stat(source).st_mtime_ns
+            except OSError:
+                source = None
+
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        blob_path = self._blob_path(digest)
+        try:
+            if not blob_path.exists():
+                blob_path.parent.mkdir(exist_ok=True)
+                self._write_atomic(blob_path, data)
+            meta = {
+                "hash": digest,
+                "version": current,
+                "text": is_text,
+                "size": len(data),
+                "source": str(source) if source is not None else None,
+                "source_mtime_ns": source_mtime_ns,
+            }
+            self._write_atomic(self._key_path(key), json.dumps(meta).encode("utf-8"))
+            self.writes += 1
+        except OSError as e:
+            self.write_errors += 1
+            if e.errno == errno.ENOSPC:
+                logger.warning(f"Shared text cache full ({self.directory}), write skipped for {key}")
+            else:
+                logger.debug(f"Shared text cache write failed for {key}: {e}")
+        self._drop(key)
+
+    def prune(self) -> int:
+        """Blocking; delete the oldest blobs until the directory fits max_bytes (mapped readers keep theirs)"""
+        if not self.enabled:
+            return 0
+        blobs = []
+        total = 0
+        for path in (self.directory / "blobs").glob("*/*.bin"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            blobs.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        removed = 0
+        for _, size, path in sorted(blobs):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        self.pruned += removed
+        self._prune_orphan_keys()
+        return removed
+
+    def _prune_orphan_keys(self):
+        """Blocking; delete key files whose blob was pruned (or never landed)"""
+        for key_path in (self.directory / "keys").iterdir():
+            if key_path.name.startswith("."):
+                continue  # a put() in flight
+            try:
+                digest = json.loads(key_path.read_bytes())["hash"]
+                if self._blob_path(digest).exists():
+                    continue
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+            key_path.unlink(missing_ok=True)
+
+    def close(self):
+        while self._open:
+            self._release(self._open.popitem()[1])
+
+    def get_stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "directory": str(self.directory),
+            "mapped_entries": len(self._open),
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "stale": self.stale,
+            "writes": self.writes,
+            "write_errors": self.write_errors,
+            "pruned": self.pruned,
+            "max_mb": round(self.max_bytes / 1024 / 1024, 2),
+            "hit_ratio": round(self.hits / lookups * 100, 2) if lookups else 0.0,
+        }
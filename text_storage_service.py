@@ -15,12 +15,14 @@ from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import anyio
 import bisect
 
 # Redis cache for multi-container support (reduces 8GB×N containers to shared 8GB)
 from redis_state.cache.text import text_cache as redis_text_cache
+from text_blob_cache import SharedBlobCache
+from word_timing_columns import ColumnarWordTimings, ColumnarWriter, ColumnarFormatError
 _HEADER_FMT = "<BIddI"
 _WORD_META_FMT = "<QQIB"
 _WORD_OFFSET_FMT = "<I"
@@ -30,6 +32,7 @@ _WORD_OFFSET_SIZE = struct.calcsize(_WORD_OFFSET_FMT)
 _TIMING_FMT_VERSION = 4
 _CACHE_MTIME_DRIFT_NS = 10_000_000
 _SMALL_ITEM_THRESHOLD = 1_024_000
+_COLUMNAR_OPEN_MAX = 256  # mapped timings.cols kept open per process
 
 try:
     import zstandard as zstd
@@ -116,11 +119,15 @@ class TrackCentricTextStorageService:
         self.cache = redis_text_cache.cache
         self.current_cache_memory = 0  # Note: This is now approximate per-container, actual is in Redis
         self.cache_lock = asyncio.Lock()  # Local lock for in-container operations
+        # Host-shared tier in front of Redis: mapped blobs, version-invalidated (no per-hit stat)
+        self.blob_cache = SharedBlobCache()
         
         self._io_sem = asyncio.Semaphore(16)
         self._compress_sem = asyncio.Semaphore(4)
         self._python_cpu_sem = asyncio.Semaphore(2)
         self._file_locks = defaultdict(asyncio.Lock)
+        # (track_id, voice_id) -> (mtime_ns, ColumnarWordTimings)
+        self._columnar: "OrderedDict[tuple, tuple]" = OrderedDict()
         
         self.cache_hits = 0
         self.cache_misses = 0
@@ -150,9 +157,24 @@ class TrackCentricTextStorageService:
     def _get_text_file_path(self, track_id: str) -> Path:
         return self._get_track_storage_dir(track_id) / "texts" / "source.txt.zst"
     
+    def _get_chunk_plan_path(self, track_id: str) -> Path:
+        return self._get_track_storage_dir(track_id) / "texts" / "chunk_plan.json.zst"
+    
     def _get_timing_file_path(self, track_id: str, voice_id: str) -> Path:
         return self._get_track_storage_dir(track_id) / f"voice-{voice_id}" / "timings.zst"
     
+    def _get_columnar_timing_path(self, track_id: str, voice_id: str) -> Path:
+        return self._get_track_storage_dir(track_id) / f"voice-{voice_id}" / "timings.cols"
+    
+    def _get_read_along_artifact_path(self, track_id: str, voice_id: str) -> Path:
+        return self._get_track_storage_dir(track_id) / f"voice-{voice_id}" / "readalong.bin"
+    
+    def _get_search_index_path(self, track_id: str, voice_id: str) -> Path:
+        return self._get_track_storage_dir(track_id) / f"voice-{voice_id}" / "search.idx"
+    
+    def _get_segment_timing_path(self, track_id: str, voice_id: str) -> Path:
+        return self._get_track_storage_dir(track_id) / f"voice-{voice_id}" / "segment_timings.bin"
+    
     def _get_timings_parts_dir(self, track_id: str, voice_id: str) -> Path:
         return self._get_track_storage_dir(track_id) / f"voice-{voice_id}" / "timings.parts"
     
@@ -215,6 +237,7 @@ class TrackCentricTextStorageService:
                 await asyncio.sleep(self.cleanup_interval)
                 if not self._shutdown:
                     await self._cleanup_expired_entries()
+                    await anyio.to_thread.run_sync(self.blob_cache.prune)
             except asyncio.CancelledError:
                 break
             except Exception:
@@ -252,6 +275,8 @@ class TrackCentricTextStorageService:
                 entry = self.cache.pop(key, None)
                 if entry:
                     self.current_cache_memory = max(0, self.current_cache_memory - entry.size)
+        for key in stale_keys:
+            await anyio.to_thread.run_sync(self.blob_cache.invalidate, key)
         
         if expired_keys or stale_keys:
             self.cache_cleanups += 1
@@ -354,6 +379,19 @@ class TrackCentricTextStorageService:
         self.cache_evictions += len(keys_to_remove)
     
     async def _cache_get(self, cache_key: str) -> Optional[Union[str, bytes]]:
+        """
+        Host-shared mapped tier first, then Redis. Writes invalidate both tiers
+        (_cache_invalidate), so hits are not checked against the file; the
+        cleanup loop still drops entries whose file changed behind our back.
+        """
+        shared = self.blob_cache.get(cache_key)
+        if shared is None and self.blob_cache.enabled:
+            shared = await anyio.to_thread.run_sync(self.blob_cache.load, cache_key)
+        if shared is not None:
+            self.cache_hits += 1
+            return shared
+        
+        blob_version = self.blob_cache.version(cache_key)
         async with self.cache_lock:
             entry = self.cache.get(cache_key)
             if not entry:
@@ -367,50 +405,28 @@ class TrackCentricTextStorageService:
                 self.current_cache_memory = max(0, self.current_cache_memory - entry.size)
                 del self.cache[cache_key]
                 return None
-        
-        stale = False
-        file_path = self._get_file_path_from_cache_key(cache_key)
-        try:
-            if file_path and await self._exists(file_path):
-                stat_info = await self._stat(file_path)
-                if stat_info.st_mtime_ns > entry.file_mtime_ns + _CACHE_MTIME_DRIFT_NS:
-                    stale = True
-            else:
-                stale = True
-        except Exception:
-            stale = True
-        
-        async with self.cache_lock:
-            current_entry = self.cache.get(cache_key)
-            if not current_entry:
-                self.cache_misses += 1
-                return None
-            
-            if current_entry is not entry:
-                self.cache_hits += 1
-                updated = current_entry._replace(
-                    last_accessed=time.time(),
-                    access_count=current_entry.access_count + 1
-                )
-                self.cache[cache_key] = updated
-                return current_entry.content
-            
-            if stale:
-                self.cache_stale_hits += 1
-                self.cache_misses += 1
-                self.current_cache_memory = max(0, self.current_cache_memory - entry.size)
-                del self.cache[cache_key]
-                return None
             
-            updated = entry._replace(
-                last_accessed=time.time(),
+            self.cache[cache_key] = entry._replace(
+                last_accessed=current_time,
                 access_count=entry.access_count + 1
             )
-            self.cache[cache_key] = updated
             self.cache_hits += 1
-            return entry.content
+        
+        await self._blob_cache_put(cache_key, entry.content, None, blob_version)
+        return entry.content
+    
+    async def _blob_cache_put(self, cache_key: str, content: Union[str, bytes], file_path: Optional[Path], blob_version: Optional[int]):
+        if self.blob_cache.enabled:
+            source = file_path or self._get_file_path_from_cache_key(cache_key)
+            await anyio.to_thread.run_sync(self.blob_cache.put, cache_key, content, source, blob_version)
+    
+    async def _cache_invalidate(self, cache_key: str):
+        """Drop cache_key from both tiers, in every worker and container"""
+        async with self.cache_lock:
+            self.cache.pop(cache_key, None)
+        await anyio.to_thread.run_sync(self.blob_cache.invalidate, cache_key)
     
-    async def _cache_set(self, cache_key: str, content: str, file_path: Optional[Path] = None):
+    async def _cache_set(self, cache_key: str, content: str, file_path: Optional[Path] = None, blob_version: Optional[int] = None):
         encoded = content.encode('utf-8')
         content_size = len(encoded)
         
@@ -449,6 +465,8 @@ class TrackCentricTextStorageService:
             
             self.cache[cache_key] = entry
             self.current_cache_memory += content_size
+        
+        await self._blob_cache_put(cache_key, content, file_path, blob_version)
     
     async def _cache_get_bytes(self, cache_key: str) -> Optional[bytes]:
         result = await self._cache_get(cache_key)
@@ -456,7 +474,7 @@ class TrackCentricTextStorageService:
             return result
         return None
     
-    async def _cache_set_bytes(self, cache_key: str, data: bytes, file_path: Optional[Path] = None):
+    async def _cache_set_bytes(self, cache_key: str, data: bytes, file_path: Optional[Path] = None, blob_version: Optional[int] = None):
         content_size = len(data)
         if content_size > 512 * 1024 * 1024:
             return
@@ -491,6 +509,8 @@ class TrackCentricTextStorageService:
             
             self.cache[cache_key] = entry
             self.current_cache_memory += content_size
+        
+        await self._blob_cache_put(cache_key, data, file_path, blob_version)
 
     async def get_word_timings_range(
         self,
@@ -516,6 +536,12 @@ class TrackCentricTextStorageService:
             List of word timing dictionaries within the range
         """
         try:
+            # Bisect the mapped columns; only the returned words become dicts
+            columns = await self.open_columnar_timings(track_id, voice_id)
+            if columns is not None:
+                lo, hi = columns.range(start, end, limit)
+                return columns.words(lo, hi)
+            
             # Get all words for this voice
             words = await self.get_word_timings(track_id, voice_id, db)
             
@@ -553,6 +579,142 @@ class TrackCentricTextStorageService:
             logger.error(f"Error getting word timings range for {track_id}:{voice_id}: {e}")
             return []
     
+    async def get_word_at_time(self, track_id: str, voice_id: str, time_seconds: float) -> Optional[Dict]:
+        """Word being spoken at time_seconds (with its global word_index), None before the first word"""
+        columns = await self.open_columnar_timings(track_id, voice_id)
+        if columns is None:
+            return None
+        index = columns.index_at(time_seconds)
+        if index < 0:
+            return None
+        word = columns.word_dict(index)
+        word['word_index'] = index
+        return word
+    
+    async def get_word_count(self, track_id: str, voice_id: str) -> int:
+        columns = await self.open_columnar_timings(track_id, voice_id)
+        return len(columns) if columns is not None else 0
+    
+    # ====================================================================
+    # COLUMNAR (MMAP) TIMINGS
+    # ====================================================================
+    
+    async def open_columnar_timings(self, track_id: str, voice_id: str) -> Optional[ColumnarWordTimings]:
+        """
+        Mapped timings.cols of a voice, built from timings.zst (and any appended
+        shards) first if it is missing or older. None if the voice has no timings.
+        """
+        key = (track_id, voice_id)
+        cols_path = self._get_columnar_timing_path(track_id, voice_id)
+        main_file = self._get_timing_file_path(track_id, voice_id)
+        parts_dir = self._get_timings_parts_dir(track_id, voice_id)
+        
+        def _mtime(path: Path) -> Optional[int]:
+            try:
+                return path.stat().st_mtime_ns
+            except OSError:
+                return None
+        
+        def _state():
+            # Appended shards, when there are any, are what get_word_timings serves
+            shards = list(parts_dir.glob("part-*.bin.zst")) if parts_dir.exists() else []
+            if shards:
+                source_mtime = max(filter(None, map(_mtime, shards)), default=None)
+            else:
+                source_mtime = _mtime(main_file)
+            return _mtime(cols_path), source_mtime, bool(shards)
+        
+        cols_mtime, source_mtime, has_parts = await anyio.to_thread.run_sync(_state)
+        if source_mtime is not None and (cols_mtime is None or cols_mtime < source_mtime):
+            if has_parts:
+                await self._build_columnar_from_words(track_id, voice_id)
+            else:
+                await self._migrate_columnar_timings(track_id, voice_id)
+            cols_mtime = await anyio.to_thread.run_sync(_mtime, cols_path)
+        if cols_mtime is None:
+            return None
+        
+        opened = self._columnar.get(key)
+        if opened and opened[0] == cols_mtime:
+            self._columnar.move_to_end(key)
+            return opened[1]
+        
+        try:
+            columns = await anyio.to_thread.run_sync(ColumnarWordTimings.open, cols_path)
+        except (OSError, ColumnarFormatError) as e:
+            logger.warning(f"Cannot map columnar timings {track_id}:{voice_id}: {e}")
+            return None
+        
+        # Replaced and evicted mappings are only dropped, never closed: a coroutine
+        # may still be reading them, and the map goes away with its last reference
+        self._columnar[key] = (cols_mtime, columns)
+        self._columnar.move_to_end(key)
+        while len(self._columnar) > _COLUMNAR_OPEN_MAX:
+            self._columnar.popitem(last=False)
+        return columns
+    
+    async def _write_columnar_timings(self, track_id: str, voice_id: str, packed_data: Union[bytes, bytearray]):
+        """Write timings.cols for freshly stored v4 timings (a failure only costs the fast path)"""
+        try:
+            writer = await self._with_sem(self._python_cpu_sem, self._columns_from_v4, packed_data)
+            await anyio.to_thread.run_sync(writer.write, self._get_columnar_timing_path(track_id, voice_id))
+        except Exception as e:
+            logger.warning(f"Columnar timings not written for {track_id}:{voice_id}: {e}")
+    
+    async def _migrate_columnar_timings(self, track_id: str, voice_id: str) -> bool:
+        """Build timings.cols from an existing timings.zst"""
+        lock_key = self._lock_key("timing", track_id, voice_id)
+        async with self._file_locks[lock_key]:
+            main_file = self._get_timing_file_path(track_id, voice_id)
+            if not await self._exists(main_file):
+                return False
+            async with aiofiles.open(main_file, 'rb') as f:
+                compressed_data = await f.read()
+            packed_data = await self._decompress_async(compressed_data)
+            await self._write_columnar_timings(track_id, voice_id, packed_data)
+            self.total_bytes_read += len(compressed_data)
+            return await self._exists(self._get_columnar_timing_path(track_id, voice_id))
+    
+    async def _build_columnar_from_words(self, track_id: str, voice_id: str):
+        """Build timings.cols from what get_word_timings serves (timings.zst plus appended shards)"""
+        words = await self.get_word_timings(track_id, voice_id)
+        if not words:
+            return
+        
+        def _build():
+            writer = ColumnarWriter()
+            for word in words:
+                writer.add_dict(word)
+            writer.write(self._get_columnar_timing_path(track_id, voice_id))
+        
+        try:
+            await self._with_sem(self._python_cpu_sem, _build)
+        except Exception as e:
+            logger.warning(f"Columnar timings not written for {track_id}:{voice_id}: {e}")
+    
+    async def migrate_columnar_timings(self) -> int:
+        """Give every stored voice timing file its timings.cols; returns how many were built"""
+        if not self.hls_segment_dir:
+            raise TextStorageError("HLS segment directory not initialized")
+        
+        def _missing():
+            found = []
+            for main_file in self.hls_segment_dir.glob("*/voice-*/timings.zst"):
+                cols_path = main_file.with_name("timings.cols")
+                if not cols_path.exists() or cols_path.stat().st_mtime_ns < main_file.stat().st_mtime_ns:
+                    found.append((main_file.parent.parent.name, main_file.parent.name[len("voice-"):]))
+            return found
+        
+        migrated = 0
+        for track_id, voice_id in await anyio.to_thread.run_sync(_missing):
+            try:
+                if await self._migrate_columnar_timings(track_id, voice_id):
+                    migrated += 1
+            except Exception as e:
+                logger.warning(f"Columnar migration failed for {track_id}:{voice_id}: {e}")
+        logger.info(f"Columnar timings migration: {migrated} voices converted")
+        return migrated
+    
     async def store_source_text(self, track_id: str, text: str, db: Optional[Session] = None) -> Dict[str, Any]:
         lock_key = self._lock_key("text", track_id)
         async with self._file_locks[lock_key]:
@@ -579,6 +741,7 @@ class TrackCentricTextStorageService:
             
             await self._rename(temp_path, file_path)
             cache_key = f"text:{track_id}"
+            await self._cache_invalidate(cache_key)
             await self._cache_set(cache_key, text, file_path)
             
             relative_path = file_path.relative_to(self.hls_segment_dir)
@@ -614,6 +777,7 @@ class TrackCentricTextStorageService:
             if cached_content:
                 return cached_content
         
+        blob_version = self.blob_cache.version(f"text:{track_id}")
         file_path = self._get_text_file_path(track_id)
         
         if await self._exists(file_path):
@@ -625,7 +789,7 @@ class TrackCentricTextStorageService:
                 text = text_bytes.decode('utf-8')
                 
                 if not bypass_cache:
-                    await self._cache_set(f"text:{track_id}", text, file_path)
+                    await self._cache_set(f"text:{track_id}", text, file_path, blob_version)
                 
                 self.total_bytes_read += len(compressed_data)
                 self.operations_count += 1
@@ -633,13 +797,62 @@ class TrackCentricTextStorageService:
         
         return None
     
+    async def store_chunk_plan(self, track_id: str, plan_key: str, chunks: List[str]) -> Path:
+        """Persist the TTS chunk split of the source text; plan_key ties it to the text and splitter settings"""
+        lock_key = self._lock_key("chunk_plan", track_id)
+        async with self._file_locks[lock_key]:
+            await self._ensure_track_directories(track_id)
+            payload = json.dumps({'plan_key': plan_key, 'chunks': chunks}).encode('utf-8')
+            compressed_data = await self._compress_async(payload)
+            
+            file_path = self._get_chunk_plan_path(track_id)
+            temp_path = self._get_temp_dir(track_id) / f"chunk_plan_{time.time_ns()}.tmp"
+            async with aiofiles.open(temp_path, 'wb') as f:
+                await f.write(compressed_data)
+            await self._rename(temp_path, file_path)
+            
+            self.total_bytes_written += len(compressed_data)
+            self.operations_count += 1
+            return file_path
+    
+    async def get_chunk_plan(self, track_id: str, plan_key: str) -> Optional[List[str]]:
+        """Stored chunk plan, or None if there is none for this plan_key (text or splitter changed)"""
+        file_path = self._get_chunk_plan_path(track_id)
+        if not await self._exists(file_path):
+            return None
+        
+        async with aiofiles.open(file_path, 'rb') as f:
+            compressed_data = await f.read()
+        try:
+            plan = json.loads(await self._decompress_async(compressed_data))
+        except Exception as e:
+            logger.warning(f"Unreadable chunk plan for {track_id}: {e}")
+            return None
+        
+        self.total_bytes_read += len(compressed_data)
+        self.operations_count += 1
+        if plan.get('plan_key') != plan_key:
+            return None
+        return plan['chunks']
+    
     async def store_word_timings(self, track_id: str, voice_id: str, word_timings: List[Dict], db: Optional[Session] = None) -> Dict[str, Any]:
+        if not word_timings:
+            raise TextStorageError("Cannot store empty word timings")
+        
+        packed_data = await self._pack_word_timings_async(word_timings)
+        return await self.store_packed_word_timings(track_id, voice_id, packed_data, db)
+    
+    async def store_packed_word_timings(self, track_id: str, voice_id: str, packed_data: Union[bytes, bytearray], db: Optional[Session] = None) -> Dict[str, Any]:
+        """Write complete v4-packed timings (e.g. from WordTimingMerger) as the voice's timing file"""
         lock_key = self._lock_key("timing", track_id, voice_id)
         async with self._file_locks[lock_key]:
-            if not word_timings:
-                raise TextStorageError("Cannot store empty word timings")
+            try:
+                version, word_count, first_time, last_time, _reserved = struct.unpack_from(_HEADER_FMT, packed_data)
+            except struct.error:
+                raise TextStorageError("Packed word timings have no header")
+            if version != _TIMING_FMT_VERSION or word_count == 0:
+                raise TextStorageError(f"Cannot store packed word timings (version {version}, {word_count} words)")
             
-            packed_data = await self._pack_word_timings_async(word_timings)
             timing_hash = self._calculate_hash(packed_data)
             
             await self._ensure_track_directories(track_id)
@@ -664,6 +877,14 @@ class TrackCentricTextStorageService:
             
             await self._rename(temp_path, file_path)
             
+            await self._write_columnar_timings(track_id, voice_id, packed_data)
+            
+            # A complete set supersedes appended shards (get_word_timings reads those first)
+            parts_dir = self._get_timings_parts_dir(track_id, voice_id)
+            if await self._exists(parts_dir):
+                await self._rmtree(parts_dir, ignore_errors=True)
+            await self._cache_invalidate(f"timing:{track_id}:{voice_id}")
+            
             relative_path = file_path.relative_to(self.hls_segment_dir)
             
             result = {
@@ -674,12 +895,12 @@ class TrackCentricTextStorageService:
                 'compressed_size': len(compressed_data),
                 'compression_ratio': len(compressed_data) / len(packed_data),
                 'compression_method': COMPRESSION_AVAILABLE,
-                'word_count': len(word_timings),
+                'word_count': word_count,
                 'track_id': track_id,
                 'voice_id': voice_id,
-                'first_word_time': word_timings[0]['start_time'],
-                'last_word_time': word_timings[-1]['end_time'],
-                'total_duration': word_timings[-1]['end_time'] - word_timings[0]['start_time'],
+                'first_word_time': first_time,
+                'last_word_time': last_time,
+                'total_duration': last_time - first_time,
                 'created_at': datetime.now(timezone.utc).isoformat()
             }
             
@@ -854,6 +1075,8 @@ class TrackCentricTextStorageService:
                     pass
             
             await self._rename(temp_path, shard_path)
+            # The cached merge predates this shard
+            await self._cache_invalidate(f"timing:{track_id}:{voice_id}")
             
             self.total_bytes_written += len(compressed_data)
             self.operations_count += 1
@@ -890,6 +1113,7 @@ class TrackCentricTextStorageService:
             logger.info(f"[WordTimingsPerf] CACHE HIT {track_id}:{voice_id} - cache_get: {(perf_cache-perf_start)*1000:.1f}ms, unpack: {(perf_end-perf_cache)*1000:.1f}ms, TOTAL: {(perf_end-perf_start)*1000:.1f}ms")
             return result
 
+        blob_version = self.blob_cache.version(cache_key)
         perf_cache_miss = time_module.perf_counter()
         logger.info(f"[WordTimingsPerf] CACHE MISS {track_id}:{voice_id} - cache check took: {(perf_cache_miss-perf_start)*1000:.1f}ms")
 
@@ -948,7 +1172,7 @@ class TrackCentricTextStorageService:
         perf_pack = time_module.perf_counter()
         logger.info(f"[WordTimingsPerf] Re-packing took: {(perf_pack-perf_sort)*1000:.1f}ms")
 
-        await self._cache_set_bytes(cache_key, packed_merged)
+        await self._cache_set_bytes(cache_key, packed_merged, blob_version=blob_version)
         perf_cache_set = time_module.perf_counter()
         logger.info(f"[WordTimingsPerf] Cache set took: {(perf_cache_set-perf_pack)*1000:.1f}ms")
 
@@ -1003,6 +1227,7 @@ class TrackCentricTextStorageService:
                         pass
                 
                 await self._rename(temp_path, file_path)
+                await self._write_columnar_timings(track_id, voice_id, packed_data)
                 
                 for shard_file in shard_files:
                     try:
@@ -1015,9 +1240,7 @@ class TrackCentricTextStorageService:
                 except Exception:
                     pass
                 
-                cache_key = f"timing:{track_id}:{voice_id}"
-                async with self.cache_lock:
-                    self.cache.pop(cache_key, None)
+                await self._cache_invalidate(f"timing:{track_id}:{voice_id}")
                 
                 logger.info(f"Consolidated {len(shard_files)} shards -> {len(all_words)} words: {track_id}:{voice_id}")
                 return True
@@ -1048,6 +1271,29 @@ class TrackCentricTextStorageService:
             packed_words.append(packed)
         return header + b"".join(packed_words)
     
+    def _columns_from_v4(self, data: Union[bytes, bytearray]) -> ColumnarWriter:
+        """Blocking; columnar copy of v4-packed timings, read record by record without dicts"""
+        writer = ColumnarWriter()
+        version, word_count, _first, _last, _reserved = struct.unpack_from(_HEADER_FMT, data)
+        if version != _TIMING_FMT_VERSION:
+            raise TextStorageError(f"Unsupported timing format version {version}")
+        view = memoryview(data)
+        offset = _HEADER_SIZE
+        for _ in range(word_count):
+            word_len = view[offset]
+            word_bytes = bytes(view[offset + 1:offset + 1 + word_len])
+            offset += 1 + word_len
+            start_ms, duration_ms, segment_idx, flags = struct.unpack_from(_WORD_META_FMT, view, offset)
+            offset += _WORD_META_SIZE
+            segment_offset = None
+            if flags & 0x01:
+                (segment_offset_ms,) = struct.unpack_from(_WORD_OFFSET_FMT, view, offset)
+                segment_offset = segment_offset_ms / 1000.0
+                offset += _WORD_OFFSET_SIZE
+            writer.add(word_bytes, start_ms / 1000.0, (start_ms + duration_ms) / 1000.0, segment_idx, segment_offset)
+        view.release()
+        return writer
+    
     def _unpack_word_timings_v4(self, data: bytes) -> List[Dict]:
         if len(data) < _HEADER_SIZE:
             return []
@@ -1172,6 +1418,7 @@ class TrackCentricTextStorageService:
             'cache_hits': self.cache_hits,
             'cache_misses': self.cache_misses,
             'cache_evictions': self.cache_evictions,
+            'shared_cache': self.blob_cache.get_stats(),
             'storage_architecture': 'track_centric_v4',
             'compression_method': COMPRESSION_AVAILABLE,
             'format_version': _TIMING_FMT_VERSION
@@ -1230,6 +1477,10 @@ class TrackCentricTextStorageService:
         async with self.cache_lock:
             self.cache.clear()
             self.current_cache_memory = 0
+        while self._columnar:
+            _, (_, columns) = self._columnar.popitem()
+            columns.close()
+        self.blob_cache.close()
 
 text_storage_service = TrackCentricTextStorageService(
     max_cache_memory_mb=8192,
@@ -0,0 +1,241 @@
+"""
+In-process track metadata cache
+
+Read-through cache of the track/album facts the hot request paths need
+(segments, playlists, read-along, comments, progress) so they stop
+re-querying Track/Album on every request.
+
+- Bounded LRU per worker with a TTL as a safety net
+- Invalidated across replicas over Redis pub/sub (same pattern as WebSocketManager)
+- Invalidation fires whenever grants are revoked for a track
+  (AuthorizationService.invalidate_on_content_change / invalidate_on_tier_change)
+
+Cached entries are plain dataclasses, never ORM instances, so they are safe to
+share between requests and sessions. TrackMeta exposes `.album.tier_restrictions`
+so it can be passed straight to permissions.check_tier_access().
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from models import Track, Album
+from websocket_manager import WebSocketManager
+
+logger = logging.getLogger(__name__)
+
+TRACK_METADATA_CACHE_MAX_ENTRIES = 20000
+TRACK_METADATA_CACHE_TTL = 300.0  # 5 minutes - catches changes that don't revoke grants
+INVALIDATION_CHANNEL = "track_metadata_invalidation"
+
+
+@dataclass(frozen=True)
+class AlbumMeta:
+    id: str
+    title: Optional[str]
+    created_by_id: Optional[int]
+    tier_restrictions: Optional[Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class TrackMeta:
+    id: str
+    album_id: Optional[str]
+    created_by_id: Optional[int]
+    track_type: str
+    default_voice: Optional[str]
+    content_version: int
+    file_path: Optional[str]
+    duration: Optional[float]
+    album: Optional[AlbumMeta]
+
+    @property
+    def is_tts(self) -> bool:
+        return self.track_type == 'tts'
+
+
+class _InvalidationBus(WebSocketManager):
+    """Redis pub/sub channel whose 'local broadcast' evicts cache entries"""
+
+    def __init__(self, cache: "TrackMetadataCache"):
+        super().__init__(channel=INVALIDATION_CHANNEL)
+        self._cache = cache
+
+    async def _broadcast_local(self, message: dict):
+        track_id = message.get('track_id')
+        album_id = message.get('album_id')
+        if track_id:
+            self._cache._evict_track(track_id)
+        if album_id:
+            self._cache._evict_album(album_id)
+
+
+class TrackMetadataCache:
+    """Bounded LRU of TrackMeta keyed by track_id"""
+
+    def __init__(self, max_entries: int = TRACK_METADATA_CACHE_MAX_ENTRIES, ttl: float = TRACK_METADATA_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # track_id -> (TrackMeta, cached_at)
+        self._bus = _InvalidationBus(self)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    # ---------------------------------------------------------------- lookups
+
+    def get_cached(self, track_id: str) -> Optional[TrackMeta]:
+        """Return a cached entry without touching the DB (None on miss)"""
+        entry = self._entries.get(track_id)
+        if entry is None:
+            return None
+        meta, cached_at = entry
+        if time.monotonic() - cached_at > self.ttl:
+            self._entries.pop(track_id, None)
+            return None
+        self._entries.move_to_end(track_id)
+        return meta
+
+    def get_sync(self, track_id: str, db: Session) -> Optional[TrackMeta]:
+        """Read-through lookup for sync callers"""
+        track_id = str(track_id)
+        meta = self.get_cached(track_id)
+        if meta is not None:
+            self.hits += 1
+            return meta
+
+        self.misses += 1
+        meta = self._load(track_id, db)
+        if meta is not None:
+            self._store(meta)
+        return meta
+
+    async def get(self, track_id: str, db: Session) -> Optional[TrackMeta]:
+        """Read-through lookup; DB work on a miss runs in the thread pool"""
+        self._ensure_bus()
+        track_id = str(track_id)
+        meta = self.get_cached(track_id)
+        if meta is not None:
+            self.hits += 1
+            return meta
+
+        self.misses += 1
+        meta = await asyncio.to_thread(self._load, track_id, db)
+        if meta is not None:
+            self._store(meta)
+        return meta
+
+    def _load(self, track_id: str, db: Session) -> Optional[TrackMeta]:
+        track = db.query(Track).filter(Track.id == track_id).first()
+        if not track:
+            return None
+        album = db.query(Album).filter(Album.id == track.album_id).first() if track.album_id else None
+        return self.from_models(track, album)
+
+    @staticmethod
+    def from_models(track: Track, album: Optional[Album]) -> TrackMeta:
+        album_meta = None
+        if album is not None:
+            album_meta = AlbumMeta(
+                id=str(album.id),
+                title=album.title,
+                created_by_id=album.created_by_id,
+                tier_restrictions=dict(album.tier_restrictions) if album.tier_restrictions else None
+            )
+        return TrackMeta(
+            id=str(track.id),
+            album_id=str(track.album_id) if track.album_id else None,
+            created_by_id=track.created_by_id,
+            track_type=getattr(track, 'track_type', None) or 'audio',
+            default_voice=track.default_voice,
+            content_version=track.content_version or 1,
+            file_path=track.file_path,
+            duration=track.duration,
+            album=album_meta
+        )
+
+    def _store(self, meta: TrackMeta):
+        self._entries[meta.id] = (meta, time.monotonic())
+        self._entries.move_to_end(meta.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    # ----------------------------------------------------------- invalidation
+
+    def _evict_track(self, track_id: str):
+        if self._entries.pop(str(track_id), None) is not None:
+            self.invalidations += 1
+
+    def _evict_album(self, album_id: str):
+        album_id = str(album_id)
+        stale = [tid for tid, (meta, _) in self._entries.items() if meta.album_id == album_id]
+        for tid in stale:
+            self._entries.pop(tid, None)
+        self.invalidations += len(stale)
+
+    def invalidate_track(self, track_id: str):
+        """Evict locally now and tell every other replica"""
+        self._evict_track(track_id)
+        self._publish({'track_id': str(track_id)})
+
+    def invalidate_album(self, album_id: str):
+        """Evict all tracks of an album locally now and tell every other replica"""
+        self._evict_album(album_id)
+        self._publish({'album_id': str(album_id)})
+
+    def _publish(self, message: dict):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Worker thread / sync context (e.g. read_along_cache.increment_version):
+            # publish on the same channel with the blocking client
+            from redis_state.config import redis_client
+            if not redis_client.publish(INVALIDATION_CHANNEL, json.dumps(message)):
+                logger.debug(f"Track metadata invalidation {message} reached no subscriber")
+            return
+        self._ensure_bus()
+        loop.create_task(self._bus.broadcast(message))
+
+    def _ensure_bus(self):
+        """Subscribe on first use so every replica listens, not only publishers"""
+        if self._bus._initialized:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._bus._initialized = True
+        loop.create_task(self._bus._init_redis())
+
+    # ---------------------------------------------------------------- metrics
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'evictions': self.evictions,
+            'pubsub_connected': self._bus._redis_client is not None
+        }
+
+
+# Global singleton instance (one per worker)
+track_metadata_cache = TrackMetadataCache()
+
+
+async def get_track_meta(track_id: str, db: Session) -> Optional[TrackMeta]:
+    """Get cached track/album facts (convenience wrapper)"""
+    return await track_metadata_cache.get(track_id, db)
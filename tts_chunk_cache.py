@@ -0,0 +1,369 @@
+"""
+Content-addressed TTS chunk cache
+
+Voice switches, regenerations and re-uploads of edited books used to
+re-synthesize every chunk even when almost all paragraphs were unchanged.
+Edge TTS output is a pure function of (text, voice, engine version), so each
+generated chunk is stored under
+
+    sha256(edge-tts version, voice, whitespace-normalized chunk text)
+
+as the MP3 bytes plus the word-boundary JSON that _generate_chunk_audio_to_file
+produced. _generate_chunks_in_parallel asks the cache before taking a user
+slot / Edge TTS concurrency permit, so editing one chapter of a 300-chunk book
+costs one chunk of synthesis.
+
+- Local disk store (TTS_CHUNK_CACHE_DIR), shared by all workers on the host;
+  writes are tmp + rename, entries are hard-linked into session dirs when
+  possible
+- Size-bounded LRU (TTS_CHUNK_CACHE_MAX_MB) over the whole directory; recency
+  is the file mtime, which hits refresh, so the order survives restarts.
+  Each worker only estimates the size between scans; once its estimate passes
+  the cap (or every TTS_CHUNK_CACHE_RESCAN_SECONDS) it takes a host-wide flock,
+  rescans the directory and evicts the oldest entries of every worker until
+  the cache is back under TTS_CHUNK_CACHE_LOW_WATER of the cap
+- Optional S4 backing (TTS_CHUNK_CACHE_S4): local misses fall through to S4,
+  new entries are uploaded in the background
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+import edge_tts
+
+logger = logging.getLogger(__name__)
+
+TTS_CHUNK_CACHE_ENABLED = os.getenv('TTS_CHUNK_CACHE', 'true').lower() in ('1', 'true', 'yes')
+TTS_CHUNK_CACHE_DIR = Path(os.getenv('TTS_CHUNK_CACHE_DIR', '/tmp/media_storage/tts_chunk_cache'))
+TTS_CHUNK_CACHE_MAX_BYTES = int(os.getenv('TTS_CHUNK_CACHE_MAX_MB', '4096')) * 1024 * 1024
+TTS_CHUNK_CACHE_RESCAN_SECONDS = float(os.getenv('TTS_CHUNK_CACHE_RESCAN_SECONDS', '60'))
+TTS_CHUNK_CACHE_LOW_WATER = 0.9  # evict down to this fraction of the cap, so scans stay rare
+TTS_CHUNK_CACHE_S4 = os.getenv('TTS_CHUNK_CACHE_S4', 'false').lower() in ('1', 'true', 'yes')
+TTS_CHUNK_CACHE_S4_PREFIX = "tts-chunk-cache"
+
+ENGINE_VERSION = f"edge-tts/{getattr(edge_tts, '__version__', 'unknown')}"
+
+
+def normalize_chunk_text(text: str) -> str:
+    """Whitespace differences do not change synthesis; collapse them so edits elsewhere don't miss"""
+    return " ".join(text.split())
+
+
+def _link_or_copy(src: Path, dst: Path):
+    """Atomically place src's bytes at dst (hard link when on the same filesystem)"""
+    tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+class TTSChunkCache:
+    """Disk LRU of synthesized chunks keyed by content hash"""
+
+    def __init__(
+        self,
+        directory: Path = TTS_CHUNK_CACHE_DIR,
+        max_bytes: int = TTS_CHUNK_CACHE_MAX_BYTES,
+        s4_backing: bool = TTS_CHUNK_CACHE_S4,
+        enabled: bool = TTS_CHUNK_CACHE_ENABLED,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.s4_backing = s4_backing
+        self.enabled = enabled and max_bytes > 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> bytes on disk (mp3 + json)
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._sync_lock = asyncio.Lock()
+        self._scanned_at = 0.0
+        self._uploads: Set[asyncio.Task] = set()
+        self.current_bytes = 0
+        self.hits = 0
+        self.s4_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(chunk_text: str, voice: str) -> str:
+        material = f"{ENGINE_VERSION}\n{voice}\n{normalize_chunk_text(chunk_text)}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        shard = self.directory / key[:2]
+        return shard / f"{key}.mp3", shard / f"{key}.json"
+
+    # ------------------------------------------------------------------ index
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            await self._sync_with_disk()
+            self._loaded = True
+            logger.info(
+                f"TTS chunk cache: {len(self._entries)} entries, "
+                f"{self.current_bytes / 1024 / 1024:.1f} MiB in {self.directory}"
+            )
+
+    def _scan(self):
+        """(key, size) of complete entries, least recently used first"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        found = []
+        for audio_path in self.directory.glob("*/*.mp3"):
+            meta_path = audio_path.with_suffix(".json")
+            try:
+                audio_stat = audio_path.stat()
+                meta_size = meta_path.stat().st_size
+            except OSError:
+                continue
+            found.append((audio_stat.st_mtime, audio_path.stem, audio_stat.st_size + meta_size))
+        found.sort()
+        return [(key, size) for _, key, size in found]
+
+    def _track(self, key: str, size: int):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.current_bytes -= previous
+        self._entries[key] = size
+        self.current_bytes += size
+
+    def _enforce_budget(self):
+        """
+        Blocking; under a flock shared by every worker on the host, rescan the
+        directory and unlink its least recently used entries until it fits.
+        Returns the surviving (key, size) list, its total and the eviction count.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / ".evict.lock", "a+b") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            entries = self._scan()
+            total = sum(size for _, size in entries)
+            evicted = 0
+            if total > self.max_bytes:
+                target = int(self.max_bytes * TTS_CHUNK_CACHE_LOW_WATER)
+                while evicted < len(entries) and total > target:
+                    total -= entries[evicted][1]
+                    evicted += 1
+                self._unlink_entries(key for key, _ in entries[:evicted])
+        return entries[evicted:], total, evicted
+
+    async def _sync_with_disk(self):
+        """Replace this worker's estimate with the host's real usage, evicting if over the cap"""
+        entries, total, evicted = await asyncio.to_thread(self._enforce_budget)
+        self._entries = OrderedDict(entries)
+        self.current_bytes = total
+        self.evictions += evicted
+        self._scanned_at = time.monotonic()
+        if evicted:
+            logger.info(f"TTS chunk cache: evicted {evicted} entries, {total / 1024 / 1024:.1f} MiB left")
+
+    def _unlink_entries(self, keys):
+        for key in keys:
+            for path in self._paths(key):
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+    # ----------------------------------------------------------------- lookup
+
+    async def fetch(self, chunk_text: str, voice: str, output_path: Path,
+                    chunk_index: int) -> Optional[Tuple[float, Path, int]]:
+        """
+        Materialize a cached chunk at output_path (+ its .timings.json) and return
+        (duration, timings_path, file_size) like _generate_chunk_audio_to_file, or None.
+        """
+        if not self.enabled:
+            return None
+        await self._ensure_loaded()
+        key = self.make_key(chunk_text, voice)
+
+        try:
+            result = await asyncio.to_thread(self._materialize, key, output_path, chunk_index, voice)
+            if result is None and self.s4_backing and await self._fetch_from_s4(key):
+                result = await asyncio.to_thread(self._materialize, key, output_path, chunk_index, voice)
+                if result is not None:
+                    self.s4_hits += 1
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"TTS chunk cache read failed for {key[:12]}: {e}")
+            result = None
+
+        if result is None:
+            self.misses += 1
+            stale = self._entries.pop(key, None)
+            if stale is not None:
+                self.current_bytes -= stale
+            return None
+
+        duration, timings_path, file_size, entry_size = result
+        self.hits += 1
+        self._track(key, entry_size)
+        return duration, timings_path, file_size
+
+    def _materialize(self, key: str, output_path: Path, chunk_index: int, voice: str):
+        audio_path, meta_path = self._paths(key)
+        try:
+            with meta_path.open('r', encoding='utf-8') as f:
+                meta = json.load(f)
+            audio_size = audio_path.stat().st_size
+        except (OSError, ValueError):
+            return None
+        if audio_size != meta.get('size'):
+            return None  # torn or foreign entry
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        _link_or_copy(audio_path, output_path)
+
+        word_boundaries = meta['word_boundaries']
+        for w in word_boundaries:
+            w['chunk_index'] = chunk_index
+            w['voice'] = voice
+        timings_path = output_path.with_suffix(".timings.json")
+        tmp = timings_path.with_suffix(".json.tmp")
+        with tmp.open('w', encoding='utf-8') as f:
+            json.dump({
+                "chunk_index": chunk_index,
+                "duration": meta['duration'],
+                "word_boundaries": word_boundaries,
+            }, f)
+        os.replace(tmp, timings_path)
+
+        now = time.time()
+        os.utime(audio_path, (now, now))
+        return meta['duration'], timings_path, audio_size, audio_size + meta_path.stat().st_size
+
+    # ------------------------------------------------------------------ store
+
+    async def store(self, chunk_text: str, voice: str, audio_path: Path, timings_path: Path):
+        """Add a freshly generated chunk; failures only cost a future cache miss"""
+        if not self.enabled:
+            return
+        await self._ensure_loaded()
+        key = self.make_key(chunk_text, voice)
+        try:
+            entry_size = await asyncio.to_thread(self._write_entry, key, voice, audio_path, timings_path)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"TTS chunk cache write failed for {key[:12]}: {e}")
+            return
+
+        self.stores += 1
+        self._track(key, entry_size)
+        # Other workers store into the same directory: never trust the local total alone
+        stale = time.monotonic() - self._scanned_at > TTS_CHUNK_CACHE_RESCAN_SECONDS
+        if (self.current_bytes > self.max_bytes or stale) and not self._sync_lock.locked():
+            async with self._sync_lock:
+                try:
+                    await self._sync_with_disk()
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning(f"TTS chunk cache eviction failed: {e}")
+
+        if self.s4_backing:
+            task = asyncio.create_task(self._upload_to_s4(key))
+            self._uploads.add(task)
+            task.add_done_callback(self._uploads.discard)
+
+    def _write_entry(self, key: str, voice: str, audio_path: Path, timings_path: Path) -> int:
+        cached_audio, cached_meta = self._paths(key)
+        cached_audio.parent.mkdir(parents=True, exist_ok=True)
+
+        with timings_path.open('r', encoding='utf-8') as f:
+            timing_data = json.load(f)
+
+        _link_or_copy(audio_path, cached_audio)
+        meta = {
+            "engine": ENGINE_VERSION,
+            "voice": voice,
+            "size": cached_audio.stat().st_size,
+            "duration": timing_data["duration"],
+            "word_boundaries": timing_data["word_boundaries"],
+        }
+        tmp = cached_meta.with_name(f".{cached_meta.name}.{uuid.uuid4().hex[:8]}.tmp")
+        with tmp.open('w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp, cached_meta)
+        return meta["size"] + cached_meta.stat().st_size
+
+    # --------------------------------------------------------------- S4 tier
+
+    async def _s4_client(self):
+        from mega_s4_client import mega_s4_client
+        if not mega_s4_client._started:
+            await mega_s4_client.start()
+        return mega_s4_client
+
+    async def _upload_to_s4(self, key: str):
+        try:
+            client = await self._s4_client()
+            audio_path, meta_path = self._paths(key)
+            await client.upload_file(meta_path, f"{TTS_CHUNK_CACHE_S4_PREFIX}/{key}.json", "application/json")
+            await client.upload_file(audio_path, f"{TTS_CHUNK_CACHE_S4_PREFIX}/{key}.mp3", "audio/mpeg")
+        except Exception as e:
+            logger.warning(f"TTS chunk cache S4 upload failed for {key[:12]}: {e}")
+
+    async def _fetch_from_s4(self, key: str) -> bool:
+        try:
+            client = await self._s4_client()
+            audio_path, meta_path = self._paths(key)
+            await asyncio.to_thread(audio_path.parent.mkdir, parents=True, exist_ok=True)
+            # Audio first: an entry only counts once its JSON (with the audio size) is in place
+            for path, suffix in ((audio_path, "mp3"), (meta_path, "json")):
+                response = await client.download_file_stream(f"{TTS_CHUNK_CACHE_S4_PREFIX}/{key}.{suffix}")
+                if not response:
+                    return False
+                tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+                try:
+                    with tmp.open('wb') as f:
+                        async for chunk in response.content.iter_chunked(65536):
+                            await asyncio.to_thread(f.write, chunk)
+                    await asyncio.to_thread(os.replace, tmp, path)
+                except Exception:
+                    tmp.unlink(missing_ok=True)
+                    raise
+                finally:
+                    response.release()
+            return True
+        except Exception as e:
+            logger.debug(f"TTS chunk cache S4 miss for {key[:12]}: {e}")
+            return False
+
+    def get_stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'directory': str(self.directory),
+            'engine': ENGINE_VERSION,
+            'entries': len(self._entries),
+            'current_mb': round(self.current_bytes / 1024 / 1024, 2),
+            'max_mb': round(self.max_bytes / 1024 / 1024, 2),
+            'hits': self.hits,
+            's4_hits': self.s4_hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'errors': self.errors,
+            's4_backing': self.s4_backing,
+            'pending_uploads': len(self._uploads),
+        }
+
+
+tts_chunk_cache = TTSChunkCache()
@@ -0,0 +1,236 @@
+"""
+Shared chunk queues for multi-track / multi-voice TTS jobs
+
+_generate_chunks_in_parallel normally gives each job a private queue and a
+private set of workers. Jobs that belong together (the voices of one fan-out,
+the chapters of one bulk series) instead register a lane with one
+ChunkLaneScheduler and share its worker pool:
+
+- a lane is one job's chunk plan plus its per-chunk coroutine
+  (process_chunk(index, text, worker_id), which still takes the job's
+  limiter slot, records the manifest and so on)
+- workers pick the next chunk across lanes: ChunkLaneScheduler goes
+  round-robin (every lane advances together), BulkChunkScheduler always
+  serves the lane with the lowest priority first and steals from the next
+  lanes once that one has nothing left to dispatch
+- a lane that fails or is cancelled stops only itself; its chunks in flight
+  are cancelled and the others keep going
+
+Used by tts_voice_fanout.VoiceFanOut and the bulk series queue.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# process_chunk(chunk_index, chunk_text, worker_id)
+ChunkProcessor = Callable[[int, str, int], Awaitable[None]]
+
+
+class _Lane:
+    """One job's progress through its chunk plan"""
+
+    def __init__(self, key: str, plan: List[str], process_chunk: ChunkProcessor, workers: int, priority: int):
+        self.key = key
+        self.plan = plan
+        self.process_chunk = process_chunk
+        self.workers = workers
+        self.priority = priority
+        self.total = len(plan)
+        self.next_index = 0
+        self.completed = 0
+        self.running: Set[asyncio.Task] = set()
+        self.done: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    @property
+    def has_pending(self) -> bool:
+        return not self.done.done() and self.next_index < self.total
+
+
+class ChunkLaneScheduler:
+    """Worker pool shared by several lanes, dispatching round-robin"""
+
+    # Limiter job the lanes' chunks take their slots from (None: each lane's own job)
+    slot_job_id: Optional[str] = None
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.chunks_completed = 0
+        self._lanes: List[_Lane] = []
+        self._workers: Set[asyncio.Task] = set()
+        self._spawned = 0
+        self._turn = 0
+
+    async def run_lane(self, key: str, plan: List[str], process_chunk: ChunkProcessor, workers: int) -> int:
+        """
+        Run process_chunk over every chunk of plan, sharing the worker pool with
+        the other lanes. Returns the chunk count; raises what process_chunk
+        raised (CancelledError if the lane's job was cancelled).
+        """
+        if not plan:
+            return 0
+
+        lane = _Lane(key, plan, process_chunk, max(1, workers), self._priority_of(key))
+        self._lanes.append(lane)
+        self._spawn_workers()
+        logger.info(
+            f"LANES [{self.name}]: {key} joined ({lane.total} chunks, "
+            f"{len(self._lanes)} lanes, {len(self._workers)} workers)"
+        )
+        try:
+            return await lane.done
+        finally:
+            # Cancelled or failed: stop dispatching this lane and drop its chunks in flight
+            for task in lane.running:
+                task.cancel()
+            if lane.running:
+                await asyncio.wait(lane.running)
+            self._lanes.remove(lane)
+            self._lane_finished(lane)
+
+    # ------------------------------------------------------------- policy
+
+    def _priority_of(self, key: str) -> int:
+        return 0
+
+    def _target_workers(self) -> int:
+        return sum(lane.workers for lane in self._lanes if not lane.done.done())
+
+    def _pick_lane(self, active: List[_Lane]) -> _Lane:
+        lane = active[self._turn % len(active)]
+        self._turn += 1
+        return lane
+
+    def _lane_finished(self, lane: _Lane):
+        pass
+
+    # ------------------------------------------------------------- scheduling
+
+    def _spawn_workers(self):
+        while len(self._workers) < self._target_workers():
+            worker_id = self._spawned
+            self._spawned += 1
+            task = asyncio.create_task(self._worker(worker_id), name=f"lane_worker_{worker_id}")
+            self._workers.add(task)
+            task.add_done_callback(self._workers.discard)
+
+    def _next_chunk(self) -> Tuple[Optional[_Lane], int]:
+        active = [lane for lane in self._lanes if lane.has_pending]
+        if not active or len(self._workers) > self._target_workers():
+            return None, 0
+        lane = self._pick_lane(active)
+        index = lane.next_index
+        lane.next_index += 1
+        return lane, index
+
+    async def _worker(self, worker_id: int):
+        processed = 0
+        while True:
+            lane, index = self._next_chunk()
+            if lane is None:
+                # Leave the pool before yielding so concurrent exits see the new size
+                self._workers.discard(asyncio.current_task())
+                break
+
+            task = asyncio.create_task(lane.process_chunk(index, lane.plan[index], worker_id))
+            lane.running.add(task)
+            try:
+                # asyncio.wait: a cancelled chunk must not look like a cancelled worker
+                await asyncio.wait({task})
+            finally:
+                lane.running.discard(task)
+                if not task.done():
+                    task.cancel()
+            self._finish_chunk(lane, task)
+            processed += 1
+
+        logger.debug(f"LANES [{self.name}]: worker-{worker_id} finished, processed {processed} chunks")
+
+    def _finish_chunk(self, lane: _Lane, task: asyncio.Task):
+        if task.cancelled():
+            if not lane.done.done():
+                lane.done.cancel()
+            return
+        error = task.exception()
+        if error is not None:
+            if not lane.done.done():
+                lane.done.set_exception(error)
+            logger.error(f"LANES [{self.name}]: lane {lane.key} failed: {error}")
+            return
+
+        lane.completed += 1
+        self.chunks_completed += 1
+        if lane.completed == lane.total and not lane.done.done():
+            lane.done.set_result(lane.total)
+
+    # ---------------------------------------------------------- observability
+
+    def get_stats(self) -> Dict:
+        return {
+            "name": self.name,
+            "workers": len(self._workers),
+            "chunks_completed": self.chunks_completed,
+            "elapsed_seconds": round(time.time() - self.started_at, 1),
+            "lanes": {
+                lane.key: {
+                    "priority": lane.priority,
+                    "dispatched": lane.next_index,
+                    "completed": lane.completed,
+                    "total": lane.total,
+                }
+                for lane in self._lanes
+            },
+        }
+
+
+class BulkChunkScheduler(ChunkLaneScheduler):
+    """
+    Priority lanes for a bulk series: every worker serves the earliest chapter
+    that still has chunks to dispatch, so chapters finish (and become playable)
+    in order, and idle workers steal from later chapters instead of waiting
+    for one long chapter's last chunks.
+    """
+
+    def __init__(self, name: str, workers: int, slot_job_id: str):
+        super().__init__(name)
+        self.workers = max(1, workers)
+        self.slot_job_id = slot_job_id
+        self._priorities: Dict[str, int] = {}
+        self._synthesized: Dict[str, asyncio.Event] = {}
+        self.steals = 0
+
+    def expect_lane(self, key: str, priority: int) -> asyncio.Event:
+        """Register a lane's priority ahead of time; the event is set once its chunks are done"""
+        self._priorities[key] = priority
+        return self._synthesized.setdefault(key, asyncio.Event())
+
+    def forget_lane(self, key: str):
+        self._priorities.pop(key, None)
+        self._synthesized.pop(key, None)
+
+    def _priority_of(self, key: str) -> int:
+        return self._priorities.get(key, 0)
+
+    def _target_workers(self) -> int:
+        return self.workers if any(not lane.done.done() for lane in self._lanes) else 0
+
+    def _pick_lane(self, active: List[_Lane]) -> _Lane:
+        lane = min(active, key=lambda l: l.priority)
+        head = min((l for l in self._lanes if not l.done.done()), key=lambda l: l.priority)
+        if lane is not head:
+            self.steals += 1
+        return lane
+
+    def _lane_finished(self, lane: _Lane):
+        event = self._synthesized.get(lane.key)
+        if event:
+            event.set()
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats.update({"max_workers": self.workers, "steals": self.steals})
+        return stats
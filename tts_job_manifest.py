@@ -0,0 +1,303 @@
+"""
+Durable per-chunk manifests for crash-resumable TTS jobs
+
+A container restart used to cost every in-flight TTS job all of its work:
+StatusLock.clear_all_on_startup() marked the voice failed, the temp cleanup
+removed the session directory with its finished chunks, and the user had to
+start a long book again from chunk zero.
+
+TTSJobManifest makes a session directory resumable:
+
+- manifest.json sits in the session directory next to the chunk files and is
+  rewritten atomically (tmp + rename) after every finished chunk. It records
+  the job (kind, track, voice, user, title), a hash of the source text, the
+  chunk count once the split is known and, per chunk, the text hash, audio
+  file, timing shard, duration and size
+- The same summary is mirrored in Redis (tts_manifest namespace) so every
+  container can see which jobs are in flight and where their chunks live
+- On startup find_interrupted_jobs() collects unfinished manifests, StatusLock
+  keeps their locks instead of failing them, and the TTS API re-runs the
+  worker on the old session directory; _generate_chunks_in_parallel reuses
+  every recorded chunk whose files are intact and only synthesizes the rest
+- A user cancel or a failed job discards the manifest; handing the finished
+  audio to HLS preparation retires it
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from redis_state.async_state_manager import AsyncRedisStateManager
+
+logger = logging.getLogger(__name__)
+
+TTS_RESUME_ENABLED = os.getenv('TTS_RESUME_JOBS', 'true').lower() in ('1', 'true', 'yes')
+TTS_SESSION_ROOT = Path(os.getenv('TTS_SESSION_ROOT', '/tmp/media_storage/tts'))
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+MANIFEST_MIRROR_TTL = 7 * 24 * 3600
+
+manifest_state = AsyncRedisStateManager("tts_manifest")
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _write_atomic(path: Path, payload: str):
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_text(payload, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+class TTSJobManifest:
+    """Chunk plan and progress of one TTS job, persisted in its session directory"""
+
+    def __init__(self, session_dir: Path, data: Dict):
+        self.session_dir = Path(session_dir)
+        self.path = self.session_dir / MANIFEST_FILENAME
+        self.data = data
+        self._save_lock = asyncio.Lock()
+        self._discarded = False
+
+    @classmethod
+    async def create(
+        cls,
+        session_dir: Path,
+        *,
+        kind: str,
+        track_id: str,
+        voice: str,
+        user_id: int,
+        text: str,
+        params: Optional[Dict] = None,
+    ) -> "TTSJobManifest":
+        now = time.time()
+        manifest = cls(session_dir, {
+            'version': MANIFEST_VERSION,
+            'kind': kind,
+            'track_id': track_id,
+            'voice': voice,
+            'user_id': user_id,
+            'params': params or {},
+            'text_sha256': await asyncio.to_thread(_sha256, text),
+            'status': 'generating',
+            'total_chunks': None,
+            'chunks': {},
+            'created_at': now,
+            'updated_at': now,
+        })
+        await manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, session_dir: Path) -> Optional["TTSJobManifest"]:
+        """Blocking; None if the directory has no readable manifest"""
+        path = Path(session_dir) / MANIFEST_FILENAME
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != MANIFEST_VERSION:
+            logger.warning(f"Ignoring TTS manifest with unknown version: {path}")
+            return None
+        return cls(session_dir, data)
+
+    # ------------------------------------------------------------- accessors
+
+    @property
+    def kind(self) -> str:
+        return self.data['kind']
+
+    @property
+    def track_id(self) -> str:
+        return self.data['track_id']
+
+    @property
+    def voice(self) -> str:
+        return self.data['voice']
+
+    @property
+    def user_id(self) -> int:
+        return self.data['user_id']
+
+    @property
+    def params(self) -> Dict:
+        return self.data.get('params') or {}
+
+    @property
+    def status(self) -> str:
+        return self.data.get('status', 'generating')
+
+    @property
+    def total_chunks(self) -> Optional[int]:
+        return self.data.get('total_chunks')
+
+    @property
+    def completed_count(self) -> int:
+        return len(self.data['chunks'])
+
+    @property
+    def mirror_key(self) -> str:
+        return f"{self.track_id}:{self.voice}"
+
+    # --------------------------------------------------------------- updates
+
+    async def bind_text(self, text: str):
+        """Forget recorded chunks if the source text changed since they were generated"""
+        text_sha = await asyncio.to_thread(_sha256, text)
+        if text_sha == self.data['text_sha256']:
+            return
+        logger.info(f"TTS manifest {self.mirror_key}: source text changed, dropping {self.completed_count} chunks")
+        self.data['text_sha256'] = text_sha
+        self.data['total_chunks'] = None
+        self.data['chunks'] = {}
+        await self.save()
+
+    async def completed_chunk(self, index: int, chunk_text: str) -> Optional[Tuple[float, Path, int]]:
+        """(duration, timings_path, size) of a recorded chunk that is still intact on disk"""
+        entry = self.data['chunks'].get(str(index))
+        if not entry or entry['text_sha256'] != _sha256(chunk_text):
+            return None
+        return await asyncio.to_thread(self._verify_chunk, index, entry)
+
+    def _verify_chunk(self, index: int, entry: Dict) -> Optional[Tuple[float, Path, int]]:
+        try:
+            if (self.session_dir / entry['file']).stat().st_size != entry['size']:
+                return None
+        except OSError:
+            return None
+        # Timing shards are moved into timings/ once every chunk is done
+        for timings_path in (
+            self.session_dir / entry['timings'],
+            self.session_dir / "timings" / f"chunk_{index:04d}.json",
+        ):
+            if timings_path.exists():
+                return entry['duration'], timings_path, entry['size']
+        return None
+
+    async def record_chunk(
+        self,
+        index: int,
+        chunk_text: str,
+        chunk_file: Path,
+        timings_path: Path,
+        duration: float,
+        size: int,
+    ):
+        self.data['chunks'][str(index)] = {
+            'text_sha256': _sha256(chunk_text),
+            'file': chunk_file.name,
+            'timings': timings_path.name,
+            'duration': duration,
+            'size': size,
+        }
+        await self.save()
+
+    async def set_total_chunks(self, total_chunks: int):
+        self.data['total_chunks'] = total_chunks
+        await self.save()
+
+    async def save(self):
+        async with self._save_lock:
+            if self._discarded:
+                return
+            self.data['updated_at'] = time.time()
+            payload = json.dumps(self.data)
+            await asyncio.to_thread(_write_atomic, self.path, payload)
+            await manifest_state.set_status(
+                self.mirror_key,
+                self.status,
+                metadata={
+                    'kind': self.kind,
+                    'session_dir': str(self.session_dir),
+                    'completed_chunks': self.completed_count,
+                    'total_chunks': self.total_chunks,
+                    'user_id': self.user_id,
+                },
+                ttl=MANIFEST_MIRROR_TTL,
+            )
+
+    async def discard(self):
+        """Job finished or abandoned: nothing left to resume"""
+        async with self._save_lock:
+            self._discarded = True
+            await asyncio.to_thread(self.path.unlink, missing_ok=True)
+            await manifest_state.delete_status(self.mirror_key)
+
+
+async def retire_manifest(session_dir: Path):
+    """Drop the manifest of a session whose audio has been handed on (no-op without one)"""
+    manifest = await asyncio.to_thread(TTSJobManifest.load, session_dir)
+    if manifest is not None:
+        await manifest.discard()
+        logger.info(f"TTS manifest retired: {manifest.mirror_key} ({manifest.completed_count} chunks)")
+
+
+def _scan_manifests(root: Path) -> List[TTSJobManifest]:
+    if not root.is_dir():
+        return []
+    manifests = []
+    for path in root.glob(f"*/{MANIFEST_FILENAME}"):
+        manifest = TTSJobManifest.load(path.parent)
+        if manifest is not None and manifest.status == 'generating':
+            manifests.append(manifest)
+    return manifests
+
+
+async def find_interrupted_jobs(root: Path = TTS_SESSION_ROOT) -> List[TTSJobManifest]:
+    """
+    Unfinished jobs left in this container's session root, one per track/voice
+    (the newest); older duplicates are removed with their session directories.
+    """
+    if not TTS_RESUME_ENABLED:
+        return []
+
+    manifests = await asyncio.to_thread(_scan_manifests, root)
+    newest: Dict[Tuple[str, str], TTSJobManifest] = {}
+    for manifest in sorted(manifests, key=lambda m: m.data.get('created_at', 0)):
+        key = (manifest.track_id, manifest.voice)
+        superseded = newest.get(key)
+        if superseded is not None:
+            await asyncio.to_thread(shutil.rmtree, superseded.session_dir, True)
+        newest[key] = manifest
+
+    if newest:
+        logger.info(f"Found {len(newest)} interrupted TTS jobs in {root}")
+    return list(newest.values())
+
+
+def resumable_session_dirs(root: Path = TTS_SESSION_ROOT) -> Set[Path]:
+    if not TTS_RESUME_ENABLED:
+        return set()
+    return {manifest.session_dir for manifest in _scan_manifests(root)}
+
+
+def rmtree_preserving_sessions(path: Path):
+    """shutil.rmtree(path), except for session directories that can still be resumed"""
+    keep = resumable_session_dirs()
+    if not any(path == session_dir or path in session_dir.parents for session_dir in keep):
+        shutil.rmtree(path)
+        return
+    _rmtree_except(path, keep)
+    logger.info(f"Kept {len(keep)} resumable TTS session directories under {path}")
+
+
+def _rmtree_except(path: Path, keep: Set[Path]):
+    for child in path.iterdir():
+        if child in keep:
+            continue
+        if child.is_dir() and not child.is_symlink():
+            if any(child in session_dir.parents for session_dir in keep):
+                _rmtree_except(child, keep)
+            else:
+                shutil.rmtree(child, ignore_errors=True)
+        else:
+            child.unlink(missing_ok=True)
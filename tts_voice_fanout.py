@@ -0,0 +1,41 @@
+"""
+Voice fan-out: one chunk plan, several voices
+
+A popular track is often requested in several voices at once (up to
+VoiceCacheManager.max_voices_popular). Run as independent voice switches,
+every voice loaded the source text from storage, re-ran the chunk split and
+kept a private chunk queue, so the splitting and text I/O were paid once per
+voice and whichever voice started first held the workers.
+
+VoiceFanOut runs those voices as one job:
+
+- the source text is loaded and split once by the caller; the split is the
+  persisted chunk plan (EnhancedVoiceAwareTTSService.get_chunk_plan), so a
+  later single-voice switch of the track reuses it too
+- every voice registers a lane over the same plan (tts_chunk_scheduler);
+  one shared pool of workers takes the next chunk from the lanes
+  round-robin, so all voices advance together instead of queueing behind
+  each other
+- a lane still synthesizes through its own TTS job (fair-limiter slot,
+  manifest, chunk cache, progressive HLS); a voice that fails or is
+  cancelled stops only its own lane
+"""
+
+from typing import Dict, List
+
+from tts_chunk_scheduler import ChunkLaneScheduler
+
+
+class VoiceFanOut(ChunkLaneScheduler):
+    """Round-robin lanes for several voices over one track's chunk plan"""
+
+    def __init__(self, track_id: str, text: str, plan: List[str]):
+        super().__init__(f"fanout:{track_id}")
+        self.track_id = track_id
+        self.text = text
+        self.plan = plan
+
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats.update({"track_id": self.track_id, "plan_chunks": len(self.plan)})
+        return stats
@@ -59,6 +59,14 @@ class VoiceAccessTracker:
         """Delegate to Redis tracker"""
         return self._redis_tracker.get_voice_activity(track_id, voice_id)
 
+    def clear_voice(self, track_id: str, voice_id: str):
+        """Delegate to Redis tracker"""
+        self._redis_tracker.clear_voice(track_id, voice_id)
+
+    async def flush(self):
+        """Push buffered accesses to Redis now"""
+        await self._redis_tracker.flush()
+
     def cleanup_old_entries(self):
         """Delegate to Redis tracker (handled by TTL)"""
         self._redis_tracker.cleanup_old_entries()
@@ -287,8 +295,7 @@ class VoiceCacheManager:
                 await anyio.to_thread.run_sync(shutil.rmtree, voice_dir, True)
                 logger.info(f"Removed voice directory: {voice_dir}")
                 
-                if track_id in self.access_tracker.voice_access_cache:
-                    self.access_tracker.voice_access_cache[track_id].pop(voice_id, None)
+                self.access_tracker.clear_voice(track_id, voice_id)
                 
                 try:
                     from enhanced_tts_voice_service import enhanced_voice_tts_service
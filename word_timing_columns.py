@@ -0,0 +1,187 @@
+"""
+Columnar, memory-mapped word timings
+
+timings.zst holds variable-length word records behind one zstd frame, so
+every cache miss decompressed the whole book and unpacked it into a list of
+per-word dicts, and get_word_timings_range then rebuilt a list of start
+times on every call. A 150k-word book is ~150k dicts per worker before the
+first lookup.
+
+timings.cols sits next to timings.zst and stores the same words
+uncompressed, column by column, so a worker mmaps it and reads only the
+pages a lookup touches:
+
+    header    magic "WTC1", version, flags, word count, string table size
+    starts    float64[n]   word start (seconds)
+    ends      float64[n]   word end (seconds)
+    offsets   float32[n]   offset inside its HLS segment (NaN: not mapped)
+    segments  uint32[n]    HLS segment index
+    chars     uint32[n+1]  byte offsets of each word in the string table
+    strings   UTF-8 words, back to back
+
+- index_at() and range() bisect the start/end columns in place (memoryview
+  casts over the mmap); nothing is materialized for the lookup itself, only
+  the words returned become dicts
+- ColumnarWriter builds the file from the words in any form (text storage
+  feeds it v4 records straight from the packed bytes, so existing
+  timings.zst files migrate without going through dicts)
+"""
+
+import math
+import mmap
+import os
+import struct
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+COLUMNS_MAGIC = b"WTC1"
+COLUMNS_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIQ")  # magic, version, flags, words, reserved, string table bytes
+
+
+class ColumnarFormatError(ValueError):
+    pass
+
+
+class ColumnarWriter:
+    """Accumulates words column by column; build() returns the file contents"""
+
+    def __init__(self):
+        self._starts = array("d")
+        self._ends = array("d")
+        self._offsets = array("f")
+        self._segments = array("I")
+        self._chars = array("I", [0])
+        self._strings = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def add(self, word: Union[str, bytes], start: float, end: float,
+            segment_index: int = 0, segment_offset: Optional[float] = None):
+        self._strings += word.encode("utf-8") if isinstance(word, str) else word
+        self._starts.append(start)
+        self._ends.append(end)
+        self._offsets.append(math.nan if segment_offset is None else segment_offset)
+        self._segments.append(segment_index)
+        self._chars.append(len(self._strings))
+
+    def add_dict(self, word: Dict):
+        start = float(word.get("start_time", 0.0))
+        end = float(word.get("end_time", start + float(word.get("duration", 0.0))))
+        self.add(word.get("word", "") or "", start, end,
+                 int(word.get("segment_index", 0) or 0), word.get("segment_offset"))
+
+    def build(self) -> bytes:
+        header = _HEADER.pack(COLUMNS_MAGIC, COLUMNS_VERSION, 0, len(self._starts), 0, len(self._strings))
+        return b"".join((
+            header,
+            self._starts.tobytes(),
+            self._ends.tobytes(),
+            self._offsets.tobytes(),
+            self._segments.tobytes(),
+            self._chars.tobytes(),
+            bytes(self._strings),
+        ))
+
+    def write(self, path: Path):
+        """Blocking; atomic (tmp + rename) so readers never map a half-written file"""
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            tmp.write_bytes(self.build())
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+class ColumnarWordTimings:
+    """Read-only view over a timings.cols buffer (an mmap or bytes)"""
+
+    def __init__(self, buffer, path: Optional[Path] = None):
+        self.path = path
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ColumnarFormatError("Columnar timings shorter than their header")
+        magic, version, _flags, count, _reserved, strings_size = _HEADER.unpack_from(view)
+        if magic != COLUMNS_MAGIC or version != COLUMNS_VERSION:
+            raise ColumnarFormatError(f"Not a columnar timings file (magic {magic!r}, version {version})")
+
+        pos = _HEADER.size
+        sections = []
+        for code, length in (("d", count), ("d", count), ("f", count), ("I", count), ("I", count + 1)):
+            size = length * array(code).itemsize
+            sections.append(view[pos:pos + size].cast(code))
+            pos += size
+        if pos + strings_size != len(view):
+            raise ColumnarFormatError("Columnar timings size does not match their header")
+
+        self._view = view
+        self.starts, self.ends, self._offsets, self._segments, self._chars = sections
+        self._strings = view[pos:]
+        self.word_count = count
+
+    @classmethod
+    def open(cls, path: Path) -> "ColumnarWordTimings":
+        """Blocking; maps the file read-only"""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped, path)
+        except Exception:
+            mapped.close()
+            raise
+
+    def close(self):
+        """Unmap now; if a lookup still holds a slice, the mapping goes with the last reference instead"""
+        try:
+            for view in (self.starts, self.ends, self._offsets, self._segments, self._chars, self._strings, self._view):
+                view.release()
+            if isinstance(self._buffer, mmap.mmap):
+                self._buffer.close()
+        except BufferError:
+            pass
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    # ------------------------------------------------------------- lookups
+
+    def index_at(self, time: float) -> int:
+        """Index of the word being spoken at time (the last one started by then), -1 before the first"""
+        return bisect_right(self.starts, time) - 1
+
+    def range(self, start: float, end: float, limit: Optional[int] = None) -> Tuple[int, int]:
+        """[lo, hi) of the words overlapping [start, end] (word ends are non-decreasing)"""
+        lo = bisect_left(self.ends, start)
+        hi = max(lo, bisect_right(self.starts, end))
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return lo, hi
+
+    def word(self, index: int) -> str:
+        return bytes(self._strings[self._chars[index]:self._chars[index + 1]]).decode("utf-8", errors="replace")
+
+    def word_dict(self, index: int) -> Dict:
+        """Same shape as the v4 unpacker's dicts"""
+        start, end = self.starts[index], self.ends[index]
+        wd = {
+            "word": self.word(index),
+            "start_time": start,
+            "duration": round(end - start, 3),  # whole milliseconds, as v4 stores it
+            "end_time": end,
+            "segment_index": self._segments[index],
+        }
+        offset = self._offsets[index]
+        if offset == offset:  # not NaN
+            wd["segment_offset"] = round(offset, 3)
+        return wd
+
+    def words(self, lo: int = 0, hi: Optional[int] = None) -> List[Dict]:
+        hi = self.word_count if hi is None else min(hi, self.word_count)
+        return [self.word_dict(i) for i in range(max(0, lo), hi)]
@@ -0,0 +1,162 @@
+"""
+Single-pass word-timing merge for TTS jobs
+
+Once the last chunk was synthesized, _load_and_merge_timings read every
+chunk timing shard again, copied each word dict to add its offset, appended
+the batches as timings.parts shards and wrote an NDJSON copy, which the S4
+upload then parsed back into dicts and packed once more into timings.zst.
+
+WordTimingMerger does that work while the chunks are still being generated:
+
+- add_chunk(index, timings_path) is awaited by each chunk as soon as its
+  timing shard is written; the shard is parsed off the event loop and held
+  until every earlier chunk has arrived, then its words are packed straight
+  from the parsed shard into v4 word records (text_storage_service format)
+  at their cumulative offset
+- only the packed records are kept (~25 bytes per word): no per-word dict
+  copies, no .jsonl and no timings.parts shards
+- align() re-bases the records onto the spliced MP3's frame-accurate chunk
+  durations in place; finish() fills in the header, and
+  store_packed_word_timings() compresses and writes timings.zst in one go
+"""
+
+import json
+import logging
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import anyio
+
+from text_storage_service import _HEADER_FMT, _HEADER_SIZE, _TIMING_FMT_VERSION, _WORD_META_FMT, _WORD_META_SIZE
+
+logger = logging.getLogger(__name__)
+
+_WORD_LEN = struct.Struct("<B")
+_WORD_META = struct.Struct(_WORD_META_FMT)
+_START_MS = struct.Struct("<Q")
+
+
+@dataclass
+class _MergedChunk:
+    start: int          # byte range of the chunk's records in the body
+    end: int
+    offset: float       # seconds added to the shard's word times
+    duration: float
+    last_end: float     # end of the chunk's last word, shard-relative (0.0 if it has none)
+
+
+def _read_shard(path: Path) -> Tuple[float, List[Dict]]:
+    """Blocking; (duration, word_boundaries) of one chunk timing shard"""
+    shard = json.loads(path.read_text() or "{}")
+    return float(shard.get("duration", 0.0)), shard.get("word_boundaries", []) or []
+
+
+def _shift_records(body: bytearray, start: int, end: int, delta_ms: int):
+    """Add delta_ms to the start of every word record in body[start:end]"""
+    pos = start
+    while pos < end:
+        meta = pos + 1 + body[pos]
+        (start_ms,) = _START_MS.unpack_from(body, meta)
+        _START_MS.pack_into(body, meta, max(0, start_ms + delta_ms))
+        pos = meta + _WORD_META_SIZE
+
+
+class WordTimingMerger:
+    """Packs a TTS job's chunk timing shards into one timing file as the chunks finish"""
+
+    def __init__(self, track_id: str, voice: str):
+        self.track_id = track_id
+        self.voice = voice
+        self.word_count = 0
+        self._body = bytearray(_HEADER_SIZE)
+        self._chunks: List[_MergedChunk] = []
+        self._pending: Dict[int, Tuple[float, List[Dict]]] = {}
+        self._elapsed = 0.0
+
+    @property
+    def chunks_merged(self) -> int:
+        return len(self._chunks)
+
+    @property
+    def total_duration(self) -> float:
+        return self._elapsed
+
+    async def add_chunk(self, index: int, timings_path: Path):
+        """Take chunk index's shard; chunks may arrive in any order"""
+        if index < len(self._chunks) or index in self._pending:
+            return
+        shard = await anyio.to_thread.run_sync(_read_shard, Path(timings_path))
+        if index < len(self._chunks):
+            return
+        self._pending[index] = shard
+        while len(self._chunks) in self._pending:
+            self._append(*self._pending.pop(len(self._chunks)))
+
+    @classmethod
+    async def from_directory(cls, timings_dir: Path, track_id: str, voice: str) -> "WordTimingMerger":
+        """Merge the chunk_*.json shards of a finished job (no merger ran alongside it)"""
+        merger = cls(track_id, voice)
+        timing_files = sorted(await anyio.to_thread.run_sync(lambda: list(timings_dir.glob("chunk_*.json"))))
+        for index, timing_file in enumerate(timing_files):
+            await merger.add_chunk(index, timing_file)
+        return merger
+
+    def _append(self, duration: float, words: List[Dict]):
+        body = self._body
+        offset = self._elapsed
+        start = len(body)
+        last_end = 0.0
+        for w in words:
+            word_bytes = (w.get("word", "") or "").encode("utf-8")
+            if len(word_bytes) > 255:
+                word_bytes = word_bytes[:252] + b"..."
+            word_start = float(w.get("start_time", 0.0))
+            word_end = float(w.get("end_time", word_start))
+            word_duration = float(w.get("duration", word_end - word_start))
+            body += _WORD_LEN.pack(len(word_bytes))
+            body += word_bytes
+            body += _WORD_META.pack(int((word_start + offset) * 1000), int(word_duration * 1000), 0, 0)
+            last_end = word_end
+        self.word_count += len(words)
+        self._chunks.append(_MergedChunk(start, len(body), offset, max(0.0, duration), last_end))
+        self._elapsed = offset + max(0.0, duration)
+
+    def align(self, durations: Sequence[float]) -> float:
+        """
+        Re-base the merged chunks onto durations (the spliced chunks' frame-accurate
+        ones) so word offsets line up with the final MP3. Returns the total duration.
+        """
+        elapsed = 0.0
+        for chunk, duration in zip(self._chunks, durations):
+            delta_ms = round((elapsed - chunk.offset) * 1000)
+            if delta_ms:
+                _shift_records(self._body, chunk.start, chunk.end, delta_ms)
+            chunk.offset = elapsed
+            chunk.duration = duration
+            elapsed += duration
+        self._elapsed = elapsed
+        return elapsed
+
+    def finish(self, total_chunks: int) -> bytearray:
+        """The packed v4 timings (header included) once all total_chunks shards are merged"""
+        if len(self._chunks) != total_chunks or self._pending:
+            raise ValueError(
+                f"Timing merge incomplete for {self.track_id}:{self.voice}: "
+                f"{len(self._chunks)}/{total_chunks} chunks merged"
+            )
+        if self.word_count == 0:
+            raise ValueError(f"No usable timings loaded from {total_chunks} chunks")
+
+        first_time = _START_MS.unpack_from(self._body, _HEADER_SIZE + 1 + self._body[_HEADER_SIZE])[0] / 1000.0
+        last = next(chunk for chunk in reversed(self._chunks) if chunk.end > chunk.start)
+        struct.pack_into(
+            _HEADER_FMT, self._body, 0,
+            _TIMING_FMT_VERSION, self.word_count, first_time, last.offset + last.last_end, 0
+        )
+        logger.info(
+            f"Merged {self.word_count} words from {total_chunks} chunks "
+            f"({len(self._body) / 1024:.0f} KiB packed): {self.track_id}:{self.voice}"
+        )
+        return self._body
@@ -292,9 +292,21 @@ worker_monitor = WorkerMonitor()
 
 # API endpoints for monitoring (add these to your app.py)
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from auth import login_required
+from models import User
 
-monitor_router = APIRouter(prefix="/api/admin/monitor", tags=["monitoring"])
+async def require_creator(current_user: User = Depends(login_required)) -> User:
+    """Monitoring endpoints are creator-only"""
+    if not current_user.is_creator:
+        raise HTTPException(status_code=403, detail="Admin only")
+    return current_user
+
+monitor_router = APIRouter(
+    prefix="/api/admin/monitor",
+    tags=["monitoring"],
+    dependencies=[Depends(require_creator)]
+)
 
 @monitor_router.get("/status")
 async def get_worker_status():
@@ -312,6 +324,7 @@ async def get_worker_status():
 @monitor_router.get("/health")
 async def get_system_health():
     """Get detailed system health report."""
+    from worker_config import worker_config
     # Get latest health report
     track_status = await worker_monitor._get_track_manager_status()
     album_status = await worker_monitor._get_album_manager_status()
@@ -346,6 +359,18 @@ async def get_recent_logs(lines: int = 20):
     """Get recent monitoring logs."""
     return worker_monitor.get_recent_logs(lines)
 
+@monitor_router.get("/segment-cache")
+async def get_segment_cache_stats():
+    """Hot segment memory cache: hit ratio and bytes served from memory (this worker)."""
+    from hot_segment_cache import hot_segment_cache
+    return hot_segment_cache.get_stats()
+
+@monitor_router.get("/memory-caches")
+async def get_memory_cache_stats():
+    """Bounded in-process caches: entries, bytes, hit ratio, evictions and expirations (this worker)."""
+    from bounded_cache import all_stats
+    return all_stats()
+
 # Add this to your app.py:
 # app.include_router(monitor_router)
 